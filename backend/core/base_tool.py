@@ -2,7 +2,7 @@
 Classe base abstrata para tools (NEWAVE e DECOMP).
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class BaseTool(ABC):
@@ -65,6 +65,22 @@ class BaseTool(ABC):
         """
         pass
     
+    def get_cache_params(self, query: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Parâmetros canônicos que determinam o resultado de execute(query, **kwargs),
+        para a chave do cache de resultados (core/tool_result_cache.py).
+
+        Tools que extraem os parâmetros da query (usina, submercado, estágio,
+        forced_plant_code, ...) podem retorná-los aqui: perguntas diferentes com
+        os mesmos parâmetros ("CVU de Angra 1", "cvu da usina Angra 1")
+        compartilham o resultado. O dict deve conter tudo o que influencia o
+        resultado, inclusive os kwargs.
+
+        Returns:
+            Dict de parâmetros, ou None (padrão) para usar a query normalizada
+        """
+        return None
+
     def get_name(self) -> str:
         """Retorna o nome da tool."""
         return self.__class__.__name__
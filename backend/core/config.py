@@ -112,6 +112,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
 
+# Backend de embeddings (routing semântico e RAG): "azure" (padrão) ou "local"
+# "local" usa embeddings de n-gramas de caracteres com hashing, calculados em processo
+# (sem rede; ver core/local_embeddings.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "azure").strip().lower()
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "1024"))
+
 # Azure OpenAI (usado para embeddings via Azure)
 # Em produção, recomenda-se definir explicitamente:
 # - AZURE_OPENAI_API_KEY
@@ -136,6 +142,88 @@ SEMANTIC_MATCH_MIN_SCORE = float(os.getenv("SEMANTIC_MATCH_MIN_SCORE", "0.35"))
 USE_HYBRID_MATCHING = os.getenv("USE_HYBRID_MATCHING", "true").lower() == "true"
 QUERY_EXPANSION_ENABLED = os.getenv("QUERY_EXPANSION_ENABLED", "true").lower() == "true"
 
+# Store persistente de embeddings das tools (evita chamar a API de embeddings a cada restart/worker)
+TOOL_EMBEDDINGS_STORE_ENABLED = os.getenv("TOOL_EMBEDDINGS_STORE_ENABLED", "true").lower() == "true"
+TOOL_EMBEDDINGS_STORE_DIR = Path(os.getenv("TOOL_EMBEDDINGS_STORE_DIR", str(DATA_DIR / "embeddings")))
+
+# Cache de embeddings de queries (LRU limitado por entradas e bytes; TTL 0 = sem expiração)
+QUERY_EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", "2048"))
+QUERY_EMBEDDING_CACHE_MAX_MB = float(os.getenv("QUERY_EMBEDDING_CACHE_MAX_MB", "64"))
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "0"))
+# Rankings de tools por query já calculados (uma passada serve best-tool, top-k e disambiguation)
+RANKINGS_CACHE_MAX_ENTRIES = int(os.getenv("RANKINGS_CACHE_MAX_ENTRIES", "256"))
+
+# Cache de resultados das tools (ver core/tool_result_cache.py)
+# Chave: tool, conteúdo dos decks, parâmetros extraídos pela tool (ou query normalizada); só resultados com success=True
+TOOL_RESULT_CACHE_ENABLED = os.getenv("TOOL_RESULT_CACHE_ENABLED", "true").lower() == "true"
+TOOL_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_RESULT_CACHE_MAX_ENTRIES", "4096"))
+TOOL_RESULT_CACHE_MAX_MB = float(os.getenv("TOOL_RESULT_CACHE_MAX_MB", "256"))
+# Intervalo máximo (s) em que o fingerprint de um deck extraído é reaproveitado sem percorrer a árvore
+# (alterações no próprio diretório do deck mudam o mtime e invalidam na hora); 0 percorre a cada chamada
+TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS = float(os.getenv("TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS", "2"))
+
+# Pool de processos para parse de arquivos dos decks (ver core/parse_pool.py)
+# O parse do cfinterface é Python puro e segura o GIL: em threads, os decks são lidos um de cada vez.
+# Número de processos do pool; 0 ou 1 desativa o pool (parse em threads)
+PARSE_POOL_PROCESSES = int(os.getenv("PARSE_POOL_PROCESSES", str(min(8, os.cpu_count() or 1))))
+
+# Decks lidos direto do ZIP (ver core/utils/zip_deck.py)
+# Com DECK_ZIP_ON_DEMAND, load_deck não extrai o ZIP inteiro: cada arquivo do deck é
+# descomprimido na primeira vez que uma tool o abre. "false" volta ao extractall.
+DECK_ZIP_ON_DEMAND = os.getenv("DECK_ZIP_ON_DEMAND", "true").lower() == "true"
+# Limite (MB) dos arquivos descomprimidos sob demanda mantidos em disco (LRU; 0 = sem limite)
+DECK_MEMBER_CACHE_MAX_MB = int(os.getenv("DECK_MEMBER_CACHE_MAX_MB", "4096"))
+# Deduplicação por conteúdo: arquivos idênticos em decks diferentes são extraídos uma vez
+# (blob por SHA-256 em DECK_BLOB_DIR) e ligados por hard link em cada deck.
+# DECK_BLOB_DIR deve estar no mesmo sistema de arquivos dos decks (senão cada deck fica com a própria cópia)
+DECK_DEDUP_ENABLED = os.getenv("DECK_DEDUP_ENABLED", "true").lower() == "true"
+DECK_BLOB_DIR = Path(os.getenv("DECK_BLOB_DIR", str(DATA_DIR / "deck_blobs")))
+
+# Catálogo de decks em memória (ver core/utils/deck_catalog.py)
+# Intervalo mínimo (s) entre verificações de mtime dos diretórios de decks; 0 verifica a cada chamada
+DECK_CATALOG_RECHECK_SECONDS = float(os.getenv("DECK_CATALOG_RECHECK_SECONDS", "2"))
+
+# Ingestão em segundo plano de decks novos/alterados (ver core/deck_ingestion.py)
+DECK_INGEST_ENABLED = os.getenv("DECK_INGEST_ENABLED", "true").lower() == "true"
+# Intervalo (s) entre verificações da pasta de decks; 0 verifica só na subida
+DECK_INGEST_POLL_SECONDS = float(os.getenv("DECK_INGEST_POLL_SECONDS", "60"))
+# Threads que processam a fila de ingestão (o parse segura o GIL: poucas bastam)
+DECK_INGEST_WORKERS = int(os.getenv("DECK_INGEST_WORKERS", "1"))
+
+# Execução das queries dos agentes fora do event loop (ver core/query_executor.py)
+# Threads que executam /query e /query/stream (compartilhadas pelos três agentes)
+QUERY_EXECUTOR_WORKERS = int(os.getenv("QUERY_EXECUTOR_WORKERS", "8"))
+# Queries aguardando uma thread livre; acima disso a API responde 503
+QUERY_EXECUTOR_MAX_QUEUE = int(os.getenv("QUERY_EXECUTOR_MAX_QUEUE", "16"))
+# Valor do header Retry-After (s) nas respostas 503
+QUERY_EXECUTOR_RETRY_AFTER_SECONDS = int(os.getenv("QUERY_EXECUTOR_RETRY_AFTER_SECONDS", "5"))
+
+# Modo multiprocesso com afinidade de decks (ver backend/supervisor.py e core/deck_affinity.py)
+# Processos worker iniciados pelo supervisor (run.py); 1 = processo único, como antes
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+# Porta do primeiro worker (localhost); os demais usam as seguintes
+WORKER_BASE_PORT = int(os.getenv("WORKER_BASE_PORT", "8100"))
+# Definidos pelo supervisor em cada worker: índice do worker e total de workers
+WORKER_INDEX = int(os.getenv("WORKER_INDEX", "0"))
+WORKER_COUNT = int(os.getenv("WORKER_COUNT", "1"))
+
+# Upload de decks (ver core/deck_upload.py)
+# Threads que preparam os decks enviados (extração em segundo plano)
+UPLOAD_EXTRACT_WORKERS = int(os.getenv("UPLOAD_EXTRACT_WORKERS", "2"))
+# Tempo máximo (s) que uma query aguarda a preparação do deck da sessão
+UPLOAD_WAIT_SECONDS = float(os.getenv("UPLOAD_WAIT_SECONDS", "300"))
+
+# Sessões dos agentes (ver core/session_store.py)
+# Sessões sem uso há mais que o TTL (s) são removidas, com o diretório do upload
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+# Sessões mantidas em memória por agente (LRU); com persistência, as demais ficam só no SQLite
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+# Intervalo (s) entre execuções do reaper de sessões e uploads abandonados; 0 desativa
+SESSION_REAP_INTERVAL_SECONDS = float(os.getenv("SESSION_REAP_INTERVAL_SECONDS", "600"))
+# Persistência das sessões em SQLite: sobrevivem a reinícios e são vistas por todos os workers
+SESSION_PERSIST_ENABLED = os.getenv("SESSION_PERSIST_ENABLED", "true").lower() == "true"
+SESSION_DB_PATH = Path(os.getenv("SESSION_DB_PATH", str(DATA_DIR / "sessions.db")))
+
 # Disambiguation settings (baseado em análise empírica de 70 queries)
 DISAMBIGUATION_SCORE_DIFF_THRESHOLD = float(os.getenv("DISAMBIGUATION_SCORE_DIFF_THRESHOLD", "0.1"))  # Diferença mediana observada: 0.0931
 DISAMBIGUATION_MAX_OPTIONS = int(os.getenv("DISAMBIGUATION_MAX_OPTIONS", "3"))  # Maioria dos conflitos envolve 2-3 tools
@@ -0,0 +1,77 @@
+"""
+⚡ Afinidade de decks entre processos worker (hash consistente).
+
+Os caches de decks (dadger_cache, inewave_cache, hidr_reader, sessões) são
+por processo. Com vários workers, cada requisição caía em um worker
+qualquer: o mesmo deck era parseado e guardado em vários processos,
+multiplicando os 3-5 GB de cache, e os hits se perdiam.
+
+No modo multiprocesso (backend/supervisor.py) cada deck pertence a um único
+worker, escolhido por hash consistente do nome (prefixado pelo agente: o
+NW202501 do NEWAVE e o DC202501-sem1 do DECOMP são distribuídos
+independentemente). O supervisor usa o anel para rotear as requisições e
+cada worker o usa para ingerir em segundo plano só os seus decks
+(core/deck_ingestion.py). Com hash consistente, mudar o número de workers
+move apenas ~1/N dos decks.
+
+Uso:
+    from backend.core.deck_affinity import owns_deck, worker_for_deck
+
+    worker = worker_for_deck("decomp", "DC202501-sem1", worker_count=4)
+    if owns_deck("decomp", "DC202501-sem1"):
+        ...
+"""
+import bisect
+import hashlib
+from functools import lru_cache
+from typing import List, Tuple
+
+from backend.core.config import WORKER_COUNT, WORKER_INDEX
+
+# Pontos de cada worker no anel: mais pontos, distribuição mais uniforme
+_REPLICAS = 128
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def deck_key(agent: str, deck_name: str) -> str:
+    """Chave de roteamento de um deck (agente + nome)."""
+    return f"{agent.lower()}:{deck_name}"
+
+
+class HashRing:
+    """Anel de hash consistente sobre os workers 0..worker_count-1."""
+
+    def __init__(self, worker_count: int, replicas: int = _REPLICAS):
+        self.worker_count = max(1, worker_count)
+        points: List[Tuple[int, int]] = sorted(
+            (_hash(f"worker-{worker}-{replica}"), worker)
+            for worker in range(self.worker_count)
+            for replica in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._workers = [w for _, w in points]
+
+    def get_worker(self, key: str) -> int:
+        """Worker dono da chave (primeiro ponto do anel a partir do hash da chave)."""
+        if self.worker_count == 1:
+            return 0
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._workers[i]
+
+
+@lru_cache(maxsize=None)
+def get_ring(worker_count: int) -> HashRing:
+    return HashRing(worker_count)
+
+
+def worker_for_deck(agent: str, deck_name: str, worker_count: int = WORKER_COUNT) -> int:
+    """Índice do worker responsável pelo deck."""
+    return get_ring(worker_count).get_worker(deck_key(agent, deck_name))
+
+
+def owns_deck(agent: str, deck_name: str) -> bool:
+    """True se este processo é o worker responsável pelo deck (sempre, em processo único)."""
+    return WORKER_COUNT <= 1 or worker_for_deck(agent, deck_name) == WORKER_INDEX
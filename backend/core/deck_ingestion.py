@@ -0,0 +1,290 @@
+"""
+⚡ Ingestão em segundo plano de decks novos ou alterados.
+
+Um ZIP novo na pasta de decks só era aberto quando alguma requisição chamava
+load_deck(), e mesmo assim só extraído: o primeiro analista a abrir o deck
+semanal novo pagava extração, parse e montagem dos índices de usinas.
+
+O DeckIngestor de cada agente (NEWAVE, DECOMP, DESSEM) verifica o catálogo de
+decks a cada DECK_INGEST_POLL_SECONDS. Decks novos, ou cujo ZIP mudou
+(mtime/tamanho), entram em uma fila processada por threads de fundo, do mais
+recente para o mais antigo. Cada deck passa por:
+
+    pendente -> processando -> pronto (ou erro)
+
+O processamento é a função ingest(deck_name) do agente: preparar o deck
+(load_deck), fazer o parse dos arquivos principais nos caches e montar os
+índices de nomes de usinas. O status por deck fica disponível em
+get_status() (endpoint GET /decks/ingestion de cada API) e o resumo em
+get_progress() (GET /health/ready).
+
+A primeira verificação, no startup, encontra todos os decks: ela é o preload
+em segundo plano (ver core/startup.py). No modo multiprocesso cada worker
+ingere apenas os decks que lhe pertencem (core/deck_affinity.py).
+
+Configuração: DECK_INGEST_ENABLED, DECK_INGEST_POLL_SECONDS, DECK_INGEST_WORKERS.
+
+Uso:
+    from backend.core.deck_ingestion import DeckIngestor
+
+    ingestor = DeckIngestor("DECOMP", list_available_decks, ingest_deck)
+    ingestor.start()
+    ingestor.get_status()
+"""
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.config import (
+    DECK_INGEST_ENABLED,
+    DECK_INGEST_POLL_SECONDS,
+    DECK_INGEST_WORKERS,
+    safe_print,
+)
+from backend.core.deck_affinity import owns_deck
+
+PENDING = "pendente"
+RUNNING = "processando"
+READY = "pronto"
+ERROR = "erro"
+
+
+def _zip_fingerprint(deck: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(deck["zip_path"])
+    except (KeyError, OSError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DeckIngestor:
+    """Detecta decks novos/alterados e os processa em threads de fundo."""
+
+    def __init__(
+        self,
+        name: str,
+        list_decks: Callable[[], List[Dict[str, Any]]],
+        ingest: Callable[[str], Optional[Dict[str, Any]]],
+        poll_seconds: float = DECK_INGEST_POLL_SECONDS,
+        workers: int = DECK_INGEST_WORKERS,
+    ):
+        """
+        Args:
+            name: Nome usado nos logs (ex: "DECOMP")
+            list_decks: Lista de decks (list_available_decks do agente)
+            ingest: Processa um deck pelo nome; o dict retornado vai para o status
+            poll_seconds: Intervalo entre verificações da pasta de decks
+            workers: Threads de processamento
+        """
+        self.name = name
+        self._list_decks = list_decks
+        self._ingest = ingest
+        self.poll_seconds = poll_seconds
+        self.workers = max(1, workers)
+
+        self._lock = threading.Lock()
+        # Nome do deck -> status (ver _new_status)
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._queue: "queue.PriorityQueue[Tuple[Tuple[int, int, int], int, str]]" = queue.PriorityQueue()
+        self._sequence = 0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _new_status(self, deck: Dict[str, Any], fingerprint: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+        return {
+            "deck": deck["name"],
+            "status": PENDING,
+            "zip_path": deck.get("zip_path"),
+            "fingerprint": fingerprint,
+            "queued_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "seconds": None,
+            "error": None,
+            "details": None,
+        }
+
+    def scan(self) -> int:
+        """
+        Compara o catálogo com o último estado e enfileira decks novos/alterados.
+
+        Returns:
+            Número de decks enfileirados
+        """
+        # Só os decks deste worker (todos, em processo único)
+        decks = [deck for deck in self._list_decks() if owns_deck(self.name, deck["name"])]
+        queued = 0
+        with self._lock:
+            for deck in decks:
+                fingerprint = _zip_fingerprint(deck)
+                current = self._status.get(deck["name"])
+                if current is not None and current["fingerprint"] == fingerprint:
+                    continue
+                if current is not None and current["status"] in (PENDING, RUNNING):
+                    # Mudou durante o processamento: reprocessar depois
+                    current["fingerprint"] = None
+                    continue
+                self._status[deck["name"]] = self._new_status(deck, fingerprint)
+                self._enqueue_locked(deck)
+                queued += 1
+        if queued:
+            safe_print(f"[INGEST {self.name}] 📦 {queued} deck(s) novo(s) ou alterado(s) na fila")
+        return queued
+
+    def _enqueue_locked(self, deck: Dict[str, Any]) -> None:
+        # Mais recente primeiro: (ano, mês, semana) negativos na prioridade
+        priority = (-int(deck.get("year") or 0), -int(deck.get("month") or 0), -int(deck.get("week") or 0))
+        self._sequence += 1
+        self._queue.put((priority, self._sequence, deck["name"]))
+
+    def ingest_now(self, deck_name: str) -> bool:
+        """
+        Enfileira um deck (mesmo que já processado).
+
+        Returns:
+            False se o deck não existir no catálogo
+        """
+        deck = next((d for d in self._list_decks() if d["name"] == deck_name), None)
+        if deck is None:
+            return False
+        with self._lock:
+            current = self._status.get(deck_name)
+            if current is not None and current["status"] in (PENDING, RUNNING):
+                return True
+            self._status[deck_name] = self._new_status(deck, _zip_fingerprint(deck))
+            self._enqueue_locked(deck)
+        self.start()
+        return True
+
+    def _process(self, deck_name: str) -> None:
+        with self._lock:
+            status = self._status.get(deck_name)
+            if status is None or status["status"] != PENDING:
+                return
+            status["status"] = RUNNING
+            status["started_at"] = time.time()
+
+        start = time.time()
+        try:
+            details = self._ingest(deck_name)
+            outcome, error = READY, None
+        except Exception as e:
+            details, outcome, error = None, ERROR, str(e)
+        elapsed = time.time() - start
+
+        with self._lock:
+            status["status"] = outcome
+            status["error"] = error
+            status["details"] = details
+            status["finished_at"] = time.time()
+            status["seconds"] = round(elapsed, 3)
+        progress = self.get_progress()
+        counter = f"{progress['done']}/{progress['total']}"
+        if outcome == READY:
+            safe_print(f"[INGEST {self.name}] ✅ {deck_name} pronto em {elapsed:.2f}s ({counter})")
+        else:
+            safe_print(f"[INGEST {self.name}] ❌ {deck_name}: {error} ({counter})")
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                _, _, deck_name = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                self._process(deck_name)
+            finally:
+                self._queue.task_done()
+
+    def _poller(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                safe_print(f"[INGEST {self.name}] ⚠️ Erro ao verificar decks: {e}")
+            if self.poll_seconds <= 0:
+                return
+            self._stop.wait(self.poll_seconds)
+
+    def start(self) -> bool:
+        """
+        Inicia o monitoramento e as threads de processamento (idempotente).
+
+        Returns:
+            False se a ingestão estiver desativada (DECK_INGEST_ENABLED)
+        """
+        if not DECK_INGEST_ENABLED:
+            return False
+        with self._lock:
+            if self._threads:
+                return True
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"ingest-{self.name.lower()}-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            self._threads.append(threading.Thread(target=self._poller, name=f"ingest-{self.name.lower()}-poll", daemon=True))
+            for thread in self._threads:
+                thread.start()
+        safe_print(f"[INGEST {self.name}] ⚡ Ingestão em segundo plano iniciada ({self.workers} worker(s))")
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Para as threads (o deck em processamento termina antes)."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a fila esvaziar (útil em scripts e testes)."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                busy = any(s["status"] in (PENDING, RUNNING) for s in self._status.values())
+            if not busy:
+                return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.1)
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Resumo da ingestão: decks conhecidos, processados e contagem por estado."""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for status in self._status.values():
+                counts[status["status"]] = counts.get(status["status"], 0) + 1
+            running = bool(self._threads)
+        total = sum(counts.values())
+        done = counts.get(READY, 0) + counts.get(ERROR, 0)
+        return {
+            "enabled": DECK_INGEST_ENABLED,
+            "running": running,
+            "total": total,
+            "done": done,
+            "complete": running and done == total,
+            "counts": counts,
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Status por deck e contagem por estado."""
+        with self._lock:
+            decks = [
+                {k: v for k, v in s.items() if k != "fingerprint"}
+                for s in self._status.values()
+            ]
+            running = bool(self._threads)
+        counts: Dict[str, int] = {}
+        for deck in decks:
+            counts[deck["status"]] = counts.get(deck["status"], 0) + 1
+        return {
+            "agent": self.name,
+            "enabled": DECK_INGEST_ENABLED,
+            "running": running,
+            "poll_seconds": self.poll_seconds,
+            "counts": counts,
+            "decks": sorted(decks, key=lambda d: d["deck"]),
+        }
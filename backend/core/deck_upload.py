@@ -0,0 +1,281 @@
+"""
+⚡ Upload de decks em streaming, com deduplicação e preparação em segundo plano.
+
+/upload fazia `await file.read()` (o ZIP inteiro, centenas de MB no NEWAVE,
+em memória) e extraía o deck dentro da requisição: uploads em paralelo
+estouravam a memória e o tempo limite do proxy reverso.
+
+Agora:
+- o arquivo é copiado para o disco em blocos de 1 MB, em uma thread,
+  calculando o SHA-256 no caminho; o ZIP fica em UPLOADS_DIR/.zips/<sha>.zip
+  (um único arquivo por conteúdo, mesmo com uploads repetidos)
+- ZIP idêntico a um deck do repositório: a sessão aponta para o deck já
+  preparado (load_deck), com os caches aquecidos pela ingestão
+- ZIP já enviado antes: o arquivo não é gravado de novo, e os arquivos do
+  deck e os objetos parseados são compartilhados pela deduplicação por
+  conteúdo (core/utils/zip_deck.py, core/utils/content_hash.py)
+- a preparação do diretório da sessão (ensure_deck_dir) roda em segundo
+  plano; o status fica em get_status() (GET /upload/{session_id}) e as
+  queries aguardam a preparação com wait_ready()
+- a sessão pronta é registrada com on_ready (SessionStore.put, ver
+  core/session_store.py); collect() descarta status antigos e os ZIPs que
+  nenhuma sessão de upload usa mais
+
+Uso:
+    from backend.core.deck_upload import DeckUploadManager
+
+    uploads = DeckUploadManager("DECOMP", UPLOADS_DIR, list_available_decks, load_deck, session_store.put)
+    status = await uploads.accept(file)
+    deck_path = await uploads.wait_ready(session_id)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from backend.core.config import UPLOAD_EXTRACT_WORKERS, UPLOAD_WAIT_SECONDS, safe_print
+from backend.core.utils.content_hash import content_digest, remember_digest
+from backend.core.utils.zip_deck import MARKER_NAME, close_zip_deck, ensure_deck_dir, get_zip_deck
+
+PENDING = "processando"
+READY = "pronto"
+ERROR = "erro"
+
+_CHUNK_BYTES = 1024 * 1024
+
+
+def _copy_and_hash(src: BinaryIO, dst_path: Path) -> Tuple[str, int]:
+    """Copia src para dst_path em blocos, retornando (sha256, bytes)."""
+    h = hashlib.sha256()
+    size = 0
+    src.seek(0)
+    with open(dst_path, "wb") as dst:
+        while True:
+            chunk = src.read(_CHUNK_BYTES)
+            if not chunk:
+                break
+            h.update(chunk)
+            dst.write(chunk)
+            size += len(chunk)
+    return h.hexdigest(), size
+
+
+class DeckUploadManager:
+    """Recebe ZIPs de decks enviados e prepara as sessões em segundo plano."""
+
+    def __init__(
+        self,
+        name: str,
+        uploads_dir: Path,
+        list_decks: Callable[[], List[Dict[str, Any]]],
+        load_deck: Callable[[str], Path],
+        on_ready: Optional[Callable[[str, Path], None]] = None,
+        workers: int = UPLOAD_EXTRACT_WORKERS,
+    ):
+        """
+        Args:
+            name: Nome usado nos logs (ex: "DECOMP")
+            uploads_dir: Diretório das sessões de upload
+            list_decks: Decks do repositório (list_available_decks do agente)
+            load_deck: Prepara um deck do repositório pelo nome
+            on_ready: Chamado com (session_id, deck_path) quando o deck fica pronto
+            workers: Threads de preparação
+        """
+        self.name = name
+        self.uploads_dir = Path(uploads_dir)
+        self.zips_dir = self.uploads_dir / ".zips"
+        self._list_decks = list_decks
+        self._load_deck = load_deck
+        self._on_ready = on_ready
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"upload-{name.lower()}")
+        self._lock = threading.Lock()
+        # session_id -> status do upload
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+
+    def _find_repository_deck(self, digest: str, size: int) -> Optional[str]:
+        """Deck do repositório com o mesmo ZIP (compara o hash só de ZIPs do mesmo tamanho)."""
+        for deck in self._list_decks():
+            zip_path = deck.get("zip_path")
+            try:
+                if zip_path and os.path.getsize(zip_path) == size and content_digest(zip_path) == digest:
+                    return deck["name"]
+            except OSError:
+                continue
+        return None
+
+    def _store(self, file: Any) -> Tuple[Path, str, int, bool]:
+        """
+        Grava o upload em .zips/<sha>.zip.
+
+        Returns:
+            (caminho do ZIP, sha256, bytes, True se o conteúdo já existia)
+        """
+        self.zips_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.zips_dir / f".upload-{uuid.uuid4().hex}.tmp"
+        try:
+            digest, size = _copy_and_hash(file.file, tmp)
+            zip_path = self.zips_dir / f"{digest}.zip"
+            if zip_path.exists() and zip_path.stat().st_size == size:
+                # Renova o mtime: collect() não remove um ZIP acabado de reenviar
+                os.utime(zip_path)
+                return zip_path, digest, size, True
+            os.replace(tmp, zip_path)
+            remember_digest(str(zip_path), digest)
+            return zip_path, digest, size, False
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    async def accept(self, file: Any) -> Dict[str, Any]:
+        """
+        Grava o ZIP enviado e agenda a preparação do deck.
+
+        Args:
+            file: UploadFile do FastAPI
+
+        Returns:
+            Status do upload (session_id, sha256, files_count, status, ...)
+
+        Raises:
+            zipfile.BadZipFile: o arquivo não é um ZIP válido
+        """
+        start = time.time()
+        zip_path, digest, size, known = await asyncio.to_thread(self._store, file)
+        # Lê só o diretório central: valida o ZIP e conta os arquivos
+        try:
+            files_count = len((await asyncio.to_thread(get_zip_deck, str(zip_path))).names())
+        except zipfile.BadZipFile:
+            if not known:
+                zip_path.unlink(missing_ok=True)
+            raise
+        repository_deck = await asyncio.to_thread(self._find_repository_deck, digest, size)
+
+        session_id = str(uuid.uuid4())
+        status = {
+            "session_id": session_id,
+            "status": PENDING,
+            "filename": file.filename,
+            "sha256": digest,
+            "bytes": size,
+            "files_count": files_count,
+            # Deck do repositório com o mesmo ZIP, ou "upload" se o ZIP já tinha sido enviado
+            "duplicate_of": repository_deck or ("upload" if known else None),
+            "deck_path": None,
+            "error": None,
+            "created_at": time.time(),
+            "seconds": None,
+        }
+        with self._lock:
+            self._jobs[session_id] = status
+            self._futures[session_id] = self._executor.submit(self._prepare, session_id, zip_path, repository_deck)
+
+        origem = (
+            f"igual ao deck {repository_deck}" if repository_deck
+            else "conteúdo já enviado antes" if known
+            else "novo"
+        )
+        safe_print(
+            f"[UPLOAD {self.name}] 📦 {file.filename} recebido em {time.time() - start:.2f}s "
+            f"({size / 1024 ** 2:.1f} MB, {origem})"
+        )
+        return dict(status)
+
+    def _update(self, session_id: str, **values: Any) -> None:
+        with self._lock:
+            status = self._jobs.get(session_id)
+            if status is not None:
+                status.update(values)
+
+    def _prepare(self, session_id: str, zip_path: Path, repository_deck: Optional[str]) -> Path:
+        start = time.time()
+        try:
+            if repository_deck:
+                deck_path = Path(self._load_deck(repository_deck))
+            else:
+                deck_path = ensure_deck_dir(zip_path, self.uploads_dir / session_id)
+        except Exception as e:
+            self._update(session_id, status=ERROR, error=str(e), seconds=round(time.time() - start, 3))
+            safe_print(f"[UPLOAD {self.name}] ❌ Erro ao preparar {session_id}: {e}")
+            raise
+        if self._on_ready is not None:
+            self._on_ready(session_id, deck_path)
+        self._update(session_id, status=READY, deck_path=str(deck_path), seconds=round(time.time() - start, 3))
+        safe_print(f"[UPLOAD {self.name}] ✅ Sessão {session_id} pronta em {time.time() - start:.2f}s")
+        return deck_path
+
+    def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Status do upload da sessão, ou None se a sessão não veio de /upload neste processo."""
+        with self._lock:
+            status = self._jobs.get(session_id)
+            return dict(status) if status is not None else None
+
+    async def wait_ready(self, session_id: str, timeout: float = UPLOAD_WAIT_SECONDS) -> Optional[Path]:
+        """
+        Aguarda a preparação do deck da sessão (sem bloquear o event loop).
+
+        Returns:
+            Caminho do deck, ou None se a sessão não for um upload pendente/pronto
+        """
+        with self._lock:
+            future = self._futures.get(session_id)
+        if future is None:
+            return None
+        try:
+            # shield: o tempo limite desta espera não cancela a preparação
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except Exception:
+            return None
+
+    def forget(self, session_id: str) -> None:
+        """Descarta o status da sessão (sessão removida)."""
+        with self._lock:
+            self._jobs.pop(session_id, None)
+            self._futures.pop(session_id, None)
+
+    def collect(self, max_age_seconds: float) -> int:
+        """
+        Descarta status de uploads concluídos há mais de max_age_seconds e
+        remove de .zips os ZIPs antigos que nenhum diretório de sessão usa.
+
+        Returns:
+            Número de ZIPs removidos
+        """
+        if max_age_seconds <= 0:
+            return 0
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            for session_id, status in list(self._jobs.items()):
+                if status["status"] != PENDING and status["created_at"] < cutoff:
+                    self._jobs.pop(session_id, None)
+                    self._futures.pop(session_id, None)
+            in_use = {os.path.abspath(self.zips_dir / f"{status['sha256']}.zip") for status in self._jobs.values()}
+
+        if not self.zips_dir.is_dir():
+            return 0
+        # ZIPs dos diretórios de sessão (marcador do zip_deck), de qualquer agente
+        for marker in self.uploads_dir.glob(f"*/{MARKER_NAME}"):
+            try:
+                in_use.add(os.path.abspath(json.loads(marker.read_text(encoding="utf-8"))["zip_path"]))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        removed = 0
+        for zip_path in self.zips_dir.glob("*.zip"):
+            try:
+                if os.path.abspath(zip_path) in in_use or zip_path.stat().st_mtime >= cutoff:
+                    continue
+                close_zip_deck(str(zip_path))
+                zip_path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        if removed:
+            safe_print(f"[UPLOAD {self.name}] 🗑️ {removed} ZIPs enviados sem sessão removidos")
+        return removed
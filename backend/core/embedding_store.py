@@ -0,0 +1,262 @@
+"""
+⚡ Store persistente de embeddings das descrições das tools.
+
+O cache em memória do semantic matcher (_tool_embeddings_cache) é perdido a
+cada restart e não é compartilhado entre workers do uvicorn: sem este store,
+cada processo chama a API de embeddings uma vez por tool no cold start.
+
+Os embeddings ficam em um arquivo .npy por modelo de embeddings, em
+TOOL_EMBEDDINGS_STORE_DIR (padrão: data/embeddings/). Cada linha é um registro
+estruturado (description_hash, vetor float32), então o arquivo é um só e pode
+ser aberto com memory mapping (np.load(mmap_mode="r")) sem copiar os vetores
+para a memória de cada worker.
+
+A chave é (nome do modelo, description_hash): se a descrição de uma tool mudar,
+o hash muda e o embedding é gerado novamente; se o modelo mudar, outro arquivo
+é usado. O arquivo só é reescrito quando há embeddings novos, com escrita
+atômica (arquivo temporário + os.replace). Se a escrita falhar (ex: arquivo
+aberto por outro processo no Windows), os embeddings novos continuam válidos
+em memória e a escrita é tentada de novo na próxima inclusão.
+
+Uso:
+    from backend.core import embedding_store
+
+    model_name = embedding_store.get_model_name(embeddings_model)
+    vector = embedding_store.get_embedding(model_name, description_hash)
+    if vector is None:
+        embedding = embeddings_model.embed_query(description)
+        embedding_store.put_embeddings(model_name, {description_hash: embedding})
+"""
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from backend.core.config import (
+    EMBEDDING_BACKEND,
+    OPENAI_EMBEDDING_MODEL,
+    TOOL_EMBEDDINGS_STORE_DIR,
+    TOOL_EMBEDDINGS_STORE_ENABLED,
+    safe_print,
+)
+
+# Tamanho do md5 em hexadecimal (description_hash)
+_HASH_SIZE = 32
+
+
+class _ModelStore:
+    """Embeddings persistidos de um único modelo."""
+
+    def __init__(self, model_name: str, path: str):
+        self.model_name = model_name
+        self.path = path
+        self.records: Optional[np.ndarray] = None  # Array estruturado (memory-mapped)
+        self.index: Dict[str, int] = {}  # description_hash -> linha em records
+        self.pending: Dict[str, np.ndarray] = {}  # Embeddings ainda não gravados no disco
+
+    def load(self) -> None:
+        """(Re)abre o arquivo do disco com memory mapping."""
+        self.records = None
+        self.index = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            records = np.load(self.path, mmap_mode="r")
+            if records.dtype.names != ("hash", "vector"):
+                safe_print(f"[EMBEDDING STORE] [AVISO] Formato inválido em {self.path}, ignorando")
+                return
+            self.records = records
+            self.index = {h.decode("ascii"): i for i, h in enumerate(records["hash"])}
+        except Exception as e:
+            safe_print(f"[EMBEDDING STORE] [AVISO] Erro ao ler {self.path}: {e}")
+
+    def get(self, description_hash: str) -> Optional[np.ndarray]:
+        vector = self.pending.get(description_hash)
+        if vector is not None:
+            return vector
+        row = self.index.get(description_hash)
+        if row is None:
+            return None
+        # Cópia: o array memory-mapped não deve escapar do store
+        return np.array(self.records["vector"][row], dtype=np.float32)
+
+    def flush(self) -> None:
+        """Grava os embeddings pendentes junto com os já persistidos."""
+        if not self.pending:
+            return
+
+        # Recarregar do disco: outro worker pode ter gravado embeddings novos
+        self.load()
+        merged: Dict[str, np.ndarray] = {}
+        if self.records is not None:
+            for h, row in self.index.items():
+                merged[h] = np.array(self.records["vector"][row], dtype=np.float32)
+        merged.update(self.pending)
+        # Liberar o memory map antes de substituir o arquivo (necessário no Windows)
+        self.records = None
+        self.index = {}
+
+        dims = {v.shape[0] for v in self.pending.values()}
+        dim = dims.pop() if len(dims) == 1 else None
+        if dim is None:
+            safe_print(f"[EMBEDDING STORE] [AVISO] Dimensões inconsistentes para {self.model_name}, não persistindo")
+            self.load()
+            return
+        merged = {h: v for h, v in merged.items() if v.shape[0] == dim}
+
+        dtype = np.dtype([("hash", f"S{_HASH_SIZE}"), ("vector", np.float32, (dim,))])
+        records = np.empty(len(merged), dtype=dtype)
+        records["hash"] = [h.encode("ascii") for h in merged]
+        records["vector"] = np.stack(list(merged.values()))
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, records)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            safe_print(f"[EMBEDDING STORE] [AVISO] Erro ao gravar {self.path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.load()
+            return
+
+        safe_print(f"[EMBEDDING STORE] [OK] {len(self.pending)} embeddings novos gravados ({len(merged)} no total, modelo {self.model_name})")
+        self.pending = {}
+        self.load()
+
+
+_stores: Dict[str, _ModelStore] = {}
+_lock = threading.RLock()
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "writes": 0,
+}
+
+
+def get_model_name(embeddings_model) -> str:
+    """
+    Retorna o nome do modelo de embeddings usado como parte da chave do store.
+
+    Args:
+        embeddings_model: Instância de embeddings (ex: AzureOpenAIEmbeddings)
+
+    Returns:
+        Nome do modelo (ex: "text-embedding-3-small")
+    """
+    for attr in ("model", "model_name"):
+        name = getattr(embeddings_model, attr, None)
+        if isinstance(name, str) and name:
+            return name
+    return type(embeddings_model).__name__
+
+
+def _get_store(model_name: str) -> _ModelStore:
+    with _lock:
+        store = _stores.get(model_name)
+        if store is None:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+            path = os.path.join(str(TOOL_EMBEDDINGS_STORE_DIR), f"tool_embeddings_{safe_name}.npy")
+            store = _ModelStore(model_name, path)
+            store.load()
+            _stores[model_name] = store
+        return store
+
+
+def get_embedding(model_name: str, description_hash: str) -> Optional[np.ndarray]:
+    """
+    Retorna o embedding persistido de uma descrição, se existir.
+
+    Args:
+        model_name: Nome do modelo de embeddings
+        description_hash: md5 da descrição da tool
+
+    Returns:
+        Embedding (não normalizado) como array float32, ou None
+    """
+    if not TOOL_EMBEDDINGS_STORE_ENABLED:
+        return None
+    with _lock:
+        vector = _get_store(model_name).get(description_hash)
+        _stats["hits" if vector is not None else "misses"] += 1
+        return vector
+
+
+def get_embeddings(model_name: str, description_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Versão em lote de get_embedding().
+
+    Returns:
+        Dict {description_hash: embedding} apenas com os hashes encontrados
+    """
+    found = {}
+    for description_hash in description_hashes:
+        vector = get_embedding(model_name, description_hash)
+        if vector is not None:
+            found[description_hash] = vector
+    return found
+
+
+def put_embeddings(model_name: str, embeddings: Dict[str, list]) -> None:
+    """
+    Adiciona embeddings ao store e grava o arquivo do modelo.
+
+    Hashes já persistidos são ignorados, então o arquivo só é reescrito quando
+    alguma descrição é nova ou mudou.
+
+    Args:
+        model_name: Nome do modelo de embeddings
+        embeddings: Dict {description_hash: embedding}
+    """
+    if not TOOL_EMBEDDINGS_STORE_ENABLED or not embeddings:
+        return
+    with _lock:
+        store = _get_store(model_name)
+        for description_hash, embedding in embeddings.items():
+            if store.get(description_hash) is None:
+                store.pending[description_hash] = np.asarray(embedding, dtype=np.float32)
+        if store.pending:
+            store.flush()
+            _stats["writes"] += 1
+
+
+def clear_embedding_store(delete_files: bool = False) -> None:
+    """
+    Descarta os stores abertos (útil para testes).
+
+    Args:
+        delete_files: Se True, remove também os arquivos do disco
+    """
+    with _lock:
+        if delete_files:
+            for store in _stores.values():
+                store.records = None
+                if os.path.exists(store.path):
+                    os.remove(store.path)
+        _stores.clear()
+    safe_print("[EMBEDDING STORE] 🗑️ Store limpo")
+
+
+def get_store_stats() -> dict:
+    """Retorna estatísticas do store persistente."""
+    with _lock:
+        return {
+            "enabled": TOOL_EMBEDDINGS_STORE_ENABLED,
+            "directory": str(TOOL_EMBEDDINGS_STORE_DIR),
+            "models": {
+                name: len(store.index) + len(store.pending) for name, store in _stores.items()
+            },
+            **_stats,
+        }
+
+
+# Abrir o store do modelo padrão já no import (memory mapping: custo desprezível)
+if TOOL_EMBEDDINGS_STORE_ENABLED and EMBEDDING_BACKEND == "azure":
+    _get_store(OPENAI_EMBEDDING_MODEL)
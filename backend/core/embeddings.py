@@ -0,0 +1,71 @@
+"""
+Factory do backend de embeddings usado no routing semântico e no RAG.
+
+O backend é escolhido por EMBEDDING_BACKEND:
+- "azure" (padrão): AzureOpenAIEmbeddings (core/azure_openai.py)
+- "local": HashingNgramEmbeddings, em processo e sem rede (core/local_embeddings.py)
+
+Os dois expõem a interface Embeddings do LangChain (embed_query/embed_documents)
+e um atributo "model", usado como chave pelo cache de queries, pelo store
+persistente e pelas matrizes do semantic matcher: trocar de backend nunca
+mistura vetores de modelos diferentes.
+
+Uso:
+    from backend.core.embeddings import get_embeddings, get_collection_name
+
+    embeddings = get_embeddings()
+    collection = get_collection_name("inewave_docs")
+"""
+import threading
+
+from backend.core.config import EMBEDDING_BACKEND, LOCAL_EMBEDDING_DIM, safe_print
+
+EMBEDDING_BACKENDS = ("azure", "local")
+
+_embeddings = None
+_lock = threading.Lock()
+
+
+def _create_embeddings(backend: str):
+    if backend == "azure":
+        from backend.core.azure_openai import get_azure_embeddings
+        return get_azure_embeddings()
+    if backend == "local":
+        from backend.core.local_embeddings import HashingNgramEmbeddings
+        return HashingNgramEmbeddings(dim=LOCAL_EMBEDDING_DIM)
+    raise RuntimeError(
+        f"[EMBEDDINGS] EMBEDDING_BACKEND inválido: '{backend}'. "
+        f"Valores aceitos: {', '.join(EMBEDDING_BACKENDS)}"
+    )
+
+
+def get_embeddings():
+    """
+    Retorna o modelo de embeddings do backend configurado (singleton).
+
+    Raises:
+        RuntimeError: Se o backend for inválido ou a configuração estiver incompleta
+    """
+    global _embeddings
+    if _embeddings is None:
+        with _lock:
+            if _embeddings is None:
+                _embeddings = _create_embeddings(EMBEDDING_BACKEND)
+                safe_print(f"[EMBEDDINGS] Backend '{EMBEDDING_BACKEND}' inicializado (modelo: {getattr(_embeddings, 'model', '?')})")
+    return _embeddings
+
+
+def get_collection_name(base_name: str) -> str:
+    """
+    Nome da collection do Chroma para o backend atual.
+
+    Vetores de backends diferentes têm dimensões diferentes e não podem dividir
+    a mesma collection. O backend padrão mantém o nome original (collections
+    já indexadas continuam válidas).
+
+    Args:
+        base_name: Nome base da collection (ex: "inewave_docs")
+    """
+    if EMBEDDING_BACKEND == "azure":
+        return base_name
+    return f"{base_name}_{EMBEDDING_BACKEND}"
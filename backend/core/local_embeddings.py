@@ -0,0 +1,85 @@
+"""
+Embeddings locais (em processo, sem rede) com hashing de n-gramas de caracteres.
+
+Alternativa ao Azure OpenAI para ambientes sem acesso ao endpoint (air-gapped)
+e para testes de carga sem custo de API. Cada texto vira um vetor esparso de
+frequências de n-gramas de caracteres (3 a 5) e de palavras, projetado em
+LOCAL_EMBEDDING_DIM posições por hashing (crc32, estável entre processos),
+com TF sublinear (log1p) e normalização L2.
+
+Não há IDF ajustado em um corpus: o embedding de um texto depende só do
+próprio texto, então os vetores podem ser cacheados e persistidos (query cache,
+store de embeddings das tools, Chroma) como os do Azure.
+
+Selecionado com EMBEDDING_BACKEND=local (ver core/embeddings.py).
+"""
+import re
+import unicodedata
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+class HashingNgramEmbeddings(Embeddings):
+    """Embeddings de n-gramas de caracteres com hashing, compatíveis com LangChain."""
+
+    def __init__(self, dim: int = 1024, ngram_range: Tuple[int, int] = (3, 5)):
+        """
+        Args:
+            dim: Dimensão dos vetores gerados
+            ngram_range: Tamanhos mínimo e máximo dos n-gramas de caracteres
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+        # Nome usado como chave nos caches/stores de embeddings
+        self.model = f"local-hashing-ngram-{dim}"
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Minúsculas, sem acentos e apenas caracteres alfanuméricos."""
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        return _NON_ALNUM.sub(" ", text).strip()
+
+    def _features(self, text: str) -> List[str]:
+        """Palavras e n-gramas de caracteres (com bordas de palavra) do texto."""
+        min_n, max_n = self.ngram_range
+        features = []
+        for word in self._normalize_text(text).split():
+            features.append(f"w:{word}")
+            padded = f" {word} "
+            for n in range(min_n, max_n + 1):
+                for i in range(len(padded) - n + 1):
+                    features.append(padded[i:i + n])
+        return features
+
+    def _embed(self, text: str) -> List[float]:
+        features = self._features(text)
+        if not features:
+            return [0.0] * self.dim
+
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode("utf-8")) for f in features),
+            dtype=np.uint32,
+            count=len(features),
+        )
+        indices = (hashes % self.dim).astype(np.int64)
+        # Bit mais alto do hash define o sinal (reduz o viés das colisões)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+
+        counts = np.bincount(indices, weights=signs, minlength=self.dim)
+        vector = np.sign(counts) * np.log1p(np.abs(counts))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.astype(np.float32).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
@@ -0,0 +1,170 @@
+"""
+⚡ Pool de processos para o parse de arquivos dos decks (ex: dadger.rv* do DECOMP).
+
+Dadger.read() e os demais leitores do cfinterface fazem parse em Python puro
+e seguram o GIL: as threads das tools multi-deck carregavam os arquivos um de
+cada vez, mesmo com vários cores livres. Este módulo faz o parse em processos
+separados e devolve ao processo principal o objeto já lido, serializado com
+pickle. Desserializar um Dadger custa uma fração do parse do texto, então o
+processo principal só paga a cópia.
+
+O pool é criado sob demanda, reaproveitado entre requisições e usa o contexto
+"spawn" (não herda threads/locks do servidor, funciona igual em Linux e
+Windows). O custo de subir os processos é pago uma única vez. O módulo fica em
+backend.core para que os workers não importem a API do DECOMP/NEWAVE: só a
+classe do arquivo (ex: backend.decomp.decompclass.Dadger) é importada em cada processo.
+
+submit_parse_to_file() faz o parse e grava o objeto (pickle) em um arquivo
+no próprio worker, sem devolver nada ao processo principal: usado pelos
+snapshots em disco de objetos lidos sob demanda (decomp/utils/parsed_snapshot.py).
+
+Configuração: PARSE_POOL_PROCESSES (0 ou 1 desativa o pool).
+
+Uso:
+    from backend.core.parse_pool import parse_files_in_processes
+
+    objetos = parse_files_in_processes(Dadger, ["/decks/A/dadger.rv0", "/decks/B/dadger.rv1"])
+"""
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from backend.core.config import PARSE_POOL_PROCESSES, safe_print
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def is_parse_pool_enabled() -> bool:
+    """True se o parse em processos estiver habilitado (PARSE_POOL_PROCESSES > 1)."""
+    return PARSE_POOL_PROCESSES > 1
+
+
+def _parse_file(file_class: type, path: str) -> Tuple[Any, float]:
+    """
+    Executado no processo worker: faz o parse e retorna (objeto, segundos).
+
+    O objeto é serializado pelo ProcessPoolExecutor no retorno.
+    """
+    start = time.perf_counter()
+    obj = file_class.read(path)
+    return obj, time.perf_counter() - start
+
+
+def _parse_to_file(file_class: type, path: str, dest: str) -> Tuple[int, float]:
+    """
+    Executado no processo worker: faz o parse e grava o objeto em dest (pickle).
+
+    Returns:
+        (bytes gravados, segundos)
+    """
+    start = time.perf_counter()
+    obj = file_class.read(path)
+    tmp = f"{dest}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, dest)
+    return os.path.getsize(dest), time.perf_counter() - start
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_POOL_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            safe_print(f"[PARSE POOL] ⚡ Pool de parse iniciado com {PARSE_POOL_PROCESSES} processos")
+        return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Encerra os processos do pool (chamado no shutdown da API)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        safe_print("[PARSE POOL] 🗑️ Pool de parse encerrado")
+
+
+def parse_files_in_processes(
+    file_class: type,
+    paths: Iterable[str],
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Faz o parse de vários arquivos em paralelo no pool de processos.
+
+    Arquivos que falharem são omitidos do resultado (o erro é logado) para
+    que o chamador possa tentar o caminho normal. Se o pool quebrar (worker
+    morto pelo sistema, por exemplo), ele é recriado na próxima chamada.
+
+    Args:
+        file_class: Classe com método read(path) importável pelos workers (ex: Dadger)
+        paths: Caminhos completos dos arquivos
+        timeout: Tempo máximo total de espera em segundos (None = sem limite)
+
+    Returns:
+        Dict {caminho: objeto lido}
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+
+    start = time.perf_counter()
+    results: Dict[str, Any] = {}
+    try:
+        pool = _get_pool()
+        futures = {pool.submit(_parse_file, file_class, path): path for path in paths}
+        for future in as_completed(futures, timeout=timeout):
+            path = futures[future]
+            try:
+                obj, parse_seconds = future.result()
+                results[path] = obj
+                safe_print(f"[PARSE POOL] ⚡ {file_class.__name__} {path} lido em {parse_seconds:.2f}s (processo)")
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                safe_print(f"[PARSE POOL] ⚠️ Erro ao ler {path}: {e}")
+    except BrokenProcessPool as e:
+        safe_print(f"[PARSE POOL] ❌ Pool de processos quebrado: {e}")
+        shutdown_parse_pool()
+    except Exception as e:
+        # TimeoutError de as_completed ou falha ao criar o pool
+        safe_print(f"[PARSE POOL] ⚠️ Parse em processos interrompido: {e}")
+
+    elapsed = time.perf_counter() - start
+    safe_print(f"[PARSE POOL] ✅ {len(results)}/{len(paths)} arquivos {file_class.__name__} em {elapsed:.2f}s")
+    return results
+
+
+def submit_parse_to_file(file_class: type, path: str, dest: str) -> Optional[Future]:
+    """
+    Agenda no pool o parse de path e a gravação do objeto lido em dest (pickle).
+
+    O objeto não volta para o processo principal: só o resultado do Future,
+    (bytes gravados, segundos do parse).
+
+    Args:
+        file_class: Classe com método read(path) importável pelos workers
+        path: Caminho do arquivo a ler
+        dest: Arquivo de destino (gravado de forma atômica)
+
+    Returns:
+        Future, ou None se o pool está desativado ou não pôde ser usado
+    """
+    if not is_parse_pool_enabled():
+        return None
+    try:
+        return _get_pool().submit(_parse_to_file, file_class, path, dest)
+    except (BrokenProcessPool, RuntimeError) as e:
+        safe_print(f"[PARSE POOL] ⚠️ Pool de processos indisponível: {e}")
+        shutdown_parse_pool()
+        return None
@@ -0,0 +1,204 @@
+"""
+⚡ Pool limitado de threads para as queries dos agentes, com backpressure (503).
+
+/query e /query/stream são handlers async que chamavam run_query /
+run_query_stream (LangGraph, síncronos) direto no event loop: uma comparação
+multi-deck lenta congelava a API para todos os outros clientes, e no
+streaming cada requisição ocupava uma thread do pool padrão do Starlette,
+sem limite.
+
+Este módulo executa as queries em um ThreadPoolExecutor compartilhado pelos
+três agentes:
+- no máximo QUERY_EXECUTOR_WORKERS queries executando ao mesmo tempo
+- no máximo QUERY_EXECUTOR_MAX_QUEUE aguardando uma thread; acima disso a
+  requisição é recusada na hora (QueryExecutorSaturated -> HTTP 503 com
+  Retry-After), em vez de esperar atrás de todas as outras
+- no streaming, o gerador roda na thread do pool e os eventos chegam ao
+  event loop por uma fila asyncio; se o cliente desconectar, o gerador é
+  encerrado no próximo evento e a thread é liberada
+
+Threads, e não processos: as queries usam os caches em memória do processo
+(dadger_cache, inewave_cache, sessões) e os objetos do LangGraph não são
+serializáveis. O parse pesado de arquivos já vai para processos em
+core/parse_pool.py.
+
+Uso:
+    from backend.core.query_executor import QueryExecutorSaturated, query_executor
+
+    result = await query_executor.run(run_query, query, deck_path, session_id=session_id)
+    events = query_executor.stream(event_generator)  # AsyncIterator para StreamingResponse
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from backend.core.config import (
+    QUERY_EXECUTOR_MAX_QUEUE,
+    QUERY_EXECUTOR_RETRY_AFTER_SECONDS,
+    QUERY_EXECUTOR_WORKERS,
+    safe_print,
+)
+
+# Marca o fim do stream na fila de eventos
+_END = object()
+
+
+class QueryExecutorSaturated(Exception):
+    """Todas as threads ocupadas e a fila de espera cheia."""
+
+    def __init__(self, capacity: int, retry_after: int = QUERY_EXECUTOR_RETRY_AFTER_SECONDS):
+        super().__init__(
+            f"Servidor ocupado: {capacity} queries em execução ou na fila. "
+            f"Tente novamente em {retry_after}s."
+        )
+        self.retry_after = retry_after
+
+
+class QueryExecutor:
+    """Executa funções bloqueantes em um pool de threads com fila limitada."""
+
+    def __init__(self, workers: int = QUERY_EXECUTOR_WORKERS, max_queue: int = QUERY_EXECUTOR_MAX_QUEUE):
+        """
+        Args:
+            workers: Threads de execução
+            max_queue: Tarefas aguardando uma thread livre antes de recusar
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.capacity = self.workers + self.max_queue
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Tarefas admitidas (executando + na fila)
+        self._admitted = 0
+        self._running = 0
+        self._stats = {"completed": 0, "failed": 0, "rejected": 0, "cancelled": 0, "wait_seconds": 0.0}
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="query")
+            return self._pool
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self._stats["rejected"] += 1
+                rejected = self._stats["rejected"]
+            else:
+                self._admitted += 1
+                return
+        safe_print(f"[QUERY EXECUTOR] ⚠️ Query recusada: {self.capacity} em execução/na fila ({rejected} recusadas)")
+        raise QueryExecutorSaturated(self.capacity)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Admite (ou recusa) e agenda fn no pool; a vaga é liberada ao terminar."""
+        self._admit()
+        queued_at = time.perf_counter()
+
+        def task() -> Any:
+            with self._lock:
+                self._running += 1
+                self._stats["wait_seconds"] += time.perf_counter() - queued_at
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._stats["failed"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._admitted -= 1
+            with self._lock:
+                self._stats["completed"] += 1
+            return result
+
+        try:
+            return self._get_pool().submit(task)
+        except Exception:
+            with self._lock:
+                self._admitted -= 1
+            raise
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Executa fn(*args, **kwargs) no pool sem bloquear o event loop.
+
+        Raises:
+            QueryExecutorSaturated: pool e fila cheios (responder 503)
+        """
+        return await asyncio.wrap_future(self._submit(fn, *args, **kwargs))
+
+    def stream(self, generator_fn: Callable[[], Iterable[Any]]) -> AsyncIterator[Any]:
+        """
+        Executa o gerador síncrono generator_fn() no pool e repassa os itens.
+
+        A vaga no pool é reservada aqui, antes da resposta começar: se o pool
+        estiver cheio, QueryExecutorSaturated é lançada e a API ainda pode
+        responder 503.
+
+        Returns:
+            Iterador assíncrono com os itens do gerador (para StreamingResponse)
+        """
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[Any]" = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def produce() -> None:
+            generator = generator_fn()
+            try:
+                for item in generator:
+                    if cancelled.is_set():
+                        with self._lock:
+                            self._stats["cancelled"] += 1
+                        break
+                    loop.call_soon_threadsafe(events.put_nowait, item)
+            finally:
+                close = getattr(generator, "close", None)
+                if close is not None:
+                    close()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(events.put_nowait, _END)
+
+        future = self._submit(produce)
+
+        async def consume() -> AsyncIterator[Any]:
+            try:
+                while True:
+                    item = await events.get()
+                    if item is _END:
+                        break
+                    yield item
+                # Propaga exceções do gerador que não viraram evento
+                await asyncio.wrap_future(future)
+            finally:
+                # Cliente desconectou (ou fim normal): o gerador para no próximo item
+                cancelled.set()
+
+        return consume()
+
+    def shutdown(self) -> None:
+        """Encerra o pool (chamado no shutdown da API)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        """Ocupação do pool e contadores de queries."""
+        with self._lock:
+            return {
+                **self._stats,
+                "wait_seconds": round(self._stats["wait_seconds"], 3),
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._admitted - self._running,
+                "saturated": self._admitted >= self.capacity,
+            }
+
+
+# Pool único do processo, compartilhado por NEWAVE, DECOMP e DESSEM
+query_executor = QueryExecutor()
@@ -6,8 +6,17 @@ from typing import Optional, Tuple, Dict, List, Callable, Any, Protocol
 import numpy as np
 import re
 import hashlib
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from backend.core.config import safe_print
+from backend.core import embedding_store
+from backend.core.config import (
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+    QUERY_EMBEDDING_CACHE_MAX_MB,
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    RANKINGS_CACHE_MAX_ENTRIES,
+    safe_print,
+)
+from backend.core.single_flight_cache import SingleFlightCache
 
 
 # Protocolo para qualquer tipo de Tool
@@ -21,9 +30,24 @@ class ToolProtocol(Protocol):
 # Estrutura: {tool_name: {'description_hash': str, 'embedding': list[float], 'embedding_normalized': np.ndarray}}
 _tool_embeddings_cache: Dict[str, Dict] = {}
 
-# Cache global de embeddings de queries
-# Estrutura: {query_hash: {'expanded_query': str, 'embedding': list[float], 'embedding_normalized': np.ndarray}}
-_query_embeddings_cache: Dict[str, Dict] = {}
+# Cache global de embeddings de queries (LRU limitado, TTL opcional, single-flight)
+# Estrutura: {(model_name, query_hash): (embedding, embedding_normalized)}
+_query_embeddings_cache = SingleFlightCache(
+    max_entries=QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+    max_bytes=int(QUERY_EMBEDDING_CACHE_MAX_MB * 1024 * 1024),
+    ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+)
+
+
+# Matrizes empilhadas de embeddings por registry de tools
+# Estrutura: {(registry_name, model_name): {'signature': tuple, 'signature_hash': str,
+#                                           'names': list[str], 'matrix': np.ndarray [n_tools, dim]}}
+_tool_matrices: Dict[Tuple[str, str], Dict] = {}
+_tool_matrices_lock = threading.Lock()
+
+# Rankings já calculados (uma passada serve best-tool, top-k e disambiguation)
+# Estrutura: {(model_name, signature_hash, query_hash): tuple[(tool_name, score), ...]}
+_rankings_cache = SingleFlightCache(max_entries=RANKINGS_CACHE_MAX_ENTRIES, max_bytes=0)
 
 
 def clear_tool_embeddings_cache():
@@ -33,10 +57,13 @@ def clear_tool_embeddings_cache():
     """
     global _tool_embeddings_cache
     _tool_embeddings_cache.clear()
+    with _tool_matrices_lock:
+        _tool_matrices.clear()
+    _rankings_cache.clear()
     safe_print("[SEMANTIC MATCHER] Cache de embeddings das tools limpo")
 
 
-def get_cache_stats() -> Dict[str, int]:
+def get_cache_stats() -> Dict[str, Any]:
     """
     Retorna estatísticas do cache de embeddings.
     
@@ -46,7 +73,14 @@ def get_cache_stats() -> Dict[str, int]:
     return {
         'cached_tools': len(_tool_embeddings_cache),
         'cached_queries': len(_query_embeddings_cache),
-        'total_embeddings': len(_tool_embeddings_cache)
+        'total_embeddings': len(_tool_embeddings_cache),
+        'tool_matrices': {
+            f"{registry}|{model}": entry['matrix'].shape[0]
+            for (registry, model), entry in _tool_matrices.items()
+        },
+        'rankings_cache': _rankings_cache.get_stats(),
+        'query_cache': _query_embeddings_cache.get_stats(),
+        'persistent_store': embedding_store.get_store_stats()
     }
 
 
@@ -55,7 +89,6 @@ def clear_query_embeddings_cache():
     Limpa o cache de embeddings de queries.
     Útil se necessário limpar o cache de queries.
     """
-    global _query_embeddings_cache
     _query_embeddings_cache.clear()
     safe_print("[SEMANTIC MATCHER] Cache de embeddings de queries limpo")
 
@@ -77,43 +110,37 @@ def _normalize_embedding(embedding: list[float]) -> np.ndarray:
     return embedding_array / norm
 
 
-def _get_query_embedding(expanded_query: str, embeddings_model) -> Tuple[list[float], np.ndarray]:
+def _get_query_embedding(expanded_query: str, embeddings_model) -> Tuple[np.ndarray, np.ndarray]:
     """
     Obtém o embedding de uma query expandida, usando cache se disponível.
     
+    Queries idênticas concorrentes aguardam uma única chamada ao modelo
+    (single-flight no SingleFlightCache).
+    
     Args:
         expanded_query: Query expandida
         embeddings_model: Modelo de embeddings
         
     Returns:
-        Tupla (embedding, embedding_normalized)
+        Tupla (embedding, embedding_normalized), ambos float32
     """
-    global _query_embeddings_cache
-    
-    # Calcular hash da query expandida
+    # Chave: modelo + hash da query expandida
     query_hash = hashlib.md5(expanded_query.encode('utf-8')).hexdigest()
+    key = (embedding_store.get_model_name(embeddings_model), query_hash)
     
-    # Verificar se já temos o embedding em cache
-    if query_hash in _query_embeddings_cache:
-        cached = _query_embeddings_cache[query_hash]
-        safe_print(f"[SEMANTIC MATCHER] [OK] Embedding de query em cache")
-        return cached['embedding'], cached['embedding_normalized']
-    
-    # Gerar novo embedding
-    safe_print(f"[SEMANTIC MATCHER] Gerando novo embedding de query...")
-    embedding = embeddings_model.embed_query(expanded_query)
-    
-    # Normalizar embedding
-    embedding_normalized = _normalize_embedding(embedding)
+    generated = False
     
-    # Armazenar no cache
-    _query_embeddings_cache[query_hash] = {
-        'expanded_query': expanded_query,
-        'embedding': embedding,
-        'embedding_normalized': embedding_normalized
-    }
+    def compute() -> Tuple[np.ndarray, np.ndarray]:
+        nonlocal generated
+        generated = True
+        safe_print(f"[SEMANTIC MATCHER] Gerando novo embedding de query...")
+        embedding = np.asarray(embeddings_model.embed_query(expanded_query), dtype=np.float32)
+        return embedding, _normalize_embedding(embedding)
     
-    return embedding, embedding_normalized
+    result = _query_embeddings_cache.get_or_compute(key, compute)
+    if not generated:
+        safe_print(f"[SEMANTIC MATCHER] [OK] Embedding de query em cache")
+    return result
 
 
 def preload_tool_embeddings(
@@ -202,13 +229,46 @@ def expand_query(query: str, expansions: Dict[str, List[str]], enabled: bool = T
     return expanded_query
 
 
-def _get_tool_embedding(tool, embeddings_model) -> Tuple[list[float], np.ndarray]:
+def _get_description_hash(tool) -> str:
+    """
+    Retorna o hash da descrição da tool (chave para detectar mudanças).
+    
+    ToolSpec (core/tool_registry.py) já traz o hash memoizado por classe;
+    para instâncias comuns o hash é calculado aqui.
+    """
+    if hasattr(tool, 'get_description_hash'):
+        return tool.get_description_hash()
+    return hashlib.md5(tool.get_description().encode('utf-8')).hexdigest()
+
+
+def _store_tool_embedding(tool_name: str, description_hash: str, embedding) -> np.ndarray:
+    """
+    Armazena o embedding de uma tool no cache em memória.
+    
+    Returns:
+        Embedding normalizado
+    """
+    embedding_normalized = _normalize_embedding(embedding)
+    _tool_embeddings_cache[tool_name] = {
+        'description_hash': description_hash,
+        'embedding': embedding,
+        'embedding_normalized': embedding_normalized
+    }
+    return embedding_normalized
+
+
+def _get_tool_embedding(tool, embeddings_model, persist: bool = True) -> Tuple[list[float], np.ndarray]:
     """
     Obtém o embedding de uma tool, usando cache se disponível.
     
+    Ordem de busca: cache em memória -> store persistente em disco
+    (core/embedding_store.py) -> API de embeddings.
+    
     Args:
         tool: Tool para obter embedding
         embeddings_model: Modelo de embeddings
+        persist: Se True, grava o embedding novo no store persistente
+                 (False quando o chamador grava em lote)
         
     Returns:
         Tupla (embedding, embedding_normalized)
@@ -217,7 +277,7 @@ def _get_tool_embedding(tool, embeddings_model) -> Tuple[list[float], np.ndarray
     tool_description = tool.get_description()
     
     # Calcular hash da descrição para detectar mudanças
-    description_hash = hashlib.md5(tool_description.encode('utf-8')).hexdigest()
+    description_hash = _get_description_hash(tool)
     
     # Verificar se já temos o embedding em cache e se a descrição não mudou
     if tool_name in _tool_embeddings_cache:
@@ -231,19 +291,22 @@ def _get_tool_embedding(tool, embeddings_model) -> Tuple[list[float], np.ndarray
         else:
             safe_print(f"[SEMANTIC MATCHER]   [AVISO] Descricao mudou, regenerando embedding (tool: {tool_name})")
     
+    # Verificar o store persistente (embeddings gerados em execuções anteriores)
+    model_name = embedding_store.get_model_name(embeddings_model)
+    stored = embedding_store.get_embedding(model_name, description_hash)
+    if stored is not None:
+        safe_print(f"[SEMANTIC MATCHER]   [OK] Embedding no store persistente (tool: {tool_name})")
+        embedding = stored.tolist()
+        return embedding, _store_tool_embedding(tool_name, description_hash, embedding)
+    
     # Gerar novo embedding
     safe_print(f"[SEMANTIC MATCHER]   Gerando novo embedding (tool: {tool_name})")
     embedding = embeddings_model.embed_query(tool_description)
     
-    # Normalizar embedding
-    embedding_normalized = _normalize_embedding(embedding)
-    
     # Armazenar no cache
-    _tool_embeddings_cache[tool_name] = {
-        'description_hash': description_hash,
-        'embedding': embedding,
-        'embedding_normalized': embedding_normalized
-    }
+    embedding_normalized = _store_tool_embedding(tool_name, description_hash, embedding)
+    if persist:
+        embedding_store.put_embeddings(model_name, {description_hash: embedding})
     
     return embedding, embedding_normalized
 
@@ -295,8 +358,7 @@ def _get_tool_embeddings_parallel(
     # Separar tools cacheadas das que precisam ser processadas
     for tool in tools:
         tool_name = tool.get_name()
-        tool_description = tool.get_description()
-        description_hash = hashlib.md5(tool_description.encode('utf-8')).hexdigest()
+        description_hash = _get_description_hash(tool)
         
         if tool_name in _tool_embeddings_cache:
             cached = _tool_embeddings_cache[tool_name]
@@ -310,6 +372,26 @@ def _get_tool_embeddings_parallel(
         # Tool precisa ser processada
         tools_to_process.append(tool)
     
+    # Buscar no store persistente as tools que não estão em memória
+    model_name = embedding_store.get_model_name(embeddings_model)
+    if tools_to_process:
+        stored = embedding_store.get_embeddings(
+            model_name, [_get_description_hash(tool) for tool in tools_to_process]
+        )
+        if stored:
+            safe_print(f"[SEMANTIC MATCHER] [OK] {len(stored)} embeddings carregados do store persistente")
+        remaining = []
+        for tool in tools_to_process:
+            description_hash = _get_description_hash(tool)
+            if description_hash in stored:
+                embedding = stored[description_hash].tolist()
+                results[tool.get_name()] = (
+                    embedding, _store_tool_embedding(tool.get_name(), description_hash, embedding)
+                )
+            else:
+                remaining.append(tool)
+        tools_to_process = remaining
+    
     # Processar tools não cacheadas em paralelo
     if tools_to_process:
         safe_print(f"[SEMANTIC MATCHER] Processando {len(tools_to_process)} embeddings em paralelo...")
@@ -317,7 +399,7 @@ def _get_tool_embeddings_parallel(
         def process_tool(tool) -> Tuple[str, list[float], np.ndarray]:
             """Função auxiliar para processar uma tool."""
             try:
-                embedding, embedding_normalized = _get_tool_embedding(tool, embeddings_model)
+                embedding, embedding_normalized = _get_tool_embedding(tool, embeddings_model, persist=False)
                 return tool.get_name(), embedding, embedding_normalized
             except Exception as e:
                 safe_print(f"[SEMANTIC MATCHER] [AVISO] Erro ao processar {tool.get_name()}: {e}")
@@ -330,10 +412,133 @@ def _get_tool_embeddings_parallel(
                 tool_name, embedding, embedding_normalized = future.result()
                 if tool_name is not None and embedding is not None:
                     results[tool_name] = (embedding, embedding_normalized)
+        
+        # Gravar os embeddings novos no store persistente em uma única escrita
+        new_embeddings = {
+            _get_description_hash(tool): results[tool.get_name()][0]
+            for tool in tools_to_process
+            if tool.get_name() in results
+        }
+        embedding_store.put_embeddings(model_name, new_embeddings)
     
     return results
 
 
+def get_tool_embedding_matrix(
+    tools: list,
+    embeddings_model,
+    registry_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Retorna a matriz empilhada (float32, contígua) de embeddings normalizados de um registry.
+    
+    A matriz é montada uma vez por (registry, modelo) e só é reconstruída quando a
+    assinatura do registry muda (tool adicionada/removida ou description_hash diferente).
+    
+    Args:
+        tools: Lista de tools do registry
+        embeddings_model: Modelo de embeddings
+        registry_name: Nome do registry ("newave-single", "newave-comparison",
+                       "decomp-single", "decomp-multi"). Se None, a chave é
+                       derivada da própria lista de tools.
+        
+    Returns:
+        Dict com 'names' (nome da tool de cada linha), 'matrix' [n_tools, dim]
+        e 'signature_hash'
+    """
+    signature = tuple((tool.get_name(), _get_description_hash(tool)) for tool in tools)
+    signature_hash = hashlib.md5(repr(signature).encode('utf-8')).hexdigest()
+    model_name = embedding_store.get_model_name(embeddings_model)
+    key = (registry_name or f"adhoc-{signature_hash[:12]}", model_name)
+    
+    entry = _tool_matrices.get(key)
+    if entry is not None and entry['signature'] == signature:
+        return entry
+    
+    safe_print(f"[SEMANTIC MATCHER] Montando matriz de embeddings do registry {key[0]} ({len(tools)} tools)...")
+    tool_embeddings_dict = _get_tool_embeddings_parallel(tools, embeddings_model)
+    names = [name for name, _ in signature if name in tool_embeddings_dict]
+    if names:
+        matrix = np.ascontiguousarray(
+            np.stack([tool_embeddings_dict[name][1] for name in names]), dtype=np.float32
+        )
+    else:
+        matrix = np.empty((0, 0), dtype=np.float32)
+    
+    entry = {
+        'signature': signature,
+        'signature_hash': signature_hash,
+        'names': names,
+        'matrix': matrix,
+    }
+    # Só guardar matrizes completas: tools que falharam são tentadas de novo na próxima query
+    if len(names) == len(signature):
+        with _tool_matrices_lock:
+            _tool_matrices[key] = entry
+    return entry
+
+
+def rank_tools_semantic(
+    query: str,
+    tools: list,
+    get_embeddings_func: Callable[[], Any],
+    query_expansion_enabled: bool,
+    expansions: Dict[str, List[str]],
+    registry_name: Optional[str] = None
+) -> list[Tuple[Any, float]]:
+    """
+    Calcula o ranking completo de tools para uma query (um produto matriz-vetor).
+    
+    O ranking fica em cache por (modelo, registry, query expandida): as chamadas
+    seguintes para a mesma query (best-tool, top-k, fallback da disambiguation)
+    reutilizam o mesmo resultado.
+    
+    Args:
+        query: Query do usuário
+        tools: Lista de tools disponíveis
+        get_embeddings_func: Função para obter modelo de embeddings
+        query_expansion_enabled: Se query expansion está habilitada
+        expansions: Dicionário de expansões para query expansion
+        registry_name: Nome do registry (ver get_tool_embedding_matrix)
+        
+    Returns:
+        Lista de tuplas (tool, score) ordenadas por score decrescente
+    """
+    if not tools:
+        return []
+    
+    expanded_query = expand_query(query, expansions, query_expansion_enabled)
+    if expanded_query != query:
+        safe_print(f"[SEMANTIC MATCHER] Query Expansion aplicada:")
+        safe_print(f"[SEMANTIC MATCHER]   Original: \"{query}\"")
+        safe_print(f"[SEMANTIC MATCHER]   Expandida: \"{expanded_query}\"")
+    
+    embeddings_model = get_embeddings_func()
+    entry = get_tool_embedding_matrix(tools, embeddings_model, registry_name)
+    if not entry['names']:
+        safe_print("[SEMANTIC MATCHER] [AVISO] Nenhum embedding de tool obtido")
+        return []
+    
+    query_hash = hashlib.md5(expanded_query.encode('utf-8')).hexdigest()
+    ranking_key = (embedding_store.get_model_name(embeddings_model), entry['signature_hash'], query_hash)
+    
+    def compute_ranking() -> tuple:
+        _, query_embedding_normalized = _get_query_embedding(expanded_query, embeddings_model)
+        similarities = _calculate_cosine_similarity_batch(query_embedding_normalized, entry['matrix'])
+        order = np.argsort(-similarities, kind='stable')
+        return tuple((entry['names'][i], float(similarities[i])) for i in order)
+    
+    if len(entry['names']) == len(entry['signature']):
+        ranking = _rankings_cache.get_or_compute(ranking_key, compute_ranking)
+    else:
+        # Matriz parcial (embedding de alguma tool falhou): não cachear o ranking,
+        # para que as tools que faltam entrem assim que o embedding for obtido
+        ranking = compute_ranking()
+    
+    tool_map = {tool.get_name(): tool for tool in tools}
+    return [(tool_map[name], score) for name, score in ranking if name in tool_map]
+
+
 def find_best_tool_semantic(
     query: str,
     tools: list,
@@ -342,7 +547,8 @@ def find_best_tool_semantic(
     expansions: Dict[str, List[str]],
     semantic_match_min_score: float,
     threshold: float = 0.7,
-    can_handle_filter: bool = False
+    can_handle_filter: bool = False,
+    registry_name: Optional[str] = None
 ) -> Optional[Tuple[Any, float]]:
     """
     Encontra a tool mais relevante usando matching semântico.
@@ -356,6 +562,7 @@ def find_best_tool_semantic(
         semantic_match_min_score: Score mínimo para executar uma tool
         threshold: Threshold mínimo de similaridade para ranking
         can_handle_filter: Se deve filtrar tools por can_handle (DECOMP usa True)
+        registry_name: Nome do registry (ver get_tool_embedding_matrix)
         
     Returns:
         Tupla (tool, score) se encontrada tool acima do threshold, ou None
@@ -366,14 +573,6 @@ def find_best_tool_semantic(
     
     safe_print("[SEMANTIC MATCHER] ===== INÍCIO: Semantic Matching =====")
     safe_print(f"[SEMANTIC MATCHER] Query original: \"{query}\"")
-    
-    # Aplicar query expansion se habilitado
-    expanded_query = expand_query(query, expansions, query_expansion_enabled)
-    if expanded_query != query:
-        safe_print(f"[SEMANTIC MATCHER] Query Expansion aplicada:")
-        safe_print(f"[SEMANTIC MATCHER]   Original: \"{query}\"")
-        safe_print(f"[SEMANTIC MATCHER]   Expandida: \"{expanded_query}\"")
-    
     safe_print(f"[SEMANTIC MATCHER] Threshold (ranking): {threshold:.3f}")
     safe_print(f"[SEMANTIC MATCHER] Score mínimo para executar: {semantic_match_min_score:.3f}")
     safe_print(f"[SEMANTIC MATCHER] Tools disponíveis: {len(tools)}")
@@ -383,96 +582,40 @@ def find_best_tool_semantic(
     safe_print(f"[SEMANTIC MATCHER] Cache: {cache_stats['cached_tools']} tools com embeddings cacheados")
     
     try:
-        # Obter modelo de embeddings
-        safe_print("[SEMANTIC MATCHER] Gerando embedding da query...")
-        embeddings_model = get_embeddings_func()
-        
-        # Obter embedding da query expandida (usando cache se disponível)
-        query_embedding, query_embedding_normalized = _get_query_embedding(expanded_query, embeddings_model)
-        safe_print(f"[SEMANTIC MATCHER] [OK] Embedding da query gerado (dimensão: {len(query_embedding)})")
+        ranking = rank_tools_semantic(
+            query, tools, get_embeddings_func, query_expansion_enabled, expansions, registry_name
+        )
         
         # Filtrar tools por can_handle se necessário
-        tools_filtered = tools
         if can_handle_filter:
             safe_print("[SEMANTIC MATCHER] Filtrando tools por can_handle...")
-            tools_filtered = []
-            for tool in tools:
+            ranking_filtered = []
+            for tool, score in ranking:
                 try:
                     if tool.can_handle(query):
-                        tools_filtered.append(tool)
+                        ranking_filtered.append((tool, score))
                 except Exception as e:
                     safe_print(f"[SEMANTIC MATCHER]   [AVISO] Erro ao verificar can_handle para {tool.get_name()}: {e}")
-                    tools_filtered.append(tool)  # Incluir mesmo assim em caso de erro
-            safe_print(f"[SEMANTIC MATCHER] Tools após filtro can_handle: {len(tools_filtered)}/{len(tools)}")
+                    ranking_filtered.append((tool, score))  # Incluir mesmo assim em caso de erro
+            safe_print(f"[SEMANTIC MATCHER] Tools após filtro can_handle: {len(ranking_filtered)}/{len(ranking)}")
             
-            if not tools_filtered:
+            if not ranking_filtered:
                 safe_print("[SEMANTIC MATCHER] [AVISO] Nenhuma tool passou pelo filtro can_handle")
                 return None
+            ranking = ranking_filtered
         
-        # Obter embeddings das tools (com cache)
-        safe_print("[SEMANTIC MATCHER] Obtendo embeddings das tools...")
-        tool_embeddings_dict = _get_tool_embeddings_parallel(tools_filtered, embeddings_model)
-        
-        # Preparar arrays para cálculo vetorizado
-        tool_names = []
-        tool_embeddings_normalized = []
-        tool_map = {}
-        
-        for tool in tools_filtered:
-            tool_name = tool.get_name()
-            if tool_name in tool_embeddings_dict:
-                tool_names.append(tool_name)
-                _, embedding_normalized = tool_embeddings_dict[tool_name]
-                tool_embeddings_normalized.append(embedding_normalized)
-                tool_map[tool_name] = tool
-        
-        if not tool_embeddings_normalized:
-            safe_print("[SEMANTIC MATCHER] [AVISO] Nenhum embedding de tool obtido")
+        if not ranking:
             return None
         
-        # Converter para array NumPy
-        tool_embeddings_array = np.array(tool_embeddings_normalized)
-        
-        # Calcular todas as similaridades de uma vez (vetorizado)
-        safe_print("[SEMANTIC MATCHER] Calculando similaridades com cada tool (vetorizado)...")
-        safe_print("[SEMANTIC MATCHER] " + "=" * 70)
-        similarities = _calculate_cosine_similarity_batch(query_embedding_normalized, tool_embeddings_array)
-        
-        # Processar resultados
-        best_tool = None
-        best_score = 0.0
-        all_scores = []
-        
-        for idx, (tool_name, similarity) in enumerate(zip(tool_names, similarities)):
-            try:
-                tool = tool_map[tool_name]
-                safe_print(f"[SEMANTIC MATCHER] [{idx+1}/{len(tool_names)}] {tool_name}: {similarity:.4f}")
-                
-                all_scores.append({
-                    'tool': tool_name,
-                    'score': float(similarity),
-                    'above_threshold': similarity >= threshold
-                })
-                
-                if similarity > best_score:
-                    best_score = float(similarity)
-                    best_tool = tool
-                    
-            except Exception as e:
-                safe_print(f"[SEMANTIC MATCHER]   [ERRO] Erro ao processar {tool_name}: {e}")
-                continue
-        
-        safe_print("[SEMANTIC MATCHER] " + "=" * 70)
-        
         # Mostrar ranking completo
+        safe_print("[SEMANTIC MATCHER] " + "=" * 70)
         safe_print("[SEMANTIC MATCHER]  RANKING DE SIMILARIDADE:")
-        all_scores_sorted = sorted(all_scores, key=lambda x: x['score'], reverse=True)
-        for rank, item in enumerate(all_scores_sorted, 1):
-            tool_name = item['tool']
-            score = item['score']
-            above = "[OK]" if item['above_threshold'] else "[X]"
+        for rank, (tool, score) in enumerate(ranking, 1):
+            above = "[OK]" if score >= threshold else "[X]"
             marker = ">>> " if rank == 1 else "    "
-            safe_print(f"[SEMANTIC MATCHER]   {marker}{rank}. {tool_name}: {score:.4f} {above}")
+            safe_print(f"[SEMANTIC MATCHER]   {marker}{rank}. {tool.get_name()}: {score:.4f} {above}")
+        
+        best_tool, best_score = ranking[0]
         
         # Decisão final
         safe_print("[SEMANTIC MATCHER] " + "=" * 70)
@@ -480,14 +623,14 @@ def find_best_tool_semantic(
         safe_print(f"[SEMANTIC MATCHER]   - Score >= {semantic_match_min_score:.3f}: Tool sera executada")
         safe_print(f"[SEMANTIC MATCHER]   - Score < {semantic_match_min_score:.3f}: Nenhuma tool (fluxo normal)")
         
-        if best_tool and best_score >= semantic_match_min_score:
+        if best_score > 0.0 and best_score >= semantic_match_min_score:
             safe_print(f"[SEMANTIC MATCHER] [OK] TOOL SELECIONADA PARA EXECUCAO!")
             safe_print(f"[SEMANTIC MATCHER]   Tool: {best_tool.get_name()}")
             safe_print(f"[SEMANTIC MATCHER]   Score: {best_score:.4f}")
             safe_print("[SEMANTIC MATCHER] ===== FIM: Semantic Matching (TOOL SELECIONADA) =====")
             return (best_tool, best_score)
         else:
-            if best_tool:
+            if best_score > 0.0:
                 safe_print(f"[SEMANTIC MATCHER] [X] NENHUMA TOOL SERA EXECUTADA")
                 safe_print(f"[SEMANTIC MATCHER]   Melhor tool: {best_tool.get_name()}")
                 safe_print(f"[SEMANTIC MATCHER]   Melhor score: {best_score:.4f}")
@@ -510,7 +653,8 @@ def find_top_tools_semantic(
     query_expansion_enabled: bool,
     expansions: Dict[str, List[str]],
     top_n: int = 3,
-    threshold: float = 0.55
+    threshold: float = 0.55,
+    registry_name: Optional[str] = None
 ) -> list[Tuple[Any, float]]:
     """
     Encontra as top N tools mais relevantes usando matching semântico.
@@ -523,6 +667,7 @@ def find_top_tools_semantic(
         expansions: Dicionário de expansões para query expansion
         top_n: Número máximo de tools a retornar (padrão: 3)
         threshold: Threshold mínimo de similaridade para ranking
+        registry_name: Nome do registry (ver get_tool_embedding_matrix)
         
     Returns:
         Lista de tuplas (tool, score) ordenadas por score decrescente
@@ -534,51 +679,13 @@ def find_top_tools_semantic(
     safe_print(f"[SEMANTIC MATCHER] ===== INÍCIO: find_top_tools_semantic (top_n={top_n}) =====")
     safe_print(f"[SEMANTIC MATCHER] Query: \"{query}\"")
     
-    # Aplicar query expansion se habilitado
-    expanded_query = expand_query(query, expansions, query_expansion_enabled)
-    
     try:
-        # Obter modelo de embeddings
-        embeddings_model = get_embeddings_func()
-        
-        # Obter embedding da query expandida (usando cache se disponível)
-        query_embedding, query_embedding_normalized = _get_query_embedding(expanded_query, embeddings_model)
-        
-        # Obter embeddings de todas as tools em paralelo (com cache)
-        tool_embeddings_dict = _get_tool_embeddings_parallel(tools, embeddings_model)
-        
-        # Preparar arrays para cálculo vetorizado
-        tool_names = []
-        tool_embeddings_normalized = []
-        tool_map = {}
-        
-        for tool in tools:
-            tool_name = tool.get_name()
-            if tool_name in tool_embeddings_dict:
-                tool_names.append(tool_name)
-                _, embedding_normalized = tool_embeddings_dict[tool_name]
-                tool_embeddings_normalized.append(embedding_normalized)
-                tool_map[tool_name] = tool
-        
-        if not tool_embeddings_normalized:
-            safe_print("[SEMANTIC MATCHER] [AVISO] Nenhum embedding de tool obtido")
+        all_scores = rank_tools_semantic(
+            query, tools, get_embeddings_func, query_expansion_enabled, expansions, registry_name
+        )
+        if not all_scores:
             return []
         
-        # Converter para array NumPy
-        tool_embeddings_array = np.array(tool_embeddings_normalized)
-        
-        # Calcular todas as similaridades de uma vez (vetorizado)
-        similarities = _calculate_cosine_similarity_batch(query_embedding_normalized, tool_embeddings_array)
-        
-        # Criar lista de scores
-        all_scores = []
-        for tool_name, similarity in zip(tool_names, similarities):
-            if tool_name in tool_map:
-                all_scores.append((tool_map[tool_name], float(similarity)))
-        
-        # Ordenar por score decrescente
-        all_scores.sort(key=lambda x: x[1], reverse=True)
-        
         # Mostrar ranking completo de scores
         safe_print(f"[SEMANTIC MATCHER]  RANKING COMPLETO DE SCORES ({len(all_scores)} tools):")
         for idx, (tool, score) in enumerate(all_scores[:10], 1):
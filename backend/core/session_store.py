@@ -0,0 +1,402 @@
+"""
+⚡ Store de sessões dos agentes: LRU em memória, TTL por inatividade e SQLite opcional.
+
+Cada api.py guardava as sessões em dicts (sessions, comparison_sessions) que
+só cresciam, e os diretórios UPLOADS_DIR/<session_id> só eram apagados se o
+cliente chamasse DELETE /sessions/{id}: o disco enchia de uploads abandonados.
+
+Agora cada agente tem um SessionStore:
+- sessões em memória em um LRU de até SESSION_MAX_SESSIONS entradas
+- com SESSION_PERSIST_ENABLED, as sessões também ficam em SQLite
+  (SESSION_DB_PATH, uma tabela para os três agentes): sobrevivem a reinícios
+  e qualquer worker do supervisor encontra a sessão criada por outro
+- uma sessão sem uso há mais de SESSION_TTL_SECONDS expira; o reaper (thread
+  de fundo, a cada SESSION_REAP_INTERVAL_SECONDS) remove as sessões expiradas,
+  o diretório do upload e o estado dele nos caches (core/utils/zip_deck.py e
+  o callback on_remove de cada agente)
+- diretórios em UPLOADS_DIR sem sessão conhecida e sem uso há mais que o TTL
+  (uploads de antes desta versão, sessões perdidas em um reinício sem
+  persistência) também são removidos
+
+O último acesso é gravado no SQLite, e o mtime do diretório do upload é
+atualizado, no máximo a cada _TOUCH_SECONDS: o diretório de uma sessão em
+uso nunca parece abandonado para o reaper de outro agente ou processo, e uma
+sessão removida por outro worker sai da memória deste na gravação seguinte.
+
+Uso:
+    from backend.core.session_store import SessionStore
+
+    session_store = SessionStore("DECOMP", UPLOADS_DIR)
+    session_store.put(session_id, deck_path, selected_decks=["DC202501-sem1"])
+    deck_path = session_store.get(session_id)  # None se a sessão não existe
+    session_store.start_reaper()
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.core.config import (
+    SESSION_DB_PATH,
+    SESSION_MAX_SESSIONS,
+    SESSION_PERSIST_ENABLED,
+    SESSION_REAP_INTERVAL_SECONDS,
+    SESSION_TTL_SECONDS,
+    safe_print,
+)
+from backend.core.utils.zip_deck import remove_deck_dir
+
+# Intervalo mínimo (s) entre gravações do último acesso de uma sessão
+_TOUCH_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    agent TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    deck_path TEXT NOT NULL,
+    selected_decks TEXT,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (agent, session_id)
+)
+"""
+
+
+class SessionStore:
+    """Sessões de um agente: session_id -> deck (e decks do modo comparação)."""
+
+    def __init__(
+        self,
+        name: str,
+        uploads_dir: Path,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        db_path: Optional[Path] = SESSION_DB_PATH if SESSION_PERSIST_ENABLED else None,
+        on_remove: Optional[Callable[[str, Path], None]] = None,
+    ):
+        """
+        Args:
+            name: Nome do agente (logs e coluna agent do SQLite, ex: "DECOMP")
+            uploads_dir: Diretório das sessões de upload
+            ttl_seconds: Inatividade (s) após a qual a sessão expira; 0 = nunca
+            max_sessions: Sessões em memória (LRU)
+            db_path: Arquivo SQLite; None mantém as sessões só em memória
+            on_remove: Chamado com (session_id, deck_path) ao remover uma sessão
+        """
+        self.name = name
+        self.uploads_dir = Path(uploads_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max(1, max_sessions)
+        self.on_remove = on_remove
+        self._touch_seconds = min(_TOUCH_SECONDS, ttl_seconds / 4) if ttl_seconds > 0 else _TOUCH_SECONDS
+        self._lock = threading.Lock()
+        # session_id -> registro (ordem = LRU)
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {"created": 0, "expired": 0, "deleted": 0, "lru_evictions": 0, "orphan_dirs": 0}
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path is not None:
+            self._open_db(Path(db_path))
+
+    def _open_db(self, db_path: Path) -> None:
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(db_path), timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(_SCHEMA)
+            self._db = db
+        except sqlite3.Error as e:
+            safe_print(f"[SESSIONS {self.name}] ⚠️ SQLite indisponível ({db_path}): {e}; sessões só em memória")
+
+    def _db_execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        if self._db is None:
+            return []
+        try:
+            with self._db_lock:
+                return self._db.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            safe_print(f"[SESSIONS {self.name}] ⚠️ Erro no SQLite: {e}")
+            return []
+
+    def _db_save(self, session_id: str, record: Dict[str, Any]) -> None:
+        self._db_execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.name,
+                session_id,
+                record["deck_path"],
+                json.dumps(record["selected_decks"]) if record["selected_decks"] is not None else None,
+                record["created_at"],
+                record["last_access"],
+            ),
+        )
+
+    def _db_touch(self, session_id: str, last_access: float) -> bool:
+        """Grava o último acesso; False se a sessão não está mais no SQLite (removida por outro worker)."""
+        if self._db is None:
+            return True
+        try:
+            with self._db_lock:
+                cursor = self._db.execute(
+                    "UPDATE sessions SET last_access = ? WHERE agent = ? AND session_id = ?",
+                    (last_access, self.name, session_id),
+                )
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            safe_print(f"[SESSIONS {self.name}] ⚠️ Erro no SQLite: {e}")
+            return True
+
+    def _db_load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._db_execute(
+            "SELECT deck_path, selected_decks, created_at, last_access FROM sessions WHERE agent = ? AND session_id = ?",
+            (self.name, session_id),
+        )
+        if not rows:
+            return None
+        deck_path, selected_decks, created_at, last_access = rows[0]
+        return {
+            "deck_path": deck_path,
+            "selected_decks": json.loads(selected_decks) if selected_decks else None,
+            "created_at": created_at,
+            "last_access": last_access,
+            "saved_at": last_access,
+        }
+
+    def _is_upload_dir(self, session_id: str, deck_path: Path) -> bool:
+        # O id vem da requisição: nunca aceitar caminhos (ex: "../decks")
+        valid = session_id == Path(session_id).name and not session_id.startswith(".")
+        return valid and deck_path == self.uploads_dir / session_id
+
+    def _remember(self, session_id: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._sessions[session_id] = record
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                # Com SQLite a sessão continua lá; sem ele, só o diretório do upload (se houver)
+                self._sessions.popitem(last=False)
+                self._stats["lru_evictions"] += 1
+
+    def put(self, session_id: str, deck_path: Path, selected_decks: Optional[List[str]] = None) -> None:
+        """
+        Registra uma sessão.
+
+        Args:
+            session_id: Id da sessão
+            deck_path: Diretório do deck da sessão
+            selected_decks: Decks do modo comparação (None no modo single)
+        """
+        now = time.time()
+        record = {
+            "deck_path": str(deck_path),
+            "selected_decks": list(selected_decks) if selected_decks is not None else None,
+            "created_at": now,
+            "last_access": now,
+            "saved_at": now,
+        }
+        self._remember(session_id, record)
+        with self._lock:
+            self._stats["created"] += 1
+        self._db_save(session_id, record)
+
+    def _lookup(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is not None:
+                self._sessions.move_to_end(session_id)
+                return record
+        record = self._db_load(session_id)
+        if record is None:
+            # Upload de antes do store (ou perdido em um reinício sem persistência)
+            legacy = self.uploads_dir / session_id
+            if self._is_upload_dir(session_id, legacy) and legacy.is_dir():
+                self.put(session_id, legacy)
+                with self._lock:
+                    return self._sessions.get(session_id)
+            return None
+        self._remember(session_id, record)
+        return record
+
+    def _touch(self, session_id: str, record: Dict[str, Any]) -> bool:
+        """Renova o TTL; False se a sessão foi removida por outro worker."""
+        now = time.time()
+        record["last_access"] = now
+        if now - record["saved_at"] < self._touch_seconds:
+            return True
+        record["saved_at"] = now
+        if not self._db_touch(session_id, now):
+            return False
+        deck_path = Path(record["deck_path"])
+        if self._is_upload_dir(session_id, deck_path):
+            try:
+                os.utime(deck_path)
+            except OSError:
+                pass
+        return True
+
+    def get(self, session_id: str) -> Optional[Path]:
+        """Diretório do deck da sessão (e renova o TTL), ou None se a sessão não existe."""
+        record = self._lookup(session_id)
+        if record is None:
+            return None
+        deck_path = Path(record["deck_path"])
+        if not deck_path.exists() or not self._touch(session_id, record):
+            # Removida por outro processo (DELETE ou reaper de outro worker)
+            self._forget(session_id)
+            return None
+        return deck_path
+
+    def get_selected_decks(self, session_id: str) -> Optional[List[str]]:
+        """Decks do modo comparação da sessão (None se não for uma sessão de comparação)."""
+        record = self._lookup(session_id)
+        return record["selected_decks"] if record is not None else None
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def _forget(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        self._db_execute("DELETE FROM sessions WHERE agent = ? AND session_id = ?", (self.name, session_id))
+
+    def _remove(self, session_id: str, deck_path: Path) -> None:
+        """Remove a sessão, o estado dela nos caches e o diretório do upload."""
+        self._forget(session_id)
+        if self.on_remove is not None:
+            try:
+                self.on_remove(session_id, deck_path)
+            except Exception as e:
+                safe_print(f"[SESSIONS {self.name}] ⚠️ Erro ao liberar caches da sessão {session_id}: {e}")
+        if self._is_upload_dir(session_id, deck_path):
+            remove_deck_dir(deck_path)
+
+    def delete(self, session_id: str) -> bool:
+        """
+        Remove a sessão e o diretório do upload (DELETE /sessions/{id}).
+
+        Returns:
+            True se a sessão ou o diretório existiam
+        """
+        record = self._lookup(session_id)
+        deck_path = Path(record["deck_path"]) if record is not None else self.uploads_dir / session_id
+        existed = record is not None or deck_path.exists()
+        self._remove(session_id, deck_path)
+        with self._lock:
+            self._stats["deleted"] += 1
+        return existed
+
+    def _is_known(self, session_id: str) -> bool:
+        """True se a sessão existe neste store ou, com SQLite, em qualquer agente."""
+        with self._lock:
+            if session_id in self._sessions:
+                return True
+        return bool(self._db_execute("SELECT 1 FROM sessions WHERE session_id = ? LIMIT 1", (session_id,)))
+
+    def reap(self) -> Dict[str, int]:
+        """
+        Remove sessões expiradas e diretórios de upload abandonados.
+
+        Returns:
+            Contagem de sessões expiradas e diretórios órfãos removidos
+        """
+        if self.ttl_seconds <= 0:
+            return {"expired": 0, "orphan_dirs": 0}
+        cutoff = time.time() - self.ttl_seconds
+
+        with self._lock:
+            expired = {
+                session_id: Path(record["deck_path"])
+                for session_id, record in self._sessions.items()
+                if record["last_access"] < cutoff
+            }
+            fresh = set(self._sessions) - set(expired)
+        rows = self._db_execute(
+            "SELECT session_id, deck_path FROM sessions WHERE agent = ? AND last_access < ?",
+            (self.name, cutoff),
+        )
+        for session_id, deck_path in rows:
+            if session_id not in fresh:
+                expired.setdefault(session_id, Path(deck_path))
+
+        for session_id, deck_path in expired.items():
+            self._remove(session_id, deck_path)
+
+        orphans = 0
+        if self.uploads_dir.is_dir():
+            for deck_dir in self.uploads_dir.iterdir():
+                if deck_dir.name.startswith(".") or not deck_dir.is_dir():
+                    continue
+                try:
+                    if deck_dir.stat().st_mtime >= cutoff or self._is_known(deck_dir.name):
+                        continue
+                except OSError:
+                    continue
+                remove_deck_dir(deck_dir)
+                orphans += 1
+
+        with self._lock:
+            self._stats["expired"] += len(expired)
+            self._stats["orphan_dirs"] += orphans
+        if expired or orphans:
+            safe_print(
+                f"[SESSIONS {self.name}] 🗑️ {len(expired)} sessões expiradas e "
+                f"{orphans} uploads abandonados removidos"
+            )
+        return {"expired": len(expired), "orphan_dirs": orphans}
+
+    def start_reaper(
+        self,
+        interval_seconds: float = SESSION_REAP_INTERVAL_SECONDS,
+        after_reap: Optional[Callable[[], Any]] = None,
+    ) -> bool:
+        """
+        Inicia o reaper em uma thread de fundo (idempotente).
+
+        Args:
+            interval_seconds: Intervalo entre execuções; 0 desativa
+            after_reap: Chamado após cada execução (ex: limpeza dos ZIPs enviados)
+
+        Returns:
+            False se o reaper já está rodando ou está desativado
+        """
+        with self._lock:
+            if interval_seconds <= 0 or (self._reaper is not None and self._reaper.is_alive()):
+                return False
+            self._stop.clear()
+            self._reaper = threading.Thread(
+                target=self._reap_loop,
+                args=(interval_seconds, after_reap),
+                name=f"sessions-{self.name.lower()}-reaper",
+                daemon=True,
+            )
+            self._reaper.start()
+            return True
+
+    def _reap_loop(self, interval_seconds: float, after_reap: Optional[Callable[[], Any]]) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.reap()
+                if after_reap is not None:
+                    after_reap()
+            except Exception as e:
+                safe_print(f"[SESSIONS {self.name}] ⚠️ Erro no reaper: {e}")
+
+    def stop_reaper(self) -> None:
+        """Para o reaper (chamado no shutdown da API)."""
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sessões em memória, configuração e contadores."""
+        with self._lock:
+            stats = {**self._stats, "in_memory": len(self._sessions)}
+        stats.update(
+            max_sessions=self.max_sessions,
+            ttl_seconds=self.ttl_seconds,
+            persistent=self._db is not None,
+        )
+        return stats
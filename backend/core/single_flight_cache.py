@@ -0,0 +1,173 @@
+"""
+⚡ Cache LRU single-flight limitado (entradas, bytes e TTL).
+
+Substitui o dict global sem limite que o semantic matcher usava para os
+embeddings de queries: em um processo de API de longa duração ele crescia
+indefinidamente, e queries idênticas concorrentes chamavam embed_query
+várias vezes. Hoje é usado também pelos rankings do semantic matcher e pelos
+resultados das tools (core/tool_result_cache.py).
+
+- LRU com limite de entradas e de bytes (evicção das menos usadas)
+- TTL opcional (0 desativa)
+- Single-flight: misses concorrentes na mesma chave aguardam um único
+  cálculo em andamento; uma exceção do cálculo chega a todos que aguardavam
+
+Uso:
+    from backend.core.single_flight_cache import SingleFlightCache
+
+    cache = SingleFlightCache(max_entries=1024, max_bytes=64 * 1024 * 1024, ttl_seconds=0)
+    value = cache.get_or_compute(key, lambda: compute_embedding(query))
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+
+
+def _estimate_bytes(value: Any) -> int:
+    """Estima o tamanho em bytes de um valor do cache (arrays NumPy, strings, tuplas)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_estimate_bytes(v) for v in value)
+    return 64
+
+
+class SingleFlightCache:
+    """Cache LRU thread-safe com limite de entradas/bytes, TTL e single-flight."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float = 0):
+        """
+        Args:
+            max_entries: Número máximo de entradas
+            max_bytes: Tamanho máximo estimado em bytes (0 desativa o limite)
+            ttl_seconds: Tempo de vida de cada entrada em segundos (0 desativa)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # Entradas: chave -> (instante de inserção, tamanho em bytes, valor)
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def _get_locked(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        created_at, size, value = entry
+        if self.ttl_seconds > 0 and time.monotonic() - created_at > self.ttl_seconds:
+            del self._entries[key]
+            self._bytes -= size
+            self._stats["expirations"] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _put_locked(self, key: Hashable, value: Any) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = _estimate_bytes(value)
+        self._entries[key] = (time.monotonic(), size, value)
+        self._bytes += size
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats["evictions"] += 1
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor) sem calcular em caso de miss."""
+        with self._lock:
+            found, value = self._get_locked(key)
+            self._stats["hits" if found else "misses"] += 1
+            return found, value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor da chave, calculando-o uma única vez em caso de miss.
+
+        Se outra thread já estiver calculando a mesma chave, aguarda o
+        resultado dela em vez de chamar compute() novamente. Exceções de
+        compute() são propagadas para todas as threads que aguardavam.
+
+        Args:
+            key: Chave do cache
+            compute: Função sem argumentos que gera o valor
+
+        Returns:
+            Valor do cache
+        """
+        with self._lock:
+            found, value = self._get_locked(key)
+            if found:
+                self._stats["hits"] += 1
+                return value
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            with self._lock:
+                self._put_locked(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas (requisições em andamento não são afetadas)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Retorna estatísticas do cache."""
+        with self._lock:
+            hits = self._stats["hits"]
+            misses = self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "inflight": len(self._inflight),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": hits / (hits + misses) if (hits + misses) > 0 else 0,
+            }
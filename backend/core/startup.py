@@ -0,0 +1,113 @@
+"""
+⚡ Inicialização em segundo plano e estado de prontidão das APIs (health checks).
+
+O startup das APIs indexava a documentação e fazia o preload síncrono de
+todos os decks antes de aceitar requisições: com muitos decks, a subida a
+frio passava do tempo do startup probe do orquestrador. Agora o startup só
+dispara as tarefas em threads de fundo e retorna:
+
+- tarefas de inicialização (ex: indexar a documentação) rodam em threads e
+  definem a prontidão: a API está pronta quando todas terminaram (com erro
+  também, como antes, em que o erro só era logado)
+- o preload de decks é a ingestão em segundo plano (core/deck_ingestion.py),
+  do deck mais recente para o mais antigo, com o progresso em get_progress();
+  ele não bloqueia a prontidão, porque um deck ainda não aquecido é
+  preparado sob demanda por load_deck() na primeira requisição
+
+/health/live responde sempre que o processo atende; /health/ready responde
+503 até as tarefas de inicialização terminarem.
+
+Uso:
+    from backend.core.startup import StartupState
+
+    startup_state = StartupState("NEWAVE")
+    startup_state.run_in_background("index_documentation", index_documentation)
+    startup_state.is_ready()
+"""
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from backend.core.config import safe_print
+
+RUNNING = "processando"
+READY = "pronto"
+ERROR = "erro"
+
+
+class StartupState:
+    """Tarefas de inicialização de uma API, executadas em threads de fundo."""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Nome usado nos logs (ex: "NEWAVE")
+        """
+        self.name = name
+        self.created_at = time.time()
+        self._lock = threading.Lock()
+        # Nome da tarefa -> status
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+
+    def run_in_background(self, task_name: str, task: Callable[[], Any]) -> bool:
+        """
+        Executa task() em uma thread de fundo (uma vez por nome).
+
+        Returns:
+            False se a tarefa já foi iniciada
+        """
+        with self._lock:
+            if task_name in self._tasks:
+                return False
+            self._tasks[task_name] = {
+                "task": task_name,
+                "status": RUNNING,
+                "started_at": time.time(),
+                "finished_at": None,
+                "seconds": None,
+                "result": None,
+                "error": None,
+            }
+        threading.Thread(
+            target=self._run,
+            args=(task_name, task),
+            name=f"startup-{self.name.lower()}-{task_name}",
+            daemon=True,
+        ).start()
+        return True
+
+    def _run(self, task_name: str, task: Callable[[], Any]) -> None:
+        start = time.time()
+        try:
+            result, outcome, error = task(), READY, None
+        except Exception as e:
+            result, outcome, error = None, ERROR, str(e)
+        elapsed = time.time() - start
+
+        with self._lock:
+            status = self._tasks[task_name]
+            status["status"] = outcome
+            status["result"] = result if isinstance(result, (int, float, str, bool)) else None
+            status["error"] = error
+            status["finished_at"] = time.time()
+            status["seconds"] = round(elapsed, 3)
+        if outcome == READY:
+            safe_print(f"[STARTUP {self.name}] ✅ {task_name} concluído em {elapsed:.2f}s")
+        else:
+            safe_print(f"[STARTUP {self.name}] ⚠️ {task_name} falhou em {elapsed:.2f}s: {error}")
+
+    def is_ready(self) -> bool:
+        """True quando o startup foi disparado e todas as tarefas terminaram."""
+        with self._lock:
+            return bool(self._tasks) and all(t["status"] != RUNNING for t in self._tasks.values())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Prontidão e status de cada tarefa."""
+        with self._lock:
+            tasks = [dict(t) for t in self._tasks.values()]
+        return {
+            "agent": self.name,
+            "ready": bool(tasks) and all(t["status"] != RUNNING for t in tasks),
+            "uptime_seconds": round(time.time() - self.created_at, 3),
+            "tasks": tasks,
+        }
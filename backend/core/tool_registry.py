@@ -0,0 +1,169 @@
+"""
+Registry lazy de tools (NEWAVE e DECOMP).
+
+O roteamento (semantic matching, disambiguation, palavras-chave prioritárias)
+só precisa do nome e da descrição de cada tool. Construir todas as tools a cada
+query é caro: algumas leem arquivos do deck no __init__ (ex: VazoesTool lê o
+CONFHD.DAT) e a MultiDeckComparisonTool carrega os decks selecionados.
+
+Este módulo expõe os metadados a partir da classe, sem executar __init__, e
+instancia apenas a tool escolhida, no momento em que ela é executada. O
+resultado de execute() passa pelo cache de resultados por conteúdo do deck
+(core/tool_result_cache.py): em um hit, a tool nem é construída, exceto quando
+ela define get_cache_params (a extração dos parâmetros precisa da instância).
+
+Uso:
+    from backend.core.tool_registry import ToolSpec
+
+    specs = [ToolSpec(ToolClass, deck_path) for ToolClass in TOOLS_REGISTRY_SINGLE]
+    best_spec = ...  # semantic matching usa get_name()/get_description()
+    result = best_spec.execute(query)  # instancia a tool apenas aqui
+"""
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Type
+
+from backend.core import tool_result_cache
+from backend.core.base_tool import BaseTool
+
+
+class ToolMetadata(NamedTuple):
+    """Metadados de uma classe de tool, independentes do deck."""
+    name: str
+    description: str
+    description_hash: str  # Chave do embedding da descrição (ver core/semantic_matcher.py)
+
+
+_metadata_cache: Dict[type, ToolMetadata] = {}
+_metadata_lock = threading.Lock()
+
+
+def get_tool_metadata(tool_class: Type) -> ToolMetadata:
+    """
+    Retorna nome, descrição e hash da descrição de uma classe de tool.
+
+    Os métodos get_name() e get_description() das tools não dependem do deck,
+    então são chamados em um protótipo criado sem __init__ (nenhum arquivo é
+    lido). O resultado é memoizado por classe.
+
+    Args:
+        tool_class: Classe da tool (subclasse de BaseTool)
+
+    Returns:
+        ToolMetadata da classe
+    """
+    metadata = _metadata_cache.get(tool_class)
+    if metadata is not None:
+        return metadata
+
+    with _metadata_lock:
+        metadata = _metadata_cache.get(tool_class)
+        if metadata is None:
+            prototype = tool_class.__new__(tool_class)
+            description = prototype.get_description()
+            metadata = ToolMetadata(
+                name=prototype.get_name(),
+                description=description,
+                description_hash=hashlib.md5(description.encode("utf-8")).hexdigest(),
+            )
+            _metadata_cache[tool_class] = metadata
+        return metadata
+
+
+class ToolSpec:
+    """
+    Referência lazy para uma tool.
+
+    Implementa a mesma interface usada pelos routers (get_name, get_description,
+    can_handle, execute), mas só constrói a tool real quando ela é executada.
+    """
+
+    def __init__(
+        self,
+        tool_class: Type,
+        *init_args: Any,
+        cache_sources: Optional[Sequence[Any]] = None,
+        **init_kwargs: Any,
+    ):
+        """
+        Args:
+            tool_class: Classe da tool
+            *init_args: Argumentos posicionais para o construtor da tool
+            cache_sources: Decks (diretórios ou ZIPs) lidos pela tool, para a chave do
+                cache de resultados. Padrão: os caminhos em init_args (deck_path ou
+                dict nome -> caminho); vazio desativa o cache para esta tool
+            **init_kwargs: Argumentos nomeados para o construtor da tool
+        """
+        self.tool_class = tool_class
+        self._init_args = init_args
+        self._init_kwargs = init_kwargs
+        self._cache_sources = cache_sources
+        self._instance: Optional[Any] = None
+        self._instance_lock = threading.Lock()
+
+    def get_name(self) -> str:
+        return get_tool_metadata(self.tool_class).name
+
+    def get_description(self) -> str:
+        return get_tool_metadata(self.tool_class).description
+
+    def get_description_hash(self) -> str:
+        return get_tool_metadata(self.tool_class).description_hash
+
+    def get_instance(self):
+        """Retorna a instância da tool, construindo-a na primeira chamada."""
+        if self._instance is None:
+            with self._instance_lock:
+                if self._instance is None:
+                    self._instance = self.tool_class(*self._init_args, **self._init_kwargs)
+        return self._instance
+
+    def can_handle(self, query: str) -> bool:
+        return self.get_instance().can_handle(query)
+
+    def _get_cache_sources(self) -> List[Any]:
+        if self._cache_sources is not None:
+            return list(self._cache_sources)
+        if "selected_decks" in self._init_kwargs:
+            # Decks lidos pelo nome dentro da tool: sem cache_sources explícito, não há chave segura
+            return []
+        sources: List[Any] = []
+        for arg in self._init_args:
+            if isinstance(arg, (str, Path)):
+                sources.append(arg)
+            elif isinstance(arg, dict):
+                sources.extend(arg.values())
+        return sources
+
+    def _get_cache_params(self, query: str, sources: List[Any], kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parâmetros extraídos pela tool (get_cache_params), se ela os define e o cache está ativo."""
+        if (
+            not tool_result_cache.TOOL_RESULT_CACHE_ENABLED
+            or not sources
+            or getattr(self.tool_class, "get_cache_params", None) in (None, BaseTool.get_cache_params)
+        ):
+            return None
+        try:
+            return self.get_instance().get_cache_params(query, **kwargs)
+        except Exception:
+            # Sem parâmetros a chave usa a query normalizada; erros reais aparecem em execute()
+            return None
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        sources = self._get_cache_sources()
+        key = tool_result_cache.make_key(
+            self.tool_class,
+            self._init_args,
+            self._init_kwargs,
+            sources,
+            query,
+            kwargs,
+            params=self._get_cache_params(query, sources, kwargs),
+        )
+        return tool_result_cache.execute_cached(
+            self.get_name(), key, lambda: self.get_instance().execute(query, **kwargs)
+        )
+
+    def __repr__(self) -> str:
+        return f"ToolSpec({self.tool_class.__name__})"
@@ -0,0 +1,304 @@
+"""
+⚡ Cache de resultados das tools por conteúdo do deck e parâmetros da query.
+
+Perguntas idênticas ("CVU de Angra 1", "carga mensal do Sudeste") sobre o
+mesmo deck refaziam a tool inteira a cada vez: construir a tool, localizar e
+ler os arquivos e montar os dados. Dashboards que repetem o mesmo conjunto de
+perguntas toda manhã pagavam esse custo em cada uma.
+
+A chave de um resultado é o hash de:
+- classe da tool
+- conteúdo de cada deck lido pela tool (deck_fingerprint): para decks
+  apoiados em ZIP, o diretório central (nome, CRC-32 e tamanho de cada
+  arquivo), sem descomprimir nada; para diretórios extraídos, caminho
+  relativo, tamanho e mtime de todos os arquivos, inclusive em subdiretórios
+  (memorizado por diretório: a árvore é percorrida de novo quando o mtime da
+  raiz muda ou a cada TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS)
+- parâmetros do construtor (caminho do deck, decks selecionados, tool forçada)
+- parâmetros canônicos extraídos da query pela tool (usina, submercado,
+  estágio, forced_plant_code, ...; BaseTool.get_cache_params), ou, nas tools
+  que não os expõem, a query normalizada (normalize_query: Unicode NFKC,
+  minúsculas, espaços e pontuação final) e os kwargs de execute
+
+Com os parâmetros da tool, perguntas diferentes sobre a mesma usina ("CVU de
+Angra 1", "cvu da usina Angra 1") compartilham o resultado; com a query
+normalizada, só as variações de caixa, espaços e pontuação. Um deck alterado
+tem outro fingerprint, e as entradas antigas saem pelo LRU. Só resultados com success=True entram no cache; um resultado que não
+entra no cache é devolvido a quem o executou, e as chamadas concorrentes que
+aguardavam a mesma chave recebem cópias.
+
+Os resultados ficam serializados (pickle): o limite em bytes é exato e cada
+hit devolve uma cópia, que quem chamou pode alterar à vontade. Misses
+concorrentes na mesma chave executam a tool uma única vez
+(core/single_flight_cache.py).
+
+Uso:
+    from backend.core import tool_result_cache
+
+    key = tool_result_cache.make_key(ToolClass, (deck_path,), {}, [deck_path], query, {},
+                                     params=tool.get_cache_params(query))
+    result = tool_result_cache.execute_cached("CargaMensalTool", key, lambda: tool.execute(query))
+"""
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from backend.core.config import (
+    TOOL_RESULT_CACHE_ENABLED,
+    TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS,
+    TOOL_RESULT_CACHE_MAX_ENTRIES,
+    TOOL_RESULT_CACHE_MAX_MB,
+)
+from backend.core.single_flight_cache import SingleFlightCache
+from backend.core.utils.content_hash import content_digest
+from backend.core.utils.zip_deck import get_deck_zip, get_zip_deck
+
+_max_bytes = int(TOOL_RESULT_CACHE_MAX_MB * 1024 * 1024)
+# Valores: (resultado serializado, segundos da execução original)
+_cache = SingleFlightCache(max_entries=TOOL_RESULT_CACHE_MAX_ENTRIES, max_bytes=_max_bytes)
+
+_stats_lock = threading.Lock()
+_stats = {"uncacheable": 0, "saved_seconds": 0.0}
+# Nome da tool -> {"hits": n, "misses": n}
+_tool_stats: Dict[str, Dict[str, int]] = {}
+
+_fingerprints_lock = threading.Lock()
+# Diretório -> (mtime_ns da raiz, time.monotonic() da varredura, fingerprint)
+_dir_fingerprints: Dict[str, tuple] = {}
+
+
+class _NotCacheable(Exception):
+    """Resultado que não entra no cache (success=False, não serializável ou grande demais)."""
+
+    def __init__(self, result: Any):
+        super().__init__()
+        self.result = result
+
+
+class _NotCanonical(Exception):
+    """Parâmetro sem forma canônica estável: a execução não usa o cache."""
+
+
+def normalize_query(query: str) -> str:
+    """Forma canônica da query: NFKC, minúsculas, espaços colapsados, sem pontuação final."""
+    text = " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+    return text.rstrip(" ?!.")
+
+
+def _walk_fingerprint(path: str) -> str:
+    """Hash de caminho relativo, tamanho e mtime de todos os arquivos da árvore."""
+    h = hashlib.sha256()
+
+    def fail(error: OSError) -> None:
+        raise error
+
+    for root, dirs, files in os.walk(path, onerror=fail):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            stat = os.stat(full)
+            relative = os.path.relpath(full, path).replace(os.sep, "/")
+            h.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _dir_fingerprint(path: str) -> str:
+    """
+    Fingerprint da árvore de um diretório, memorizado como no DeckCatalog.
+
+    Cada chamada custa um stat() da raiz: a árvore só é percorrida de novo se
+    o mtime da raiz mudou (arquivo criado, removido ou renomeado no diretório
+    do deck) ou se a última varredura tem mais de
+    TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS (alterações em arquivos e
+    subdiretórios, que não mudam o mtime da raiz).
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    now = time.monotonic()
+    with _fingerprints_lock:
+        cached = _dir_fingerprints.get(path)
+    if (
+        cached is not None
+        and cached[0] == mtime_ns
+        and now - cached[1] < TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS
+    ):
+        return cached[2]
+    fingerprint = _walk_fingerprint(path)
+    with _fingerprints_lock:
+        _dir_fingerprints[path] = (mtime_ns, now, fingerprint)
+    return fingerprint
+
+
+def deck_fingerprint(path: Any) -> Optional[str]:
+    """
+    Hash do conteúdo de um deck (diretório ou ZIP) ou arquivo.
+
+    Returns:
+        Fingerprint, ou None se o caminho não existe
+    """
+    path = str(path)
+    try:
+        if os.path.isdir(path):
+            zip_deck = get_deck_zip(path)
+            if zip_deck is not None:
+                return zip_deck.fingerprint()
+            return "dir:" + _dir_fingerprint(path)
+        if path.lower().endswith(".zip"):
+            return get_zip_deck(path).fingerprint()
+        if os.path.isfile(path):
+            return content_digest(path)
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def _canonical(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    raise _NotCanonical(type(value).__name__)
+
+
+def make_key(
+    tool_class: type,
+    init_args: tuple,
+    init_kwargs: Dict[str, Any],
+    sources: Iterable[Any],
+    query: str,
+    kwargs: Dict[str, Any],
+    params: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
+    """
+    Chave do resultado de tool_class(*init_args, **init_kwargs).execute(query, **kwargs).
+
+    Args:
+        tool_class: Classe da tool
+        init_args: Argumentos posicionais do construtor
+        init_kwargs: Argumentos nomeados do construtor
+        sources: Decks (diretórios ou ZIPs) lidos pela tool
+        query: Query passada para execute
+        kwargs: Argumentos nomeados de execute
+        params: Parâmetros extraídos pela tool (get_cache_params); substituem
+            query e kwargs na chave
+
+    Returns:
+        Chave, ou None se o resultado não pode ser cacheado (cache desativado,
+        deck inexistente, parâmetro sem forma canônica)
+    """
+    if not TOOL_RESULT_CACHE_ENABLED:
+        return None
+    fingerprints = []
+    for source in sources:
+        fingerprint = deck_fingerprint(source)
+        if fingerprint is None:
+            return None
+        fingerprints.append(fingerprint)
+    if not fingerprints:
+        return None
+    try:
+        payload = json.dumps(
+            [
+                _canonical(tool_class),
+                fingerprints,
+                _canonical(init_args),
+                _canonical(init_kwargs),
+                ["params", _canonical(params)] if params is not None
+                else ["query", normalize_query(query), _canonical(kwargs)],
+            ],
+            sort_keys=True,
+        )
+    except _NotCanonical:
+        return None
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _count(tool_name: str, outcome: str) -> None:
+    with _stats_lock:
+        counts = _tool_stats.setdefault(tool_name, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+
+def execute_cached(tool_name: str, key: Optional[str], execute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Retorna o resultado cacheado da chave ou executa a tool.
+
+    Args:
+        tool_name: Nome da tool (métricas por tool)
+        key: Chave de make_key (None executa sem cache)
+        execute: Executa a tool e retorna o dict de resultado
+
+    Returns:
+        Resultado da tool (cópia própria em caso de hit)
+    """
+    if key is None:
+        with _stats_lock:
+            _stats["uncacheable"] += 1
+        return execute()
+
+    executed = []
+
+    def compute():
+        start = time.perf_counter()
+        result = execute()
+        executed.append(result)
+        if not isinstance(result, dict) or not result.get("success"):
+            raise _NotCacheable(result)
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            raise _NotCacheable(result)
+        if _max_bytes > 0 and len(payload) > _max_bytes:
+            raise _NotCacheable(result)
+        return payload, time.perf_counter() - start
+
+    try:
+        payload, seconds = _cache.get_or_compute(key, compute)
+    except _NotCacheable as e:
+        with _stats_lock:
+            _stats["uncacheable"] += 1
+        if executed:
+            return e.result
+        # Aguardou a execução de outra chamada: o mesmo objeto não é compartilhado
+        try:
+            return copy.deepcopy(e.result)
+        except Exception:
+            return e.result
+
+    if executed:
+        _count(tool_name, "misses")
+        return executed[0]
+    _count(tool_name, "hits")
+    with _stats_lock:
+        _stats["saved_seconds"] += seconds
+    return pickle.loads(payload)
+
+
+def clear_tool_result_cache() -> None:
+    """Remove todos os resultados cacheados e os fingerprints memorizados."""
+    _cache.clear()
+    with _fingerprints_lock:
+        _dir_fingerprints.clear()
+
+
+def get_cache_stats() -> dict:
+    """Estatísticas do cache (hit rate, bytes, tempo economizado) e hits/misses por tool."""
+    with _stats_lock:
+        extra = {
+            "uncacheable": _stats["uncacheable"],
+            "saved_seconds": round(_stats["saved_seconds"], 3),
+            "by_tool": {name: dict(counts) for name, counts in _tool_stats.items()},
+        }
+    return {**_cache.get_stats(), **extra, "enabled": TOOL_RESULT_CACHE_ENABLED}
@@ -0,0 +1,93 @@
+"""
+⚡ Hash de conteúdo (SHA-256) de arquivos dos decks, memoizado por mtime/tamanho.
+
+Decks consecutivos do NEWAVE e do DECOMP repetem muitos arquivos byte a byte
+(HIDR.DAT, VAZOES.DAT, CONFHD.DAT, dadgers de semanas sem alteração). Os
+caches de arquivos parseados (inewave_cache, dadger_cache, dadgnl_cache,
+hidr_reader) usam este hash como chave: o mesmo conteúdo em 12 decks é
+parseado e guardado em memória uma única vez.
+
+O hash de um caminho só é recalculado quando o mtime, o tamanho ou o inode
+mudam. Arquivos extraídos dos ZIPs (core/utils/zip_deck.py) já chegam com o
+hash calculado durante a extração (remember_digest) e não são relidos.
+
+Uso:
+    from backend.core.utils.content_hash import content_digest
+
+    chave = content_digest(confhd_path)
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+# Caminho absoluto -> ((mtime_ns, tamanho, inode), sha256)
+_digests: "OrderedDict[str, Tuple[Tuple[int, int, int], str]]" = OrderedDict()
+_lock = threading.Lock()
+_MAX_ENTRIES = 65536
+_stats = {"hits": 0, "computed": 0, "remembered": 0}
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _store(key: str, signature: Tuple[int, int, int], digest: str) -> None:
+    with _lock:
+        _digests[key] = (signature, digest)
+        _digests.move_to_end(key)
+        while len(_digests) > _MAX_ENTRIES:
+            _digests.popitem(last=False)
+
+
+def compute_digest(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo (sem memoização)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def content_digest(path: str) -> str:
+    """
+    SHA-256 do conteúdo do arquivo, recalculado só quando o arquivo muda.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Hash hexadecimal
+    """
+    key = os.path.abspath(path)
+    signature = _signature(os.stat(key))
+    with _lock:
+        entry = _digests.get(key)
+        if entry is not None and entry[0] == signature:
+            _digests.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[1]
+
+    digest = compute_digest(key)
+    # O arquivo mudou durante a leitura: o hash pode não corresponder a nenhuma versão
+    if _signature(os.stat(key)) != signature:
+        return compute_digest(key)
+    with _lock:
+        _stats["computed"] += 1
+    _store(key, signature, digest)
+    return digest
+
+
+def remember_digest(path: str, digest: str) -> None:
+    """Registra o hash de um arquivo recém-escrito (ex: extraído de um ZIP)."""
+    key = os.path.abspath(path)
+    _store(key, _signature(os.stat(key)), digest)
+    with _lock:
+        _stats["remembered"] += 1
+
+
+def get_digest_stats() -> dict:
+    """Estatísticas da memoização de hashes."""
+    with _lock:
+        return {**_stats, "entries": len(_digests)}
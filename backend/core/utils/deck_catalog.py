@@ -0,0 +1,116 @@
+"""
+⚡ Catálogo de decks em memória, invalidado por mudanças nos diretórios.
+
+list_available_decks() dos três agentes refazia glob/iterdir no diretório de
+decks a cada chamada (grafo multi-deck, MultiDeckComparisonTool,
+/init-comparison, /decks/list, get_deck_by_name). No volume de rede dos decks
+cada varredura custa dezenas a centenas de ms, e uma consulta de comparação
+fazia várias.
+
+O catálogo guarda o resultado da varredura, um índice por nome e o mtime de
+cada diretório que a varredura leu. Criar, remover ou renomear um ZIP ou uma
+pasta altera o mtime do diretório que o contém, e a próxima consulta refaz a
+varredura. Para não pagar nem os stat() a cada chamada, os mtimes são
+verificados no máximo a cada DECK_CATALOG_RECHECK_SECONDS.
+
+Uso:
+    from backend.core.utils.deck_catalog import DeckCatalog
+
+    _catalog = DeckCatalog("NEWAVE", _scan_decks)  # _scan_decks() -> (decks, diretórios lidos)
+    decks = _catalog.list()
+    deck = _catalog.get("NW202501")
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.core.config import DECK_CATALOG_RECHECK_SECONDS, safe_print
+
+# (lista de decks, diretórios lidos pela varredura)
+ScanResult = Tuple[List[Dict[str, Any]], Iterable[Path]]
+
+
+def _dir_signature(dirs: Iterable[Path]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    signature = []
+    for directory in sorted({str(d) for d in dirs}):
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        signature.append((directory, mtime_ns))
+    return tuple(signature)
+
+
+class DeckCatalog:
+    """Resultado de uma varredura de decks, refeita quando os diretórios mudam."""
+
+    def __init__(self, name: str, scan: Callable[[], ScanResult], recheck_seconds: float = DECK_CATALOG_RECHECK_SECONDS):
+        """
+        Args:
+            name: Nome usado nos logs (ex: "NEWAVE")
+            scan: Varredura: retorna (decks, diretórios cujo conteúdo foi lido)
+            recheck_seconds: Intervalo mínimo entre verificações de mtime
+        """
+        self.name = name
+        self._scan = scan
+        self.recheck_seconds = recheck_seconds
+        self._lock = threading.Lock()
+        self._decks: Optional[List[Dict[str, Any]]] = None
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._dirs: List[Path] = []
+        self._signature: Tuple[Tuple[str, Optional[int]], ...] = ()
+        self._checked_at = 0.0
+        self._stats = {"scans": 0, "hits": 0}
+
+    def _refresh_locked(self) -> None:
+        now = time.monotonic()
+        if self._decks is not None:
+            if now - self._checked_at < self.recheck_seconds:
+                return
+            self._checked_at = now
+            if _dir_signature(self._dirs) == self._signature:
+                return
+
+        start = time.time()
+        decks, dirs = self._scan()
+        self._dirs = [Path(d) for d in dirs]
+        # Assinatura tirada depois da varredura: uma mudança durante a varredura
+        # pode ficar de fora desta lista, mas altera o mtime e força a próxima
+        self._signature = _dir_signature(self._dirs)
+        self._decks = decks
+        self._by_name = {}
+        for deck in decks:
+            self._by_name.setdefault(deck["name"], deck)
+        self._checked_at = time.monotonic()
+        self._stats["scans"] += 1
+        safe_print(f"[DECK CATALOG] ✅ {self.name}: {len(decks)} decks em {time.time() - start:.3f}s")
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Decks do catálogo (cópias: o chamador pode alterá-las)."""
+        with self._lock:
+            self._refresh_locked()
+            self._stats["hits"] += 1
+            return [dict(deck) for deck in self._decks]
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Deck pelo nome (O(1)) ou None."""
+        with self._lock:
+            self._refresh_locked()
+            self._stats["hits"] += 1
+            deck = self._by_name.get(name)
+            return dict(deck) if deck is not None else None
+
+    def invalidate(self) -> None:
+        """Força uma nova varredura na próxima consulta."""
+        with self._lock:
+            self._decks = None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "decks": len(self._decks or []),
+                "watched_dirs": len(self._dirs),
+            }
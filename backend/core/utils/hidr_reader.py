@@ -0,0 +1,280 @@
+"""
+⚡ Leitor memory-mapped do HIDR.DAT (cadastro das usinas hidrelétricas).
+
+O HIDR.DAT é um binário de registros de largura fixa, um por usina (o código
+da usina é a posição do registro, começando em 1). Ler com inewave
+(Hidr.read) monta um registro cfinterface por usina e depois o DataFrame
+cadastro campo a campo; as tools ainda percorriam esse DataFrame com
+iterrows() só para achar um nome ou um código.
+
+Este módulo descreve o registro como um dtype estruturado do NumPy e mapeia o
+arquivo em memória, sem copiar os dados:
+- índices código -> linha e nome -> código montados uma única vez
+- registro(codigo) lê só os bytes daquela usina
+- cadastro (DataFrame idêntico a Hidr.cadastro) é montado apenas se pedido
+
+O mesmo HIDR.DAT costuma se repetir em muitos decks NEWAVE e DECOMP: o cache
+identifica o arquivo pelo conteúdo (SHA-256, core/utils/content_hash.py), então decks com o mesmo HIDR.DAT
+compartilham um único mapeamento e um único DataFrame.
+
+Os dois formatos do inewave são suportados: registros de 792 bytes
+(polinômios volume-cota e cota-área em 32 bits) e de 832 bytes (em 64 bits),
+detectados pelo tamanho do arquivo como em Hidr.read.
+
+Uso:
+    from backend.core.utils.hidr_reader import get_hidr_cadastro
+
+    hidr = get_hidr_cadastro(hidr_path)
+    nome = hidr.nome(codigo)
+    codigo = hidr.codigo("FURNAS")
+    df = hidr.cadastro  # DataFrame, montado sob demanda
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.core.config import safe_print
+from backend.core.utils.content_hash import content_digest
+
+_MESES = ["JAN", "FEV", "MAR", "ABR", "MAI", "JUN", "JUL", "AGO", "SET", "OUT", "NOV", "DEZ"]
+
+
+def _campos(formato_polinomios: str) -> List[Tuple[str, str]]:
+    """Campos do registro na ordem do arquivo (mesmo layout de RegistroUHEHidr)."""
+    return [
+        ("nome_usina", "S12"),
+        ("posto", "<i4"),
+        ("_posto_bdh", "<i8"),
+        ("submercado", "<i4"),
+        ("empresa", "<i4"),
+        ("codigo_usina_jusante", "<i4"),
+        ("desvio", "<i4"),
+        ("volume_minimo", "<f4"),
+        ("volume_maximo", "<f4"),
+        ("volume_vertedouro", "<f4"),
+        ("volume_desvio", "<f4"),
+        ("cota_minima", "<f4"),
+        ("cota_maxima", "<f4"),
+        *[(f"a{i}_volume_cota", formato_polinomios) for i in range(5)],
+        *[(f"a{i}_cota_area", formato_polinomios) for i in range(5)],
+        *[(f"evaporacao_{m}", "<i4") for m in _MESES],
+        ("numero_conjuntos_maquinas", "<i4"),
+        *[(f"maquinas_conjunto_{i}", "<i4") for i in range(1, 6)],
+        *[(f"potencia_nominal_conjunto_{i}", "<f4") for i in range(1, 6)],
+        ("_ignorados", "S300"),
+        *[(f"queda_nominal_conjunto_{i}", "<f4") for i in range(1, 6)],
+        *[(f"vazao_nominal_conjunto_{i}", "<i4") for i in range(1, 6)],
+        ("produtibilidade_especifica", "<f4"),
+        ("perdas", "<f4"),
+        ("numero_polinomios_jusante", "<i4"),
+        *[(f"a{i}_jusante_{j}", "<f4") for j in range(1, 7) for i in range(5)],
+        *[(f"referencia_jusante_{i}", "<f4") for i in range(1, 7)],
+        ("canal_fuga_medio", "<f4"),
+        ("influencia_vertimento_canal_fuga", "<i4"),
+        ("fator_carga_maximo", "<f4"),
+        ("fator_carga_minimo", "<f4"),
+        ("vazao_minima_historica", "<i4"),
+        ("numero_unidades_base", "<i4"),
+        ("tipo_turbina", "<i4"),
+        ("representacao_conjunto", "<i4"),
+        ("teif", "<f4"),
+        ("ip", "<f4"),
+        ("tipo_perda", "<i4"),
+        ("data", "S12"),
+        ("observacao", "S39"),
+        ("volume_referencia", "<f4"),
+        ("tipo_regulacao", "S1"),
+    ]
+
+
+# dtypes empacotados (sem alinhamento): volume_referencia começa no byte 787
+HIDR_DTYPES = {
+    "f32": np.dtype(_campos("<f4")),
+    "f64": np.dtype(_campos("<f8")),
+}
+assert HIDR_DTYPES["f32"].itemsize == 792 and HIDR_DTYPES["f64"].itemsize == 832
+
+# Tamanhos de arquivo válidos (320 ou 600 registros) -> formato
+_TAMANHOS_VALIDOS = {
+    n * dtype.itemsize: versao
+    for versao, dtype in HIDR_DTYPES.items()
+    for n in (320, 600)
+}
+
+# Colunas do DataFrame (mesma ordem e tipos de Hidr.cadastro)
+COLUNAS = [nome for nome, _ in _campos("<f4") if not nome.startswith("_")]
+_COLUNAS_TEXTO = {"nome_usina", "data", "observacao", "tipo_regulacao"}
+_COLUNAS_INT64_NULAVEL = {
+    "posto", "submercado", "empresa", "codigo_usina_jusante", "desvio",
+    "influencia_vertimento_canal_fuga", "vazao_minima_historica",
+    "numero_unidades_base", "tipo_turbina", "representacao_conjunto", "tipo_perda",
+}
+
+
+def detectar_versao(tamanho_arquivo: int) -> str:
+    """
+    Formato do HIDR.DAT a partir do tamanho do arquivo ("f32" ou "f64").
+
+    Mesma regra de Hidr.read: tamanhos fora do padrão assumem registros de 792 bytes.
+    """
+    return _TAMANHOS_VALIDOS.get(tamanho_arquivo, "f32")
+
+
+def _decodificar(valores: np.ndarray) -> np.ndarray:
+    """Campos de texto (bytes de largura fixa) -> str sem espaços, como o LiteralField."""
+    return np.array(
+        [v.decode("utf-8", errors="replace").strip() for v in valores.tolist()],
+        dtype=object,
+    )
+
+
+class HidrCadastro:
+    """Cadastro de usinas de um HIDR.DAT, mapeado em memória."""
+
+    def __init__(self, path: str, versao: Optional[str] = None):
+        """
+        Args:
+            path: Caminho do HIDR.DAT
+            versao: "f32" ou "f64" (None = detectar pelo tamanho do arquivo)
+        """
+        self.path = path
+        tamanho = os.path.getsize(path)
+        self.versao = versao or detectar_versao(tamanho)
+        self.dtype = HIDR_DTYPES[self.versao]
+
+        n_registros = tamanho // self.dtype.itemsize
+        if n_registros > 0:
+            self.registros = np.memmap(path, dtype=self.dtype, mode="r", shape=(n_registros,))
+        else:
+            self.registros = np.empty(0, dtype=self.dtype)
+
+        # Nomes decodificados uma única vez: base dos dois índices
+        self.nomes = _decodificar(self.registros["nome_usina"])
+        # codigo -> linha (apenas registros com nome; o código é a posição 1-based)
+        self.codigo_para_linha: Dict[int, int] = {
+            linha + 1: linha for linha, nome in enumerate(self.nomes) if nome
+        }
+        # NOME -> codigo (primeira ocorrência, como a busca sequencial das tools)
+        self.nome_para_codigo: Dict[str, int] = {}
+        for codigo, linha in self.codigo_para_linha.items():
+            self.nome_para_codigo.setdefault(self.nomes[linha].upper(), codigo)
+
+        self._cadastro: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.registros)
+
+    def tem_usina(self, codigo: int) -> bool:
+        return codigo in self.codigo_para_linha
+
+    def nome(self, codigo: int) -> Optional[str]:
+        """Nome da usina pelo código (None se não existir ou estiver vazia)."""
+        linha = self.codigo_para_linha.get(codigo)
+        return None if linha is None else self.nomes[linha]
+
+    def codigo(self, nome: str) -> Optional[int]:
+        """Código da usina pelo nome exato (sem diferenciar maiúsculas/minúsculas)."""
+        return self.nome_para_codigo.get(str(nome).upper().strip())
+
+    def codigo_para_nome(self) -> Dict[int, str]:
+        """Mapeamento {codigo: nome} de todas as usinas cadastradas."""
+        return {codigo: self.nomes[linha] for codigo, linha in self.codigo_para_linha.items()}
+
+    def registro(self, codigo: int) -> Optional[Dict[str, Any]]:
+        """
+        Dados de uma usina, com as mesmas chaves das colunas de Hidr.cadastro.
+
+        Lê apenas o registro da usina do memory map.
+
+        Returns:
+            Dict {coluna: valor} (tipos Python) ou None se o código não existir
+        """
+        if not 1 <= codigo <= len(self.registros):
+            return None
+        registro = self.registros[codigo - 1]
+        dados = {}
+        for coluna in COLUNAS:
+            valor = registro[coluna]
+            if coluna in _COLUNAS_TEXTO:
+                dados[coluna] = bytes(valor).decode("utf-8", errors="replace").strip()
+            else:
+                dados[coluna] = valor.item()
+        return dados
+
+    @property
+    def cadastro(self) -> pd.DataFrame:
+        """
+        DataFrame no mesmo formato de Hidr.cadastro (índice codigo_usina, 1-based).
+
+        Montado coluna a coluna na primeira chamada e reutilizado depois:
+        não deve ser modificado por quem o recebe (use .copy()).
+        """
+        if self._cadastro is None:
+            with self._lock:
+                if self._cadastro is None:
+                    self._cadastro = self._montar_cadastro()
+        return self._cadastro
+
+    def _montar_cadastro(self) -> pd.DataFrame:
+        dados = {}
+        for coluna in COLUNAS:
+            valores = self.registros[coluna]
+            if coluna == "nome_usina":
+                dados[coluna] = self.nomes
+            elif coluna in _COLUNAS_TEXTO:
+                dados[coluna] = _decodificar(valores)
+            elif coluna in _COLUNAS_INT64_NULAVEL:
+                dados[coluna] = pd.array(valores.astype(np.int64), dtype="Int64")
+            elif valores.dtype.kind == "i":
+                dados[coluna] = valores.astype(np.int64)
+            else:
+                dados[coluna] = valores.astype(np.float64)
+
+        df = pd.DataFrame(dados, index=range(1, len(self.registros) + 1))
+        df.index.name = "codigo_usina"
+        return df
+
+
+# SHA-256 do conteúdo -> HidrCadastro (compartilhado entre decks com o mesmo HIDR.DAT)
+_cache: "OrderedDict[str, HidrCadastro]" = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 16
+
+
+def get_hidr_cadastro(path: str) -> HidrCadastro:
+    """
+    Retorna o HIDR.DAT mapeado em memória (cacheado por conteúdo).
+
+    O hash do arquivo só é recalculado quando o mtime ou o tamanho mudam.
+
+    Args:
+        path: Caminho do HIDR.DAT
+
+    Returns:
+        HidrCadastro do arquivo
+    """
+    digest = content_digest(path)
+
+    with _cache_lock:
+        hidr = _cache.get(digest)
+        if hidr is not None:
+            _cache.move_to_end(digest)
+            return hidr
+
+        hidr = HidrCadastro(path)
+        _cache[digest] = hidr
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+        safe_print(f"[HIDR] ⚡ {path} mapeado: {len(hidr)} registros ({hidr.versao}), {len(hidr.codigo_para_linha)} usinas")
+        return hidr
+
+
+def clear_hidr_cache():
+    """Descarta os arquivos mapeados (útil para testes ou reload forçado)."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,683 @@
+"""
+⚡ Decks lidos direto do ZIP, sem extrair o arquivo inteiro.
+
+O load_deck dos três agentes (NEWAVE, DECOMP, DESSEM) fazia extractall de
+cada ZIP e depois movia os arquivos para fora da subpasta: todo deck existia
+duas vezes no disco e o preload escrevia gigabytes, mesmo que as tools só
+abrissem meia dúzia de arquivos por deck.
+
+Aqui o diretório do deck passa a ser só um marcador (.deck_zip, apontando
+para o ZIP). O diretório central do ZIP é lido uma vez e mantido em memória
+(ZipDeck). Cada arquivo é descomprimido sob demanda no diretório do deck,
+na primeira vez que uma tool o procura (find_deck_member / glob_deck_members),
+e os arquivos assim extraídos formam um cache em disco limitado por
+DECK_MEMBER_CACHE_MAX_MB (LRU). Como as bibliotecas (inewave, idecomp) leem
+por caminho, as tools continuam recebendo um caminho de arquivo.
+
+Com DECK_DEDUP_ENABLED, cada conteúdo (SHA-256) é extraído uma única vez em
+DECK_BLOB_DIR e ligado por hard link no diretório de cada deck que o contém:
+o HIDR.DAT repetido em 12 decks ocupa o disco uma vez e, como os caches de
+arquivos parseados usam o hash de conteúdo como chave (core/utils/content_hash.py),
+é parseado uma vez.
+
+Diretórios sem marcador (decks já extraídos, uploads) funcionam como antes.
+
+O diretório do deck (marcador ou extração completa) é criado uma única vez
+por deck (ensure_deck_dir): chamadas concorrentes aguardam a que está em
+andamento, e o diretório é montado em uma pasta temporária e renomeado no
+final, então nunca aparece pela metade.
+
+Uso:
+    from backend.core.utils.zip_deck import ensure_deck_dir, find_deck_member
+
+    ensure_deck_dir(zip_path, deck_dir)               # no load_deck
+    sistema_path = find_deck_member(deck_dir, "SISTEMA.DAT")
+"""
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.core.config import (
+    DECK_BLOB_DIR,
+    DECK_DEDUP_ENABLED,
+    DECK_MEMBER_CACHE_MAX_MB,
+    DECK_ZIP_ON_DEMAND,
+    safe_print,
+)
+from backend.core.utils.content_hash import remember_digest
+
+# Arquivo que marca um diretório de deck como apoiado em um ZIP
+MARKER_NAME = ".deck_zip"
+
+
+class ZipDeck:
+    """Acesso aos arquivos de um ZIP de deck, com o diretório central em memória."""
+
+    def __init__(self, zip_path: str):
+        self.zip_path = os.path.abspath(zip_path)
+        stat = os.stat(self.zip_path)
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self._zip = zipfile.ZipFile(self.zip_path, "r")
+
+        infos = [i for i in self._zip.infolist() if not i.is_dir()]
+        # ZIP com todos os arquivos em uma única subpasta: a subpasta é ignorada
+        # (equivalente ao antigo "mover arquivos para o nível superior")
+        prefix = ""
+        top_levels = {i.filename.split("/", 1)[0] for i in infos}
+        if len(top_levels) == 1 and all("/" in i.filename for i in infos):
+            prefix = top_levels.pop() + "/"
+
+        # Nome relativo no deck -> ZipInfo
+        self.members: Dict[str, zipfile.ZipInfo] = {}
+        for info in infos:
+            name = info.filename[len(prefix):]
+            parts = name.split("/")
+            # Nunca extrair fora do diretório do deck
+            if not name or name.startswith("/") or ".." in parts:
+                continue
+            self.members[name] = info
+        self._lower = {name.lower(): name for name in self.members}
+        self._fingerprint: Optional[str] = None
+
+    def fingerprint(self) -> str:
+        """
+        Hash do conteúdo do deck a partir do diretório central (nome, CRC-32 e
+        tamanho de cada arquivo), sem descomprimir nada.
+        """
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            for name in sorted(self.members):
+                info = self.members[name]
+                h.update(f"{name}\0{info.CRC:08x}\0{info.file_size}\n".encode("utf-8"))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def names(self) -> List[str]:
+        """Nomes relativos dos arquivos do deck."""
+        return list(self.members)
+
+    def find(self, filename: str) -> Optional[str]:
+        """Nome do arquivo no ZIP, tolerando variação de maiúsculas/minúsculas."""
+        if filename in self.members:
+            return filename
+        return self._lower.get(filename.lower())
+
+    def glob(self, pattern: str) -> List[str]:
+        """Nomes que casam com o padrão (ex: "dadger.rv*"), sem diferenciar maiúsculas."""
+        pattern = pattern.lower()
+        return sorted(name for name in self.members if fnmatch.fnmatch(name.lower(), pattern))
+
+    def read(self, name: str) -> bytes:
+        """Conteúdo descomprimido de um arquivo do deck."""
+        return self._zip.read(self.members[name])
+
+    def open(self, name: str):
+        """Abre um arquivo do deck para leitura (binária) sem extraí-lo."""
+        return self._zip.open(self.members[name])
+
+    def write_member(self, name: str, dst_path: str) -> str:
+        """
+        Descomprime um arquivo em dst_path calculando o SHA-256 do conteúdo.
+
+        O mtime do arquivo é a data gravada no ZIP, para que o arquivo
+        extraído de novo tenha o mesmo mtime.
+
+        Returns:
+            SHA-256 do conteúdo
+        """
+        info = self.members[name]
+        h = hashlib.sha256()
+        with self._zip.open(info) as src, open(dst_path, "wb") as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                h.update(chunk)
+                dst.write(chunk)
+        zip_time = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(dst_path, (zip_time, zip_time))
+        return h.hexdigest()
+
+    def extract(self, name: str, deck_dir: str) -> str:
+        """Descomprime um arquivo no diretório do deck (gravação atômica)."""
+        target = os.path.join(deck_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.tmp{os.getpid()}-{threading.get_ident()}"
+        digest = self.write_member(name, tmp)
+        os.replace(tmp, target)
+        remember_digest(target, digest)
+        return target
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+_lock = threading.RLock()
+# ZIPs abertos: caminho absoluto -> ZipDeck (reaberto se o ZIP mudar no disco)
+_zip_decks: Dict[str, ZipDeck] = {}
+# Diretórios de deck apoiados em ZIP: diretório absoluto -> caminho do ZIP
+_deck_dirs: Dict[str, str] = {}
+
+# Arquivos extraídos sob demanda: caminho -> tamanho (ordem = LRU)
+_extracted: "OrderedDict[str, int]" = OrderedDict()
+_extracted_bytes = 0
+_extract_locks: Dict[str, threading.Lock] = {}
+# Um lock por diretório de deck: preparação/extração única (single-flight)
+_deck_locks: Dict[str, threading.Lock] = {}
+_stats = {"extractions": 0, "extracted_bytes": 0, "evictions": 0, "deck_waits": 0, "dedup_links": 0, "dedup_bytes": 0}
+
+# Deduplicação por conteúdo: arquivo extraído -> SHA-256 do blob ligado a ele
+_extracted_digests: Dict[str, str] = {}
+# (nome em minúsculas, CRC-32, tamanho) do ZIP -> SHA-256: liga o blob sem descomprimir
+_member_digests: Dict[Tuple[str, int, int], str] = {}
+_blobs_collected = False
+
+
+def get_zip_deck(zip_path: str) -> ZipDeck:
+    """Retorna o ZipDeck do arquivo (diretório central lido uma única vez)."""
+    key = os.path.abspath(zip_path)
+    stat = os.stat(key)
+    with _lock:
+        zip_deck = _zip_decks.get(key)
+        if zip_deck is not None and (zip_deck.mtime_ns, zip_deck.size) == (stat.st_mtime_ns, stat.st_size):
+            return zip_deck
+        if zip_deck is not None:
+            zip_deck.close()
+        zip_deck = ZipDeck(key)
+        _zip_decks[key] = zip_deck
+        return zip_deck
+
+
+def _get_deck_lock(deck_dir: Path) -> threading.Lock:
+    key = os.path.abspath(deck_dir)
+    with _lock:
+        lock = _deck_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _deck_locks[key] = lock
+        return lock
+
+
+def _create_deck_dir(deck_dir: Path, fill: Callable[[Path], Path]) -> bool:
+    """
+    Cria deck_dir de forma atômica: fill(tmp) preenche um diretório temporário
+    ao lado do destino e retorna o diretório a ser renomeado para deck_dir.
+
+    Quem lista ou abre o deck nunca vê um diretório pela metade. Se outro
+    processo criar deck_dir antes, o diretório temporário é descartado.
+
+    Returns:
+        True se este processo criou deck_dir
+    """
+    deck_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp = deck_dir.parent / f".{deck_dir.name}.tmp-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    try:
+        source = fill(tmp)
+        try:
+            os.rename(source, deck_dir)
+        except OSError:
+            if not deck_dir.exists():
+                raise
+            return False
+        return True
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def prepare_zip_deck_dir(zip_path: Path, deck_dir: Path) -> Path:
+    """
+    Prepara o diretório de um deck lido direto do ZIP (sem extrair nada).
+
+    Se o ZIP mudou desde a última preparação, os arquivos extraídos da versão
+    anterior são removidos. Use ensure_deck_dir, que serializa chamadas
+    concorrentes para o mesmo deck.
+
+    Args:
+        zip_path: Caminho do ZIP do deck
+        deck_dir: Diretório do deck (ex: decks/NW202501)
+
+    Returns:
+        deck_dir
+    """
+    zip_deck = get_zip_deck(str(zip_path))
+    marker = {"zip_path": zip_deck.zip_path, "mtime_ns": zip_deck.mtime_ns, "size": zip_deck.size}
+
+    def write_marker(directory: Path) -> Path:
+        tmp = directory / f"{MARKER_NAME}.tmp{os.getpid()}-{threading.get_ident()}"
+        tmp.write_text(json.dumps(marker), encoding="utf-8")
+        os.replace(tmp, directory / MARKER_NAME)
+        return directory
+
+    if not deck_dir.exists():
+        _create_deck_dir(deck_dir, write_marker)
+    else:
+        previous = _read_marker(str(deck_dir))
+        if previous != marker:
+            if previous is not None:
+                for name in zip_deck.names():
+                    _forget_extracted(os.path.join(str(deck_dir), *name.split("/")), remove=True)
+            write_marker(deck_dir)
+
+    with _lock:
+        _deck_dirs[os.path.abspath(deck_dir)] = zip_deck.zip_path
+    return deck_dir
+
+
+def extract_deck_zip(zip_path: Path, deck_dir: Path) -> Path:
+    """
+    Extrai o ZIP inteiro em deck_dir (modo sem DECK_ZIP_ON_DEMAND).
+
+    Se o ZIP tiver uma única subpasta, o conteúdo dela vira o deck. A extração
+    acontece em um diretório temporário renomeado no final (atômico). Use
+    ensure_deck_dir, que serializa chamadas concorrentes para o mesmo deck.
+    """
+    def extract(directory: Path) -> Path:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            zip_ref.extractall(directory)
+        # Se extraiu em uma subpasta, ela é que vira o deck
+        extracted_items = list(directory.iterdir())
+        if len(extracted_items) == 1 and extracted_items[0].is_dir():
+            return extracted_items[0]
+        return directory
+
+    start = time.time()
+    if _create_deck_dir(deck_dir, extract):
+        safe_print(f"[ZIP DECK] ✅ {zip_path.name} extraído em {time.time() - start:.2f}s")
+    return deck_dir
+
+
+def ensure_deck_dir(zip_path: Path, deck_dir: Path, on_demand: bool = DECK_ZIP_ON_DEMAND) -> Path:
+    """
+    Garante o diretório do deck a partir do ZIP, uma única vez por deck.
+
+    Chamadas concorrentes para o mesmo deck (preload e requisições no início
+    do mês) aguardam a preparação em andamento em vez de extrair de novo. Entre
+    processos, a criação atômica do diretório garante que ninguém veja um
+    deck pela metade.
+
+    Args:
+        zip_path: Caminho do ZIP do deck
+        deck_dir: Diretório do deck
+        on_demand: Ler direto do ZIP (True) ou extrair o ZIP inteiro (False)
+
+    Returns:
+        deck_dir
+    """
+    # Deck já extraído por completo: nada a fazer
+    if deck_dir.exists() and not is_zip_deck_dir(deck_dir):
+        return deck_dir
+
+    lock = _get_deck_lock(deck_dir)
+    if not lock.acquire(blocking=False):
+        with _lock:
+            _stats["deck_waits"] += 1
+        safe_print(f"[ZIP DECK] ⏳ Aguardando preparação em andamento de {deck_dir.name}")
+        lock.acquire()
+    try:
+        if on_demand and (not deck_dir.exists() or is_zip_deck_dir(deck_dir)):
+            return prepare_zip_deck_dir(zip_path, deck_dir)
+        if not deck_dir.exists():
+            extract_deck_zip(zip_path, deck_dir)
+        return deck_dir
+    finally:
+        lock.release()
+
+
+def is_zip_deck_dir(deck_dir: Path) -> bool:
+    """True se o diretório do deck foi preparado por prepare_zip_deck_dir."""
+    return (Path(deck_dir) / MARKER_NAME).is_file()
+
+
+def remove_deck_dir(deck_dir: Path) -> None:
+    """
+    Remove o diretório de um deck (ex: sessão de upload expirada) e esquece seu estado.
+
+    Os arquivos extraídos saem da contabilidade do cache LRU e os blobs que
+    ficarem sem links são removidos.
+    """
+    key = os.path.abspath(deck_dir)
+    prefix = key + os.sep
+    with _lock:
+        _deck_dirs.pop(key, None)
+        _deck_locks.pop(key, None)
+        paths = [path for path in _extracted if path.startswith(prefix)]
+        digests = [_extracted_digests.pop(path) for path in list(_extracted_digests) if path.startswith(prefix)]
+        for path in list(_extract_locks):
+            if path.startswith(prefix):
+                del _extract_locks[path]
+    for path in paths:
+        _forget_extracted(path)
+    shutil.rmtree(key, ignore_errors=True)
+    for digest in digests:
+        _release_blob(digest)
+
+
+def close_zip_deck(zip_path: str) -> None:
+    """Fecha e esquece o ZipDeck do arquivo (antes de remover o ZIP do disco)."""
+    with _lock:
+        zip_deck = _zip_decks.pop(os.path.abspath(zip_path), None)
+    if zip_deck is not None:
+        zip_deck.close()
+
+
+def _read_marker(deck_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(deck_dir, MARKER_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_deck_zip(deck_dir: str) -> Optional[ZipDeck]:
+    """ZipDeck do diretório de deck, ou None se o diretório não for apoiado em ZIP."""
+    key = os.path.abspath(deck_dir)
+    with _lock:
+        zip_path = _deck_dirs.get(key)
+    if zip_path is None:
+        # Preparado por outro processo (ou antes de um reinício)
+        marker = _read_marker(key)
+        if marker is None or not os.path.exists(marker.get("zip_path", "")):
+            return None
+        zip_path = marker["zip_path"]
+        with _lock:
+            _deck_dirs[key] = zip_path
+        _track_existing(key, get_zip_deck(zip_path))
+    try:
+        return get_zip_deck(zip_path)
+    except OSError:
+        return None
+
+
+def _track_existing(deck_dir: str, zip_deck: ZipDeck) -> None:
+    """Inclui no cache LRU arquivos extraídos antes de um reinício."""
+    for name in zip_deck.names():
+        path = os.path.join(deck_dir, *name.split("/"))
+        if os.path.isfile(path):
+            _remember_extracted(path, os.path.getsize(path))
+
+
+def _remember_extracted(path: str, size: int) -> None:
+    global _extracted_bytes
+    with _lock:
+        previous = _extracted.pop(path, None)
+        if previous is not None:
+            _extracted_bytes -= previous
+        _extracted[path] = size
+        _extracted_bytes += size
+        max_bytes = DECK_MEMBER_CACHE_MAX_MB * 1024 * 1024
+        # O arquivo recém-extraído nunca é removido: quem pediu vai abri-lo agora
+        while max_bytes > 0 and _extracted_bytes > max_bytes and len(_extracted) > 1:
+            old_path, old_size = _extracted.popitem(last=False)
+            _extracted_bytes -= old_size
+            _stats["evictions"] += 1
+            try:
+                os.remove(old_path)
+            except OSError:
+                # Arquivo em uso (Windows) ou já removido: será reextraído se necessário
+                pass
+            _release_blob(_extracted_digests.pop(old_path, None))
+
+
+def _forget_extracted(path: str, remove: bool = False) -> None:
+    global _extracted_bytes
+    with _lock:
+        size = _extracted.pop(path, None)
+        if size is not None:
+            _extracted_bytes -= size
+    if remove:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        with _lock:
+            digest = _extracted_digests.pop(path, None)
+        _release_blob(digest)
+
+
+def _touch_extracted(path: str) -> None:
+    with _lock:
+        if path in _extracted:
+            _extracted.move_to_end(path)
+
+
+def _get_extract_lock(path: str) -> threading.Lock:
+    with _lock:
+        lock = _extract_locks.get(path)
+        if lock is None:
+            lock = threading.Lock()
+            _extract_locks[path] = lock
+        return lock
+
+
+def _blob_path(digest: str) -> str:
+    return os.path.join(str(DECK_BLOB_DIR), digest[:2], digest)
+
+
+def _release_blob(digest: Optional[str]) -> None:
+    """
+    Remove o blob quando nenhum deck tem mais um hard link para ele.
+
+    Outro processo pode ligar o blob a um deck entre o stat e a remoção: o
+    arquivo do deck continua válido (o link já existe), só o nome do blob
+    some e o conteúdo será extraído de novo no próximo deck que o pedir.
+    """
+    if digest is None:
+        return
+    blob = _blob_path(digest)
+    try:
+        if os.stat(blob).st_nlink <= 1:
+            os.remove(blob)
+    except OSError:
+        pass
+
+
+def _collect_orphan_blobs() -> None:
+    """Remove blobs sem links (deixados por um processo anterior), uma vez por processo."""
+    global _blobs_collected
+    with _lock:
+        if _blobs_collected:
+            return
+        _blobs_collected = True
+    if not DECK_BLOB_DIR.is_dir():
+        return
+    for blob in DECK_BLOB_DIR.glob("??/*"):
+        try:
+            if blob.is_file() and blob.stat().st_nlink <= 1:
+                blob.unlink()
+        except OSError:
+            pass
+
+
+def _link_into_deck(source: str, path: str) -> bool:
+    """
+    Cria path como hard link para source (gravação atômica).
+
+    Returns:
+        False se o hard link não é suportado (path não é criado)
+
+    Raises:
+        FileNotFoundError: source não existe (ex: blob removido por outro processo)
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}-{threading.get_ident()}"
+    try:
+        os.link(source, tmp)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # Sistemas de arquivos diferentes ou sem suporte a hard link
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def _extract_dedup(zip_deck: ZipDeck, name: str, path: str) -> bool:
+    """
+    Extrai um arquivo do deck pelo armazenamento por conteúdo.
+
+    O link do deck é sempre criado antes de o blob ficar visível com um único
+    link: o blob publicado já nasce com dois (blob e deck), então a coleta de
+    blobs órfãos (st_nlink <= 1) de outro processo nunca o remove debaixo de
+    um deck que está sendo montado. Os blobs são somente leitura (0444): uma
+    escrita in-place não altera todos os decks que compartilham o conteúdo.
+
+    Returns:
+        True se o conteúdo já estava extraído (só o link foi criado)
+    """
+    _collect_orphan_blobs()
+    info = zip_deck.members[name]
+    member_key = (name.lower(), info.CRC, info.file_size)
+    with _lock:
+        digest = _member_digests.get(member_key)
+
+    if digest is not None:
+        try:
+            if _link_into_deck(_blob_path(digest), path):
+                _remember_blob_link(path, digest)
+                return True
+        except FileNotFoundError:
+            # Blob removido (por outro processo ou pela coleta): extrair de novo
+            pass
+
+    DECK_BLOB_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = os.path.join(str(DECK_BLOB_DIR), f".tmp{os.getpid()}-{threading.get_ident()}")
+    try:
+        digest = zip_deck.write_member(name, tmp)
+        os.chmod(tmp, 0o444)
+        with _lock:
+            _member_digests[member_key] = digest
+        blob = _blob_path(digest)
+        reused = False
+        try:
+            # Mesmo conteúdo já extraído de outro deck
+            reused = _link_into_deck(blob, path)
+        except FileNotFoundError:
+            pass
+        if not reused:
+            if not _link_into_deck(tmp, path):
+                # Sem hard link não há deduplicação: o deck fica com a própria cópia
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, path)
+                remember_digest(path, digest)
+                return False
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            try:
+                # Publica o blob sem sobrescrever um publicado em paralelo
+                os.link(tmp, blob)
+            except FileExistsError:
+                pass
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _remember_blob_link(path, digest)
+    return reused
+
+
+def _remember_blob_link(path: str, digest: str) -> None:
+    remember_digest(path, digest)
+    with _lock:
+        _extracted_digests[path] = digest
+
+
+def _ensure_extracted(zip_deck: ZipDeck, name: str, deck_dir: str) -> str:
+    path = os.path.join(os.path.abspath(deck_dir), *name.split("/"))
+    with _get_extract_lock(path):
+        info = zip_deck.members[name]
+        if os.path.isfile(path) and os.path.getsize(path) == info.file_size:
+            _touch_extracted(path)
+            return path
+        start = time.time()
+        reused = False
+        if DECK_DEDUP_ENABLED:
+            reused = _extract_dedup(zip_deck, name, path)
+        else:
+            zip_deck.extract(name, deck_dir)
+        with _lock:
+            if reused:
+                _stats["dedup_links"] += 1
+                _stats["dedup_bytes"] += info.file_size
+            else:
+                _stats["extractions"] += 1
+                _stats["extracted_bytes"] += info.file_size
+        _remember_extracted(path, info.file_size)
+        origem = "conteúdo já extraído de outro deck" if reused else f"{info.file_size / 1024 ** 2:.1f} MB"
+        safe_print(
+            f"[ZIP DECK] ⚡ {name} extraído de {os.path.basename(zip_deck.zip_path)} "
+            f"em {time.time() - start:.2f}s ({origem})"
+        )
+        return path
+
+
+def find_deck_member(deck_dir: str, filename: str) -> Optional[str]:
+    """
+    Localiza um arquivo do deck, extraindo-o do ZIP se necessário.
+
+    Tolera variação de maiúsculas/minúsculas (ex: "HIDR.DAT" e "hidr.dat").
+
+    Args:
+        deck_dir: Diretório do deck
+        filename: Nome do arquivo (ex: "CONFHD.DAT")
+
+    Returns:
+        Caminho completo do arquivo ou None se não existir no deck
+    """
+    zip_deck = get_deck_zip(deck_dir)
+    if zip_deck is not None:
+        name = zip_deck.find(filename)
+        if name is not None:
+            return _ensure_extracted(zip_deck, name, deck_dir)
+
+    for candidate in (filename, filename.upper(), filename.lower()):
+        path = os.path.join(deck_dir, candidate)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def glob_deck_members(deck_dir: str, pattern: str) -> List[str]:
+    """
+    Nomes dos arquivos do deck que casam com o padrão (ex: "dadger.rv*").
+
+    Não extrai nada: use find_deck_member(deck_dir, nome) para obter o caminho.
+    """
+    zip_deck = get_deck_zip(deck_dir)
+    if zip_deck is not None:
+        return zip_deck.glob(pattern)
+    deck = Path(deck_dir)
+    if not deck.is_dir():
+        return []
+    return sorted(f.name for f in deck.glob(pattern) if f.is_file())
+
+
+def list_deck_files(deck_dir: str) -> List[str]:
+    """Nomes dos arquivos do deck (do ZIP, se o deck for apoiado em ZIP)."""
+    zip_deck = get_deck_zip(deck_dir)
+    if zip_deck is not None:
+        return zip_deck.names()
+    deck = Path(deck_dir)
+    if not deck.is_dir():
+        return []
+    return [f.name for f in deck.iterdir() if f.is_file() and f.name != MARKER_NAME]
+
+
+def get_member_cache_stats() -> dict:
+    """Estatísticas dos arquivos extraídos sob demanda."""
+    with _lock:
+        return {
+            **_stats,
+            "zip_decks": len(_zip_decks),
+            "files": len(_extracted),
+            "bytes": _extracted_bytes,
+            "max_bytes": DECK_MEMBER_CACHE_MAX_MB * 1024 * 1024,
+        }
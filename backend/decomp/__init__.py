@@ -1,4 +1,12 @@
 """
 Agente DECOMP: Análise de decks do modelo DECOMP.
 """
-from .api import app as decomp_app
+
+
+def __getattr__(name):
+    # Import tardio da API: módulos leves do pacote (ex: decompclass, importado
+    # pelos processos do pool de parse) não devem carregar o FastAPI/LangGraph
+    if name == "decomp_app":
+        from .api import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,7 +11,7 @@ from backend.decomp.config import (
     USE_HYBRID_MATCHING,
     safe_print
 )
-from backend.decomp.tools.semantic_matcher import find_best_tool_semantic
+from backend.decomp.tools.semantic_matcher import find_best_tool_semantic, REGISTRY_MULTI
 from backend.core.nodes.tool_router_base import (
     generate_plant_correction_followup,
     parse_plant_correction_query,
@@ -118,7 +118,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
             # Tentar semantic matching
             safe_print("[TOOL ROUTER DECOMP MULTI] Tentando semantic matching...")
             try:
-                semantic_result = find_best_tool_semantic(query, tools, threshold=SEMANTIC_MATCH_THRESHOLD)
+                semantic_result = find_best_tool_semantic(query, tools, threshold=SEMANTIC_MATCH_THRESHOLD, registry_name=REGISTRY_MULTI)
                 if semantic_result:
                     best_tool, score = semantic_result
                     tool_name = best_tool.get_name()
@@ -1,6 +1,6 @@
 """Registry de tools para modo Multi-Deck DECOMP."""
 from typing import List, Dict
-from backend.decomp.tools.base import DECOMPTool
+from backend.core.tool_registry import ToolSpec
 from backend.decomp.agents.multi_deck.tools.inflexibilidade_multi_deck_tool import InflexibilidadeMultiDeckTool
 from backend.decomp.agents.multi_deck.tools.disponibilidade_multi_deck_tool import DisponibilidadeMultiDeckTool
 from backend.decomp.agents.multi_deck.tools.cvu_multi_deck_tool import CVUMultiDeckTool
@@ -27,6 +27,6 @@ TOOLS_REGISTRY_MULTI = [
     GLMultiDeckTool,
 ]
 
-def get_available_tools(selected_decks: List[str], deck_paths: Dict[str, str]) -> List[DECOMPTool]:
-    """Retorna tools disponíveis para comparação multi-deck DECOMP."""
-    return [ToolClass(deck_paths) for ToolClass in TOOLS_REGISTRY_MULTI]
+def get_available_tools(selected_decks: List[str], deck_paths: Dict[str, str]) -> List[ToolSpec]:
+    """Retorna referências lazy (ToolSpec) para as tools de comparação multi-deck DECOMP."""
+    return [ToolSpec(ToolClass, deck_paths) for ToolClass in TOOLS_REGISTRY_MULTI]
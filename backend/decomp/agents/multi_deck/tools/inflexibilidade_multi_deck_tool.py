@@ -13,7 +13,7 @@ from backend.decomp.utils.deck_loader import (
     get_deck_display_name
 )
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 import os
 import pandas as pd
 import multiprocessing
@@ -349,38 +349,17 @@ class InflexibilidadeMultiDeckTool(DECOMPTool):
         }
     
     def _load_all_dadgers_parallel(self) -> Dict[str, Any]:
-        """Carrega todos os dadgers em paralelo."""
-        dadger_cache = {}
-        
-        def load_dadger(deck_name: str, deck_path: str) -> tuple[str, Any]:
-            try:
-                from backend.decomp.utils.dadger_cache import get_cached_dadger
-                dadger = get_cached_dadger(deck_path)
-                if dadger:
-                    return (deck_name, dadger)
-                return (deck_name, None)
-            except Exception as e:
-                safe_print(f"[INFLEXIBILIDADE MULTI-DECK] ⚠️ Erro ao carregar dadger para {deck_name}: {e}")
-                return (deck_name, None)
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_deck = {
-                executor.submit(load_dadger, deck_name, deck_path): deck_name
-                for deck_name, deck_path in self.deck_paths.items()
-            }
-            
-            for future in as_completed(future_to_deck):
-                deck_name = future_to_deck[future]
-                try:
-                    deck_name_result, dadger = future.result(timeout=60)
-                    if dadger is not None:
-                        dadger_cache[deck_name_result] = dadger
-                except FutureTimeoutError:
-                    safe_print(f"[INFLEXIBILIDADE MULTI-DECK] ⏱️ Timeout ao carregar dadger para {deck_name}")
-                except Exception as e:
-                    safe_print(f"[INFLEXIBILIDADE MULTI-DECK] ⚠️ Erro ao obter resultado de carregamento para {deck_name}: {e}")
-        
-        return dadger_cache
+        """
+        Carrega todos os dadgers em paralelo.
+
+        Dadgers fora do cache são lidos no pool de processos do dadger_cache:
+        o parse segura o GIL e não paraleliza em threads.
+
+        Returns:
+            Dict mapeando deck_name para objeto Dadger carregado
+        """
+        from backend.decomp.utils.dadger_cache import get_cached_dadgers
+        return get_cached_dadgers(self.deck_paths, max_workers=self.max_workers)
     
     def _execute_single_deck(
         self,
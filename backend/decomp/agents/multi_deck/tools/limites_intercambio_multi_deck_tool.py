@@ -120,6 +120,11 @@ class LimitesIntercambioMultiDeckTool(DECOMPTool):
         
         deck_results = []
         
+        # Pré-carregar os dadgers fora do cache no pool de processos (o parse em
+        # threads é serializado pelo GIL); a tool de cada deck usa o cache
+        from backend.decomp.utils.dadger_cache import get_cached_dadgers
+        get_cached_dadgers(self.deck_paths, max_workers=self.max_workers)
+        
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
                 executor.submit(
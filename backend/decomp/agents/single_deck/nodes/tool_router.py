@@ -20,7 +20,7 @@ from backend.decomp.config import (
     DISAMBIGUATION_MIN_SCORE,
     safe_print
 )
-from backend.decomp.tools.semantic_matcher import find_best_tool_semantic, find_top_tools_semantic
+from backend.decomp.tools.semantic_matcher import find_best_tool_semantic, find_top_tools_semantic, REGISTRY_SINGLE
 from backend.core.utils.debug import write_debug_log
 from backend.core.nodes.tool_router_base import (
     execute_tool as shared_execute_tool,
@@ -146,7 +146,8 @@ def tool_router_node(state: SingleDeckState) -> dict:
         safe_print("[TOOL ROUTER DECOMP] Tentando semantic matching...")
         try:
             top_tools = find_top_tools_semantic(
-                query, tools, top_n=5, threshold=SEMANTIC_MATCH_THRESHOLD
+                query, tools, top_n=5, threshold=SEMANTIC_MATCH_THRESHOLD,
+                registry_name=REGISTRY_SINGLE,
             )
             if top_tools:
                 best_tool, score = top_tools[0]
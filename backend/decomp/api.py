@@ -26,22 +26,24 @@ def _safe_print(*args, **kwargs):
 if sys.platform == 'win32':
     builtins.print = _safe_print
 
+import os
 import uuid
-import shutil
 import zipfile
 from pathlib import Path
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from backend.decomp.config import UPLOADS_DIR
 from backend.decomp.agents.single_deck.graph import run_query as single_deck_run_query, run_query_stream as single_deck_run_query_stream
 from backend.decomp.agents.multi_deck.graph import run_query as multi_deck_run_query, run_query_stream as multi_deck_run_query_stream
 from backend.decomp.rag import index_documentation
-from backend.decomp.utils.dadger_cache import get_cache_stats
-from backend.decomp.utils.deck_loader import list_available_decks, load_deck
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from backend.decomp.utils.deck_loader import deck_ingestor, list_available_decks, load_deck
+from backend.core.deck_upload import ERROR as UPLOAD_ERROR, PENDING as UPLOAD_PENDING, DeckUploadManager
+from backend.core.query_executor import QueryExecutorSaturated, query_executor
+from backend.core.session_store import SessionStore
+from backend.core.startup import StartupState
+from backend.core.utils.zip_deck import list_deck_files
 
 app = FastAPI(
     title="DECOMP Agent API",
@@ -63,9 +65,6 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-sessions: dict[str, Path] = {}
-comparison_sessions: dict[str, list[str]] = {}
-
 class QueryRequest(BaseModel):
     session_id: str
     query: str
@@ -84,6 +83,9 @@ class UploadResponse(BaseModel):
     session_id: str
     message: str
     files_count: int
+    status: str | None = None  # /upload: "processando", "pronto" ou "erro"
+    sha256: str | None = None
+    duplicate_of: str | None = None
 
 class IndexResponse(BaseModel):
     documents_count: int
@@ -113,94 +115,83 @@ class ComparisonInitResponse(BaseModel):
     files_count: int
 
 
-def preload_decomp_decks():
+# Indexação da documentação e preload de decks rodam em threads de fundo:
+# o servidor aceita requisições logo após o startup (ver core/startup.py)
+startup_state = StartupState("DECOMP")
+
+
+def _release_session(session_id: str, deck_path: Path) -> None:
+    """Esquece o upload da sessão e as entradas dos caches lidas do diretório dela."""
+    uploads.forget(session_id)
+    if deck_path.parent != UPLOADS_DIR:
+        # Deck do repositório: os caches continuam valendo para as outras sessões
+        return
+    prefix = str(deck_path) + os.sep
+    for _, entries, evict, _ in _file_caches().values():
+        for entry in entries():
+            if entry["path"].startswith(prefix):
+                evict(entry["key"])
+
+
+# Sessões (session_id -> deck e decks da comparação), com TTL e persistência (ver core/session_store.py)
+session_store = SessionStore("DECOMP", UPLOADS_DIR, on_remove=_release_session)
+
+# Decks enviados por /upload: gravados em streaming e preparados em segundo plano
+uploads = DeckUploadManager("DECOMP", UPLOADS_DIR, list_available_decks, load_deck, session_store.put)
+
+
+def _collect_garbage() -> None:
+    """Limpeza após cada execução do reaper: ZIPs enviados sem referência e snapshots antigos."""
+    from backend.decomp.decompclass import Dadger
+    from backend.decomp.utils.dadgnl import Dadgnl
+    from backend.decomp.utils.parsed_snapshot import prune_snapshots
+
+    uploads.collect(session_store.ttl_seconds)
+    prune_snapshots((Dadger, Dadgnl))
+
+
+def _index_documentation() -> int:
+    count = index_documentation()
+    print(f"📚 Documentação DECOMP indexada: {count} documentos")
+    return count
+
+
+def start_background_startup() -> None:
     """
-    Preload de todos os decks DECOMP disponíveis no cache.
-    Executa de forma síncrona no startup para garantir que tudo esteja carregado.
+    Inicia a indexação da documentação e o preload de decks em segundo plano.
+
+    O preload é a ingestão de decks (deck_ingestor), do mais recente para o
+    mais antigo; decks ainda não aquecidos são preparados sob demanda por
+    load_deck(). Idempotente: também é chamada pelo app unificado (main.py).
     """
-    try:
-        print("\n" + "="*60)
-        print("[PRELOAD DECOMP] ⚡ Iniciando preload de decks...")
-        print("="*60)
-        start_time = time.time()
-        
-        # Listar todos os decks disponíveis
-        available_decks = list_available_decks()
+    startup_state.run_in_background("index_documentation", _index_documentation)
+    deck_ingestor.start()
+    session_store.start_reaper(after_reap=_collect_garbage)
 
-        if not available_decks:
-            print("[PRELOAD DECOMP] ⚠️ Nenhum deck DECOMP encontrado")
-            return
-
-        print(f"[PRELOAD DECOMP] 📦 Encontrados {len(available_decks)} decks")
-
-        # Preload em paralelo (usar até 8 workers para não sobrecarregar)
-        max_workers = min(8, len(available_decks))
-        loaded_count = 0
-        error_count = 0
-        errors_detail = []
-
-        def load_single_deck(deck_info):
-            """Carrega um deck usando o deck_loader (que aquece os caches)."""
-            try:
-                deck_name = deck_info["name"]
-                # Carregar deck (extrai se necessário e aquece Dadger/Dadgnl via deck_loader)
-                _ = load_deck(deck_name)
-                return (deck_name, True, None)
-            except Exception as e:
-                return (deck_info.get('name', 'unknown'), False, str(e))
-
-        print(f"[PRELOAD DECOMP] 🔄 Carregando {len(available_decks)} decks em paralelo ({max_workers} workers)...")
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(load_single_deck, deck): deck
-                for deck in available_decks
-            }
-
-            for future in as_completed(futures):
-                deck_name, success, error = future.result()
-                if success:
-                    loaded_count += 1
-                    if loaded_count % 10 == 0:
-                        print(f"[PRELOAD DECOMP] ✅ {loaded_count}/{len(available_decks)} decks carregados...")
-                else:
-                    error_count += 1
-                    errors_detail.append((deck_name, error))
-                    if error:
-                        print(f"[PRELOAD DECOMP] ⚠️ Erro ao carregar {deck_name}: {error}")
-
-        elapsed = time.time() - start_time
-        cache_stats = get_cache_stats()
-
-        print("\n" + "-"*60)
-        print(f"[PRELOAD DECOMP] ✅ Preload concluído em {elapsed:.2f}s")
-        print(f"[PRELOAD DECOMP]   📊 Decks carregados: {loaded_count}/{len(available_decks)}")
-        print(f"[PRELOAD DECOMP]   ❌ Erros: {error_count}")
-        if error_count > 0:
-            print(f"[PRELOAD DECOMP]   ⚠️ Decks com erro: {[e[0] for e in errors_detail[:5]]}")
-        print(f"[PRELOAD DECOMP]   💾 Cache (Dadger): {cache_stats['currsize']}/{cache_stats['maxsize']} slots usados")
-        if cache_stats['hits'] + cache_stats['misses'] > 0:
-            print(f"[PRELOAD DECOMP]   🎯 Hit rate (Dadger): {cache_stats['hit_rate']*100:.1f}%")
-        print("="*60 + "\n")
-        
-    except Exception as e:
-        print(f"\n[PRELOAD DECOMP] ❌ Erro crítico no preload: {e}")
-        import traceback
-        traceback.print_exc()
-        print("="*60 + "\n")
 
 @app.on_event("startup")
 async def startup_event():
-    """Executa no startup do servidor, ANTES de aceitar requisições."""
-    # 1. Indexar documentação primeiro
-    try:
-        count = index_documentation()
-        print(f"📚 Documentação DECOMP indexada: {count} documentos")
-    except Exception as e:
-        print(f"⚠️ Erro ao indexar documentação DECOMP: {e}")
-    
-    # 2. Preload síncrono de decks (bloqueia até terminar)
-    preload_decomp_decks()
+    """Executa no startup do servidor DECOMP (não bloqueia: tarefas em segundo plano)."""
+    start_background_startup()
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness: o processo está atendendo requisições."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 503 até a inicialização terminar; inclui o progresso do preload de decks."""
+    status = {
+        **startup_state.get_status(),
+        "preload": deck_ingestor.get_progress(),
+        "query_executor": query_executor.get_stats(),
+        "sessions": session_store.get_stats(),
+    }
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
 
 @app.get("/")
 async def root():
@@ -215,58 +206,73 @@ async def upload_deck(file: UploadFile = File(...)):
     """Upload de um deck DECOMP (arquivo .zip)."""
     if not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Apenas arquivos .zip são aceitos")
-    
-    session_id = str(uuid.uuid4())
-    session_path = UPLOADS_DIR / session_id
-    session_path.mkdir(parents=True, exist_ok=True)
-    
-    zip_path = session_path / file.filename
-    with open(zip_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(session_path)
-    
-    zip_path.unlink()
-    
-    extracted_items = list(session_path.iterdir())
-    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-        inner_dir = extracted_items[0]
-        for item in inner_dir.iterdir():
-            shutil.move(str(item), str(session_path / item.name))
-        inner_dir.rmdir()
-    
-    files_count = len(list(session_path.glob("*")))
-    sessions[session_id] = session_path
-    
+
+    # Gravado em disco em blocos; o deck é preparado em segundo plano (ver core/deck_upload.py)
+    try:
+        upload = await uploads.accept(file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Arquivo .zip inválido")
+
     return UploadResponse(
-        session_id=session_id,
-        message="Deck DECOMP carregado com sucesso",
-        files_count=files_count
+        session_id=upload["session_id"],
+        message=f"Deck DECOMP recebido; preparação em andamento (GET /upload/{upload['session_id']})",
+        files_count=upload["files_count"],
+        status=upload["status"],
+        sha256=upload["sha256"],
+        duplicate_of=upload["duplicate_of"],
     )
 
+
+@app.get("/upload/{session_id}")
+async def get_upload_status(session_id: str):
+    """Status da preparação de um deck enviado por /upload."""
+    status = uploads.get_status(session_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Upload {session_id} não encontrado")
+    return status
+
+
+async def _wait_for_upload(session_id: str) -> None:
+    """
+    Aguarda a preparação do deck de uma sessão criada por /upload (registrada no store ao ficar pronta).
+
+    Se a preparação falhou ou ainda não terminou, responde com o status do
+    upload em vez de "sessão não encontrada".
+    """
+    await uploads.wait_ready(session_id)
+    status = uploads.get_status(session_id)
+    if status is None:
+        return
+    if status["status"] == UPLOAD_ERROR:
+        raise HTTPException(status_code=422, detail=f"Erro ao preparar o deck enviado: {status['error']}")
+    if status["status"] == UPLOAD_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Deck da sessão {session_id} ainda em preparação",
+            headers={"Retry-After": "5"},
+        )
+
+
+def _get_session_path(session_id: str) -> Path:
+    deck_path = session_store.get(session_id)
+    if deck_path is None:
+        raise HTTPException(status_code=404, detail=f"Sessão {session_id} não encontrada")
+    return deck_path
+
 @app.post("/query", response_model=QueryResponse)
 async def query_deck(request: QueryRequest):
     """Envia uma pergunta sobre o deck DECOMP."""
+    await _wait_for_upload(request.session_id)
     session_id = request.session_id
-    
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(status_code=404, detail=f"Sessão {session_id} não encontrada")
-    
-    deck_path = str(sessions[session_id])
+    deck_path = str(_get_session_path(session_id))
     analysis_mode = request.analysis_mode or "single"
     
     try:
         if analysis_mode == "comparison":
-            selected_decks = comparison_sessions.get(session_id)
-            result = multi_deck_run_query(request.query, deck_path, session_id=session_id, selected_decks=selected_decks)
+            selected_decks = session_store.get_selected_decks(session_id)
+            result = await query_executor.run(multi_deck_run_query, request.query, deck_path, session_id=session_id, selected_decks=selected_decks)
         else:
-            result = single_deck_run_query(request.query, deck_path, session_id=session_id)
+            result = await query_executor.run(single_deck_run_query, request.query, deck_path, session_id=session_id)
         
         return QueryResponse(
             session_id=session_id,
@@ -277,28 +283,23 @@ async def query_deck(request: QueryRequest):
             visualization_data=result.get("visualization_data"),
             plant_correction_followup=result.get("plant_correction_followup"),
         )
+    except QueryExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao processar query: {str(e)}")
 
 @app.post("/query/stream")
 async def query_deck_stream(request: QueryRequest):
     """Envia uma pergunta sobre o deck DECOMP com streaming."""
+    await _wait_for_upload(request.session_id)
     session_id = request.session_id
     analysis_mode = request.analysis_mode or "single"
-    
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(status_code=404, detail=f"Sessão {session_id} não encontrada")
-    
-    deck_path = str(sessions[session_id])
+    deck_path = str(_get_session_path(session_id))
+    selected_decks = session_store.get_selected_decks(session_id)
     
     def event_generator():
         try:
             if analysis_mode == "comparison":
-                selected_decks = comparison_sessions.get(session_id)
                 yield from multi_deck_run_query_stream(request.query, deck_path, session_id=session_id, selected_decks=selected_decks)
             else:
                 yield from single_deck_run_query_stream(request.query, deck_path, session_id=session_id)
@@ -306,8 +307,13 @@ async def query_deck_stream(request: QueryRequest):
             import json
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
     
+    try:
+        events = query_executor.stream(event_generator)
+    except QueryExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
     return StreamingResponse(
-        event_generator(),
+        events,
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"}
     )
@@ -315,26 +321,16 @@ async def query_deck_stream(request: QueryRequest):
 @app.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """Retorna informações sobre uma sessão."""
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(status_code=404, detail=f"Sessão {session_id} não encontrada")
-    
-    session_path = sessions[session_id]
-    files = [f.name for f in session_path.glob("*") if f.is_file()]
+    await _wait_for_upload(session_id)
+    session_path = _get_session_path(session_id)
+    files = list_deck_files(str(session_path))
     
     return {"session_id": session_id, "path": str(session_path), "files": files, "files_count": len(files)}
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Remove uma sessão e seus arquivos."""
-    session_path = UPLOADS_DIR / session_id
-    if session_path.exists():
-        shutil.rmtree(session_path)
-    if session_id in sessions:
-        del sessions[session_id]
+    session_store.delete(session_id)
     return {"message": f"Sessão {session_id} removida com sucesso"}
 
 @app.post("/index", response_model=IndexResponse)
@@ -379,8 +375,8 @@ async def load_deck_from_repo(request: LoadDeckRequest):
     try:
         deck_path = load_deck(request.deck_name)
         session_id = str(uuid.uuid4())
-        sessions[session_id] = deck_path
-        files_count = len(list(deck_path.glob("*")))
+        session_store.put(session_id, deck_path)
+        files_count = len(list_deck_files(str(deck_path)))
         return UploadResponse(session_id=session_id, message=f"Deck {request.deck_name} carregado", files_count=files_count)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=f"Deck {request.deck_name} não encontrado: {str(e)}")
@@ -411,9 +407,8 @@ async def init_comparison_mode(request: InitComparisonRequest = None):
         deck_paths = load_multiple_decks(selected_deck_names)
         first_deck_path = deck_paths[selected_deck_names[0]]
         session_id = str(uuid.uuid4())
-        sessions[session_id] = first_deck_path
-        comparison_sessions[session_id] = selected_deck_names
-        files_count = len(list(first_deck_path.glob("*")))
+        session_store.put(session_id, first_deck_path, selected_decks=selected_deck_names)
+        files_count = len(list_deck_files(str(first_deck_path)))
         
         selected_decks_info = [
             DeckInfo(
@@ -437,6 +432,50 @@ async def init_comparison_mode(request: InitComparisonRequest = None):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao inicializar modo comparação: {str(e)}")
 
+def _file_caches() -> dict:
+    """Caches de arquivos parseados do DECOMP: nome -> (stats, entries, evict, clear)."""
+    from backend.decomp.utils import dadger_cache, dadgnl_cache
+    return {
+        "dadger": (dadger_cache.get_cache_stats, dadger_cache.get_cache_entries,
+                   dadger_cache.evict_dadger, dadger_cache.clear_dadger_cache),
+        "dadgnl": (dadgnl_cache.get_cache_stats, dadgnl_cache.get_cache_entries,
+                   dadgnl_cache.evict_dadgnl, dadgnl_cache.clear_dadgnl_cache),
+    }
+
+@app.get("/admin/cache")
+async def get_file_caches():
+    """Estatísticas e entradas (bytes estimados por deck) dos caches de Dadger/Dadgnl."""
+    return {
+        name: {"stats": stats(), "entries": entries()}
+        for name, (stats, entries, _, _) in _file_caches().items()
+    }
+
+@app.delete("/admin/cache/{cache_name}")
+async def evict_file_cache(cache_name: str, path: str | None = None):
+    """Remove uma entrada (path = caminho do arquivo, como em GET /admin/cache) ou limpa o cache inteiro."""
+    caches = _file_caches()
+    if cache_name not in caches:
+        raise HTTPException(status_code=404, detail=f"Cache {cache_name} não encontrado (use: {', '.join(caches)})")
+    stats, _, evict, clear = caches[cache_name]
+    if path is None:
+        clear()
+        return {"message": f"Cache {cache_name} limpo", "stats": stats()}
+    if not evict(path):
+        raise HTTPException(status_code=404, detail=f"Entrada {path} não está no cache {cache_name}")
+    return {"message": f"Entrada {path} removida do cache {cache_name}", "stats": stats()}
+
+@app.get("/decks/ingestion")
+async def get_deck_ingestion_status():
+    """Status da ingestão em segundo plano por deck (pendente, processando, pronto, erro)."""
+    return deck_ingestor.get_status()
+
+@app.post("/decks/ingestion/{deck_name}")
+async def ingest_deck_now(deck_name: str):
+    """Enfileira a (re)ingestão de um deck."""
+    if not deck_ingestor.ingest_now(deck_name):
+        raise HTTPException(status_code=404, detail=f"Deck {deck_name} não encontrado")
+    return {"message": f"Deck {deck_name} na fila de ingestão", "status": deck_ingestor.get_status()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
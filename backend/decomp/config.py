@@ -1,6 +1,7 @@
 """
 Configurações específicas do DECOMP Agent.
 """
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 from backend.core.config import *
@@ -21,5 +22,26 @@ DECOMP_DECKS_DIR.mkdir(parents=True, exist_ok=True)
 DECOMP_DOCS_DIR.mkdir(parents=True, exist_ok=True)
 DECOMP_CHROMA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Orçamento de memória (MB) dos caches de arquivos parseados (ver utils/file_cache.py).
+# O tamanho de cada entrada é estimado ao carregar; as menos usadas saem quando o total
+# passa do limite. 0 = sem limite.
+DECOMP_DADGER_CACHE_MAX_MB = int(os.getenv("DECOMP_DADGER_CACHE_MAX_MB", "2048"))
+DECOMP_DADGNL_CACHE_MAX_MB = int(os.getenv("DECOMP_DADGNL_CACHE_MAX_MB", "256"))
+
+# Leitura sob demanda do dadger (ver utils/lazy_registers.py): cada tipo de registro
+# (UH, CT, DP, ...) só é parseado no primeiro acesso, na thread da requisição.
+# Desativada por padrão: o parse completo vai para o pool de processos nas tools
+# multi-deck e os snapshots em disco gravam o objeto já lido. Carregamentos de vários
+# decks (get_cached_dadgers) usam o pool mesmo com a leitura sob demanda ativa.
+DECOMP_DADGER_LAZY = os.getenv("DECOMP_DADGER_LAZY", "false").lower() == "true"
+
+# Snapshot em disco dos Dadger/Dadgnl já parseados (ver utils/parsed_snapshot.py),
+# carregado no próximo boot em vez de refazer o parse
+DECOMP_SNAPSHOT_ENABLED = os.getenv("DECOMP_SNAPSHOT_ENABLED", "true").lower() == "true"
+DECOMP_SNAPSHOT_DIR = Path(os.getenv("DECOMP_SNAPSHOT_DIR", str(DECOMP_DATA_DIR / "snapshots")))
+# Snapshots não lidos há mais que isso (decks removidos ou substituídos) são apagados
+# junto com a limpeza periódica das sessões. 0 = não remover por idade
+DECOMP_SNAPSHOT_MAX_AGE_DAYS = float(os.getenv("DECOMP_SNAPSHOT_MAX_AGE_DAYS", "30"))
+
 # Todas as configurações compartilhadas são importadas de shared.config via "from backend.core.config import *"
 # Apenas configurações específicas do DECOMP permanecem aqui
@@ -1,10 +1,13 @@
-from typing import Any, List, Optional, Type, TypeVar, Union
+import sys
+from typing import Any, Callable, List, Optional, Type, TypeVar, Union
 
 import numpy as np
 import pandas  # type: ignore
 from cfinterface.components.register import Register
 from cfinterface.files.registerfile import RegisterFile
 
+from backend.decomp.utils.lazy_registers import ler_registros_sob_demanda
+
 from idecomp.decomp.modelos.dadger import (
     ACALTEFE,
     ACCOFEVA,
@@ -217,34 +220,279 @@ class Dadger(RegisterFile):
         DA,
     ]
 
+    # Campos dos filtros usados como chave do índice de registros (ver __registros)
+    CAMPOS_INDEXADOS = (
+        "codigo_usina",
+        "codigo_restricao",
+        "codigo_submercado",
+        "codigo_ree",
+        "estagio",
+    )
+
     def __init__(self, data=...) -> None:
         super().__init__(data)
+        self.__indices: dict = {}
+        self.__dfs: dict = {}
+        self.__estrutura_indexada: Any = None
+        self.__ouvinte_crescimento: Optional[Callable[[], None]] = None
+        self.__marca_crescimento: Any = None
+
+    def __getstate__(self):
+        # O ouvinte é uma função do cache deste processo: não vai para o pickle
+        estado = super().__getstate__()
+        dicionario, slots = estado if isinstance(estado, tuple) else (estado, None)
+        dicionario = {
+            k: v
+            for k, v in (dicionario or {}).items()
+            if k not in ("_Dadger__ouvinte_crescimento", "_Dadger__marca_crescimento")
+        }
+        return dicionario, slots
+
+    def __setstate__(self, estado) -> None:
+        dicionario, slots = estado if isinstance(estado, tuple) else (estado, None)
+        self.__dict__.update(dicionario or {})
+        for nome, valor in (slots or {}).items():
+            setattr(self, nome, valor)
+        self.__ouvinte_crescimento = None
+        self.__marca_crescimento = None
+
+    def ao_crescer(self, ouvinte: Optional[Callable[[], None]]) -> None:
+        """
+        Registra a função chamada quando o Dadger passa a ocupar mais (ou
+        menos) memória depois de lido: índice de registros construído,
+        DataFrame memoizado ou tipo de registro parseado sob demanda.
+
+        Usado pelo cache de arquivos (utils/file_cache.py) para reestimar o
+        tamanho da entrada. None remove o ouvinte.
+
+        :param ouvinte: Função sem argumentos, ou None
+        """
+        self.__ouvinte_crescimento = ouvinte
+        self.__marca_crescimento = self.__estado_memoria()
+
+    def __estado_memoria(self) -> tuple:
+        pendentes = getattr(self.data, "tipos_pendentes", ())
+        return (len(pendentes), len(self.__indices), len(self.__dfs))
+
+    def __notifica_crescimento(self) -> None:
+        ouvinte = self.__ouvinte_crescimento
+        if ouvinte is None:
+            return
+        estado = self.__estado_memoria()
+        if estado != self.__marca_crescimento:
+            self.__marca_crescimento = estado
+            ouvinte()
+
+    def tamanho_memoizado(self) -> int:
+        """
+        Bytes estimados dos índices de registros e dos DataFrames
+        memoizados (não incluem os registros em si).
+        """
+        getsizeof = sys.getsizeof
+        total = 0
+        for indice in list(self.__indices.values()):
+            if not indice:
+                continue
+            total += getsizeof(indice)
+            for chave, registros in list(indice.items()):
+                total += getsizeof(chave) + getsizeof(registros)
+        for df in list(self.__dfs.values()):
+            total += int(df.memory_usage(index=True, deep=True).sum())
+        return total
+
+    @classmethod
+    def read_lazy(cls, content: str) -> "Dadger":
+        """
+        Lê o `dadger.rvx` sem fazer o parse dos registros: cada tipo de
+        registro (UH, CT, DP, ...) é parseado no primeiro acesso a ele.
+
+        Os métodos de acesso são os mesmos da leitura completa. A escrita
+        reproduz as linhas não acessadas exatamente como foram lidas.
+
+        :param content: caminho do arquivo
+        :type content: str
+        :return: O Dadger com leitura sob demanda
+        :rtype: :class:`Dadger`
+        """
+        return cls(
+            ler_registros_sob_demanda(
+                content, cls.REGISTERS, cls.ENCODING, cls.STORAGE
+            )
+        )
+
+    def __valida_indices(self, t: Type[T]) -> None:
+        """
+        Descarta os índices e os DataFrames memoizados se a lista de
+        registros mudou desde que foram construídos.
+
+        O RegisterData recria o índice por tipo (`_type_index`) a cada
+        inserção no meio ou remoção e o `append` altera o tamanho, então a
+        referência ao dicionário (mantida viva, para não haver reuso de id)
+        junto com o número de registros identifica a estrutura atual. Na
+        leitura sob demanda o parse de um tipo altera `_type_index` in-place
+        sem mudar o número de registros: o número de tipos pendentes também
+        entra na estrutura, e o tipo t é parseado antes de conferi-la, para
+        que o índice construído em seguida não seja descartado na próxima
+        consulta.
+        """
+        materializa = getattr(self.data, "materializa", None)
+        if materializa is not None:
+            materializa(t)
+        estrutura = (
+            getattr(self.data, "_type_index", None),
+            len(self.data),
+            len(getattr(self.data, "tipos_pendentes", ())),
+        )
+        atual = self.__estrutura_indexada
+        if (
+            atual is None
+            or atual[0] is not estrutura[0]
+            or atual[1:] != estrutura[1:]
+        ):
+            self.__indices = {}
+            self.__dfs = {}
+            self.__estrutura_indexada = estrutura
+
+    def __indice(self, t: Type[T], campos: tuple) -> dict:
+        """
+        Índice {valores dos campos: [registros]} para o tipo t, construído
+        na primeira consulta e reaproveitado enquanto a estrutura não mudar.
+        """
+        chave = (t, campos)
+        indice = self.__indices.get(chave)
+        if indice is None:
+            indice = {}
+            for r in self.data.of_type(t):
+                valores = tuple(getattr(r, c) for c in campos)
+                try:
+                    indice.setdefault(valores, []).append(r)
+                except TypeError:
+                    # Valor não hashable: o tipo não pode ser indexado por esses campos
+                    indice = None
+                    break
+            self.__indices[chave] = indice if indice is not None else False
+        return indice if indice is not False else None
+
+    def __registros(
+        self, t: Type[T], **filtros
+    ) -> Optional[Union[T, List[T]]]:
+        registros = self.__busca_registros(t, **filtros)
+        self.__notifica_crescimento()
+        return registros
+
+    def __busca_registros(
+        self, t: Type[T], **filtros
+    ) -> Optional[Union[T, List[T]]]:
+        """
+        Equivalente a `self.data.get_registers_of_type(t, **filtros)`, mas
+        resolve os filtros por campos de CAMPOS_INDEXADOS (código da usina,
+        da restrição, estágio, ...) em um índice por tipo em vez de percorrer
+        todos os registros do tipo. Os filtros são conferidos apenas sobre
+        os registros encontrados no índice.
+
+        Os índices acompanham inserções e remoções de registros. Alterar
+        in-place um campo indexado de um registro existente exige chamar
+        `reindexa()`.
+        """
+        filtros = {k: v for k, v in filtros.items() if v is not None}
+        campos = tuple(c for c in self.CAMPOS_INDEXADOS if c in filtros)
+        if not campos:
+            return self.data.get_registers_of_type(t, **filtros)
+
+        self.__valida_indices(t)
+        indice = self.__indice(t, campos)
+        if indice is None:
+            return self.data.get_registers_of_type(t, **filtros)
+        try:
+            candidatos = indice.get(tuple(filtros[c] for c in campos), [])
+        except TypeError:
+            return self.data.get_registers_of_type(t, **filtros)
+
+        # Todos os filtros são conferidos nos candidatos (poucos registros):
+        # cobre também campos indexados alterados in-place depois do índice
+        registros = [
+            r
+            for r in candidatos
+            if all(getattr(r, k) == v for k, v in filtros.items())
+        ]
+        if len(registros) == 0:
+            return None
+        elif len(registros) == 1:
+            return registros[0]
+        return registros
+
+    def reindexa(self) -> None:
+        """
+        Descarta os índices de registros e os DataFrames memoizados, que
+        serão reconstruídos na próxima consulta. Necessário apenas após
+        alterar in-place registros já existentes (ex: `codigo_usina`,
+        `estagio`, limites).
+        """
+        self.__indices = {}
+        self.__dfs = {}
+        self.__estrutura_indexada = None
+        self.__notifica_crescimento()
+
+    @staticmethod
+    def __expande_colunas_df(df: pandas.DataFrame) -> pandas.DataFrame:
+        """
+        Expande colunas cujos valores são listas (ex: limites por patamar)
+        em colunas `<coluna>_1`, `<coluna>_2`, ..., completando listas mais
+        curtas com NaN.
 
-    def __expande_colunas_df(self, df: pandas.DataFrame) -> pandas.DataFrame:
-        colunas_com_listas = df.map(lambda linha: isinstance(linha, list)).all()
+        Cada coluna é montada como um único bloco 2-D NumPy, em vez de um
+        `df.apply(..., axis=1)` por linha.
+        """
         nomes_colunas = [
-            c for c in colunas_com_listas[colunas_com_listas].index
+            c
+            for c in df.columns
+            if df[c].dtype == object
+            and all(isinstance(v, list) for v in df[c])
         ]
         for c in nomes_colunas:
-            num_elementos = len(df.at[0, c])
+            listas = df[c].tolist()
+            num_elementos = max(len(v) for v in listas)
             particoes_coluna = [f"{c}_{i}" for i in range(1, num_elementos + 1)]
-            df[particoes_coluna] = df.apply(
-                lambda linha: linha[c]
-                + [np.nan] * max(0, num_elementos - len(linha[c])),
-                axis=1,
-                result_type="expand",
+            linhas = [v + [np.nan] * (num_elementos - len(v)) for v in listas]
+            try:
+                bloco = np.array(linhas, dtype=np.float64)
+                expandidas = pandas.DataFrame(
+                    bloco, index=df.index, columns=particoes_coluna
+                )
+            except (TypeError, ValueError):
+                # Valores não numéricos: inferência de tipos por coluna
+                expandidas = pandas.DataFrame(
+                    linhas, index=df.index, columns=particoes_coluna
+                )
+            df = pandas.concat(
+                [df.drop(columns=[c]), expandidas], axis=1
             )
-            df.drop(columns=[c], inplace=True)
         return df
 
+    def __df(self, t: Type[T]) -> pandas.DataFrame:
+        """
+        DataFrame com todos os registros do tipo t (colunas de listas já
+        expandidas), memoizado por tipo enquanto a estrutura não mudar.
+
+        Retorna uma cópia: quem chama pode alterar o DataFrame sem afetar
+        as próximas consultas ao mesmo Dadger (compartilhado pelo cache).
+        """
+        self.__valida_indices(t)
+        df = self.__dfs.get(t)
+        if df is None:
+            df = self.__expande_colunas_df(self._as_df(t))
+            self.__dfs[t] = df
+            self.__notifica_crescimento()
+        return df.copy()
+
     def __registros_ou_df(
         self, t: Type[T], **kwargs
     ) -> Optional[Union[T, List[T], pandas.DataFrame]]:
         if kwargs.get("df"):
-            return self.__expande_colunas_df(self._as_df(t))
+            return self.__df(t)
         else:
             kwargs_sem_df = {k: v for k, v in kwargs.items() if k != "df"}
-            return self.data.get_registers_of_type(t, **kwargs_sem_df)
+            return self.__registros(t, **kwargs_sem_df)
 
     @property
     def te(self) -> Optional[TE]:
@@ -255,7 +503,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`TE` | None.
         """
-        r = self.data.get_registers_of_type(TE)
+        r = self.__registros(TE)
         if isinstance(r, TE):
             return r
         else:
@@ -605,7 +853,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`TX` | None.
         """
-        r = self.data.get_registers_of_type(TX)
+        r = self.__registros(TX)
         if isinstance(r, TX):
             return r
         else:
@@ -620,7 +868,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`GP` | None.
         """
-        r = self.data.get_registers_of_type(GP)
+        r = self.__registros(GP)
         if isinstance(r, GP):
             return r
         else:
@@ -635,7 +883,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`NI` | None.
         """
-        r = self.data.get_registers_of_type(NI)
+        r = self.__registros(NI)
         if isinstance(r, NI):
             return r
         else:
@@ -650,7 +898,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`DT` | None.
         """
-        r = self.data.get_registers_of_type(DT)
+        r = self.__registros(DT)
         if isinstance(r, DT):
             return r
         else:
@@ -753,7 +1001,7 @@ class Dadger(RegisterFile):
             ultimo_registro = None
             if ei is not None and estagio <= ef:  # type: ignore
                 for e in range(ei, estagio + 1):  # type: ignore
-                    registro_estagio = self.data.get_registers_of_type(
+                    registro_estagio = self.__registros(
                         LU, codigo_restricao=codigo_restricao, estagio=e
                     )
                     if registro_estagio is not None:
@@ -773,9 +1021,9 @@ class Dadger(RegisterFile):
             return None
 
         if df:
-            return self.__expande_colunas_df(self._as_df(LU))
+            return self.__df(LU)
         else:
-            lu = self.data.get_registers_of_type(
+            lu = self.__registros(
                 LU, codigo_restricao=codigo_restricao, estagio=estagio
             )
             if isinstance(lu, list):
@@ -1003,7 +1251,7 @@ class Dadger(RegisterFile):
         :return: Um ou mais registros, se existirem.
         :rtype: :class:`EA` | list[:class:`EA`] | :class:`pandas.DataFrame` | None
         """
-        return self.data.get_registers_of_type(EA, codigo_ree=codigo_ree, df=df)
+        return self.__registros(EA, codigo_ree=codigo_ree, df=df)
 
     def es(
         self,
@@ -1374,7 +1622,7 @@ class Dadger(RegisterFile):
             ultimo_registro = None
             if ei is not None and estagio <= ef:  # type: ignore
                 for e in range(ei, estagio + 1):  # type: ignore
-                    registro_estagio = self.data.get_registers_of_type(
+                    registro_estagio = self.__registros(
                         LV, codigo_restricao=codigo_restricao, estagio=e
                     )
                     if registro_estagio is not None:
@@ -1392,9 +1640,9 @@ class Dadger(RegisterFile):
             return None
 
         if df:
-            return self.__expande_colunas_df(self._as_df(LV))
+            return self.__df(LV)
         else:
-            lv = self.data.get_registers_of_type(
+            lv = self.__registros(
                 LV, codigo_restricao=codigo_restricao, estagio=estagio
             )
             if isinstance(lv, list):
@@ -1541,7 +1789,7 @@ class Dadger(RegisterFile):
             ultimo_registro = None
             if ei is not None and estagio <= ef:  # type: ignore
                 for e in range(ei, estagio + 1):  # type: ignore
-                    registro_estagio = self.data.get_registers_of_type(
+                    registro_estagio = self.__registros(
                         LQ, codigo_restricao=codigo_restricao, estagio=e
                     )
                     if registro_estagio is not None:
@@ -1559,9 +1807,9 @@ class Dadger(RegisterFile):
             return None
 
         if df:
-            return self.__expande_colunas_df(self._as_df(LQ))
+            return self.__df(LQ)
         else:
-            lq = self.data.get_registers_of_type(
+            lq = self.__registros(
                 LQ, codigo_restricao=codigo_restricao, estagio=estagio
             )
             if isinstance(lq, list):
@@ -1710,7 +1958,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`EV` | None.
         """
-        r = self.data.get_registers_of_type(EV)
+        r = self.__registros(EV)
         if isinstance(r, EV):
             return r
         else:
@@ -1725,7 +1973,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`FJ` | None.
         """
-        r = self.data.get_registers_of_type(FJ)
+        r = self.__registros(FJ)
         if isinstance(r, FJ):
             return r
         else:
@@ -1739,7 +1987,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`PU` | None.
         """
-        r = self.data.get_registers_of_type(PU)
+        r = self.__registros(PU)
         if isinstance(r, PU):
             return r
         else:
@@ -1754,7 +2002,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`RC` | None.
         """
-        r = self.data.get_registers_of_type(RC)
+        r = self.__registros(RC)
         if isinstance(r, RC):
             return r
         else:
@@ -1815,7 +2063,7 @@ class Dadger(RegisterFile):
         :return: Um ou mais registros, se existirem.
         :rtype: :class:`TS` | list[:class:`TS`] | None
         """
-        return self.data.get_registers_of_type(
+        return self.__registros(
             TS,
             tolerancia_primaria=tolerancia_primaria,
             tolerancia_secundaria=tolerancia_secundaria,
@@ -1857,7 +2105,7 @@ class Dadger(RegisterFile):
         :return: Um ou mais registros, se existirem.
         :rtype: :class:`PV` | list[:class:`PV`] | None
         """
-        return self.data.get_registers_of_type(
+        return self.__registros(
             PV,
             penalidade_variaveis_folga=penalidade_variaveis_folga,
             tolerancia_viabilidade_restricoes=tolerancia_viabilidade_restricoes,
@@ -1899,7 +2147,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`FA` | None.
         """
-        r = self.data.get_registers_of_type(FA)
+        r = self.__registros(FA)
         if isinstance(r, FA):
             return r
         else:
@@ -1914,7 +2162,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`VT` | None.
         """
-        r = self.data.get_registers_of_type(VT)
+        r = self.__registros(VT)
         if isinstance(r, VT):
             return r
         else:
@@ -1929,7 +2177,7 @@ class Dadger(RegisterFile):
         :return: Um registro, se existir.
         :rtype: :class:`CS` | None.
         """
-        r = self.data.get_registers_of_type(CS)
+        r = self.__registros(CS)
         if isinstance(r, CS):
             return r
         else:
@@ -2029,4 +2277,4 @@ class Dadger(RegisterFile):
         :return: Um ou mais registros, se existirem.
         :rtype: :class:`PD` | list[:class:`PD`] | None
         """
-        return self.data.get_registers_of_type(PD, algoritmo=algoritmo)
\ No newline at end of file
+        return self.__registros(PD, algoritmo=algoritmo)
\ No newline at end of file
@@ -5,7 +5,7 @@ Usa ChromaDB com collection separada para DECOMP.
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from backend.decomp.config import DECOMP_CHROMA_DIR as CHROMA_DIR
-from backend.core.azure_openai import get_azure_embeddings
+from backend.core.embeddings import get_collection_name, get_embeddings as _get_backend_embeddings
 
 
 _vectorstore = None
@@ -13,7 +13,7 @@ _vectorstore = None
 
 def get_embeddings():
     """Retorna o modelo de embeddings configurado."""
-    return get_azure_embeddings()
+    return _get_backend_embeddings()
 
 
 def get_vectorstore() -> Chroma:
@@ -21,7 +21,7 @@ def get_vectorstore() -> Chroma:
     global _vectorstore
     if _vectorstore is None:
         _vectorstore = Chroma(
-            collection_name="decomp_docs",
+            collection_name=get_collection_name("decomp_docs"),
             embedding_function=get_embeddings(),
             persist_directory=str(CHROMA_DIR)
         )
@@ -3,6 +3,7 @@ Tools do DECOMP Agent.
 """
 from typing import List
 
+from backend.core.tool_registry import ToolSpec
 from .base import DECOMPTool
 from .uh_usinas_hidreletricas_tool import UHUsinasHidrelétricasTool
 from .ct_usinas_termelétricas_tool import CTUsinasTermelétricasTool
@@ -35,17 +36,19 @@ TOOLS_REGISTRY_SINGLE = [
 ]
 
 
-def get_available_tools(deck_path: str) -> List[DECOMPTool]:
+def get_available_tools(deck_path: str) -> List[ToolSpec]:
     """
-    Retorna instâncias de todas as tools disponíveis para modo single deck DECOMP.
+    Retorna referências lazy (ToolSpec) para as tools do modo single deck DECOMP.
+    
+    A tool só é instanciada quando executada (ver core/tool_registry.py).
     
     Args:
         deck_path: Caminho do diretório do deck DECOMP
         
     Returns:
-        Lista de instâncias de tools
+        Lista de ToolSpec
     """
-    return [ToolClass(deck_path) for ToolClass in TOOLS_REGISTRY_SINGLE]
+    return [ToolSpec(ToolClass, deck_path) for ToolClass in TOOLS_REGISTRY_SINGLE]
 
 
 __all__ = [
@@ -4,7 +4,7 @@ Calcula média ponderada dos valores ANDE dos 3 patamares.
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 import pandas as pd
 from typing import Dict, Any, Optional
 
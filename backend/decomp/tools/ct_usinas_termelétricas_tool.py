@@ -4,7 +4,7 @@ Acessa dados de cadastro de UTE, patamares de carga, CVU, disponibilidade, infle
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 import os
 import pandas as pd
 import re
@@ -110,6 +110,67 @@ class CTUsinasTermelétricasTool(DECOMPTool):
         - "CVU do patamar pesada"
         """
     
+    def _extrai_filtros(self, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Filtros da consulta extraídos da query (sem o casamento por nome da usina).
+        
+        Args:
+            query: Query do usuário
+            **kwargs: forced_plant_code (código da usina corrigido pelo usuário)
+            
+        Returns:
+            Dict com codigo_usina, codigo_submercado, estagio, patamar,
+            cvu_apenas e cvu_inflexibilidade_disponibilidade
+        """
+        forced_plant_code = kwargs.get("forced_plant_code")
+        if forced_plant_code is not None:
+            codigo_usina = int(forced_plant_code)
+        else:
+            codigo_usina = self._extract_codigo_usina(query)
+        estagio = self._extract_estagio(query)
+        is_cvu_only = self._is_cvu_query(query)
+        is_cvu_inflexibilidade_disponibilidade_query = self._is_cvu_inflexibilidade_disponibilidade_query(query)
+        
+        # Query de CVU SEMPRE usa estágio 1, ignorando qualquer especificação;
+        # CVU/inflexibilidade/disponibilidade sem estágio usa estágio 1 por padrão
+        if is_cvu_only or (is_cvu_inflexibilidade_disponibilidade_query and estagio is None):
+            estagio = 1
+        
+        return {
+            "codigo_usina": codigo_usina,
+            "codigo_submercado": self._extract_codigo_submercado(query),
+            "estagio": estagio,
+            "patamar": self._extract_patamar(query),
+            "cvu_apenas": is_cvu_only,
+            "cvu_inflexibilidade_disponibilidade": is_cvu_inflexibilidade_disponibilidade_query,
+        }
+    
+    def get_cache_params(self, query: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Parâmetros da consulta para o cache de resultados (ver BaseTool).
+        
+        Inclui o código da usina casado pelo nome, como em execute(), para que
+        "CVU de Angra 1" e "CVU da usina Angra 1" caiam na mesma chave.
+        """
+        from backend.decomp.utils.dadger_cache import get_cached_dadger
+        dadger = get_cached_dadger(self.deck_path)
+        if dadger is None:
+            return None
+        
+        filtros = self._extrai_filtros(query, **kwargs)
+        if filtros["codigo_usina"] is None:
+            ct_data = dadger.ct(
+                codigo_usina=None,
+                codigo_submercado=filtros["codigo_submercado"],
+                estagio=filtros["estagio"],
+                df=True
+            )
+            if isinstance(ct_data, pd.DataFrame) and not ct_data.empty:
+                filtros["codigo_usina_nome"] = self._extract_usina_from_query(
+                    query, dadger, ct_data.to_dict('records')
+                )
+        return filtros
+    
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         """
         Executa a consulta sobre usinas termelétricas do Bloco CT.
@@ -134,24 +195,20 @@ class CTUsinasTermelétricasTool(DECOMPTool):
             
             # Extrair filtros da query
             forced_plant_code = kwargs.get("forced_plant_code")
+            filtros = self._extrai_filtros(query, **kwargs)
+            codigo_usina = filtros["codigo_usina"]
             if forced_plant_code is not None:
-                codigo_usina = int(forced_plant_code)
                 safe_print(f"[CT TOOL] ⚙️ Código forçado recebido via follow-up: {codigo_usina}")
-            else:
-                codigo_usina = self._extract_codigo_usina(query)
-            codigo_submercado = self._extract_codigo_submercado(query)
-            estagio = self._extract_estagio(query)
-            patamar = self._extract_patamar(query)  # NOVO: extrair patamar
-            is_cvu_only = self._is_cvu_query(query)  # NOVO: verificar se é query de CVU
-            is_cvu_inflexibilidade_disponibilidade_query = self._is_cvu_inflexibilidade_disponibilidade_query(query)
-            
-            # MUDANÇA: Se é query de CVU, SEMPRE usar estágio 1, ignorando qualquer especificação
+            codigo_submercado = filtros["codigo_submercado"]
+            estagio = filtros["estagio"]
+            patamar = filtros["patamar"]
+            is_cvu_only = filtros["cvu_apenas"]
+            is_cvu_inflexibilidade_disponibilidade_query = filtros["cvu_inflexibilidade_disponibilidade"]
+            
             if is_cvu_only:
-                estagio = 1
                 safe_print(f"[CT TOOL] Query de CVU detectada - FORÇANDO estágio 1 (ignorando qualquer especificação de estágio)")
-            elif is_cvu_inflexibilidade_disponibilidade_query and estagio is None:
-                estagio = 1
-                safe_print(f"[CT TOOL] Query específica sobre CVU/inflexibilidade/disponibilidade sem estágio especificado - usando estágio 1 por padrão")
+            elif is_cvu_inflexibilidade_disponibilidade_query and estagio == 1:
+                safe_print(f"[CT TOOL] Query específica sobre CVU/inflexibilidade/disponibilidade - usando estágio 1")
             elif estagio is None:
                 # Query geral do bloco CT - não aplicar filtro de estágio (mostrar todos)
                 safe_print(f"[CT TOOL] Query geral do bloco CT - mostrando todos os estágios")
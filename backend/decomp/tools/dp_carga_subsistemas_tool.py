@@ -4,7 +4,7 @@ Acessa dados de demanda por patamar, duração dos patamares, etc.
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 import os
 import pandas as pd
 import re
@@ -9,7 +9,8 @@ VERSÃO SIMPLIFICADA: Apenas lê o registro IA do arquivo como DataFrame.
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.utils.deck_loader import find_dadger_file
+from backend.decomp.decompclass import Dadger
 import os
 import pandas as pd
 import re
@@ -515,15 +516,7 @@ class LimitesIntercambioDECOMPTool(DECOMPTool):
     
     def _find_dadger_file(self) -> Optional[str]:
         """Encontra o arquivo dadger.rvX no deck."""
-        for ext in range(10):
-            candidate = os.path.join(self.deck_path, f"dadger.rv{ext}")
-            if os.path.exists(candidate):
-                return candidate
-        # Tentar .rvx
-        candidate = os.path.join(self.deck_path, "dadger.rvx")
-        if os.path.exists(candidate):
-            return candidate
-        return None
+        return find_dadger_file(self.deck_path)
     
     def _normalize_submercado_layout(self, nome: str) -> str:
         """Normaliza token da query para o valor canônico do layout DECOMP IA."""
@@ -6,7 +6,7 @@ OTIMIZADO: Carrega CT apenas uma vez, regex pré-compiladas, operações vetoriz
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 import pandas as pd
 import re
 import sys
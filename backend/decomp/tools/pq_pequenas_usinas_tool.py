@@ -4,7 +4,7 @@ Específica para Single Deck: apenas estágio 1, com cálculo ponderado por hora
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 import os
 import pandas as pd
 import re
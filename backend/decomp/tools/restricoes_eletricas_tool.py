@@ -16,10 +16,11 @@ import os
 import re
 
 import pandas as pd
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
+from backend.decomp.utils.deck_loader import find_dadger_file
 
 
 class RestricoesEletricasDECOMPTool(DECOMPTool):
@@ -327,14 +328,7 @@ class RestricoesEletricasDECOMPTool(DECOMPTool):
 
     def _find_dadger_file(self) -> Optional[str]:
         """Encontra o arquivo dadger.rvX ou dadger.rvx no deck."""
-        for ext in range(10):
-            candidate = os.path.join(self.deck_path, f"dadger.rv{ext}")
-            if os.path.exists(candidate):
-                return candidate
-        candidate = os.path.join(self.deck_path, "dadger.rvx")
-        if os.path.exists(candidate):
-            return candidate
-        return None
+        return find_dadger_file(self.deck_path)
 
     def _extract_nome_query(self, query: str) -> Optional[str]:
         """
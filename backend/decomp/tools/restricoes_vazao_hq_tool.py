@@ -15,10 +15,12 @@ import sys
 from pathlib import Path
 
 import pandas as pd
-from idecomp.decomp import Dadger
+from backend.decomp.decompclass import Dadger
 
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
+from backend.decomp.utils.deck_loader import find_dadger_file
+from backend.core.utils.zip_deck import find_deck_member
 
 # Cache global para mapeamento código -> nome das usinas hidrelétricas (igual UHUsinasHidrelétricasTool)
 _HIDR_MAPPING_CACHE: Optional[Dict[int, str]] = None
@@ -296,16 +298,8 @@ class RestricoesVazaoHQTool(DECOMPTool):
             return get_cached_dadger(self.deck_path)
         except ImportError:
             # Fallback: tentar leitura direta
-            import os
-
-            for ext in range(10):
-                candidate = os.path.join(self.deck_path, f"dadger.rv{ext}")
-                if os.path.exists(candidate):
-                    return Dadger.read(candidate)
-            candidate = os.path.join(self.deck_path, "dadger.rvx")
-            if os.path.exists(candidate):
-                return Dadger.read(candidate)
-            return None
+            candidate = find_dadger_file(self.deck_path)
+            return Dadger.read(candidate) if candidate else None
 
     # 1) Resolver nome de UHE -> codigo_usina via UH
     # Usa EXATAMENTE o mesmo mecanismo da UHUsinasHidrelétricasTool
@@ -411,10 +405,9 @@ class RestricoesVazaoHQTool(DECOMPTool):
         
         # 2.1: Tentar hidr.dat do próprio deck DECOMP (preferencial)
         if self.deck_path:
-            hidr_paths_to_try.extend([
-                os.path.join(self.deck_path, "hidr.dat"),
-                os.path.join(self.deck_path, "HIDR.DAT"),
-            ])
+            hidr_paths_to_try.append(
+                find_deck_member(self.deck_path, "hidr.dat") or os.path.join(self.deck_path, "hidr.dat")
+            )
         
         # 2.2: Construir caminhos para data/newave/decks
         from backend.core.config import DATA_DIR
@@ -428,10 +421,9 @@ class RestricoesVazaoHQTool(DECOMPTool):
                 
                 for deck_dir in deck_dirs[:3]:
                     deck_full_path = newave_decks_dir / deck_dir
-                    hidr_paths_to_try.extend([
-                        str(deck_full_path / "HIDR.DAT"),
-                        str(deck_full_path / "hidr.dat"),
-                    ])
+                    hidr_paths_to_try.append(
+                        find_deck_member(str(deck_full_path), "HIDR.DAT") or str(deck_full_path / "HIDR.DAT")
+                    )
             except Exception as e:
                 safe_print(f"[HQ] [AVISO] Erro ao listar decks NEWAVE: {e}")
         
@@ -441,72 +433,24 @@ class RestricoesVazaoHQTool(DECOMPTool):
                 continue
             
             try:
-                from inewave.newave import Hidr
+                from backend.core.utils.hidr_reader import get_hidr_cadastro
                 safe_print(f"[HQ] [OK] Lendo hidr.dat: {hidr_path}")
-                hidr = Hidr.read(hidr_path)
+                # Leitor memory-mapped compartilhado com o NEWAVE (índice código -> nome pronto)
+                cache_completo = get_hidr_cadastro(hidr_path).codigo_para_nome()
                 
-                if hidr.cadastro is not None and not hidr.cadastro.empty:
-                    cache_completo = {}
-                    for idx, hidr_row in hidr.cadastro.iterrows():
-                        codigo_hidr = None
-                        nome_hidr = None
-                        
-                        try:
-                            if isinstance(idx, (int, float)) and idx > 0:
-                                codigo_hidr = int(idx)
-                        except (ValueError, TypeError):
-                            pass
-                        
-                        if codigo_hidr is None:
-                            for cod_col in ['codigo_usina', 'codigo', 'codigo_usina_hidr', 'numero_usina', 'numero']:
-                                if cod_col in hidr_row.index:
-                                    try:
-                                        val = hidr_row[cod_col]
-                                        if pd.notna(val):
-                                            codigo_hidr = int(val)
-                                            break
-                                    except (ValueError, TypeError):
-                                        continue
-                        
-                        for nome_col in ['nome_usina', 'nome', 'nome_da_usina', 'usina', 'nome_do_posto']:
-                            if nome_col in hidr_row.index:
-                                val = hidr_row[nome_col]
-                                if pd.notna(val):
-                                    nome_hidr = str(val).strip()
-                                    if nome_hidr and nome_hidr != 'nan' and nome_hidr != '' and nome_hidr.lower() != 'none':
-                                        break
-                        
-                        if codigo_hidr and codigo_hidr > 0 and nome_hidr:
-                            cache_completo[codigo_hidr] = nome_hidr
+                if len(cache_completo) > 0:
+                    # Salvar no cache global
+                    _HIDR_MAPPING_CACHE = cache_completo
+                    _HIDR_CACHE_DECK_PATH = hidr_path
                     
-                    if len(cache_completo) == 0:
-                        # Fallback: usar índice
-                        for idx in hidr.cadastro.index:
-                            try:
-                                codigo_hidr = int(idx) if isinstance(idx, (int, float)) else None
-                                if codigo_hidr and codigo_hidr > 0:
-                                    row = hidr.cadastro.loc[idx]
-                                    for col in hidr.cadastro.columns:
-                                        val = row[col]
-                                        if pd.notna(val) and isinstance(val, str) and len(val.strip()) > 2:
-                                            nome_hidr = val.strip()
-                                            if nome_hidr.lower() not in ['nan', 'none', '']:
-                                                cache_completo[codigo_hidr] = nome_hidr
-                                                break
-                            except Exception:
-                                continue
+                    # Filtrar apenas os códigos necessários para retornar
+                    mapeamento = {
+                        codigo: cache_completo.get(codigo, f"Usina {codigo}")
+                        for codigo in codigos_usinas
+                    }
                     
-                    if len(cache_completo) > 0:
-                        _HIDR_MAPPING_CACHE = cache_completo
-                        _HIDR_CACHE_DECK_PATH = hidr_path
-                        
-                        mapeamento = {
-                            codigo: cache_completo.get(codigo, f"Usina {codigo}")
-                            for codigo in codigos_usinas
-                        }
-                        
-                        safe_print(f"[HQ] ✅ Cache criado com {len(cache_completo)} usinas de {hidr_path}")
-                        break
+                    safe_print(f"[HQ] ✅ Cache criado com {len(cache_completo)} usinas de {hidr_path}")
+                    break
                         
             except Exception as e:
                 safe_print(f"[HQ] [AVISO] Erro ao ler hidr.dat {hidr_path}: {e}")
@@ -84,6 +84,11 @@ DECOMP_QUERY_EXPANSIONS = {
 }
 
 
+# Nomes dos registries de tools (uma matriz de embeddings pré-computada por registry)
+REGISTRY_SINGLE = "decomp-single"
+REGISTRY_MULTI = "decomp-multi"
+
+
 def preload_tool_embeddings(tools: list[DECOMPTool]) -> None:
     """
     Pré-carrega os embeddings de todas as tools no cache.
@@ -101,7 +106,8 @@ def expand_query(query: str) -> str:
 def find_best_tool_semantic(
     query: str, 
     tools: list[DECOMPTool], 
-    threshold: float = 0.7
+    threshold: float = 0.7,
+    registry_name: Optional[str] = None
 ) -> Optional[Tuple[DECOMPTool, float]]:
     """
     Encontra a tool mais relevante usando matching semântico.
@@ -110,6 +116,7 @@ def find_best_tool_semantic(
         query: Query do usuário
         tools: Lista de tools disponíveis
         threshold: Threshold mínimo de similaridade (0.0 a 1.0)
+        registry_name: Registry das tools (REGISTRY_*), chave da matriz de embeddings
         
     Returns:
         Tupla (tool, score) se encontrada tool acima do threshold, ou None
@@ -122,7 +129,8 @@ def find_best_tool_semantic(
         expansions=DECOMP_QUERY_EXPANSIONS,
         semantic_match_min_score=SEMANTIC_MATCH_MIN_SCORE,
         threshold=threshold,
-        can_handle_filter=False  # Desabilitado para permitir matching semântico de todas as tools
+        can_handle_filter=False,  # Desabilitado para permitir matching semântico de todas as tools
+        registry_name=registry_name
     )
 
 
@@ -130,7 +138,8 @@ def find_top_tools_semantic(
     query: str,
     tools: list[DECOMPTool],
     top_n: int = 3,
-    threshold: float = 0.55
+    threshold: float = 0.55,
+    registry_name: Optional[str] = None
 ) -> list[Tuple[DECOMPTool, float]]:
     """
     Encontra as top N tools mais relevantes usando matching semântico.
@@ -140,6 +149,7 @@ def find_top_tools_semantic(
         tools: Lista de tools disponíveis
         top_n: Número máximo de tools a retornar (padrão: 3)
         threshold: Threshold mínimo de similaridade para ranking
+        registry_name: Registry das tools (REGISTRY_*), chave da matriz de embeddings
         
     Returns:
         Lista de tuplas (tool, score) ordenadas por score decrescente
@@ -151,5 +161,6 @@ def find_top_tools_semantic(
         query_expansion_enabled=QUERY_EXPANSION_ENABLED,
         expansions=DECOMP_QUERY_EXPANSIONS,
         top_n=top_n,
-        threshold=threshold
+        threshold=threshold,
+        registry_name=registry_name
     )
@@ -4,7 +4,8 @@ Acessa dados de volume inicial, REE, evaporação e operação das usinas hidrel
 """
 from backend.decomp.tools.base import DECOMPTool
 from backend.decomp.config import safe_print
-from idecomp.decomp import Dadger
+from backend.core.utils.zip_deck import find_deck_member
+from backend.decomp.decompclass import Dadger
 import os
 import pandas as pd
 import re
@@ -336,10 +337,9 @@ class UHUsinasHidrelétricasTool(DECOMPTool):
         
         # 2.1: Tentar hidr.dat do próprio deck DECOMP (preferencial)
         if self.deck_path:
-            hidr_paths_to_try.extend([
-                os.path.join(self.deck_path, "hidr.dat"),
-                os.path.join(self.deck_path, "HIDR.DAT"),
-            ])
+            hidr_paths_to_try.append(
+                find_deck_member(self.deck_path, "hidr.dat") or os.path.join(self.deck_path, "hidr.dat")
+            )
         
         # 2.2: Construir caminhos para data/newave/decks
         from backend.core.config import DATA_DIR
@@ -354,10 +354,9 @@ class UHUsinasHidrelétricasTool(DECOMPTool):
                 
                 for deck_dir in deck_dirs[:3]:  # Apenas os 3 mais recentes
                     deck_full_path = newave_decks_dir / deck_dir
-                    hidr_paths_to_try.extend([
-                        str(deck_full_path / "HIDR.DAT"),
-                        str(deck_full_path / "hidr.dat"),
-                    ])
+                    hidr_paths_to_try.append(
+                        find_deck_member(str(deck_full_path), "HIDR.DAT") or str(deck_full_path / "HIDR.DAT")
+                    )
             except Exception as e:
                 safe_print(f"[UH TOOL] [AVISO] Erro ao listar decks NEWAVE: {e}")
         
@@ -367,99 +366,25 @@ class UHUsinasHidrelétricasTool(DECOMPTool):
                 continue
             
             try:
-                from inewave.newave import Hidr
+                from backend.core.utils.hidr_reader import get_hidr_cadastro
                 safe_print(f"[UH TOOL] [OK] Lendo hidr.dat: {hidr_path}")
-                hidr = Hidr.read(hidr_path)
+                # Leitor memory-mapped compartilhado com o NEWAVE (índice código -> nome pronto)
+                cache_completo = get_hidr_cadastro(hidr_path).codigo_para_nome()
                 
-                if hidr.cadastro is not None and not hidr.cadastro.empty:
-                    safe_print(f"[UH TOOL] [DEBUG] Colunas disponíveis: {list(hidr.cadastro.columns)[:10]}...")
-                    safe_print(f"[UH TOOL] [DEBUG] Total de linhas no cadastro: {len(hidr.cadastro)}")
-                    
-                    # Carregar TODOS os códigos do hidr.dat no cache global
-                    cache_completo = {}
-                    for idx, hidr_row in hidr.cadastro.iterrows():
-                        codigo_hidr = None
-                        nome_hidr = None
-                        
-                        # Tentar usar o índice como código (comum no HIDR.DAT)
-                        try:
-                            if isinstance(idx, (int, float)) and idx > 0:
-                                codigo_hidr = int(idx)
-                        except (ValueError, TypeError):
-                            pass
-                        
-                        # Tentar diferentes nomes de coluna para código
-                        if codigo_hidr is None:
-                            for cod_col in ['codigo_usina', 'codigo', 'codigo_usina_hidr', 'numero_usina', 'numero']:
-                                if cod_col in hidr_row.index:
-                                    try:
-                                        val = hidr_row[cod_col]
-                                        if pd.notna(val):
-                                            codigo_hidr = int(val)
-                                            break
-                                    except (ValueError, TypeError):
-                                        continue
-                        
-                        # Tentar diferentes nomes de coluna para nome
-                        for nome_col in ['nome_usina', 'nome', 'nome_da_usina', 'usina', 'nome_do_posto']:
-                            if nome_col in hidr_row.index:
-                                val = hidr_row[nome_col]
-                                if pd.notna(val):
-                                    nome_hidr = str(val).strip()
-                                    if nome_hidr and nome_hidr != 'nan' and nome_hidr != '' and nome_hidr.lower() != 'none':
-                                        break
-                        
-                        if codigo_hidr and codigo_hidr > 0 and nome_hidr:
-                            cache_completo[codigo_hidr] = nome_hidr
+                if len(cache_completo) > 0:
+                    # Salvar no cache global
+                    _HIDR_MAPPING_CACHE = cache_completo
+                    _HIDR_CACHE_DECK_PATH = hidr_path
                     
-                    safe_print(f"[UH TOOL] [DEBUG] Usinas extraídas do hidr.dat: {len(cache_completo)}")
+                    # Filtrar apenas os códigos necessários para retornar
+                    mapeamento = {
+                        codigo: cache_completo.get(codigo, f"Usina {codigo}")
+                        for codigo in codigos_usinas
+                    }
                     
-                    if len(cache_completo) > 0:
-                        # Mostrar alguns exemplos
-                        exemplos = list(cache_completo.items())[:5]
-                        safe_print(f"[UH TOOL] [DEBUG] Exemplos: {exemplos}")
-                        
-                        # Salvar no cache global
-                        _HIDR_MAPPING_CACHE = cache_completo
-                        _HIDR_CACHE_DECK_PATH = hidr_path
-                        
-                        # Filtrar apenas os códigos necessários para retornar
-                        mapeamento = {
-                            codigo: cache_completo.get(codigo, f"Usina {codigo}")
-                            for codigo in codigos_usinas
-                        }
-                        
-                        safe_print(f"[UH TOOL] ✅ Cache criado com {len(cache_completo)} usinas de {hidr_path}")
-                        break
-                    else:
-                        # Se não encontrou nenhuma usina, tentar usar o índice como código
-                        safe_print(f"[UH TOOL] [AVISO] Nenhuma usina encontrada com nomes válidos, tentando usar índice...")
-                        for idx in hidr.cadastro.index:
-                            try:
-                                codigo_hidr = int(idx) if isinstance(idx, (int, float)) else None
-                                if codigo_hidr and codigo_hidr > 0:
-                                    # Tentar encontrar nome em qualquer coluna de texto
-                                    row = hidr.cadastro.loc[idx]
-                                    for col in hidr.cadastro.columns:
-                                        val = row[col]
-                                        if pd.notna(val) and isinstance(val, str) and len(val.strip()) > 2:
-                                            nome_hidr = val.strip()
-                                            if nome_hidr.lower() not in ['nan', 'none', '']:
-                                                cache_completo[codigo_hidr] = nome_hidr
-                                                break
-                            except Exception:
-                                continue
+                    safe_print(f"[UH TOOL] ✅ Cache criado com {len(cache_completo)} usinas de {hidr_path}")
+                    break
                         
-                        if len(cache_completo) > 0:
-                            safe_print(f"[UH TOOL] [DEBUG] Usinas encontradas usando índice: {len(cache_completo)}")
-                            _HIDR_MAPPING_CACHE = cache_completo
-                            _HIDR_CACHE_DECK_PATH = hidr_path
-                            mapeamento = {
-                                codigo: cache_completo.get(codigo, f"Usina {codigo}")
-                                for codigo in codigos_usinas
-                            }
-                            break
-                            
             except Exception as e:
                 safe_print(f"[UH TOOL] [AVISO] Erro ao ler hidr.dat {hidr_path}: {e}")
                 continue
@@ -0,0 +1,150 @@
+"""
+Benchmark do carregamento de múltiplos dadgers: threads x pool de processos.
+
+Compara, com o cache vazio (cold), o caminho antigo das tools multi-deck
+(get_cached_dadger em um ThreadPoolExecutor com cpu_count()*2 workers) com
+get_cached_dadgers(), que faz o parse no pool de processos. O pool é medido
+duas vezes: na primeira chamada (inclui subir os processos; executado com -m,
+cada processo reimporta este módulo e o pacote backend.decomp) e já aquecido,
+que é o caso do servidor depois da primeira consulta multi-deck.
+
+Sem decks reais disponíveis, --sinteticos N gera N dadgers sintéticos com a
+mesma mistura de registros de um deck semanal (UH, CT, HQ/LQ/CQ, RE/LU/FU, ...).
+
+Uso:
+    python -m backend.decomp.utils.benchmark_dadger_parsing
+    python -m backend.decomp.utils.benchmark_dadger_parsing --decks-dir data/decomp/decks
+    python -m backend.decomp.utils.benchmark_dadger_parsing --sinteticos 20
+
+    Número de processos do pool: variável de ambiente PARSE_POOL_PROCESSES.
+    Com DECOMP_DADGER_LAZY=true o caminho em threads só classifica as linhas
+    (o parse fica para o primeiro acesso): deixe desativado (padrão) para
+    comparar o parse completo.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+# Adicionar caminho do projeto ao sys.path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from cfinterface.components.floatfield import FloatField
+from cfinterface.components.integerfield import IntegerField
+from idecomp.decomp.modelos import dadger as registros
+
+from backend.core.parse_pool import shutdown_parse_pool
+from backend.decomp.config import DECOMP_DECKS_DIR, PARSE_POOL_PROCESSES
+from backend.decomp.utils.dadger_cache import clear_dadger_cache, get_cached_dadger, get_cached_dadgers
+from backend.decomp.utils.deck_loader import find_dadger_file
+
+# Quantidade de registros de cada tipo em um dadger sintético (ordem de grandeza de um deck semanal)
+_REGISTROS_SINTETICOS = {
+    "TE": 1, "SB": 5, "UH": 170, "CT": 1500, "DP": 150, "HQ": 300, "LQ": 1500,
+    "CQ": 1500, "HV": 100, "LV": 500, "CV": 500, "RE": 400, "LU": 2000,
+    "FU": 1000, "FT": 800, "FI": 200, "VI": 170, "IA": 200, "PQ": 800,
+}
+
+
+def _linha_sintetica(registro: type, indice: int, rng: random.Random) -> str:
+    valores = []
+    for campo in registro.LINE.fields:
+        if isinstance(campo, IntegerField):
+            valores.append(rng.randint(1, min(10 ** campo.size - 1, 999)))
+        elif isinstance(campo, FloatField):
+            valores.append(round(rng.uniform(0, 10 ** (campo.size - 4)), 2))
+        else:
+            valores.append(f"U{indice}"[:campo.size])
+    linha = registro.LINE.write(valores)
+    return registro.IDENTIFIER + linha[len(registro.IDENTIFIER):]
+
+
+def gerar_decks_sinteticos(destino: Path, quantidade: int) -> Dict[str, str]:
+    """Gera `quantidade` decks com um dadger.rv0 sintético cada."""
+    deck_paths = {}
+    for i in range(quantidade):
+        rng = random.Random(i)
+        deck_dir = destino / f"DC2025{(i // 5) + 1:02d}-sem{(i % 5) + 1}"
+        deck_dir.mkdir(parents=True, exist_ok=True)
+        linhas = [
+            _linha_sintetica(getattr(registros, nome), j, rng)
+            for nome, quantidade_registros in _REGISTROS_SINTETICOS.items()
+            for j in range(quantidade_registros)
+        ]
+        (deck_dir / "dadger.rv0").write_text("".join(linhas))
+        deck_paths[deck_dir.name] = str(deck_dir)
+    return deck_paths
+
+
+def listar_decks_extraidos(decks_dir: Path) -> Dict[str, str]:
+    """Decks já extraídos (diretórios com dadger.rv*) dentro de decks_dir."""
+    return {
+        d.name: str(d)
+        for d in sorted(decks_dir.iterdir())
+        if d.is_dir() and find_dadger_file(str(d))
+    }
+
+
+def _medir_threads(deck_paths: Dict[str, str]) -> float:
+    """Caminho antigo: get_cached_dadger em threads (cpu_count()*2 workers)."""
+    clear_dadger_cache()
+    max_workers = min(len(deck_paths), max(multiprocessing.cpu_count() * 2, 8))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(get_cached_dadger, deck_paths.values()))
+    return time.perf_counter() - start
+
+
+def _medir_processos(deck_paths: Dict[str, str]) -> float:
+    """Caminho novo: get_cached_dadgers (parse no pool de processos)."""
+    clear_dadger_cache()
+    start = time.perf_counter()
+    get_cached_dadgers(deck_paths)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parse de dadgers: threads x processos")
+    parser.add_argument("--decks-dir", type=Path, default=DECOMP_DECKS_DIR,
+                        help="Diretório com decks DECOMP já extraídos")
+    parser.add_argument("--sinteticos", type=int, default=0,
+                        help="Gerar N decks sintéticos em vez de usar --decks-dir")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.sinteticos > 0:
+            deck_paths = gerar_decks_sinteticos(Path(tmp), args.sinteticos)
+        else:
+            deck_paths = listar_decks_extraidos(args.decks_dir)
+        if not deck_paths:
+            print(f"Nenhum deck com dadger.rv* em {args.decks_dir} (use --sinteticos N)")
+            return
+
+        tamanho_total = sum(os.path.getsize(find_dadger_file(p)) for p in deck_paths.values())
+        print(f"Decks: {len(deck_paths)} ({tamanho_total / 1024 / 1024:.1f} MB de dadgers)")
+        print(f"CPUs: {multiprocessing.cpu_count()} | PARSE_POOL_PROCESSES: {PARSE_POOL_PROCESSES}")
+
+        resultados = {
+            "threads": _medir_threads(deck_paths),
+            "processos (pool frio)": _medir_processos(deck_paths),
+            "processos (pool aquecido)": _medir_processos(deck_paths),
+        }
+        shutdown_parse_pool()
+        clear_dadger_cache()
+
+    base = resultados["threads"]
+    print("\n" + "=" * 50)
+    for nome, segundos in resultados.items():
+        print(f"{nome:<28} {segundos:8.2f}s  ({base / segundos:4.1f}x)")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
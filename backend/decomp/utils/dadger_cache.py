@@ -2,90 +2,191 @@
 ⚡ Cache global para objetos Dadger do DECOMP.
 
 O Dadger.read() é uma operação muito lenta (faz parse do arquivo inteiro).
-Este módulo implementa um cache LRU para evitar leituras repetidas.
+Este módulo implementa um cache LRU para evitar leituras repetidas, limitado
+pela memória estimada dos objetos (DECOMP_DADGER_CACHE_MAX_MB, ver
+utils/file_cache.py) e não por uma quantidade fixa de decks.
+
+Para vários decks de uma vez (tools multi-deck), get_cached_dadgers() faz o
+parse dos dadgers que faltam em um pool de processos (ver core/parse_pool.py),
+contornando o GIL, e guarda os objetos neste mesmo cache.
+
+Com DECOMP_DADGER_LAZY, o Dadger de um único deck é lido sob demanda
+(Dadger.read_lazy): carregar um deck novo só classifica as linhas, e cada
+tipo de registro é parseado no primeiro acesso. Cada tipo parseado (e cada
+índice ou DataFrame memoizado) reestima o tamanho da entrada no cache
+(MemoryBudgetCache.resize). Vários decks de uma vez continuam indo para o
+pool de processos, com o parse completo.
+
+Depois do primeiro parse, o Dadger é gravado em um snapshot em disco
+(utils/parsed_snapshot.py) e, após um reinício, é carregado dele.
 
 Uso:
-    from backend.decomp.utils.dadger_cache import get_cached_dadger
-    
+    from backend.decomp.utils.dadger_cache import get_cached_dadger, get_cached_dadgers
+
     dadger = get_cached_dadger(deck_path)
+    dadgers = get_cached_dadgers({"DC202501-sem1": deck_path_1, "DC202501-sem2": deck_path_2})
 """
-from functools import lru_cache
-from typing import Optional
-from idecomp.decomp import Dadger
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from backend.decomp.decompclass import Dadger
 from backend.decomp.utils.deck_loader import find_dadger_file
-from backend.decomp.config import safe_print
-import time
+from backend.decomp.utils.file_cache import MemoryBudgetCache
+from backend.decomp.utils.parsed_snapshot import file_digest, load_snapshot, load_with_snapshot, save_snapshot_async
+from backend.core.parse_pool import is_parse_pool_enabled, parse_files_in_processes
+from backend.decomp.config import DECOMP_DADGER_CACHE_MAX_MB, DECOMP_DADGER_LAZY, safe_print
+
+# Cache limitado pelo tamanho estimado dos Dadgers (DECOMP_DADGER_CACHE_MAX_MB),
+# não pela quantidade de decks: um deck mensal grande ocupa várias vezes um semanal.
+# A chave é o hash do conteúdo: semanas com o mesmo dadger compartilham uma entrada
+_cache = MemoryBudgetCache("DADGER", max_bytes=DECOMP_DADGER_CACHE_MAX_MB * 1024 * 1024, key_by_content=True)
 
-# Cache com até 55 decks em memória (~3-5GB RAM)
-# Ajuste conforme a quantidade de decks que você usa
-_CACHE_SIZE = 55
+# Dadgers lidos no pool de processos (contados também em misses)
+_process_loads = 0
+_process_loads_lock = threading.Lock()
 
 
-@lru_cache(maxsize=_CACHE_SIZE)
 def _load_dadger(dadger_path: str) -> Dadger:
     """
     Carrega o Dadger com cache LRU.
-    
+
     ⚠️ INTERNO: Use get_cached_dadger() em vez disso.
-    
+
     Args:
         dadger_path: Caminho completo do arquivo dadger.rv*
-        
+
     Returns:
         Objeto Dadger carregado
     """
-    start = time.time()
-    dadger = Dadger.read(dadger_path)
-    elapsed = time.time() - start
-    safe_print(f"[DADGER CACHE] ⚡ Carregado {dadger_path} em {elapsed:.2f}s (novo)")
-    return dadger
+    reader = Dadger.read_lazy if DECOMP_DADGER_LAZY else Dadger.read
+    return _cache.get_or_load(dadger_path, lambda path: load_with_snapshot(path, Dadger, reader))
 
 
 def get_cached_dadger(deck_path: str) -> Optional[Dadger]:
     """
     Retorna objeto Dadger do cache ou carrega se não existir.
-    
+
     Esta função deve ser usada por todas as tools em vez de Dadger.read() direto.
-    
+
     Args:
         deck_path: Caminho do diretório do deck DECOMP
-        
+
     Returns:
         Objeto Dadger ou None se não encontrar o arquivo
     """
     dadger_path = find_dadger_file(deck_path)
-    
+
     if not dadger_path:
         safe_print(f"[DADGER CACHE] ❌ Arquivo dadger não encontrado em {deck_path}")
         return None
-    
-    # Verificar se já está em cache
-    cache_info = _load_dadger.cache_info()
-    
-    # Carregar (do cache ou novo)
-    dadger = _load_dadger(dadger_path)
-    
-    # Log se veio do cache
-    new_cache_info = _load_dadger.cache_info()
-    if new_cache_info.hits > cache_info.hits:
-        safe_print(f"[DADGER CACHE] ✅ Hit! {dadger_path} (cache)")
-    
-    return dadger
+
+    return _load_dadger(dadger_path)
+
+
+def _count_process_loads(n: int) -> None:
+    global _process_loads
+    with _process_loads_lock:
+        _process_loads += n
+
+
+def get_cached_dadgers(deck_paths: Dict[str, str], max_workers: int = 8) -> Dict[str, Dadger]:
+    """
+    Carrega os dadgers de vários decks, usando o cache e paralelizando os misses.
+
+    Dadgers que não estão no cache são lidos no pool de processos
+    (PARSE_POOL_PROCESSES > 1) quando há mais de um a ler; caso contrário,
+    ou se o pool falhar para algum arquivo, são lidos em threads como antes.
+
+    Args:
+        deck_paths: Dict {nome_do_deck: caminho_do_deck}
+        max_workers: Número de threads do caminho sem pool de processos
+
+    Returns:
+        Dict {nome_do_deck: Dadger} apenas com os decks carregados com sucesso
+    """
+    dadger_paths: Dict[str, str] = {}
+    for deck_name, deck_path in deck_paths.items():
+        dadger_path = find_dadger_file(deck_path)
+        if dadger_path:
+            dadger_paths[deck_name] = dadger_path
+        else:
+            safe_print(f"[DADGER CACHE] ❌ Arquivo dadger não encontrado em {deck_path}")
+
+    # Arquivos que ainda não estão no cache (ou mudaram no disco): chave -> (caminho, versão)
+    missing: Dict[str, Tuple[str, int]] = {}
+    for dadger_path in dadger_paths.values():
+        try:
+            key = _cache.make_key(dadger_path)
+            version = _cache.version(dadger_path)
+        except OSError:
+            continue
+        if key not in missing and not _cache.contains(key, version):
+            missing[key] = (dadger_path, version)
+
+    parsed: Dict[str, Dadger] = {}
+    # Também com a leitura sob demanda: as tools multi-deck acessam os mesmos tipos
+    # em todos os decks, e o parse deles em threads seria serializado pelo GIL
+    if len(missing) > 1 and is_parse_pool_enabled():
+        # Snapshots em disco primeiro; só o restante vai para o pool
+        to_parse: Dict[str, str] = {}
+        for key, (dadger_path, version) in missing.items():
+            digest = file_digest(dadger_path)
+            dadger = load_snapshot(dadger_path, Dadger, digest)
+            if dadger is not None:
+                parsed[key] = dadger
+                _cache.put(key, version, dadger, path=dadger_path)
+            else:
+                to_parse[dadger_path] = key
+        if len(to_parse) > 1:
+            safe_print(f"[DADGER CACHE] ⚡ {len(to_parse)} dadgers fora do cache: parse em processos")
+            from_pool = parse_files_in_processes(Dadger, list(to_parse))
+            for dadger_path, dadger in from_pool.items():
+                key = to_parse[dadger_path]
+                save_snapshot_async(dadger_path, Dadger, file_digest(dadger_path), dadger)
+                _cache.put(key, missing[key][1], dadger, path=dadger_path)
+                parsed[key] = dadger
+            _count_process_loads(len(from_pool))
+
+    def load(item: Tuple[str, str]) -> Tuple[str, Optional[Dadger]]:
+        deck_name, dadger_path = item
+        try:
+            dadger = parsed.get(_cache.make_key(dadger_path))
+        except OSError:
+            dadger = None
+        if dadger is not None:
+            return deck_name, dadger
+        try:
+            return deck_name, _load_dadger(dadger_path)
+        except Exception as e:
+            safe_print(f"[DADGER CACHE] ⚠️ Erro ao carregar dadger de {deck_name}: {e}")
+            return deck_name, None
+
+    # Hits do cache e o que o pool não leu (pool desativado, um único miss ou falha)
+    workers = max(1, min(max_workers, len(dadger_paths)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        loaded = list(executor.map(load, dadger_paths.items()))
+
+    return {deck_name: dadger for deck_name, dadger in loaded if dadger is not None}
 
 
 def clear_dadger_cache():
     """Limpa o cache do Dadger (útil para testes ou reload forçado)."""
-    _load_dadger.cache_clear()
+    _cache.clear()
     safe_print("[DADGER CACHE] 🗑️ Cache limpo")
 
 
+def evict_dadger(dadger_path: str) -> bool:
+    """Remove um dadger do cache (caminho do arquivo, como em get_cache_entries())."""
+    return _cache.evict(dadger_path)
+
+
+def get_cache_entries() -> list:
+    """Entradas do cache (caminho, bytes estimados, hits), da mais recente para a mais antiga."""
+    return _cache.entries()
+
+
 def get_cache_stats() -> dict:
-    """Retorna estatísticas do cache."""
-    info = _load_dadger.cache_info()
-    return {
-        "hits": info.hits,
-        "misses": info.misses,
-        "maxsize": info.maxsize,
-        "currsize": info.currsize,
-        "hit_rate": info.hits / (info.hits + info.misses) if (info.hits + info.misses) > 0 else 0
-    }
+    """Retorna estatísticas do cache (bytes estimados, entradas, evicções, hit rate)."""
+    with _process_loads_lock:
+        process_loads = _process_loads
+    return {**_cache.get_stats(), "process_loads": process_loads}
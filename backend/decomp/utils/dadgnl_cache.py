@@ -2,26 +2,28 @@
 ⚡ Cache global para objetos Dadgnl do DECOMP.
 
 O RegisterFile.read() é uma operação muito lenta (faz parse do arquivo inteiro).
-Este módulo implementa um cache LRU para evitar leituras repetidas.
+Este módulo implementa um cache LRU para evitar leituras repetidas, limitado
+pela memória estimada dos objetos (DECOMP_DADGNL_CACHE_MAX_MB, ver
+utils/file_cache.py). Após um reinício, os Dadgnl já lidos são carregados do
+snapshot em disco (utils/parsed_snapshot.py).
 
 Uso:
     from backend.decomp.utils.dadgnl_cache import get_cached_dadgnl
     
     dadgnl = get_cached_dadgnl(deck_path)
 """
-from functools import lru_cache
 from typing import Optional
 from backend.decomp.utils.deck_loader import find_dadgnl_file
-from backend.decomp.config import safe_print
+from backend.decomp.utils.file_cache import MemoryBudgetCache
+from backend.decomp.utils.parsed_snapshot import load_with_snapshot
+from backend.decomp.config import DECOMP_DADGNL_CACHE_MAX_MB, safe_print
 from backend.decomp.utils.dadgnl import Dadgnl
-import time
 
-# Cache com até 55 decks em memória (~3-5GB RAM)
-# Ajuste conforme a quantidade de decks que você usa
-_CACHE_SIZE = 55
+# Cache limitado pelo tamanho estimado dos Dadgnls (DECOMP_DADGNL_CACHE_MAX_MB)
+# e chaveado pelo conteúdo: o mesmo dadgnl em vários decks é lido uma vez
+_cache = MemoryBudgetCache("DADGNL", max_bytes=DECOMP_DADGNL_CACHE_MAX_MB * 1024 * 1024, key_by_content=True)
 
 
-@lru_cache(maxsize=_CACHE_SIZE)
 def _load_dadgnl(dadgnl_path: str) -> Dadgnl:
     """
     Carrega o Dadgnl com cache LRU.
@@ -34,12 +36,8 @@ def _load_dadgnl(dadgnl_path: str) -> Dadgnl:
     Returns:
         Objeto Dadgnl carregado com registros GL
     """
-    start = time.time()
-    # Criar Dadgnl (que herda de RegisterFile e especifica GL nos REGISTERS)
-    dadgnl = Dadgnl.read(dadgnl_path)
-    elapsed = time.time() - start
-    safe_print(f"[DADGNL CACHE] ⚡ Carregado {dadgnl_path} em {elapsed:.2f}s (novo)")
-    return dadgnl
+    # Dadgnl herda de RegisterFile e especifica GL nos REGISTERS
+    return _cache.get_or_load(dadgnl_path, lambda path: load_with_snapshot(path, Dadgnl, Dadgnl.read))
 
 
 def get_cached_dadgnl(deck_path: str) -> Optional[Dadgnl]:
@@ -60,33 +58,25 @@ def get_cached_dadgnl(deck_path: str) -> Optional[Dadgnl]:
         safe_print(f"[DADGNL CACHE] ❌ Arquivo dadgnl não encontrado em {deck_path}")
         return None
     
-    # Verificar se já está em cache
-    cache_info = _load_dadgnl.cache_info()
-    
-    # Carregar (do cache ou novo)
-    dadgnl = _load_dadgnl(dadgnl_path)
-    
-    # Log se veio do cache
-    new_cache_info = _load_dadgnl.cache_info()
-    if new_cache_info.hits > cache_info.hits:
-        safe_print(f"[DADGNL CACHE] ✅ Hit! {dadgnl_path} (cache)")
-    
-    return dadgnl
+    return _load_dadgnl(dadgnl_path)
 
 
 def clear_dadgnl_cache():
     """Limpa o cache do Dadgnl (útil para testes ou reload forçado)."""
-    _load_dadgnl.cache_clear()
+    _cache.clear()
     safe_print("[DADGNL CACHE] 🗑️ Cache limpo")
 
 
+def evict_dadgnl(dadgnl_path: str) -> bool:
+    """Remove um dadgnl do cache (caminho do arquivo, como em get_cache_entries())."""
+    return _cache.evict(dadgnl_path)
+
+
+def get_cache_entries() -> list:
+    """Entradas do cache (caminho, bytes estimados, hits), da mais recente para a mais antiga."""
+    return _cache.entries()
+
+
 def get_cache_stats() -> dict:
-    """Retorna estatísticas do cache."""
-    info = _load_dadgnl.cache_info()
-    return {
-        "hits": info.hits,
-        "misses": info.misses,
-        "maxsize": info.maxsize,
-        "currsize": info.currsize,
-        "hit_rate": info.hits / (info.hits + info.misses) if (info.hits + info.misses) > 0 else 0
-    }
+    """Retorna estatísticas do cache (bytes estimados, entradas, evicções, hit rate)."""
+    return _cache.get_stats()
@@ -2,13 +2,15 @@
 Utilitário para carregar e extrair decks DECOMP da pasta decks/.
 Suporta descoberta dinâmica de N decks.
 """
-import zipfile
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, TypedDict
+from typing import Any, List, Dict, Optional, Tuple, TypedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from backend.decomp.config import DECOMP_DECKS_DIR, DECOMP_DATA_DIR
 from backend.core.config import ROOT_DIR
+from backend.core.deck_ingestion import DeckIngestor
+from backend.core.utils.deck_catalog import DeckCatalog
+from backend.core.utils.zip_deck import ensure_deck_dir, find_deck_member, glob_deck_members
 
 def _find_decks_dir() -> Path:
     """
@@ -158,12 +160,8 @@ def is_decomp_deck(deck_path: Path) -> bool:
         return False
     
     # Verificar se contém qualquer arquivo dadger.rv* (rvx, rv0, rv1, rv2, rv3, rv4, etc.)
-    # Todos os tipos de arquivo DECOMP são equivalentes
-    for file in deck_path.glob("dadger.rv*"):
-        if file.is_file():
-            return True
-    
-    return False
+    # Todos os tipos de arquivo DECOMP são equivalentes (no disco ou no ZIP do deck)
+    return bool(glob_deck_members(str(deck_path), "dadger.rv*"))
 
 
 def find_first_semestre_zip(month_dir: Path) -> Optional[Path]:
@@ -184,7 +182,7 @@ def find_first_semestre_zip(month_dir: Path) -> Optional[Path]:
     return None
 
 
-def list_available_decks() -> List[DeckInfo]:
+def _scan_decks() -> Tuple[List[DeckInfo], List[Path]]:
     """
     Escaneia a pasta decks/ e lista todos os decks DECOMP disponíveis.
     
@@ -192,15 +190,18 @@ def list_available_decks() -> List[DeckInfo]:
     - decks/DC{YYYY}{MM}/DC{YYYY}{MM}-sem{N}.zip (sem1, sem2, sem3, sem4, sem5)
     
     Returns:
-        Lista de DeckInfo ordenada cronologicamente (mais antigo primeiro, depois por semana)
+        (Lista de DeckInfo ordenada cronologicamente, diretórios lidos na varredura)
     """
     decks: List[DeckInfo] = []
+    # Diretórios lidos por _find_decks_dir e pela varredura (invalidação do catálogo)
+    scanned_dirs = [DECOMP_DECKS_DIR, DECOMP_DECKS_DIR / "decks", DECOMP_DATA_DIR]
     
     # Recalcular o diretório dinamicamente para garantir que está correto
     decks_dir = _find_decks_dir()
+    scanned_dirs.append(decks_dir)
     
     if not decks_dir.exists():
-        return decks
+        return decks, scanned_dirs
     
     # Buscar pastas DC{YYYY}{MM}/ dentro de decks/
     for month_dir in decks_dir.iterdir():
@@ -217,9 +218,9 @@ def list_available_decks() -> List[DeckInfo]:
         
         if month_parsed is None:
             continue
+        scanned_dirs.append(month_dir)
         
         # Buscar TODOS os decks semanais dentro da pasta
-        print(f"[DEBUG DECOMP] list_available_decks: Buscando decks semanais em {month_name}")
         for sem_num in range(1, 6):
             zip_file = month_dir / f"{month_name}-sem{sem_num}.zip"
             if zip_file.exists():
@@ -227,7 +228,6 @@ def list_available_decks() -> List[DeckInfo]:
                 parsed = parse_deck_name(deck_name)
                 
                 if parsed is None:
-                    print(f"[DEBUG DECOMP] list_available_decks: Nome de deck inválido: {deck_name}")
                     continue
                 
                 # O caminho extraído deve incluir a semana no nome
@@ -243,7 +243,6 @@ def list_available_decks() -> List[DeckInfo]:
                     "extracted_path": str(extracted_path) if extracted_path.exists() else None
                 }
                 decks.append(deck_info)
-                print(f"[DEBUG DECOMP] list_available_decks: Deck adicionado: {deck_name} de {zip_file}")
         
         # Se não encontrou nenhum ZIP semanal, tentar ZIP direto na pasta (compatibilidade)
         zip_file = month_dir / f"{month_name}.zip"
@@ -320,7 +319,22 @@ def list_available_decks() -> List[DeckInfo]:
     # Ordenar cronologicamente (mais antigo primeiro, depois por semana)
     unique_decks.sort(key=lambda d: (d["year"], d["month"], d.get("week") or 0))
     
-    return unique_decks
+    return unique_decks, scanned_dirs
+
+
+_catalog = DeckCatalog("DECOMP", _scan_decks)
+
+
+def list_available_decks() -> List[DeckInfo]:
+    """
+    Lista todos os decks DECOMP disponíveis (catálogo em memória).
+    
+    A pasta decks/ só é escaneada de novo quando algum diretório muda.
+    
+    Returns:
+        Lista de DeckInfo ordenada cronologicamente (mais antigo primeiro, depois por semana)
+    """
+    return _catalog.list()
 
 
 def get_deck_by_name(deck_name: str) -> Optional[DeckInfo]:
@@ -333,16 +347,15 @@ def get_deck_by_name(deck_name: str) -> Optional[DeckInfo]:
     Returns:
         DeckInfo ou None se não encontrado
     """
-    decks = list_available_decks()
-    for deck in decks:
-        if deck["name"] == deck_name:
-            return deck
-    return None
+    return _catalog.get(deck_name)
 
 
 def load_deck(deck_name: str) -> Path:
     """
-    Extrai e retorna caminho do deck DECOMP.
+    Prepara (ou extrai) e retorna caminho do deck DECOMP.
+
+    Com DECK_ZIP_ON_DEMAND o ZIP não é extraído: o diretório recebe apenas o
+    marcador do ZIP e cada arquivo é extraído na primeira leitura.
     
     Estrutura esperada:
     - decks/DC{YYYY}{MM}/DC{YYYY}{MM}-sem{N}.zip
@@ -353,8 +366,6 @@ def load_deck(deck_name: str) -> Path:
     Returns:
         Path do diretório extraído
     """
-    import shutil
-    
     # Recalcular o diretório dinamicamente
     decks_dir = _find_decks_dir()
     
@@ -409,19 +420,8 @@ def load_deck(deck_name: str) -> Path:
     # O diretório de extração deve incluir a semana no nome para evitar conflitos
     extract_path = decks_dir / f"{deck_name}_extracted"
 
-    # Extrair se ainda não foi extraído
-    if not extract_path.exists():
-        extract_path.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_path)
-        
-        # Se extraiu em uma subpasta, mover arquivos para o nível superior
-        extracted_items = list(extract_path.iterdir())
-        if len(extracted_items) == 1 and extracted_items[0].is_dir():
-            inner_dir = extracted_items[0]
-            for item in inner_dir.iterdir():
-                shutil.move(str(item), str(extract_path / item.name))
-            inner_dir.rmdir()
+    # Preparação única por deck, mesmo com chamadas concorrentes
+    ensure_deck_dir(zip_path, extract_path)
 
     # Verificar se é um deck DECOMP válido
     if not is_decomp_deck(extract_path):
@@ -546,16 +546,12 @@ def find_dadger_file(deck_path: str) -> Optional[str]:
     Returns:
         Caminho completo do arquivo dadger encontrado, ou None se não encontrado
     """
-    from pathlib import Path
-    
-    deck_path_obj = Path(deck_path)
-    if not deck_path_obj.is_dir():
+    if not Path(deck_path).is_dir():
         return None
     
-    # Buscar qualquer arquivo dadger.rv*
-    for file in deck_path_obj.glob("dadger.rv*"):
-        if file.is_file():
-            return str(file)
+    # Buscar qualquer arquivo dadger.rv* (no disco ou no ZIP do deck)
+    for name in glob_deck_members(deck_path, "dadger.rv*"):
+        return find_deck_member(deck_path, name)
     
     return None
 
@@ -571,16 +567,12 @@ def find_dadgnl_file(deck_path: str) -> Optional[str]:
     Returns:
         Caminho completo do arquivo dadgnl encontrado, ou None se não encontrado
     """
-    from pathlib import Path
-    
-    deck_path_obj = Path(deck_path)
-    if not deck_path_obj.is_dir():
+    if not Path(deck_path).is_dir():
         return None
     
-    # Buscar qualquer arquivo dadgnl.rv*
-    for file in deck_path_obj.glob("dadgnl.rv*"):
-        if file.is_file():
-            return str(file)
+    # Buscar qualquer arquivo dadgnl.rv* (no disco ou no ZIP do deck)
+    for name in glob_deck_members(deck_path, "dadgnl.rv*"):
+        return find_deck_member(deck_path, name)
     
     return None
 
@@ -625,4 +617,56 @@ def calculate_week_thursday(year: int, month: int, week: int) -> str:
     # Adicionar (week - 1) semanas para obter a quinta-feira da semana N
     target_thursday = first_thursday + timedelta(weeks=(week - 1))
     
-    return target_thursday.strftime("%Y-%m-%d")
\ No newline at end of file
+    return target_thursday.strftime("%Y-%m-%d")
+
+def ingest_deck(deck_name: str) -> Dict[str, Any]:
+    """
+    Prepara um deck e aquece os caches antes da primeira consulta.
+
+    Usado pela ingestão em segundo plano (deck_ingestor): load_deck já
+    aquece Dadger/Dadgnl; aqui os registros do dadger lido sob demanda são
+    todos parseados, o hidr.dat é lido e os índices de nomes de usinas são
+    montados.
+
+    Args:
+        deck_name: Nome do deck (ex: "DC202501-sem1")
+
+    Returns:
+        Dict com os arquivos aquecidos e ausentes
+    """
+    # Imports locais para evitar dependências cíclicas
+    from backend.core.utils.hidr_reader import get_hidr_cadastro
+    from backend.decomp.utils.dadger_cache import get_cached_dadger
+    from backend.decomp.utils.hydraulic_plant_matcher import get_decomp_hydraulic_plant_matcher
+    from backend.decomp.utils.thermal_plant_matcher import get_decomp_thermal_plant_matcher
+
+    deck_path = str(load_deck(deck_name))
+    result: Dict[str, Any] = {"warmed": [], "missing": []}
+
+    dadger = get_cached_dadger(deck_path)
+    if dadger is None:
+        result["missing"].append("dadger")
+    else:
+        # Leitura sob demanda: parsear agora o que a primeira consulta pagaria
+        materializa_tudo = getattr(dadger.data, "materializa_tudo", None)
+        if materializa_tudo is not None:
+            materializa_tudo()
+        result["warmed"].append("dadger")
+    if find_dadgnl_file(deck_path):
+        result["warmed"].append("dadgnl")
+
+    hidr_path = find_deck_member(deck_path, "hidr.dat")
+    if hidr_path is None:
+        result["missing"].append("hidr.dat")
+    else:
+        result["usinas_hidr"] = len(get_hidr_cadastro(hidr_path).codigo_para_nome())
+        result["warmed"].append("hidr.dat")
+
+    # Índices de nomes de usinas (de-para), montados uma vez por processo
+    get_decomp_thermal_plant_matcher()
+    get_decomp_hydraulic_plant_matcher()
+    return result
+
+
+# Ingestão em segundo plano de decks novos/alterados (iniciada no startup da API)
+deck_ingestor = DeckIngestor("DECOMP", list_available_decks, ingest_deck)
@@ -0,0 +1,345 @@
+"""
+⚡ Cache LRU limitado por memória para arquivos do DECOMP lidos com cfinterface.
+
+Base dos caches de Dadger e Dadgnl (dadger_cache.py, dadgnl_cache.py). Em vez
+de um número fixo de decks (o antigo maxsize=55, que em decks grandes passava
+da memória do container), cada objeto tem o tamanho estimado ao entrar no cache e as
+entradas menos usadas são descartadas quando a soma passa do orçamento em
+bytes configurado.
+
+A estimativa percorre os registros do arquivo (RegisterFile.data) somando
+sys.getsizeof do registro, da lista de valores e de cada valor: fica próxima
+do consumo real (que inclui ainda o overhead do alocador) e custa poucos
+milissegundos, contra centenas do parse. Objetos que crescem depois de lidos
+(o Dadger memoiza índices e DataFrames e parseia registros sob demanda)
+avisam o cache pelo ouvinte registrado em ao_crescer(): a entrada é
+reestimada (resize) e o orçamento é aplicado sobre o total atualizado.
+
+A entrada guarda o mtime do arquivo: se ele for alterado no disco, a próxima
+leitura descarta a entrada antiga e faz o parse novamente. Com
+key_by_content=True a chave é o SHA-256 do conteúdo (core/utils/content_hash.py):
+o mesmo dadger repetido em vários decks ocupa uma única entrada, e um arquivo
+alterado simplesmente tem outra chave.
+
+Uso:
+    from backend.decomp.utils.file_cache import MemoryBudgetCache
+
+    cache = MemoryBudgetCache("DADGER", max_bytes=2 * 1024 ** 3, key_by_content=True)
+    dadger = cache.get_or_load(dadger_path, Dadger.read)
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.core.utils.content_hash import content_digest
+from backend.decomp.config import safe_print
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estima o tamanho em memória (bytes) de um arquivo lido com cfinterface.
+
+    Para RegisterFile/BlockFile/SectionFile soma os componentes em obj.data e
+    seus valores, mais o que o objeto memoiza (tamanho_memoizado(), ex:
+    índices e DataFrames do Dadger); para outros objetos retorna
+    sys.getsizeof (raso).
+    """
+    data = getattr(obj, "data", None)
+    if data is None:
+        return sys.getsizeof(obj)
+
+    getsizeof = sys.getsizeof
+    items = list(data)
+    total = getsizeof(obj) + getsizeof(items) + len(items) * 8
+    for item in items:
+        total += getsizeof(item)
+        values = getattr(item, "data", None)
+        if isinstance(values, list):
+            total += getsizeof(values) + sum(map(getsizeof, values))
+        elif values is not None:
+            total += getsizeof(values)
+    tamanho_memoizado = getattr(obj, "tamanho_memoizado", None)
+    if callable(tamanho_memoizado):
+        total += tamanho_memoizado()
+    return total
+
+
+class _Entry:
+    __slots__ = ["mtime_ns", "size", "obj", "path", "loaded_at", "last_access", "hits", "load_seconds"]
+
+    def __init__(self, mtime_ns: int, size: int, obj: Any, path: str, load_seconds: float):
+        self.mtime_ns = mtime_ns
+        self.path = path
+        self.size = size
+        self.obj = obj
+        self.loaded_at = time.time()
+        self.last_access = self.loaded_at
+        self.hits = 0
+        self.load_seconds = load_seconds
+
+
+class MemoryBudgetCache:
+    """Cache LRU thread-safe de arquivos lidos, limitado por bytes estimados."""
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        sizer: Callable[[Any], int] = estimate_size,
+        key_by_content: bool = False,
+    ):
+        """
+        Args:
+            name: Nome usado nos logs (ex: "DADGER")
+            max_bytes: Orçamento em bytes (0 desativa o limite)
+            sizer: Função que estima o tamanho de um objeto em bytes
+            key_by_content: Chave pelo SHA-256 do conteúdo em vez do caminho
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.key_by_content = key_by_content
+
+        # Entradas: caminho absoluto (ou hash do conteúdo) -> _Entry (ordem = LRU)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Um lock por arquivo: leituras concorrentes do mesmo arquivo aguardam um único parse
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "evicted_bytes": 0,
+            "manual_evictions": 0,
+            "resizes": 0,
+        }
+
+    def make_key(self, path: str) -> str:
+        """Chave do arquivo: hash do conteúdo (key_by_content) ou caminho absoluto."""
+        if self.key_by_content:
+            return content_digest(path)
+        return os.path.abspath(path)
+
+    def version(self, path: str) -> int:
+        """Versão do arquivo para invalidação: mtime (a chave por conteúdo já muda sozinha)."""
+        if self.key_by_content:
+            return 0
+        return os.stat(path).st_mtime_ns
+
+    def _get_load_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._load_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._load_locks[key] = lock
+            return lock
+
+    @staticmethod
+    def _watch(obj: Any, listener: Optional[Callable[[], None]]) -> None:
+        ao_crescer = getattr(obj, "ao_crescer", None)
+        if callable(ao_crescer):
+            ao_crescer(listener)
+
+    def _remove_locked(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            self._watch(entry.obj, None)
+        return entry
+
+    def lookup(self, key: str, mtime_ns: int) -> Tuple[bool, Any]:
+        """
+        Procura a chave no cache; descarta a entrada se o arquivo mudou.
+
+        Não altera as estatísticas de hits/misses (use record_hit).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.mtime_ns != mtime_ns:
+                self._remove_locked(key)
+                self._stats["invalidations"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.obj
+
+    def contains(self, key: str, mtime_ns: int) -> bool:
+        """True se a chave estiver no cache e atualizada (sem alterar a ordem LRU)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.mtime_ns == mtime_ns
+
+    def record_hit(self, key: str) -> None:
+        with self._lock:
+            self._stats["hits"] += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.hits += 1
+                entry.last_access = time.time()
+
+    def put(self, key: str, mtime_ns: int, obj: Any, load_seconds: float = 0.0, path: Optional[str] = None) -> int:
+        """
+        Guarda um objeto recém-lido (conta como miss) e aplica o orçamento.
+
+        path é o arquivo de onde o objeto foi lido (listado em entries()).
+
+        Returns:
+            Tamanho estimado do objeto em bytes
+        """
+        size = self.sizer(obj)
+        with self._lock:
+            self._stats["misses"] += 1
+            self._remove_locked(key)
+            self._entries[key] = _Entry(mtime_ns, size, obj, path or key, load_seconds)
+            self._bytes += size
+            self._watch(obj, lambda: self.resize(key))
+            self._enforce_budget_locked()
+        if self.max_bytes > 0 and size > self.max_bytes:
+            safe_print(
+                f"[{self.name} CACHE] ⚠️ {path or key} ({size / 1024 ** 2:.1f} MB) sozinho excede o "
+                f"orçamento de {self.max_bytes / 1024 ** 2:.0f} MB; mantido apenas até a próxima leitura"
+            )
+        return size
+
+    def resize(self, key: str) -> int:
+        """
+        Reestima o tamanho de uma entrada que cresceu (ou encolheu) depois de
+        entrar no cache e aplica o orçamento sobre o total atualizado.
+
+        A entrada passa a ser a mais recente (quem a fez crescer está usando).
+
+        Returns:
+            Novo tamanho estimado em bytes (0 se a chave não está no cache)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        size = self.sizer(entry.obj)
+        with self._lock:
+            # Removida ou substituída enquanto estimávamos
+            if self._entries.get(key) is not entry:
+                return 0
+            self._bytes += size - entry.size
+            entry.size = size
+            self._stats["resizes"] += 1
+            self._entries.move_to_end(key)
+            self._enforce_budget_locked()
+        return size
+
+    def _enforce_budget_locked(self) -> None:
+        # A entrada mais recente nunca é descartada: quem acabou de ler precisa dela
+        while self.max_bytes > 0 and self._bytes > self.max_bytes and len(self._entries) > 1:
+            evicted_key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._watch(entry.obj, None)
+            self._load_locks.pop(evicted_key, None)
+            self._stats["evictions"] += 1
+            self._stats["evicted_bytes"] += entry.size
+            safe_print(f"[{self.name} CACHE] 🗑️ Evicção (LRU): {entry.path} ({entry.size / 1024 ** 2:.1f} MB)")
+
+    def get_or_load(self, path: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Retorna o objeto do cache ou faz o parse com loader(path).
+
+        Args:
+            path: Caminho completo do arquivo
+            loader: Função de leitura (ex: Dadger.read)
+
+        Returns:
+            Objeto lido (compartilhado - não modificar in-place)
+        """
+        key = self.make_key(path)
+        mtime_ns = self.version(path)
+
+        found, obj = self.lookup(key, mtime_ns)
+        if found:
+            self.record_hit(key)
+            safe_print(f"[{self.name} CACHE] ✅ Hit! {path} (cache)")
+            return obj
+
+        with self._get_load_lock(key):
+            # Outra thread pode ter carregado enquanto esperávamos o lock
+            found, obj = self.lookup(key, mtime_ns)
+            if found:
+                self.record_hit(key)
+                return obj
+
+            start = time.time()
+            obj = loader(path)
+            elapsed = time.time() - start
+            size = self.put(key, mtime_ns, obj, elapsed, path=path)
+            safe_print(f"[{self.name} CACHE] ⚡ Carregado {path} em {elapsed:.2f}s ({size / 1024 ** 2:.1f} MB, novo)")
+            return obj
+
+    def evict(self, path: str) -> bool:
+        """
+        Remove uma entrada do cache.
+
+        Args:
+            path: Caminho do arquivo ou chave (como listados em entries())
+
+        Returns:
+            True se a entrada existia
+        """
+        with self._lock:
+            known = path in self._entries
+        if known:
+            key = path
+        else:
+            try:
+                key = self.make_key(path)
+            except OSError:
+                return False
+        with self._lock:
+            entry = self._remove_locked(key)
+            self._load_locks.pop(key, None)
+            if entry is None:
+                return False
+            self._stats["manual_evictions"] += 1
+        safe_print(f"[{self.name} CACHE] 🗑️ Entrada removida: {entry.path} ({entry.size / 1024 ** 2:.1f} MB)")
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                self._watch(entry.obj, None)
+            self._entries.clear()
+            self._load_locks.clear()
+            self._bytes = 0
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Entradas do cache, da mais usada recentemente para a menos."""
+        with self._lock:
+            return [
+                {
+                    "path": entry.path,
+                    "key": key,
+                    "bytes": entry.size,
+                    "hits": entry.hits,
+                    "loaded_at": entry.loaded_at,
+                    "last_access": entry.last_access,
+                    "load_seconds": round(entry.load_seconds, 3),
+                }
+                for key, entry in reversed(self._entries.items())
+            ]
+
+    def get_stats(self) -> dict:
+        """Retorna estatísticas do cache."""
+        with self._lock:
+            hits = self._stats["hits"]
+            misses = self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "usage": self._bytes / self.max_bytes if self.max_bytes > 0 else 0,
+                "hit_rate": hits / (hits + misses) if (hits + misses) > 0 else 0,
+            }
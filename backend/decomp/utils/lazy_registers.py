@@ -0,0 +1,198 @@
+"""
+⚡ Leitura sob demanda (por tipo de registro) de arquivos de registros do DECOMP.
+
+O RegisterFile.read() do cfinterface identifica e faz o parse de todas as
+linhas do arquivo. No dadger.rv* isso significa ~80 tipos de registro, mas
+uma consulta de CVU só usa CT e uma de carga só usa DP.
+
+Aqui a leitura faz uma única passada barata: cada linha é classificada pelo
+identificador (mesma regra do cfinterface: o primeiro registro de REGISTERS
+cujo IDENTIFIER casa com o início da linha) e guardada crua em um
+DefaultRegister. O parse dos campos de um tipo só acontece no primeiro
+acesso a ele (of_type / get_registers_of_type, usados por todos os métodos
+do Dadger), e o registro parseado substitui a linha crua na mesma posição.
+Linhas nunca acessadas são escritas de volta exatamente como foram lidas.
+
+Uso:
+    from backend.decomp.decompclass import Dadger
+
+    dadger = Dadger.read_lazy(dadger_path)
+    dadger.ct(codigo_usina=1)  # faz o parse apenas dos registros CT
+"""
+import io
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Type, Union
+
+from cfinterface.components.defaultregister import DefaultRegister
+from cfinterface.components.register import Register
+from cfinterface.data.registerdata import RegisterData
+from cfinterface.storage import StorageType
+
+# Um lock para todas as materializações: o parse segura o GIL de qualquer forma,
+# e o lock não vai para o objeto (que precisa continuar serializável com pickle)
+_materializacao_lock = threading.RLock()
+
+
+def _classificador(registros: List[Type[Register]]) -> Callable[[str], Type[Register]]:
+    """
+    Função linha -> tipo de registro equivalente à busca do RegisterReading,
+    memoizada pelo início da linha.
+
+    Registros com o mesmo IDENTIFIER_DIGITS são avaliados em grupo: para
+    grupos com identificadores curtos (ex: "UH  ") o resultado depende só de
+    line[:4] e é memoizado; para os demais (ex: "AC  ... NUMPOS") uma única
+    regex combinada descarta as linhas que não casam com nenhum deles.
+    """
+    grupos: Dict[int, List[int]] = {}
+    for i, r in enumerate(registros):
+        grupos.setdefault(r.IDENTIFIER_DIGITS, []).append(i)
+    padroes = {i: re.compile(r.IDENTIFIER) for i, r in enumerate(registros)}
+    combinados = {
+        digitos: re.compile("|".join(f"(?:{registros[i].IDENTIFIER})" for i in indices))
+        for digitos, indices in grupos.items()
+    }
+    curtos = min(grupos) if grupos else 0
+    memo: Dict[str, Optional[int]] = {}
+
+    def primeiro_do_grupo(digitos: int, inicio: str) -> Optional[int]:
+        if combinados[digitos].search(inicio) is None:
+            return None
+        return next((i for i in grupos[digitos] if padroes[i].search(inicio)), None)
+
+    def classifica(linha: str) -> Type[Register]:
+        inicio = linha[:curtos]
+        if inicio not in memo:
+            memo[inicio] = primeiro_do_grupo(curtos, inicio)
+        melhor = memo[inicio]
+        for digitos in grupos:
+            if digitos == curtos or (melhor is not None and melhor < grupos[digitos][0]):
+                continue
+            candidato = primeiro_do_grupo(digitos, linha[:digitos])
+            if candidato is not None and (melhor is None or candidato < melhor):
+                melhor = candidato
+        return registros[melhor] if melhor is not None else DefaultRegister
+
+    return classifica
+
+
+class LazyRegisterData(RegisterData):
+    """
+    RegisterData cujos registros são parseados por tipo no primeiro acesso.
+
+    Enquanto não parseadas, as linhas ficam em DefaultRegister (com o texto
+    original) na posição que ocupam no arquivo, então posições, inserções,
+    remoções e escrita funcionam como no RegisterData comum.
+    """
+
+    __slots__ = ["_pendentes", "_storage"]
+
+    def __init__(self, root: Register, storage: Union[str, StorageType] = StorageType.TEXT) -> None:
+        super().__init__(root)
+        # Tipo de registro -> linhas cruas (DefaultRegister) ainda não parseadas
+        self._pendentes: Dict[Type[Register], List[DefaultRegister]] = {}
+        self._storage = storage
+
+    def materializa(self, t: type) -> None:
+        """
+        Faz o parse das linhas pendentes de todos os tipos que são t ou subclasses.
+
+        `_pendentes` só é lido sob o lock, e um tipo só sai dele depois que
+        `_type_index` foi atualizado: uma thread que consulta um tipo em
+        parse por outra aguarda o fim do parse em vez de ver o tipo sem
+        registros.
+        """
+        with _materializacao_lock:
+            tipos = [p for p in self._pendentes if issubclass(p, t)]
+            for tipo in tipos:
+                # Parse de todas as linhas antes de alterar o objeto: um erro
+                # de leitura deixa o tipo pendente e os dados intactos
+                parseados = []
+                for cru in self._pendentes[tipo]:
+                    # Linha removida do arquivo antes de ser acessada
+                    if cru._container is not self:
+                        continue
+                    registro = tipo()
+                    registro.read(io.StringIO(cru.data), self._storage)
+                    parseados.append((cru, registro))
+                posicoes = []
+                for cru, registro in parseados:
+                    registro._container = self
+                    registro._index = cru._index
+                    cru._container = None
+                    self._items[cru._index] = registro
+                    posicoes.append(registro._index)
+                if posicoes:
+                    # Atualização in-place do índice por tipo (o objeto continua o mesmo)
+                    substituidas = set(posicoes)
+                    defaults = self._type_index.get(DefaultRegister, [])
+                    defaults[:] = [i for i in defaults if i not in substituidas]
+                    existentes = self._type_index.setdefault(tipo, [])
+                    existentes.extend(posicoes)
+                    existentes.sort()
+                del self._pendentes[tipo]
+
+    def materializa_tudo(self) -> None:
+        """Faz o parse de todos os tipos pendentes."""
+        self.materializa(Register)
+
+    @property
+    def tipos_pendentes(self) -> List[Type[Register]]:
+        """Tipos de registro presentes no arquivo e ainda não parseados."""
+        with _materializacao_lock:
+            return list(self._pendentes)
+
+    def of_type(self, t):
+        self.materializa(t)
+        return super().of_type(t)
+
+    def __eq__(self, o: object) -> bool:
+        self.materializa_tudo()
+        if isinstance(o, LazyRegisterData):
+            o.materializa_tudo()
+        return super().__eq__(o)
+
+
+def ler_registros_sob_demanda(
+    caminho: str,
+    registros: List[Type[Register]],
+    encodings: Union[str, List[str]],
+    storage: Union[str, StorageType] = StorageType.TEXT,
+) -> LazyRegisterData:
+    """
+    Lê um arquivo de registros (texto) classificando as linhas sem parsear campos.
+
+    Args:
+        caminho: Caminho do arquivo (ex: dadger.rv0)
+        registros: Tipos de registro aceitos (RegisterFile.REGISTERS)
+        encodings: Encoding ou lista de encodings tentados em ordem (RegisterFile.ENCODING)
+        storage: Tipo de armazenamento do arquivo (apenas texto é suportado)
+
+    Returns:
+        LazyRegisterData com os registros parseados sob demanda
+    """
+    encodings = [encodings] if isinstance(encodings, str) else list(encodings)
+    linhas = None
+    for encoding in encodings:
+        try:
+            with open(caminho, encoding=encoding) as f:
+                linhas = f.readlines()
+            break
+        except UnicodeDecodeError:
+            continue
+    if linhas is None:
+        raise EncodingWarning(f"Nenhum encoding de {encodings} conseguiu ler {caminho}")
+
+    classifica = _classificador(registros)
+    data = LazyRegisterData(DefaultRegister(data=""), storage)
+    itens = data._items
+    pendentes = data._pendentes
+    for linha in linhas:
+        cru = DefaultRegister(data=linha)
+        itens.append(cru)
+        tipo = classifica(linha)
+        if tipo is not DefaultRegister:
+            pendentes.setdefault(tipo, []).append(cru)
+    data._refresh_indices(1)
+    data._rebuild_type_index()
+    return data
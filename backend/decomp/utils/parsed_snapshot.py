@@ -0,0 +1,298 @@
+"""
+⚡ Snapshot em disco de arquivos do DECOMP já parseados (Dadger, Dadgnl).
+
+Cada reinício do processo (deploy, crash, uvicorn --reload) refazia o parse
+de todos os decks no preload. Depois do primeiro parse, o objeto lido é
+gravado em disco (pickle) e, no próximo boot, é carregado em milissegundos.
+
+A chave do snapshot é o SHA-256 do conteúdo do arquivo de origem mais a
+versão do parser: versões do idecomp/cfinterface e o hash do código-fonte
+da classe lida (ex: decompclass.py) e deste módulo. Qualquer mudança no
+arquivo ou no parser gera uma chave nova; snapshots de versões antigas do
+parser são removidos ao gravar os novos.
+
+A escrita em disco de objetos já parseados acontece em uma thread de fundo.
+Objetos lidos sob demanda (Dadger.read_lazy) ainda não têm todos os
+registros parseados: o parse completo e a gravação do snapshot vão para o
+pool de processos (core/parse_pool.py), sem disputar o GIL com as
+requisições. Com o pool desativado, esses objetos não ganham snapshot.
+
+prune_snapshots() remove snapshots de versões antigas do parser e os que
+não são lidos há DECOMP_SNAPSHOT_MAX_AGE_DAYS (decks removidos ou
+substituídos): carregar um snapshot renova a sua data.
+
+Uso:
+    from backend.decomp.utils.parsed_snapshot import load_with_snapshot
+
+    dadger = load_with_snapshot(dadger_path, Dadger, Dadger.read_lazy)
+"""
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Set
+
+from backend.core.parse_pool import submit_parse_to_file
+from backend.core.utils.content_hash import content_digest
+from backend.decomp.config import (
+    DECOMP_SNAPSHOT_DIR,
+    DECOMP_SNAPSHOT_ENABLED,
+    DECOMP_SNAPSHOT_MAX_AGE_DAYS,
+    safe_print,
+)
+
+# Incrementar ao mudar o formato do snapshot
+_SNAPSHOT_FORMAT = 1
+
+_writer: Optional[ThreadPoolExecutor] = None
+_writer_lock = threading.Lock()
+# Snapshots agendados e ainda não gravados (evita gravar o mesmo duas vezes)
+_pending: Set[str] = set()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo (memoizado por mtime/tamanho)."""
+    return content_digest(path)
+
+
+@lru_cache(maxsize=None)
+def parser_version(file_class: type) -> str:
+    """
+    Versão do parser de file_class: formato do snapshot, versões das
+    bibliotecas e hash do código-fonte da classe e deste módulo.
+    """
+    partes = [str(_SNAPSHOT_FORMAT), f"py{sys.version_info.major}.{sys.version_info.minor}"]
+    for nome in ("cfinterface", "idecomp"):
+        modulo = sys.modules.get(nome)
+        partes.append(f"{nome}={getattr(modulo, '__version__', '?')}")
+
+    h = hashlib.sha256("|".join(partes).encode())
+    fontes = {inspect.getsourcefile(file_class), __file__}
+    # Módulos do projeto de que a classe depende (ex: leitura sob demanda do dadger)
+    modulo_classe = sys.modules.get(file_class.__module__)
+    for valor in vars(modulo_classe).values() if modulo_classe else []:
+        modulo_valor = getattr(valor, "__module__", None)
+        if isinstance(modulo_valor, str) and modulo_valor.startswith("backend."):
+            fonte = getattr(sys.modules.get(modulo_valor), "__file__", None)
+            if fonte:
+                fontes.add(fonte)
+    for fonte in sorted(f for f in fontes if f):
+        with open(fonte, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _snapshot_path(file_class: type, digest: str) -> Path:
+    return DECOMP_SNAPSHOT_DIR / f"{file_class.__name__.lower()}-{parser_version(file_class)}-{digest}.pkl"
+
+
+def load_snapshot(path: str, file_class: type, digest: Optional[str] = None) -> Optional[Any]:
+    """
+    Carrega o snapshot do arquivo, se existir para o conteúdo e parser atuais.
+
+    Args:
+        path: Caminho do arquivo de origem (ex: dadger.rv0)
+        file_class: Classe do arquivo (ex: Dadger)
+        digest: SHA-256 do arquivo, se já calculado
+
+    Returns:
+        Objeto lido ou None
+    """
+    if not DECOMP_SNAPSHOT_ENABLED:
+        return None
+    snapshot = _snapshot_path(file_class, digest or file_digest(path))
+    if not snapshot.exists():
+        return None
+    try:
+        with open(snapshot, "rb") as f:
+            obj = pickle.load(f)
+    except Exception as e:
+        safe_print(f"[SNAPSHOT] ⚠️ Snapshot inválido {snapshot.name}, removendo: {e}")
+        snapshot.unlink(missing_ok=True)
+        return None
+    if not isinstance(obj, file_class):
+        snapshot.unlink(missing_ok=True)
+        return None
+    try:
+        # Snapshot em uso: renova a data usada por prune_snapshots
+        os.utime(snapshot)
+    except OSError:
+        pass
+    return obj
+
+
+def _remove_old_versions(file_class: type) -> None:
+    prefixo = f"{file_class.__name__.lower()}-"
+    atual = f"{prefixo}{parser_version(file_class)}-"
+    for antigo in DECOMP_SNAPSHOT_DIR.glob(f"{prefixo}*.pkl"):
+        if not antigo.name.startswith(atual):
+            antigo.unlink(missing_ok=True)
+
+
+def prune_snapshots(file_classes: Iterable[type], max_age_days: float = DECOMP_SNAPSHOT_MAX_AGE_DAYS) -> int:
+    """
+    Remove snapshots de versões antigas do parser e os não lidos há max_age_days.
+
+    Args:
+        file_classes: Classes cujos snapshots são verificados (ex: Dadger, Dadgnl)
+        max_age_days: Idade máxima desde a última leitura; 0 não remove por idade
+
+    Returns:
+        Quantidade de arquivos removidos
+    """
+    if not DECOMP_SNAPSHOT_DIR.is_dir():
+        return 0
+    atuais = {f"{c.__name__.lower()}-": f"{c.__name__.lower()}-{parser_version(c)}-" for c in file_classes}
+    limite = time.time() - max_age_days * 86400 if max_age_days > 0 else None
+    with _writer_lock:
+        pendentes = set(_pending)
+    removidos = 0
+    for arquivo in DECOMP_SNAPSHOT_DIR.iterdir():
+        if not arquivo.is_file() or str(arquivo) in pendentes:
+            continue
+        prefixo = next((p for p in atuais if arquivo.name.startswith(p)), None)
+        versao_antiga = (
+            prefixo is not None
+            and arquivo.suffix == ".pkl"
+            and not arquivo.name.startswith(atuais[prefixo])
+        )
+        try:
+            antigo = limite is not None and arquivo.stat().st_mtime < limite
+        except OSError:
+            continue
+        if versao_antiga or antigo:
+            arquivo.unlink(missing_ok=True)
+            removidos += 1
+    if removidos:
+        safe_print(f"[SNAPSHOT] 🗑️ {removidos} snapshot(s) antigo(s) removido(s)")
+    return removidos
+
+
+def _write_snapshot(path: str, file_class: type, digest: str, payload: bytes) -> None:
+    snapshot = _snapshot_path(file_class, digest)
+    try:
+        DECOMP_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, snapshot)
+        _remove_old_versions(file_class)
+        safe_print(f"[SNAPSHOT] ✅ Snapshot gravado: {snapshot.name} ({snapshot.stat().st_size / 1024 ** 2:.1f} MB)")
+    except Exception as e:
+        safe_print(f"[SNAPSHOT] ⚠️ Erro ao gravar snapshot de {path}: {e}")
+    finally:
+        with _writer_lock:
+            _pending.discard(str(snapshot))
+
+
+def _pool_snapshot_done(path: str, file_class: type, digest: str, snapshot: Path, future: Future) -> None:
+    try:
+        tamanho, segundos = future.result()
+        # O arquivo mudou durante o parse: o objeto não corresponde ao digest
+        if file_digest(path) != digest:
+            snapshot.unlink(missing_ok=True)
+            return
+        _remove_old_versions(file_class)
+        safe_print(
+            f"[SNAPSHOT] ✅ Snapshot gravado no pool: {snapshot.name} "
+            f"({tamanho / 1024 ** 2:.1f} MB, parse em {segundos:.2f}s)"
+        )
+    except Exception as e:
+        safe_print(f"[SNAPSHOT] ⚠️ Erro ao gravar snapshot de {path} no pool: {e}")
+    finally:
+        with _writer_lock:
+            _pending.discard(str(snapshot))
+
+
+def save_snapshot_async(path: str, file_class: type, digest: str, obj: Optional[Any] = None) -> None:
+    """
+    Agenda a gravação do snapshot em segundo plano.
+
+    Args:
+        path: Caminho do arquivo de origem
+        file_class: Classe do arquivo (ex: Dadger)
+        digest: SHA-256 do arquivo quando obj foi lido
+        obj: Objeto já parseado por completo (gravado em uma thread de fundo);
+             None para fazer o parse completo e gravar no pool de processos
+
+    O objeto é serializado aqui, na thread que chama: na thread de fundo ele
+    poderia estar sendo usado (e alterado pelos caches internos) por uma tool.
+    """
+    global _writer
+    if not DECOMP_SNAPSHOT_ENABLED:
+        return
+    snapshot = _snapshot_path(file_class, digest)
+    chave = str(snapshot)
+    with _writer_lock:
+        if chave in _pending or os.path.exists(chave):
+            return
+        _pending.add(chave)
+        if obj is not None and _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decomp-snapshot")
+        writer = _writer
+
+    if obj is None:
+        DECOMP_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        future = submit_parse_to_file(file_class, path, chave)
+        if future is None:
+            # Sem pool, o parse completo disputaria o GIL com as requisições
+            with _writer_lock:
+                _pending.discard(chave)
+            return
+        future.add_done_callback(lambda f: _pool_snapshot_done(path, file_class, digest, snapshot, f))
+        return
+
+    try:
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        safe_print(f"[SNAPSHOT] ⚠️ Objeto de {path} não serializável: {e}")
+        with _writer_lock:
+            _pending.discard(chave)
+        return
+    writer.submit(_write_snapshot, path, file_class, digest, payload)
+
+
+def _fully_parsed(obj: Any) -> bool:
+    # Leitura sob demanda (LazyRegisterData) ainda tem registros sem parse
+    return not getattr(getattr(obj, "data", None), "tipos_pendentes", None)
+
+
+def load_with_snapshot(path: str, file_class: type, loader: Callable[[str], Any]) -> Any:
+    """
+    Carrega o arquivo do snapshot em disco ou com loader(path), agendando o snapshot.
+
+    Args:
+        path: Caminho do arquivo de origem
+        file_class: Classe do arquivo (ex: Dadger)
+        loader: Função de leitura (ex: Dadger.read_lazy)
+
+    Returns:
+        Objeto lido
+    """
+    if not DECOMP_SNAPSHOT_ENABLED:
+        return loader(path)
+
+    digest = file_digest(path)
+    obj = load_snapshot(path, file_class, digest)
+    if obj is not None:
+        safe_print(f"[SNAPSHOT] ⚡ {file_class.__name__} {path} carregado do snapshot")
+        return obj
+
+    obj = loader(path)
+    save_snapshot_async(path, file_class, digest, obj if _fully_parsed(obj) else None)
+    return obj
+
+
+def shutdown_snapshot_writer() -> None:
+    """Aguarda as gravações pendentes (chamado no shutdown da API)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.shutdown(wait=True)
@@ -4,15 +4,13 @@ import os
 import sys
 import builtins
 import uuid
-import shutil
 import zipfile
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from backend.dessem.config import UPLOADS_DIR
@@ -25,7 +23,12 @@ from backend.dessem.agents.multi_deck.graph import (
     run_query_stream as multi_deck_run_query_stream,
 )
 from backend.dessem.rag import index_documentation
-from backend.dessem.utils.deck_loader import list_available_decks, load_deck
+from backend.dessem.utils.deck_loader import deck_ingestor, list_available_decks, load_deck
+from backend.core.deck_upload import ERROR as UPLOAD_ERROR, PENDING as UPLOAD_PENDING, DeckUploadManager
+from backend.core.query_executor import QueryExecutorSaturated, query_executor
+from backend.core.session_store import SessionStore
+from backend.core.startup import StartupState
+from backend.core.utils.zip_deck import list_deck_files
 
 
 # =======================
@@ -83,10 +86,6 @@ app.add_middleware(
 )
 
 
-sessions: dict[str, Path] = {}
-comparison_sessions: dict[str, list[str]] = {}
-
-
 class QueryRequest(BaseModel):
     session_id: str
     query: str
@@ -106,6 +105,9 @@ class UploadResponse(BaseModel):
     session_id: str
     message: str
     files_count: int
+    status: str | None = None  # /upload: "processando", "pronto" ou "erro"
+    sha256: str | None = None
+    duplicate_of: str | None = None
 
 
 class IndexResponse(BaseModel):
@@ -140,67 +142,64 @@ class ComparisonInitResponse(BaseModel):
     files_count: int
 
 
-def preload_dessem_decks():
+# Indexação da documentação e preload de decks rodam em threads de fundo:
+# o servidor aceita requisições logo após o startup (ver core/startup.py)
+startup_state = StartupState("DESSEM")
+
+
+def _release_session(session_id: str, deck_path: Path) -> None:
+    """Esquece o upload da sessão (os arquivos do DESSEM não têm cache por caminho)."""
+    uploads.forget(session_id)
+
+
+# Sessões (session_id -> deck e decks da comparação), com TTL e persistência (ver core/session_store.py)
+session_store = SessionStore("DESSEM", UPLOADS_DIR, on_remove=_release_session)
+
+# Decks enviados por /upload: gravados em streaming e preparados em segundo plano
+uploads = DeckUploadManager("DESSEM", UPLOADS_DIR, list_available_decks, load_deck, session_store.put)
+
+
+def _index_documentation() -> int:
+    count = index_documentation()
+    print(f"[DESSEM RAG] Documentação indexada: {count} documentos")
+    return count
+
+
+def start_background_startup() -> None:
     """
-    Preload simples de todos os decks DESSEM disponíveis.
+    Inicia a indexação da documentação e o preload de decks em segundo plano.
 
-    Diferente de NEWAVE/DECOMP, aqui apenas garantimos que os ZIPs
-    foram extraídos; não há cache adicional.
+    O preload é a ingestão de decks (deck_ingestor), do mais recente para o
+    mais antigo; decks ainda não aquecidos são preparados sob demanda por
+    load_deck(). Idempotente: também é chamada pelo app unificado (main.py).
     """
-    try:
-        print("\n" + "=" * 60)
-        print("[PRELOAD DESSEM] Iniciando preload de decks...")
-        print("=" * 60)
-
-        available_decks = list_available_decks()
-        if not available_decks:
-            print("[PRELOAD DESSEM] Nenhum deck DESSEM encontrado")
-            return
-
-        print(f"[PRELOAD DESSEM] Encontrados {len(available_decks)} decks")
-
-        max_workers = min(8, len(available_decks))
-        extracted_count = 0
-        error_count = 0
-        errors_detail: list[tuple[str, str]] = []
-
-        def extract_single(deck_info: dict):
-            try:
-                deck_name = deck_info["name"]
-                load_deck(deck_name)
-                return deck_name, True, ""
-            except Exception as exc:  # pragma: no cover - log apenas
-                return deck_info.get("name", "unknown"), False, str(exc)
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(extract_single, d): d for d in available_decks}
-            for future in as_completed(futures):
-                deck_name, success, err = future.result()
-                if success:
-                    extracted_count += 1
-                else:
-                    error_count += 1
-                    errors_detail.append((deck_name, err))
-
-        print(f"[PRELOAD DESSEM] Decks extraídos: {extracted_count}")
-        print(f"[PRELOAD DESSEM] Erros: {error_count}")
-        if error_count:
-            print(f"[PRELOAD DESSEM] Decks com erro: {[e[0] for e in errors_detail[:5]]}")
-        print("=" * 60 + "\n")
-    except Exception as exc:  # pragma: no cover
-        print(f"[PRELOAD DESSEM] Erro crítico: {exc}")
+    startup_state.run_in_background("index_documentation", _index_documentation)
+    deck_ingestor.start()
+    session_store.start_reaper(after_reap=lambda: uploads.collect(session_store.ttl_seconds))
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Executa no startup do servidor DESSEM."""
-    try:
-        count = index_documentation()
-        print(f"[DESSEM RAG] Documentação indexada: {count} documentos")
-    except Exception as exc:  # pragma: no cover
-        print(f"[DESSEM RAG] Erro ao indexar documentação: {exc}")
+    """Executa no startup do servidor DESSEM (não bloqueia: tarefas em segundo plano)."""
+    start_background_startup()
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness: o processo está atendendo requisições."""
+    return {"status": "ok"}
+
 
-    preload_dessem_decks()
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 503 até a inicialização terminar; inclui o progresso do preload de decks."""
+    status = {
+        **startup_state.get_status(),
+        "preload": deck_ingestor.get_progress(),
+        "query_executor": query_executor.get_stats(),
+        "sessions": session_store.get_stats(),
+    }
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
 
 
 @app.get("/")
@@ -227,65 +226,79 @@ async def upload_deck(file: UploadFile = File(...)):
     if not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Apenas arquivos .zip são aceitos")
 
-    session_id = str(uuid.uuid4())
-    session_path = UPLOADS_DIR / session_id
-    session_path.mkdir(parents=True, exist_ok=True)
+    # Gravado em disco em blocos; o deck é preparado em segundo plano (ver core/deck_upload.py)
+    try:
+        upload = await uploads.accept(file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Arquivo .zip inválido")
 
-    zip_path = session_path / file.filename
-    with open(zip_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    return UploadResponse(
+        session_id=upload["session_id"],
+        message=f"Deck DESSEM recebido; preparação em andamento (GET /upload/{upload['session_id']})",
+        files_count=upload["files_count"],
+        status=upload["status"],
+        sha256=upload["sha256"],
+        duplicate_of=upload["duplicate_of"],
+    )
 
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(session_path)
 
-    zip_path.unlink()
+@app.get("/upload/{session_id}")
+async def get_upload_status(session_id: str):
+    """Status da preparação de um deck enviado por /upload."""
+    status = uploads.get_status(session_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Upload {session_id} não encontrado")
+    return status
 
-    extracted_items = list(session_path.iterdir())
-    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-        inner_dir = extracted_items[0]
-        for item in inner_dir.iterdir():
-            shutil.move(str(item), str(session_path / item.name))
-        inner_dir.rmdir()
 
-    files_count = len(list(session_path.glob("*")))
-    sessions[session_id] = session_path
+async def _wait_for_upload(session_id: str) -> None:
+    """
+    Aguarda a preparação do deck de uma sessão criada por /upload (registrada no store ao ficar pronta).
 
-    return UploadResponse(
-        session_id=session_id,
-        message="Deck DESSEM carregado com sucesso",
-        files_count=files_count,
-    )
+    Se a preparação falhou ou ainda não terminou, responde com o status do
+    upload em vez de "sessão não encontrada".
+    """
+    await uploads.wait_ready(session_id)
+    status = uploads.get_status(session_id)
+    if status is None:
+        return
+    if status["status"] == UPLOAD_ERROR:
+        raise HTTPException(status_code=422, detail=f"Erro ao preparar o deck enviado: {status['error']}")
+    if status["status"] == UPLOAD_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Deck da sessão {session_id} ainda em preparação",
+            headers={"Retry-After": "5"},
+        )
 
 
 def _ensure_session_path(session_id: str) -> Path:
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(status_code=404, detail=f"Sessão {session_id} não encontrada")
-    return sessions[session_id]
+    session_path = session_store.get(session_id)
+    if session_path is None:
+        raise HTTPException(status_code=404, detail=f"Sessão {session_id} não encontrada")
+    return session_path
 
 
 @app.post("/query", response_model=QueryResponse)
 async def query_deck(request: QueryRequest):
     """Executa uma consulta sobre um deck DESSEM."""
+    await _wait_for_upload(request.session_id)
     session_path = _ensure_session_path(request.session_id)
     deck_path = str(session_path)
     analysis_mode = request.analysis_mode or "single"
 
     try:
         if analysis_mode == "comparison":
-            selected = comparison_sessions.get(request.session_id)
-            result = multi_deck_run_query(
+            selected = session_store.get_selected_decks(request.session_id)
+            result = await query_executor.run(
+                multi_deck_run_query,
                 request.query,
                 deck_path,
                 session_id=request.session_id,
                 selected_decks=selected,
             )
         else:
-            result = single_deck_run_query(request.query, deck_path, session_id=request.session_id)
+            result = await query_executor.run(single_deck_run_query, request.query, deck_path, session_id=request.session_id)
 
         return QueryResponse(
             session_id=request.session_id,
@@ -295,6 +308,8 @@ async def query_deck(request: QueryRequest):
             comparison_data=result.get("comparison_data"),
             visualization_data=result.get("visualization_data"),
         )
+    except QueryExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Erro ao processar query: {exc}")
 
@@ -302,14 +317,15 @@ async def query_deck(request: QueryRequest):
 @app.post("/query/stream")
 async def query_deck_stream(request: QueryRequest):
     """Executa uma consulta sobre um deck DESSEM com SSE."""
+    await _wait_for_upload(request.session_id)
     session_path = _ensure_session_path(request.session_id)
     deck_path = str(session_path)
     analysis_mode = request.analysis_mode or "single"
+    selected = session_store.get_selected_decks(request.session_id)
 
     def event_generator():
         try:
             if analysis_mode == "comparison":
-                selected = comparison_sessions.get(request.session_id)
                 yield from multi_deck_run_query_stream(
                     request.query,
                     deck_path,
@@ -327,8 +343,13 @@ async def query_deck_stream(request: QueryRequest):
 
             yield f"data: {json.dumps({'type': 'error', 'message': str(exc)})}\n\n"
 
+    try:
+        events = query_executor.stream(event_generator)
+    except QueryExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
     return StreamingResponse(
-        event_generator(),
+        events,
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
     )
@@ -337,8 +358,9 @@ async def query_deck_stream(request: QueryRequest):
 @app.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """Retorna informações sobre uma sessão DESSEM."""
+    await _wait_for_upload(session_id)
     session_path = _ensure_session_path(session_id)
-    files = [f.name for f in session_path.glob("*") if f.is_file()]
+    files = list_deck_files(str(session_path))
     return {
         "session_id": session_id,
         "path": str(session_path),
@@ -350,11 +372,7 @@ async def get_session(session_id: str):
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Remove uma sessão DESSEM e seus arquivos."""
-    session_path = UPLOADS_DIR / session_id
-    if session_path.exists():
-        shutil.rmtree(session_path)
-    if session_id in sessions:
-        del sessions[session_id]
+    session_store.delete(session_id)
     return {"message": f"Sessão {session_id} removida com sucesso"}
 
 
@@ -395,8 +413,8 @@ async def load_deck_from_repo(request: LoadDeckRequest):
     try:
         deck_path = load_deck(request.deck_name)
         session_id = str(uuid.uuid4())
-        sessions[session_id] = deck_path
-        files_count = len(list(deck_path.glob("*")))
+        session_store.put(session_id, deck_path)
+        files_count = len(list_deck_files(str(deck_path)))
         return UploadResponse(
             session_id=session_id,
             message=f"Deck {request.deck_name} carregado",
@@ -442,10 +460,9 @@ async def init_comparison_mode(request: InitComparisonRequest | None = None):
         first_deck_path = deck_paths[selected_names[0]]
 
         session_id = str(uuid.uuid4())
-        sessions[session_id] = first_deck_path
-        comparison_sessions[session_id] = selected_names
+        session_store.put(session_id, first_deck_path, selected_decks=selected_names)
 
-        files_count = len(list(first_deck_path.glob("*")))
+        files_count = len(list_deck_files(str(first_deck_path)))
 
         selected_info = [
             DeckInfo(
@@ -469,6 +486,20 @@ async def init_comparison_mode(request: InitComparisonRequest | None = None):
         raise HTTPException(status_code=500, detail=f"Erro ao inicializar modo comparação: {exc}")
 
 
+@app.get("/decks/ingestion")
+async def get_deck_ingestion_status():
+    """Status da ingestão em segundo plano por deck (pendente, processando, pronto, erro)."""
+    return deck_ingestor.get_status()
+
+
+@app.post("/decks/ingestion/{deck_name}")
+async def ingest_deck_now(deck_name: str):
+    """Enfileira a (re)ingestão de um deck."""
+    if not deck_ingestor.ingest_now(deck_name):
+        raise HTTPException(status_code=404, detail=f"Deck {deck_name} não encontrado")
+    return {"message": f"Deck {deck_name} na fila de ingestão", "status": deck_ingestor.get_status()}
+
+
 if __name__ == "__main__":  # pragma: no cover
     import uvicorn
 
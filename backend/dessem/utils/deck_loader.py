@@ -10,13 +10,15 @@ DESSEM.
 """
 
 import re
-import zipfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, TypedDict
+from typing import Dict, List, Optional, Tuple, TypedDict
 
 from backend.dessem.config import DESSEM_DECKS_DIR, DESSEM_DATA_DIR
 from backend.core.config import ROOT_DIR
+from backend.core.deck_ingestion import DeckIngestor
+from backend.core.utils.deck_catalog import DeckCatalog
+from backend.core.utils.zip_deck import ensure_deck_dir, list_deck_files
 
 
 def _find_decks_dir() -> Path:
@@ -108,17 +110,20 @@ def parse_deck_name(deck_name: str) -> Optional[Dict[str, object]]:
     return {"year": year, "month": month, "display_name": display_name}
 
 
-def list_available_decks() -> List[DeckInfo]:
+def _scan_decks() -> Tuple[List[DeckInfo], List[Path]]:
     """
-    Lista todos os decks DESSEM disponíveis.
+    Escaneia o diretório de decks DESSEM.
 
-    Procura por arquivos DS{YYYY}{MM}.zip no diretório de decks.
+    Procura por arquivos DS{YYYY}{MM}.zip no diretório de decks e retorna
+    também os diretórios lidos (invalidação do catálogo).
     """
     decks: List[DeckInfo] = []
+    scanned_dirs = [DESSEM_DECKS_DIR, DESSEM_DECKS_DIR / "decks", DESSEM_DATA_DIR]
     decks_dir = _find_decks_dir()
+    scanned_dirs.append(decks_dir)
 
     if not decks_dir.exists():
-        return decks
+        return decks, scanned_dirs
 
     zip_files = list(decks_dir.glob("DS*.zip"))
     for zip_file in zip_files:
@@ -139,15 +144,24 @@ def list_available_decks() -> List[DeckInfo]:
         decks.append(info)
 
     decks.sort(key=lambda d: (d["year"], d["month"]))
-    return decks
+    return decks, scanned_dirs
+
+
+_catalog = DeckCatalog("DESSEM", _scan_decks)
+
+
+def list_available_decks() -> List[DeckInfo]:
+    """
+    Lista todos os decks DESSEM disponíveis (catálogo em memória).
+
+    O diretório só é escaneado de novo quando muda.
+    """
+    return _catalog.list()
 
 
 def get_deck_by_name(deck_name: str) -> Optional[DeckInfo]:
     """Retorna informações de um deck DESSEM específico, se existir."""
-    for deck in list_available_decks():
-        if deck["name"] == deck_name:
-            return deck
-    return None
+    return _catalog.get(deck_name)
 
 
 def load_deck(deck_name: str) -> Path:
@@ -164,20 +178,8 @@ def load_deck(deck_name: str) -> Path:
     if not zip_path.exists():
         raise FileNotFoundError(f"Deck {deck_name}.zip não encontrado em {decks_dir}")
 
-    if not extract_path.exists():
-        extract_path.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(extract_path)
-
-        # Se extraiu em subpasta única, promover conteúdo
-        extracted_items = list(extract_path.iterdir())
-        if len(extracted_items) == 1 and extracted_items[0].is_dir():
-            inner_dir = extracted_items[0]
-            for item in inner_dir.iterdir():
-                import shutil
-
-                shutil.move(str(item), str(extract_path / item.name))
-            inner_dir.rmdir()
+    # Preparação única por deck, mesmo com chamadas concorrentes
+    ensure_deck_dir(zip_path, extract_path)
 
     return extract_path
 
@@ -219,3 +221,13 @@ def get_deck_display_names_dict(deck_names: List[str]) -> Dict[str, str]:
     """Dicionário nome → nome amigável para vários decks DESSEM."""
     return {name: get_deck_display_name(name) for name in deck_names}
 
+
+
+def ingest_deck(deck_name: str) -> Dict[str, object]:
+    """Prepara um deck DESSEM antes da primeira consulta (ingestão em segundo plano)."""
+    deck_path = load_deck(deck_name)
+    return {"files": len(list_deck_files(str(deck_path)))}
+
+
+# Ingestão em segundo plano de decks novos/alterados (iniciada no startup da API)
+deck_ingestor = DeckIngestor("DESSEM", list_available_decks, ingest_deck)
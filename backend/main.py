@@ -3,12 +3,17 @@ Entry point unificado - FastAPI
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from backend.newave.api import app as newave_app
-from backend.decomp.api import app as decomp_app
-from backend.dessem.api import app as dessem_app
-from backend.core.azure_openai import get_azure_embeddings
-from backend.core.config import safe_print
+from backend.newave import api as newave_api
+from backend.decomp import api as decomp_api
+from backend.dessem import api as dessem_api
+from backend.core.embeddings import get_embeddings
+from backend.core.parse_pool import shutdown_parse_pool
+from backend.core.query_executor import query_executor
+from backend.core import tool_result_cache
+from backend.decomp.utils.parsed_snapshot import shutdown_snapshot_writer
+from backend.core.config import EMBEDDING_BACKEND, safe_print
 
 app = FastAPI(title="NW Multi Agent API")
 
@@ -22,31 +27,111 @@ app.add_middleware(
 )
 
 # Mount agents
-app.mount("/api/newave", newave_app)
-app.mount("/api/decomp", decomp_app)
-app.mount("/api/dessem", dessem_app)
+app.mount("/api/newave", newave_api.app)
+app.mount("/api/decomp", decomp_api.app)
+app.mount("/api/dessem", dessem_api.app)
+
+AGENT_APIS = {"newave": newave_api, "decomp": decomp_api, "dessem": dessem_api}
 
 
 @app.on_event("startup")
 async def validate_embeddings_config() -> None:
     """
-    Valida a configuração de embeddings Azure OpenAI na subida da API.
+    Valida a configuração do backend de embeddings na subida da API.
 
     Garante que as variáveis necessárias estejam presentes e que o modelo
     possa ser instanciado, falhando cedo em caso de configuração inválida.
     """
     try:
-        # Apenas instanciar o objeto já valida presença de endpoint/chave.
-        _ = get_azure_embeddings()
-        safe_print("[AZURE OPENAI] Configuração de embeddings validada com sucesso.")
+        # Apenas instanciar o objeto já valida presença de endpoint/chave (backend azure).
+        _ = get_embeddings()
+        safe_print(f"[EMBEDDINGS] Configuração de embeddings validada com sucesso (backend: {EMBEDDING_BACKEND}).")
     except Exception as exc:
         # Falhar explicitamente para evitar erros tardios em tempo de requisição.
         raise RuntimeError(
-            "[AZURE OPENAI] Falha ao inicializar embeddings. "
-            "Verifique as variáveis de ambiente de Azure OpenAI."
+            "[EMBEDDINGS] Falha ao inicializar embeddings. "
+            "Verifique EMBEDDING_BACKEND e as variáveis de ambiente de Azure OpenAI."
         ) from exc
 
 
+@app.on_event("startup")
+def start_agents() -> None:
+    """
+    Inicia em segundo plano a indexação da documentação e o preload de decks
+    dos três agentes (não bloqueia a subida; ver core/startup.py).
+
+    Os eventos de startup das APIs montadas não são executados pelo app
+    principal, então são disparados aqui (start_background_startup é idempotente).
+    """
+    for agent_api in AGENT_APIS.values():
+        agent_api.start_background_startup()
+
+
+@app.on_event("shutdown")
+def stop_deck_ingestion() -> None:
+    """Para as threads de ingestão de decks."""
+    for agent_api in AGENT_APIS.values():
+        agent_api.deck_ingestor.stop()
+
+
+@app.on_event("shutdown")
+def stop_session_reapers() -> None:
+    """Para os reapers de sessões dos agentes."""
+    for agent_api in AGENT_APIS.values():
+        agent_api.session_store.stop_reaper()
+
+
+@app.on_event("shutdown")
+def stop_query_executor() -> None:
+    """Encerra o pool de threads das queries dos agentes."""
+    query_executor.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_parse_pool() -> None:
+    """Encerra os processos do pool de parse de decks (se tiver sido iniciado)."""
+    shutdown_parse_pool()
+
+
+@app.on_event("shutdown")
+def flush_decomp_snapshots() -> None:
+    """Aguarda a gravação dos snapshots de decks DECOMP ainda pendentes."""
+    shutdown_snapshot_writer()
+
+
 @app.get("/")
 def root():
     return {"status": "ok", "agents": ["newave", "decomp", "dessem"]}
+
+
+@app.get("/health/live")
+def health_live():
+    """Liveness: o processo está atendendo requisições."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+def health_ready():
+    """Readiness: 503 até a inicialização dos três agentes terminar."""
+    agents = {
+        name: {**agent_api.startup_state.get_status(), "preload": agent_api.deck_ingestor.get_progress()}
+        for name, agent_api in AGENT_APIS.items()
+    }
+    ready = all(agent["ready"] for agent in agents.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "agents": agents, "query_executor": query_executor.get_stats()},
+    )
+
+
+@app.get("/admin/tool-cache")
+def get_tool_cache():
+    """Estatísticas do cache de resultados das tools (hit rate, bytes, hits/misses por tool)."""
+    return tool_result_cache.get_cache_stats()
+
+
+@app.delete("/admin/tool-cache")
+def clear_tool_cache():
+    """Limpa o cache de resultados das tools."""
+    tool_result_cache.clear_tool_result_cache()
+    return {"message": "Cache de resultados das tools limpo", "stats": tool_result_cache.get_cache_stats()}
@@ -7,6 +7,7 @@ import math
 import re
 from collections import Counter
 from typing import Dict, Any, List, Optional, Tuple
+from backend.newave.utils.inewave_cache import find_deck_file
 from backend.newave.agents.multi_deck.formatting.base import ComparisonFormatter, DeckData
 from backend.newave.agents.multi_deck.formatting.data_formatters.helpers import (
     extract_data_from_all_decks,
@@ -491,7 +492,7 @@ class ClastComparisonFormatter(ComparisonFormatter):
             
             # Tentar ler do DGER.DAT se o caminho for um diretório válido
             if os.path.isdir(deck_path_str):
-                dger_path = os.path.join(deck_path_str, "DGER.DAT")
+                dger_path = find_deck_file(deck_path_str, "DGER.DAT") or os.path.join(deck_path_str, "DGER.DAT")
                 if not os.path.exists(dger_path):
                     dger_path = os.path.join(deck_path_str, "dger.dat")
                 
@@ -14,7 +14,7 @@ from backend.newave.agents.multi_deck.tools import (
     get_available_tools as get_multi_deck_tools,
     get_tools_for_semantic_matching
 )
-from backend.newave.tools.semantic_matcher import find_best_tool_semantic, find_top_tools_semantic
+from backend.newave.tools.semantic_matcher import find_best_tool_semantic, find_top_tools_semantic, REGISTRY_COMPARISON
 from backend.newave.tools.base import NEWAVETool
 from backend.newave.config import (
     SEMANTIC_MATCHING_ENABLED, 
@@ -26,6 +26,7 @@ from backend.newave.config import (
     DISAMBIGUATION_MIN_SCORE,
     safe_print
 )
+from backend.core.tool_registry import ToolSpec
 from backend.core.utils.debug import write_debug_log
 from backend.core.nodes.tool_router_base import (
     generate_plant_correction_followup,
@@ -75,6 +76,12 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
     selected_decks = state.get("selected_decks", [])
     deck_paths = state.get("deck_paths", {})
     deck_display_names = state.get("deck_display_names", {})
+    # Decks lidos pelas tools de comparação (chave do cache de resultados); vazio desativa o cache
+    comparison_cache_sources = (
+        [deck_paths[name] for name in selected_decks]
+        if selected_decks and all(name in deck_paths for name in selected_decks)
+        else []
+    )
     
     safe_print("[TOOL ROUTER] ===== INÍCIO: comparison_tool_router_node (MULTI-DECK) =====")
     safe_print(f"[TOOL ROUTER] Query: {query[:100]}")
@@ -198,7 +205,12 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
             if tool_name == "MultiDeckComparisonTool":
                 safe_print(f"[TOOL ROUTER] [COMPARISON] Tool é MultiDeckComparisonTool - usando diretamente")
                 first_deck_path = deck_paths.get(selected_decks[0], deck_path) if selected_decks else deck_path
-                tool_instance = tool_class(first_deck_path, selected_decks=selected_decks)
+                tool_instance = ToolSpec(
+                    tool_class,
+                    first_deck_path,
+                    selected_decks=selected_decks,
+                    cache_sources=comparison_cache_sources,
+                )
                 result = tool_instance.execute(query_to_use)
                 
                 tool_result_dict = {
@@ -229,10 +241,12 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
             
             first_deck_path = deck_paths.get(selected_decks[0], deck_path) if selected_decks else deck_path
             # Passar a tool_class diretamente para evitar semantic matching desnecessário
-            multi_tool = MultiDeckComparisonTool(
+            multi_tool = ToolSpec(
+                MultiDeckComparisonTool,
                 first_deck_path, 
                 selected_decks=selected_decks,
-                forced_tool_class=tool_class  # Tool já identificada, passar diretamente
+                forced_tool_class=tool_class,  # Tool já identificada, passar diretamente
+                cache_sources=comparison_cache_sources,
             )
             
             # Executar com a tool já identificada (repassar forced_plant_code se correção de usina)
@@ -290,7 +304,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
             query_to_use = original_query_correction or query
             safe_print(f"[TOOL ROUTER] Query de correção de usina: tool={correction_tool_name}, codigo={plant_code}")
             result = _execute_tool_comparison(
-                selected_tool.__class__, correction_tool_name, query_to_use=query_to_use, forced_plant_code=plant_code
+                selected_tool.tool_class, correction_tool_name, query_to_use=query_to_use, forced_plant_code=plant_code
             )
             result["from_plant_correction"] = True
             return result
@@ -371,7 +385,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                 })
                 # #endregion
                 
-                result = _execute_tool_comparison(selected_tool.__class__, disambiguation_tool_name, query_to_use)
+                result = _execute_tool_comparison(selected_tool.tool_class, disambiguation_tool_name, query_to_use)
                 result["from_disambiguation"] = True
                 safe_print(f"[TOOL ROUTER] [OK] Resultado da tool retornado: success={result.get('tool_result', {}).get('success', False)}")
                 return result
@@ -392,7 +406,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                         tool_name = selected_tool.get_name()
                         safe_print(f"[TOOL ROUTER] ✅ Tool identificada pelo contexto (compatibilidade): {tool_name}")
                         safe_print(f"[TOOL ROUTER]   [COMPARISON] Executando em ambos os decks...")
-                        result = _execute_tool_comparison(selected_tool.__class__, tool_name, original_query)
+                        result = _execute_tool_comparison(selected_tool.tool_class, tool_name, original_query)
                         result["from_disambiguation"] = True
                         return result
                 
@@ -466,7 +480,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                 if tool.get_name() == tool_name:
                     safe_print(f"[TOOL ROUTER]   Tool encontrada: {tool_name}")
                     safe_print(f"[TOOL ROUTER]   [COMPARISON] Executando em ambos os decks...")
-                    result = _execute_tool_comparison(tool.__class__, tool_name)
+                    result = _execute_tool_comparison(tool.tool_class, tool_name)
                     safe_print(f"[TOOL ROUTER] ✅ Tool executada diretamente por palavra-chave prioritária")
                     return result
             
@@ -496,7 +510,8 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                 query_for_semantic, 
                 tools_for_semantic_matching,  # Usar lista filtrada
                 top_n=DISAMBIGUATION_MAX_OPTIONS,
-                threshold=DISAMBIGUATION_MIN_SCORE
+                threshold=DISAMBIGUATION_MIN_SCORE,
+                registry_name=REGISTRY_COMPARISON
             )
             
             # #region agent log
@@ -548,7 +563,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                         "timestamp": int(__import__('time').time() * 1000)
                     })
                     # #endregion
-                    result = _execute_tool_comparison(top_tool.__class__, tool_name, original_query_for_tool)
+                    result = _execute_tool_comparison(top_tool.tool_class, tool_name, original_query_for_tool)
                     result["from_disambiguation"] = True
                     return result
                 
@@ -590,7 +605,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                         "timestamp": int(__import__('time').time() * 1000)
                     })
                     # #endregion
-                    return _execute_tool_comparison(top_tool.__class__, tool_name)
+                    return _execute_tool_comparison(top_tool.tool_class, tool_name)
                 else:
                     safe_print(f"[TOOL ROUTER] ⚠️ Match semântico: melhor score {top_score:.4f} < {SEMANTIC_MATCH_MIN_SCORE:.3f}")
                     safe_print(f"[TOOL ROUTER]   → Nenhuma tool será executada")
@@ -606,7 +621,8 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                             query_for_semantic,
                             tools_for_semantic_matching,  # Usar lista filtrada
                             top_n=1,
-                            threshold=0.0  # Sem threshold mínimo
+                            threshold=0.0,  # Sem threshold mínimo
+                            registry_name=REGISTRY_COMPARISON
                         )
                         if semantic_results:
                             top_tool, top_score = semantic_results[0]
@@ -626,7 +642,7 @@ def comparison_tool_router_node(state: MultiDeckState) -> dict:
                                 "timestamp": int(__import__('time').time() * 1000)
                             })
                             # #endregion
-                            result = _execute_tool_comparison(top_tool.__class__, tool_name, original_query_for_tool)
+                            result = _execute_tool_comparison(top_tool.tool_class, tool_name, original_query_for_tool)
                             result["from_disambiguation"] = True
                             return result
                     except Exception as e:
@@ -3,7 +3,9 @@ Registry de tools para modo Multi-Deck.
 Suporta N decks para comparação dinâmica.
 """
 
+import inspect
 from typing import List, Optional, Set, Type
+from backend.core.tool_registry import ToolSpec
 from backend.newave.tools.base import NEWAVETool
 from backend.newave.tools.carga_mensal_tool import CargaMensalTool
 from backend.newave.tools.clast_valores_tool import ClastValoresTool
@@ -68,37 +70,64 @@ TOOLS_EXCLUDED_FROM_SEMANTIC_MATCHING: Set[Type[NEWAVETool]] = {
 }
 
 
+def _accepts_selected_decks(tool_class: Type[NEWAVETool]) -> bool:
+    """Verifica se o construtor da tool aceita o parâmetro selected_decks."""
+    return "selected_decks" in inspect.signature(tool_class.__init__).parameters
+
+
+def _selected_deck_sources(selected_decks: Optional[List[str]]) -> List[str]:
+    """
+    ZIPs dos decks selecionados, para a chave do cache de resultados (core/tool_result_cache.py).
+
+    Vazio (sem cache) se não houver seleção explícita ou algum deck não estiver no repositório.
+    """
+    from backend.newave.utils.deck_loader import get_deck_by_name
+
+    sources = []
+    for deck_name in selected_decks or []:
+        deck = get_deck_by_name(deck_name)
+        if deck is None:
+            return []
+        sources.append(deck["zip_path"])
+    return sources
+
+
 def get_available_tools(
     deck_path: str, 
     selected_decks: Optional[List[str]] = None
-) -> List[NEWAVETool]:
+) -> List[ToolSpec]:
     """
-    Retorna instâncias de todas as tools disponíveis para modo multi-deck.
+    Retorna referências lazy (ToolSpec) para todas as tools do modo multi-deck.
     
     Esta função retorna TODAS as tools, incluindo as que estão excluídas do
     semantic matching. Use get_tools_for_semantic_matching() para obter apenas
     as tools que devem aparecer no semantic matching.
     
+    Nenhuma tool é instanciada aqui (a MultiDeckComparisonTool, por exemplo,
+    carrega todos os decks selecionados no __init__): somente a tool executada
+    é construída (ver core/tool_registry.py).
+    
     Args:
         deck_path: Caminho do diretório do deck NEWAVE
         selected_decks: Lista de nomes dos decks selecionados para comparação
         
     Returns:
-        Lista de instâncias de tools (todas as tools)
+        Lista de ToolSpec (todas as tools)
     """
     tools = []
     
     for ToolClass in TOOLS_REGISTRY_COMPARISON:
         # Tools que suportam selected_decks
-        if ToolClass in MULTI_DECK_TOOLS:
-            try:
-                tool = ToolClass(deck_path, selected_decks=selected_decks)
-            except TypeError:
-                # Fallback se a tool não aceitar selected_decks
-                tool = ToolClass(deck_path)
+        if ToolClass in MULTI_DECK_TOOLS and _accepts_selected_decks(ToolClass):
+            tool = ToolSpec(
+                ToolClass,
+                deck_path,
+                selected_decks=selected_decks,
+                cache_sources=_selected_deck_sources(selected_decks),
+            )
         else:
-            # Tools de single deck
-            tool = ToolClass(deck_path)
+            # Tools de single deck (ou que não aceitam selected_decks)
+            tool = ToolSpec(ToolClass, deck_path)
         
         tools.append(tool)
     
@@ -109,7 +138,7 @@ def get_tools_for_semantic_matching(
     deck_path: str,
     selected_decks: Optional[List[str]] = None,
     exclude_from_semantic_matching: Optional[Set[Type[NEWAVETool]]] = None
-) -> List[NEWAVETool]:
+) -> List[ToolSpec]:
     """
     Retorna tools disponíveis para semantic matching (excluindo tools desativadas).
     
@@ -125,7 +154,7 @@ def get_tools_for_semantic_matching(
                                        Se None, usa TOOLS_EXCLUDED_FROM_SEMANTIC_MATCHING padrão.
         
     Returns:
-        Lista de instâncias de tools (filtradas para semantic matching)
+        Lista de ToolSpec (filtradas para semantic matching)
     """
     tools_to_exclude = exclude_from_semantic_matching if exclude_from_semantic_matching is not None else TOOLS_EXCLUDED_FROM_SEMANTIC_MATCHING
     
@@ -134,7 +163,7 @@ def get_tools_for_semantic_matching(
     # Filtrar tools excluídas do semantic matching
     filtered_tools = [
         tool for tool in all_tools 
-        if tool.__class__ not in tools_to_exclude
+        if tool.tool_class not in tools_to_exclude
     ]
     
     return filtered_tools
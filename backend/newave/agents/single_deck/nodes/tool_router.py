@@ -9,7 +9,7 @@ Usa funções compartilhadas de shared/agents/nodes/tool_router_base.py.
 from typing import Optional, Dict, Any, List
 from backend.newave.state import SingleDeckState
 from backend.newave.tools import get_available_tools
-from backend.newave.tools.semantic_matcher import find_best_tool_semantic, find_top_tools_semantic
+from backend.newave.tools.semantic_matcher import find_best_tool_semantic, find_top_tools_semantic, REGISTRY_SINGLE
 from backend.newave.tools.base import NEWAVETool
 from backend.newave.config import (
     SEMANTIC_MATCHING_ENABLED, 
@@ -370,7 +370,8 @@ def tool_router_node(state: SingleDeckState) -> dict:
                 query_for_semantic, 
                 tools, 
                 top_n=DISAMBIGUATION_MAX_OPTIONS,
-                threshold=DISAMBIGUATION_MIN_SCORE  # 0.4 - queremos ver todas as tools acima do mínimo
+                threshold=DISAMBIGUATION_MIN_SCORE,  # 0.4 - queremos ver todas as tools acima do mínimo
+                registry_name=REGISTRY_SINGLE
             )
             
             # #region agent log
@@ -465,7 +466,8 @@ def tool_router_node(state: SingleDeckState) -> dict:
                             query_for_semantic,
                             tools,
                             top_n=1,
-                            threshold=0.0  # Sem threshold mínimo
+                            threshold=0.0,  # Sem threshold mínimo
+                            registry_name=REGISTRY_SINGLE
                         )
                         if semantic_results:
                             top_tool, top_score = semantic_results[0]
@@ -40,20 +40,22 @@ if sys.platform == 'win32':
 # ======================================
 
 import uuid
-import shutil
 import zipfile
 from pathlib import Path
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from backend.newave.config import UPLOADS_DIR
 from backend.newave.agent import run_query as single_deck_run_query, run_query_stream as single_deck_run_query_stream
 from backend.newave.agents.multi_deck.graph import run_query as multi_deck_run_query, run_query_stream as multi_deck_run_query_stream
 from backend.newave.rag import index_documentation
-from backend.newave.utils.deck_loader import list_available_decks, load_deck
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from backend.newave.utils.deck_loader import deck_ingestor, list_available_decks, load_deck
+from backend.core.deck_upload import ERROR as UPLOAD_ERROR, PENDING as UPLOAD_PENDING, DeckUploadManager
+from backend.core.query_executor import QueryExecutorSaturated, query_executor
+from backend.core.session_store import SessionStore
+from backend.core.startup import StartupState
+from backend.core.utils.zip_deck import list_deck_files
 
 
 app = FastAPI(
@@ -76,8 +78,6 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-sessions: dict[str, Path] = {}
-
 
 class QueryRequest(BaseModel):
     session_id: str
@@ -98,6 +98,9 @@ class UploadResponse(BaseModel):
     session_id: str
     message: str
     files_count: int
+    status: str | None = None  # /upload: "processando", "pronto" ou "erro"
+    sha256: str | None = None
+    duplicate_of: str | None = None
 
 
 class IndexResponse(BaseModel):
@@ -107,99 +110,70 @@ class IndexResponse(BaseModel):
 
 
 
-def preload_newave_decks():
+# Indexação da documentação e preload de decks rodam em threads de fundo:
+# o servidor aceita requisições logo após o startup (ver core/startup.py)
+startup_state = StartupState("NEWAVE")
+
+
+def _release_session(session_id: str, deck_path: Path) -> None:
+    """Esquece o upload da sessão e os VAZOES.DAT mapeados do diretório dela."""
+    from backend.newave.utils.vazoes_mmap import evict_vazoes_dir
+
+    uploads.forget(session_id)
+    # Deck do repositório: os mapeamentos continuam valendo para as outras sessões.
+    # O cache do inewave é por conteúdo: as entradas saem pelo LRU
+    if deck_path.parent == UPLOADS_DIR:
+        evict_vazoes_dir(str(deck_path))
+
+
+# Sessões (session_id -> deck e decks da comparação), com TTL e persistência (ver core/session_store.py)
+session_store = SessionStore("NEWAVE", UPLOADS_DIR, on_remove=_release_session)
+
+# Decks enviados por /upload: gravados em streaming e preparados em segundo plano
+uploads = DeckUploadManager("NEWAVE", UPLOADS_DIR, list_available_decks, load_deck, session_store.put)
+
+
+def _index_documentation() -> int:
+    count = index_documentation()
+    print(f"📚 Documentação indexada: {count} documentos")
+    return count
+
+
+def start_background_startup() -> None:
     """
-    Preload de todos os decks NEWAVE disponíveis.
-    Garante que todos os decks estejam extraídos (prontos para uso).
-    Executa de forma síncrona no startup.
+    Inicia a indexação da documentação e o preload de decks em segundo plano.
+
+    O preload é a ingestão de decks (deck_ingestor), do mais recente para o
+    mais antigo; decks ainda não aquecidos são preparados sob demanda por
+    load_deck(). Idempotente: também é chamada pelo app unificado (main.py).
     """
-    try:
-        print("\n" + "="*60)
-        print("[PRELOAD NEWAVE] ⚡ Iniciando preload de decks...")
-        print("="*60)
-        start_time = time.time()
-        
-        # Listar todos os decks disponíveis
-        available_decks = list_available_decks()
-        
-        if not available_decks:
-            print("[PRELOAD NEWAVE] ⚠️ Nenhum deck NEWAVE encontrado")
-            return
-        
-        print(f"[PRELOAD NEWAVE] 📦 Encontrados {len(available_decks)} decks")
-        
-        # Extrair todos os decks em paralelo
-        max_workers = min(8, len(available_decks))
-        extracted_count = 0
-        already_extracted = 0
-        error_count = 0
-        errors_detail = []
-        
-        def extract_single_deck(deck_info):
-            """Extrai um deck se necessário."""
-            try:
-                deck_name = deck_info["name"]
-                deck_path = load_deck(deck_name)  # Já extrai se necessário
-                if deck_info.get("extracted_path"):
-                    return (deck_name, "already_extracted", None)
-                return (deck_name, "extracted", None)
-            except Exception as e:
-                return (deck_info.get('name', 'unknown'), "error", str(e))
-        
-        print(f"[PRELOAD NEWAVE] 🔄 Processando {len(available_decks)} decks em paralelo ({max_workers} workers)...")
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(extract_single_deck, deck): deck 
-                for deck in available_decks
-            }
-            
-            for future in as_completed(futures):
-                deck_name, status, error = future.result()
-                if status == "extracted":
-                    extracted_count += 1
-                elif status == "already_extracted":
-                    already_extracted += 1
-                else:
-                    error_count += 1
-                    errors_detail.append((deck_name, error))
-                    if error:
-                        print(f"[PRELOAD NEWAVE] ⚠️ Erro ao extrair {deck_name}: {error}")
-                
-                total_processed = extracted_count + already_extracted + error_count
-                if total_processed % 10 == 0:
-                    print(f"[PRELOAD NEWAVE] ✅ {total_processed}/{len(available_decks)} decks processados...")
-        
-        elapsed = time.time() - start_time
-        
-        print("\n" + "-"*60)
-        print(f"[PRELOAD NEWAVE] ✅ Preload concluído em {elapsed:.2f}s")
-        print(f"[PRELOAD NEWAVE]   📊 Decks extraídos: {extracted_count}")
-        print(f"[PRELOAD NEWAVE]   ✅ Já extraídos: {already_extracted}")
-        print(f"[PRELOAD NEWAVE]   ❌ Erros: {error_count}")
-        if error_count > 0:
-            print(f"[PRELOAD NEWAVE]   ⚠️ Decks com erro: {[e[0] for e in errors_detail[:5]]}")
-        print("="*60 + "\n")
-        
-    except Exception as e:
-        print(f"\n[PRELOAD NEWAVE] ❌ Erro crítico no preload: {e}")
-        import traceback
-        traceback.print_exc()
-        print("="*60 + "\n")
+    startup_state.run_in_background("index_documentation", _index_documentation)
+    deck_ingestor.start()
+    session_store.start_reaper(after_reap=lambda: uploads.collect(session_store.ttl_seconds))
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Executa no startup do servidor, ANTES de aceitar requisições."""
-    # 1. Indexar documentação primeiro
-    try:
-        count = index_documentation()
-        print(f"📚 Documentação indexada: {count} documentos")
-    except Exception as e:
-        print(f"⚠️ Erro ao indexar documentação: {e}")
-    
-    # 2. Preload síncrono de decks (bloqueia até terminar)
-    preload_newave_decks()
+    """Executa no startup do servidor NEWAVE (não bloqueia: tarefas em segundo plano)."""
+    start_background_startup()
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness: o processo está atendendo requisições."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 503 até a inicialização terminar; inclui o progresso do preload de decks."""
+    status = {
+        **startup_state.get_status(),
+        "preload": deck_ingestor.get_progress(),
+        "query_executor": query_executor.get_stats(),
+        "sessions": session_store.get_stats(),
+    }
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
 
 
 @app.get("/")
@@ -218,75 +192,86 @@ async def upload_deck(file: UploadFile = File(...)):
     Retorna um session_id para uso nas queries.
     """
     if not file.filename.endswith(".zip"):
-        raise HTTPException(
-            status_code=400,
-            detail="Apenas arquivos .zip são aceitos"
-        )
-    
-    session_id = str(uuid.uuid4())
-    session_path = UPLOADS_DIR / session_id
-    session_path.mkdir(parents=True, exist_ok=True)
-    
-    zip_path = session_path / file.filename
-    with open(zip_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(session_path)
-    
-    zip_path.unlink()
-    
-    extracted_items = list(session_path.iterdir())
-    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-        inner_dir = extracted_items[0]
-        for item in inner_dir.iterdir():
-            shutil.move(str(item), str(session_path / item.name))
-        inner_dir.rmdir()
-    
-    files_count = len(list(session_path.glob("*")))
-    sessions[session_id] = session_path
-    
+        raise HTTPException(status_code=400, detail="Apenas arquivos .zip são aceitos")
+
+    # Gravado em disco em blocos; o deck é preparado em segundo plano (ver core/deck_upload.py)
+    try:
+        upload = await uploads.accept(file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Arquivo .zip inválido")
+
     return UploadResponse(
-        session_id=session_id,
-        message="Deck NEWAVE carregado com sucesso",
-        files_count=files_count
+        session_id=upload["session_id"],
+        message=f"Deck NEWAVE recebido; preparação em andamento (GET /upload/{upload['session_id']})",
+        files_count=upload["files_count"],
+        status=upload["status"],
+        sha256=upload["sha256"],
+        duplicate_of=upload["duplicate_of"],
     )
 
 
+@app.get("/upload/{session_id}")
+async def get_upload_status(session_id: str):
+    """Status da preparação de um deck enviado por /upload."""
+    status = uploads.get_status(session_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Upload {session_id} não encontrado")
+    return status
+
+
+async def _wait_for_upload(session_id: str) -> None:
+    """
+    Aguarda a preparação do deck de uma sessão criada por /upload (registrada no store ao ficar pronta).
+
+    Se a preparação falhou ou ainda não terminou, responde com o status do
+    upload em vez de "sessão não encontrada".
+    """
+    await uploads.wait_ready(session_id)
+    status = uploads.get_status(session_id)
+    if status is None:
+        return
+    if status["status"] == UPLOAD_ERROR:
+        raise HTTPException(status_code=422, detail=f"Erro ao preparar o deck enviado: {status['error']}")
+    if status["status"] == UPLOAD_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Deck da sessão {session_id} ainda em preparação",
+            headers={"Retry-After": "5"},
+        )
+
+
 @app.post("/query", response_model=QueryResponse)
 async def query_deck(request: QueryRequest):
     """
     Envia uma pergunta sobre o deck NEWAVE.
     Requer um session_id válido de um upload anterior.
     """
+    await _wait_for_upload(request.session_id)
     session_id = request.session_id
     
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Sessão {session_id} não encontrada. Faça upload do deck primeiro."
-            )
+    session_path = session_store.get(session_id)
+    if session_path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Sessão {session_id} não encontrada. Faça upload do deck primeiro."
+        )
     
-    deck_path = str(sessions[session_id])
+    deck_path = str(session_path)
     analysis_mode = request.analysis_mode or "single"
     
     try:
         if analysis_mode == "comparison":
             # Obter decks selecionados da sessão de comparação
-            selected_decks = comparison_sessions.get(session_id)
-            result = multi_deck_run_query(
+            selected_decks = session_store.get_selected_decks(session_id)
+            result = await query_executor.run(
+                multi_deck_run_query,
                 request.query, 
                 deck_path, 
                 session_id=session_id,
                 selected_decks=selected_decks
             )
         else:
-            result = single_deck_run_query(request.query, deck_path, session_id=session_id)
+            result = await query_executor.run(single_deck_run_query, request.query, deck_path, session_id=session_id)
         
         return QueryResponse(
             session_id=session_id,
@@ -296,6 +281,8 @@ async def query_deck(request: QueryRequest):
             comparison_data=result.get("comparison_data"),
             visualization_data=result.get("visualization_data")
         )
+    except QueryExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -309,26 +296,24 @@ async def query_deck_stream(request: QueryRequest):
     Envia uma pergunta sobre o deck NEWAVE com streaming de eventos.
     Retorna Server-Sent Events (SSE) com o progresso da execução.
     """
+    await _wait_for_upload(request.session_id)
     session_id = request.session_id
     analysis_mode = request.analysis_mode or "single"
     
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Sessão {session_id} não encontrada. Faça upload do deck primeiro."
-            )
+    session_path = session_store.get(session_id)
+    if session_path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Sessão {session_id} não encontrada. Faça upload do deck primeiro."
+        )
     
-    deck_path = str(sessions[session_id])
+    deck_path = str(session_path)
+    # Decks selecionados da sessão de comparação
+    selected_decks = session_store.get_selected_decks(session_id)
     
     def event_generator():
         try:
             if analysis_mode == "comparison":
-                # Obter decks selecionados da sessão de comparação
-                selected_decks = comparison_sessions.get(session_id)
                 yield from multi_deck_run_query_stream(
                     request.query, 
                     deck_path, 
@@ -341,8 +326,13 @@ async def query_deck_stream(request: QueryRequest):
             import json
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
     
+    try:
+        events = query_executor.stream(event_generator)
+    except QueryExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
     return StreamingResponse(
-        event_generator(),
+        events,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -357,18 +347,15 @@ async def get_session(session_id: str):
     """
     Retorna informações sobre uma sessão.
     """
-    if session_id not in sessions:
-        session_path = UPLOADS_DIR / session_id
-        if session_path.exists():
-            sessions[session_id] = session_path
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Sessão {session_id} não encontrada"
-            )
+    await _wait_for_upload(session_id)
+    session_path = session_store.get(session_id)
+    if session_path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Sessão {session_id} não encontrada"
+        )
     
-    session_path = sessions[session_id]
-    files = [f.name for f in session_path.glob("*") if f.is_file()]
+    files = list_deck_files(str(session_path))
     
     return {
         "session_id": session_id,
@@ -383,13 +370,7 @@ async def delete_session(session_id: str):
     """
     Remove uma sessão e seus arquivos.
     """
-    session_path = UPLOADS_DIR / session_id
-    
-    if session_path.exists():
-        shutil.rmtree(session_path)
-    
-    if session_id in sessions:
-        del sessions[session_id]
+    session_store.delete(session_id)
     
     return {"message": f"Sessão {session_id} removida com sucesso"}
 
@@ -441,10 +422,6 @@ class ComparisonInitResponse(BaseModel):
     files_count: int
 
 
-# Armazenar decks selecionados por sessão
-comparison_sessions: dict[str, list[str]] = {}
-
-
 @app.get("/decks/list", response_model=DecksListResponse)
 async def list_decks():
     """
@@ -493,9 +470,9 @@ async def load_deck_from_repo(request: LoadDeckRequest):
         
         # Criar sessao referenciando o deck original (sem copiar)
         session_id = str(uuid.uuid4())
-        sessions[session_id] = deck_path
+        session_store.put(session_id, deck_path)
         
-        files_count = len(list(deck_path.glob("*")))
+        files_count = len(list_deck_files(str(deck_path)))
         
         return UploadResponse(
             session_id=session_id,
@@ -565,11 +542,10 @@ async def init_comparison_mode(request: InitComparisonRequest = None):
         
         # Criar sessão
         session_id = str(uuid.uuid4())
-        sessions[session_id] = first_deck_path
-        comparison_sessions[session_id] = selected_deck_names
+        session_store.put(session_id, first_deck_path, selected_decks=selected_deck_names)
         
         # Contar arquivos do primeiro deck
-        files_count = len(list(first_deck_path.glob("*")))
+        files_count = len(list_deck_files(str(first_deck_path)))
         
         # Preparar informações dos decks selecionados
         selected_decks_info = [
@@ -597,6 +573,20 @@ async def init_comparison_mode(request: InitComparisonRequest = None):
         )
 
 
+@app.get("/decks/ingestion")
+async def get_deck_ingestion_status():
+    """Status da ingestão em segundo plano por deck (pendente, processando, pronto, erro)."""
+    return deck_ingestor.get_status()
+
+
+@app.post("/decks/ingestion/{deck_name}")
+async def ingest_deck_now(deck_name: str):
+    """Enfileira a (re)ingestão de um deck."""
+    if not deck_ingestor.ingest_now(deck_name):
+        raise HTTPException(status_code=404, detail=f"Deck {deck_name} não encontrado")
+    return {"message": f"Deck {deck_name} na fila de ingestão", "status": deck_ingestor.get_status()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,6 +1,7 @@
 """
 Configurações específicas do NEWAVE Agent.
 """
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 from backend.core.config import *
@@ -21,6 +22,14 @@ NEWAVE_DECKS_DIR.mkdir(parents=True, exist_ok=True)
 NEWAVE_DOCS_DIR.mkdir(parents=True, exist_ok=True)
 NEWAVE_CHROMA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Cache de arquivos lidos com inewave (ver utils/inewave_cache.py)
+# Número máximo de arquivos parseados mantidos em memória (todas as classes e decks)
+NEWAVE_FILE_CACHE_SIZE = int(os.getenv("NEWAVE_FILE_CACHE_SIZE", "256"))
+
+# Número de postos por registro do VAZOES.DAT (largura fixa, não declarada no arquivo;
+# 320 é o padrão do inewave). Usado pelo leitor memory-mapped (ver utils/vazoes_mmap.py)
+NEWAVE_VAZOES_POSTOS = int(os.getenv("NEWAVE_VAZOES_POSTOS", "320"))
+
 # Todas as configurações compartilhadas são importadas de shared.config via "from backend.core.config import *"
 # Apenas configurações específicas do NEWAVE permanecem aqui
 
@@ -1,6 +1,7 @@
 """
 Módulo de Tools pré-programadas para consultas frequentes ao NEWAVE.
 """
+from backend.core.tool_registry import ToolSpec
 from backend.newave.tools.carga_mensal_tool import CargaMensalTool
 from backend.newave.tools.clast_valores_tool import ClastValoresTool
 from backend.newave.tools.expt_operacao_tool import ExptOperacaoTool
@@ -52,19 +53,22 @@ TOOLS_REGISTRY = TOOLS_REGISTRY_SINGLE
 
 def get_available_tools(deck_path: str, analysis_mode: str = "single"):
     """
-    Retorna instancias de todas as tools disponiveis.
+    Retorna referencias lazy (ToolSpec) para todas as tools disponiveis.
+    
+    Nenhuma tool e instanciada aqui: o roteamento usa apenas nome e descricao,
+    e somente a tool executada e construida (ver core/tool_registry.py).
     
     Args:
         deck_path: Caminho do diretorio do deck NEWAVE
         analysis_mode: Modo de analise ("single" ou "comparison")
         
     Returns:
-        Lista de instancias de tools
+        Lista de ToolSpec
     """
     if analysis_mode == "comparison":
         registry = TOOLS_REGISTRY_COMPARISON
     else:
         registry = TOOLS_REGISTRY_SINGLE
     
-    return [ToolClass(deck_path) for ToolClass in registry]
+    return [ToolSpec(ToolClass, deck_path) for ToolClass in registry]
 
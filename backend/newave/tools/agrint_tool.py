@@ -10,6 +10,7 @@ import re
 from typing import Dict, Any, Optional
 from datetime import datetime
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 class AgrintTool(NEWAVETool):
     """
@@ -133,7 +134,7 @@ class AgrintTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo AGRINT.DAT...")
-            agrint_path = os.path.join(self.deck_path, "AGRINT.DAT")
+            agrint_path = find_deck_file(self.deck_path, "AGRINT.DAT") or os.path.join(self.deck_path, "AGRINT.DAT")
             
             if not os.path.exists(agrint_path):
                 agrint_path_lower = os.path.join(self.deck_path, "agrint.dat")
@@ -151,7 +152,7 @@ class AgrintTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            agrint = Agrint.read(agrint_path)
+            agrint = get_cached_file(Agrint, agrint_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Acessar propriedades
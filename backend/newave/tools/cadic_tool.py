@@ -10,6 +10,7 @@ import pandas as pd
 import re
 from typing import Dict, Any, Optional
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 class CadicTool(NEWAVETool):
     """
@@ -261,7 +262,7 @@ class CadicTool(NEWAVETool):
         
         Fluxo:
         1. Verifica existência do C_ADIC.DAT
-        2. Lê com inewave (Cadic.read())
+        2. Lê com inewave (Cadic, via cache compartilhado)
         3. Acessa propriedade cargas (DataFrame)
         4. Aplica filtros (subsistema, período, tipo)
         5. Processa e retorna dados
@@ -273,7 +274,7 @@ class CadicTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo C_ADIC.DAT...")
-            cadic_path = os.path.join(self.deck_path, "C_ADIC.DAT")
+            cadic_path = find_deck_file(self.deck_path, "C_ADIC.DAT") or os.path.join(self.deck_path, "C_ADIC.DAT")
             
             if not os.path.exists(cadic_path):
                 cadic_path = os.path.join(self.deck_path, "c_adic.dat")
@@ -290,7 +291,7 @@ class CadicTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            cadic = Cadic.read(cadic_path)
+            cadic = get_cached_file(Cadic, cadic_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Verificar se há dados
@@ -308,11 +309,11 @@ class CadicTool(NEWAVETool):
             # ETAPA 4: Ler Sistema.DAT para obter lista de subsistemas (para busca por nome)
             sistema = None
             try:
-                sistema_path = os.path.join(self.deck_path, "SISTEMA.DAT")
+                sistema_path = find_deck_file(self.deck_path, "SISTEMA.DAT") or os.path.join(self.deck_path, "SISTEMA.DAT")
                 if not os.path.exists(sistema_path):
                     sistema_path = os.path.join(self.deck_path, "sistema.dat")
                 if os.path.exists(sistema_path):
-                    sistema = Sistema.read(sistema_path)
+                    sistema = get_cached_file(Sistema, sistema_path)
                     debug_print("[TOOL] ✅ SISTEMA.DAT lido para auxiliar busca de subsistemas")
             except Exception as e:
                 debug_print(f"[TOOL] ⚠️ Não foi possível ler SISTEMA.DAT: {e}")
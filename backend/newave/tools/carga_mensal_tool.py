@@ -4,6 +4,7 @@ Acessa o arquivo SISTEMA.DAT, propriedade mercado_energia.
 """
 from backend.newave.tools.base import NEWAVETool
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 from inewave.newave import Sistema
 import os
 import pandas as pd
@@ -209,7 +210,7 @@ class CargaMensalTool(NEWAVETool):
         debug_print(f"[TOOL] Deck path: {self.deck_path}")
         
         try:
-            sistema_path = os.path.join(self.deck_path, "SISTEMA.DAT")
+            sistema_path = find_deck_file(self.deck_path, "SISTEMA.DAT") or os.path.join(self.deck_path, "SISTEMA.DAT")
             
             if not os.path.exists(sistema_path):
                 sistema_path_upper = os.path.join(self.deck_path, "SISTEMA.DAT")
@@ -229,7 +230,7 @@ class CargaMensalTool(NEWAVETool):
             
             debug_print(f"[TOOL] ✅ Arquivo encontrado: {sistema_path}")
             
-            sistema = Sistema.read(sistema_path)
+            sistema = get_cached_file(Sistema, sistema_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             df_mercado = sistema.mercado_energia
@@ -11,6 +11,7 @@ import re
 from typing import Dict, Any, Optional
 from backend.newave.config import debug_print, safe_print
 from backend.newave.utils.thermal_plant_matcher import get_thermal_plant_matcher
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 class ClastValoresTool(NEWAVETool):
     """
@@ -148,6 +149,47 @@ class ClastValoresTool(NEWAVETool):
         
         return None
     
+    def _find_clast_path(self) -> Optional[str]:
+        """Caminho do CLAST.DAT do deck, ou None se não existir."""
+        clast_path = find_deck_file(self.deck_path, "CLAST.DAT") or os.path.join(self.deck_path, "CLAST.DAT")
+        if os.path.exists(clast_path):
+            return clast_path
+        clast_path_lower = os.path.join(self.deck_path, "clast.dat")
+        if os.path.exists(clast_path_lower):
+            return clast_path_lower
+        return None
+    
+    def _extract_params(self, query: str, clast: Clast, **kwargs) -> Dict[str, Any]:
+        """
+        Parâmetros da consulta extraídos da query: todo o resultado de execute()
+        depende só deles (e do deck).
+        
+        Args:
+            query: Query do usuário
+            clast: Objeto Clast já lido
+            **kwargs: forced_plant_code (código da classe corrigido pelo usuário)
+            
+        Returns:
+            Dict com is_cvu, tipo_valor, codigo_classe e tipo_combustivel
+        """
+        forced_plant_code = kwargs.get("forced_plant_code")
+        return {
+            "is_cvu": self._is_cvu_query(query),
+            "tipo_valor": self._extract_tipo_valor(query),
+            "codigo_classe": (
+                forced_plant_code if forced_plant_code is not None
+                else self._extract_classe_from_query(query, clast)
+            ),
+            "tipo_combustivel": self._extract_tipo_combustivel(query),
+        }
+    
+    def get_cache_params(self, query: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Parâmetros extraídos da query, para o cache de resultados (ver BaseTool)."""
+        clast_path = self._find_clast_path()
+        if clast_path is None:
+            return None
+        return self._extract_params(query, get_cached_file(Clast, clast_path), **kwargs)
+    
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         """
         Executa a consulta de valores estruturais e/ou conjunturais.
@@ -166,35 +208,33 @@ class ClastValoresTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo CLAST.DAT...")
-            clast_path = os.path.join(self.deck_path, "CLAST.DAT")
+            clast_path = self._find_clast_path()
             
-            if not os.path.exists(clast_path):
-                clast_path_lower = os.path.join(self.deck_path, "clast.dat")
-                if os.path.exists(clast_path_lower):
-                    clast_path = clast_path_lower
-                else:
-                    safe_print(f"[TOOL] ❌ Arquivo CLAST.DAT não encontrado")
-                    return {
-                        "success": False,
-                        "error": f"Arquivo CLAST.DAT não encontrado em {self.deck_path}",
-                        "tool": self.get_name()
-                    }
+            if clast_path is None:
+                safe_print(f"[TOOL] ❌ Arquivo CLAST.DAT não encontrado")
+                return {
+                    "success": False,
+                    "error": f"Arquivo CLAST.DAT não encontrado em {self.deck_path}",
+                    "tool": self.get_name()
+                }
             
             debug_print(f"[TOOL] ✅ Arquivo encontrado: {clast_path}")
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            clast = Clast.read(clast_path)
+            clast = get_cached_file(Clast, clast_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
+            params = self._extract_params(query, clast, **kwargs)
+            
             # ETAPA 3: Verificar se é query de CVU (sempre retornar todos os anos)
-            is_cvu = self._is_cvu_query(query)
+            is_cvu = params["is_cvu"]
             if is_cvu:
                 debug_print("[TOOL] ✅ Query de CVU detectada - retornando TODOS OS ANOS (sem filtro por ano)")
             
             # ETAPA 4: Identificar tipo de valor solicitado
             debug_print("[TOOL] ETAPA 4: Identificando tipo de valor solicitado...")
-            tipo_valor = self._extract_tipo_valor(query)
+            tipo_valor = params["tipo_valor"]
             debug_print(f"[TOOL] Tipo de valor identificado: {tipo_valor or 'ambos (estrutural e conjuntural)'}")
             
             # ETAPA 5: Identificar filtros
@@ -203,10 +243,8 @@ class ClastValoresTool(NEWAVETool):
             forced_plant_code = kwargs.get("forced_plant_code")
             if forced_plant_code is not None:
                 debug_print(f"[TOOL] Usando código forçado (correção): {forced_plant_code}")
-                codigo_classe = forced_plant_code
-            else:
-                codigo_classe = self._extract_classe_from_query(query, clast)
-            tipo_combustivel = self._extract_tipo_combustivel(query)
+            codigo_classe = params["codigo_classe"]
+            tipo_combustivel = params["tipo_combustivel"]
             
             if codigo_classe is not None:
                 debug_print(f"[TOOL] ✅ Filtro por classe: {codigo_classe}")
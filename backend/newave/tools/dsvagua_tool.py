@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from difflib import SequenceMatcher
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 
 class DsvaguaTool(NEWAVETool):
@@ -49,7 +50,7 @@ class DsvaguaTool(NEWAVETool):
         debug_print("[TOOL] Carregando mapeamento código → nome do CONFHD.DAT...")
         
         # Tentar encontrar CONFHD.DAT
-        confhd_path = os.path.join(self.deck_path, "CONFHD.DAT")
+        confhd_path = find_deck_file(self.deck_path, "CONFHD.DAT") or os.path.join(self.deck_path, "CONFHD.DAT")
         if not os.path.exists(confhd_path):
             confhd_path = os.path.join(self.deck_path, "confhd.dat")
         
@@ -60,7 +61,7 @@ class DsvaguaTool(NEWAVETool):
             return self._mapeamento_codigo_nome
         
         try:
-            confhd = Confhd.read(confhd_path)
+            confhd = get_cached_file(Confhd, confhd_path)
             
             if confhd.usinas is None or confhd.usinas.empty:
                 debug_print("[TOOL] ⚠️ Nenhuma usina encontrada no CONFHD.DAT")
@@ -268,7 +269,7 @@ class DsvaguaTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo DSVAGUA.DAT...")
-            dsvagua_path = os.path.join(self.deck_path, "DSVAGUA.DAT")
+            dsvagua_path = find_deck_file(self.deck_path, "DSVAGUA.DAT") or os.path.join(self.deck_path, "DSVAGUA.DAT")
             
             if not os.path.exists(dsvagua_path):
                 dsvagua_path = os.path.join(self.deck_path, "dsvagua.dat")
@@ -284,7 +285,7 @@ class DsvaguaTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            dsvagua = Dsvagua.read(dsvagua_path)
+            dsvagua = get_cached_file(Dsvagua, dsvagua_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Verificar se há dados
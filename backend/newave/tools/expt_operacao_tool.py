@@ -10,6 +10,7 @@ import re
 from typing import Dict, Any, Optional
 from backend.newave.config import debug_print, safe_print
 from backend.newave.utils.thermal_plant_matcher import get_thermal_plant_matcher
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 class ExptOperacaoTool(NEWAVETool):
     """
@@ -189,7 +190,7 @@ class ExptOperacaoTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo EXPT.DAT...")
-            expt_path = os.path.join(self.deck_path, "EXPT.DAT")
+            expt_path = find_deck_file(self.deck_path, "EXPT.DAT") or os.path.join(self.deck_path, "EXPT.DAT")
             
             if not os.path.exists(expt_path):
                 expt_path_lower = os.path.join(self.deck_path, "expt.dat")
@@ -207,7 +208,7 @@ class ExptOperacaoTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            expt = Expt.read(expt_path)
+            expt = get_cached_file(Expt, expt_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Verificar se há dados
@@ -3,13 +3,14 @@ Tool para consultar informações cadastrais das usinas hidrelétricas do HIDR.D
 Acessa dados físicos e operacionais básicos das usinas hidrelétricas.
 """
 from backend.newave.tools.base import NEWAVETool
-from inewave.newave import Hidr
 import os
 import pandas as pd
 import re
 from typing import Dict, Any, Optional
 from difflib import SequenceMatcher
+from backend.newave.utils.inewave_cache import find_deck_file
 from backend.newave.config import debug_print, safe_print
+from backend.core.utils.hidr_reader import HidrCadastro, get_hidr_cadastro
 
 
 class HidrCadastroTool(NEWAVETool):
@@ -80,7 +81,7 @@ class HidrCadastroTool(NEWAVETool):
         ]
         return any(kw in query_lower for kw in keywords)
     
-    def _extract_usina_from_query(self, query: str, hidr: Hidr) -> Optional[tuple]:
+    def _extract_usina_from_query(self, query: str, hidr: HidrCadastro) -> Optional[tuple]:
         """
         Extrai código da usina da query usando HydraulicPlantMatcher unificado.
         
@@ -88,7 +89,7 @@ class HidrCadastroTool(NEWAVETool):
         
         Args:
             query: Query do usuário
-            hidr: Objeto Hidr já lido
+            hidr: HIDR.DAT já mapeado (get_hidr_cadastro)
             
         Returns:
             Tupla (código_usina, idx_real) onde:
@@ -342,7 +343,7 @@ class HidrCadastroTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo HIDR.DAT...")
-            hidr_path = os.path.join(self.deck_path, "HIDR.DAT")
+            hidr_path = find_deck_file(self.deck_path, "HIDR.DAT") or os.path.join(self.deck_path, "HIDR.DAT")
             
             if not os.path.exists(hidr_path):
                 hidr_path_lower = os.path.join(self.deck_path, "hidr.dat")
@@ -358,9 +359,9 @@ class HidrCadastroTool(NEWAVETool):
             
             debug_print(f"[TOOL] ✅ Arquivo encontrado: {hidr_path}")
             
-            # ETAPA 2: Ler arquivo usando inewave
-            debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            hidr = Hidr.read(hidr_path)
+            # ETAPA 2: Mapear arquivo (leitor memory-mapped compartilhado NEWAVE/DECOMP)
+            debug_print("[TOOL] ETAPA 2: Mapeando arquivo HIDR.DAT...")
+            hidr = get_hidr_cadastro(hidr_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Verificar se há dados
@@ -435,18 +436,12 @@ class HidrCadastroTool(NEWAVETool):
             nome_arquivo_csv, _, _ = matcher.code_to_names[codigo_usina]
             debug_print(f"[TOOL]   Buscando usina '{nome_arquivo_csv}' no DataFrame original pelo nome")
             
-            # Buscar pelo nome no DataFrame original
-            nome_upper = nome_arquivo_csv.upper().strip()
+            # Buscar pelo nome no índice nome -> código do HIDR.DAT
             row = None
-            idx_real_encontrado = None
-            
-            for idx, df_row in cadastro.iterrows():
-                nome_df = str(df_row.get('nome_usina', '')).upper().strip()
-                if nome_df == nome_upper:
-                    row = df_row
-                    idx_real_encontrado = idx
-                    debug_print(f"[TOOL] ✅ Usina encontrada no DataFrame original: idx={idx_real_encontrado}, nome='{nome_df}'")
-                    break
+            idx_real_encontrado = hidr.codigo(nome_arquivo_csv)
+            if idx_real_encontrado is not None:
+                row = cadastro.loc[idx_real_encontrado]
+                debug_print(f"[TOOL] ✅ Usina encontrada no DataFrame original: idx={idx_real_encontrado}, nome='{hidr.nome(idx_real_encontrado)}'")
             
             if row is None:
                 safe_print(f"[TOOL] ❌ Usina '{nome_arquivo_csv}' não encontrada no DataFrame original")
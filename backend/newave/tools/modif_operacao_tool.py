@@ -9,6 +9,7 @@ import pandas as pd
 import re
 from typing import Dict, Any, Optional
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 class ModifOperacaoTool(NEWAVETool):
     """
@@ -479,7 +480,7 @@ class ModifOperacaoTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo MODIF.DAT...")
-            modif_path = os.path.join(self.deck_path, "MODIF.DAT")
+            modif_path = find_deck_file(self.deck_path, "MODIF.DAT") or os.path.join(self.deck_path, "MODIF.DAT")
             
             if not os.path.exists(modif_path):
                 modif_path_lower = os.path.join(self.deck_path, "modif.dat")
@@ -497,7 +498,7 @@ class ModifOperacaoTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            modif = Modif.read(modif_path)
+            modif = get_cached_file(Modif, modif_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Verificar se há dados
@@ -9,6 +9,7 @@ import pandas as pd
 import re
 from typing import Dict, Any, List, Optional
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 from backend.newave.utils.deck_loader import (
     list_available_decks,
     load_multiple_decks,
@@ -498,7 +499,7 @@ class MudancasGeracoesTermicasTool(NEWAVETool):
         Returns:
             Objeto Expt ou None se não encontrado
         """
-        expt_path = os.path.join(deck_path, "EXPT.DAT")
+        expt_path = find_deck_file(deck_path, "EXPT.DAT") or os.path.join(deck_path, "EXPT.DAT")
         if not os.path.exists(expt_path):
             expt_path_lower = os.path.join(deck_path, "expt.dat")
             if os.path.exists(expt_path_lower):
@@ -508,7 +509,7 @@ class MudancasGeracoesTermicasTool(NEWAVETool):
                 return None
         
         try:
-            expt = Expt.read(expt_path)
+            expt = get_cached_file(Expt, expt_path)
             return expt
         except Exception as e:
             safe_print(f"[TOOL] ❌ Erro ao ler EXPT.DAT: {e}")
@@ -567,12 +568,12 @@ class MudancasGeracoesTermicasTool(NEWAVETool):
             try:
                 from inewave.newave import Term
                 deck_path_ref = get_december_deck_path()
-                term_path = os.path.join(deck_path_ref, "TERM.DAT")
+                term_path = find_deck_file(deck_path_ref, "TERM.DAT") or os.path.join(deck_path_ref, "TERM.DAT")
                 if not os.path.exists(term_path):
                     term_path = os.path.join(deck_path_ref, "term.dat")
                 
                 if os.path.exists(term_path):
-                    term = Term.read(term_path)
+                    term = get_cached_file(Term, term_path)
                     if term.usinas is not None and not term.usinas.empty:
                         for _, term_row in term.usinas.iterrows():
                             codigo_term = int(term_row.get('codigo', 0))
@@ -9,6 +9,7 @@ import pandas as pd
 import re
 from typing import Dict, Any, List, Optional
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 from backend.newave.utils.deck_loader import (
     list_available_decks,
     load_multiple_decks,
@@ -631,7 +632,7 @@ class MudancasVazaoMinimaTool(NEWAVETool):
         Returns:
             Objeto Modif ou None se não encontrado
         """
-        modif_path = os.path.join(deck_path, "MODIF.DAT")
+        modif_path = find_deck_file(deck_path, "MODIF.DAT") or os.path.join(deck_path, "MODIF.DAT")
         if not os.path.exists(modif_path):
             modif_path_lower = os.path.join(deck_path, "modif.dat")
             if os.path.exists(modif_path_lower):
@@ -641,7 +642,7 @@ class MudancasVazaoMinimaTool(NEWAVETool):
                 return None
         
         try:
-            modif = Modif.read(modif_path)
+            modif = get_cached_file(Modif, modif_path)
             return modif
         except Exception as e:
             safe_print(f"[TOOL] ❌ Erro ao ler MODIF.DAT: {e}")
@@ -703,23 +704,20 @@ class MudancasVazaoMinimaTool(NEWAVETool):
         if codigos_sem_nome:
             debug_print(f"[TOOL] ⚠️ {len(codigos_sem_nome)} usinas sem nome no MODIF, tentando HIDR.DAT...")
             try:
-                from inewave.newave import Hidr
+                from backend.core.utils.hidr_reader import get_hidr_cadastro
                 # Usar primeiro deck disponível como referência
                 deck_path_ref = self.deck_paths.get(self.selected_decks[0]) if self.deck_paths else self.deck_path
-                hidr_path = os.path.join(deck_path_ref, "HIDR.DAT")
+                hidr_path = find_deck_file(deck_path_ref, "HIDR.DAT") or os.path.join(deck_path_ref, "HIDR.DAT")
                 if not os.path.exists(hidr_path):
                     hidr_path = os.path.join(deck_path_ref, "hidr.dat")
                 
                 if os.path.exists(hidr_path):
-                    hidr = Hidr.read(hidr_path)
-                    if hidr.cadastro is not None and not hidr.cadastro.empty:
-                        for _, hidr_row in hidr.cadastro.iterrows():
-                            codigo_hidr = int(hidr_row.get('codigo_usina', 0))
-                            if codigo_hidr in codigos_sem_nome:
-                                nome_hidr = str(hidr_row.get('nome_usina', '')).strip()
-                                if nome_hidr and nome_hidr != 'nan' and nome_hidr != '':
-                                    mapeamento[codigo_hidr] = nome_hidr
-                                    debug_print(f"[TOOL] ✅ Nome do HIDR.DAT: {codigo_hidr} -> {nome_hidr}")
+                    hidr = get_hidr_cadastro(hidr_path)
+                    for codigo in codigos_sem_nome:
+                        nome_hidr = hidr.nome(int(codigo))
+                        if nome_hidr:
+                            mapeamento[codigo] = nome_hidr
+                            debug_print(f"[TOOL] ✅ Nome do HIDR.DAT: {codigo} -> {nome_hidr}")
             except Exception as e:
                 debug_print(f"[TOOL] ⚠️ Erro ao ler HIDR.DAT para nomes: {e}")
         
@@ -118,7 +118,7 @@ class MultiDeckComparisonTool(NEWAVETool):
                         "error": "Nenhuma tool adequada encontrada para esta query"
                     }
                 
-                tool_class = best_tool.__class__
+                tool_class = best_tool.tool_class
                 tool_name = tool_class.__name__
                 print(f"[MULTI-DECK] ✅ Tool identificada via semantic matching: {tool_name} (score: {score:.2f})")
                 
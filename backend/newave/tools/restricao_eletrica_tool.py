@@ -12,6 +12,7 @@ import pandas as pd
 import re
 from typing import Dict, Any, Optional, Tuple
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 
 class RestricaoEletricaTool(NEWAVETool):
@@ -282,7 +283,7 @@ class RestricaoEletricaTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo restricao-eletrica.csv...")
-            csv_path = os.path.join(self.deck_path, "restricao-eletrica.csv")
+            csv_path = find_deck_file(self.deck_path, "restricao-eletrica.csv") or os.path.join(self.deck_path, "restricao-eletrica.csv")
             
             if not os.path.exists(csv_path):
                 safe_print(f"[TOOL] ❌ Arquivo restricao-eletrica.csv não encontrado")
@@ -296,7 +297,7 @@ class RestricaoEletricaTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando RestricaoEletrica
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com RestricaoEletrica...")
-            re_obj = RestricaoEletrica.read(csv_path)
+            re_obj = get_cached_file(RestricaoEletrica, csv_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Acessar propriedades
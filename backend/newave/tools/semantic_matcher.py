@@ -69,6 +69,11 @@ NEWAVE_QUERY_EXPANSIONS = {
 }
 
 
+# Nomes dos registries de tools (uma matriz de embeddings pré-computada por registry)
+REGISTRY_SINGLE = "newave-single"
+REGISTRY_COMPARISON = "newave-comparison"
+
+
 def preload_tool_embeddings(tools: list[NEWAVETool]) -> None:
     """
     Pré-carrega os embeddings de todas as tools no cache.
@@ -86,7 +91,8 @@ def expand_query(query: str) -> str:
 def find_best_tool_semantic(
     query: str, 
     tools: list[NEWAVETool], 
-    threshold: float = 0.7
+    threshold: float = 0.7,
+    registry_name: Optional[str] = None
 ) -> Optional[Tuple[NEWAVETool, float]]:
     """
     Encontra a tool mais relevante usando matching semântico.
@@ -95,6 +101,7 @@ def find_best_tool_semantic(
         query: Query do usuário
         tools: Lista de tools disponíveis
         threshold: Threshold mínimo de similaridade (0.0 a 1.0)
+        registry_name: Registry das tools (REGISTRY_*), chave da matriz de embeddings
         
     Returns:
         Tupla (tool, score) se encontrada tool acima do threshold, ou None
@@ -107,7 +114,8 @@ def find_best_tool_semantic(
         expansions=NEWAVE_QUERY_EXPANSIONS,
         semantic_match_min_score=SEMANTIC_MATCH_MIN_SCORE,
         threshold=threshold,
-        can_handle_filter=False  # NEWAVE não usa filtro can_handle
+        can_handle_filter=False,  # NEWAVE não usa filtro can_handle
+        registry_name=registry_name
     )
 
 
@@ -115,7 +123,8 @@ def find_top_tools_semantic(
     query: str,
     tools: list[NEWAVETool],
     top_n: int = 3,
-    threshold: float = 0.55
+    threshold: float = 0.55,
+    registry_name: Optional[str] = None
 ) -> list[Tuple[NEWAVETool, float]]:
     """
     Encontra as top N tools mais relevantes usando matching semântico.
@@ -125,6 +134,7 @@ def find_top_tools_semantic(
         tools: Lista de tools disponíveis
         top_n: Número máximo de tools a retornar (padrão: 3)
         threshold: Threshold mínimo de similaridade para ranking
+        registry_name: Registry das tools (REGISTRY_*), chave da matriz de embeddings
         
     Returns:
         Lista de tuplas (tool, score) ordenadas por score decrescente
@@ -136,5 +146,6 @@ def find_top_tools_semantic(
         query_expansion_enabled=QUERY_EXPANSION_ENABLED,
         expansions=NEWAVE_QUERY_EXPANSIONS,
         top_n=top_n,
-        threshold=threshold
+        threshold=threshold,
+        registry_name=registry_name
     )
@@ -7,6 +7,7 @@ import os
 import pandas as pd
 import re
 from typing import Dict, Any, Optional
+from backend.newave.utils.inewave_cache import find_deck_file
 from backend.newave.config import debug_print, safe_print
 from backend.newave.utils.thermal_plant_matcher import get_thermal_plant_matcher
 
@@ -330,7 +331,7 @@ class TermCadastroTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo TERM.DAT...")
-            term_path = os.path.join(self.deck_path, "TERM.DAT")
+            term_path = find_deck_file(self.deck_path, "TERM.DAT") or os.path.join(self.deck_path, "TERM.DAT")
             
             if not os.path.exists(term_path):
                 term_path_lower = os.path.join(self.deck_path, "term.dat")
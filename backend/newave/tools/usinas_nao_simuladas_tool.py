@@ -10,6 +10,7 @@ import re
 from typing import Dict, Any, Optional
 from datetime import datetime
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 
 class UsinasNaoSimuladasTool(NEWAVETool):
@@ -365,7 +366,7 @@ class UsinasNaoSimuladasTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo SISTEMA.DAT...")
-            sistema_path = os.path.join(self.deck_path, "SISTEMA.DAT")
+            sistema_path = find_deck_file(self.deck_path, "SISTEMA.DAT") or os.path.join(self.deck_path, "SISTEMA.DAT")
             
             if not os.path.exists(sistema_path):
                 sistema_path = os.path.join(self.deck_path, "sistema.dat")
@@ -381,7 +382,7 @@ class UsinasNaoSimuladasTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            sistema = Sistema.read(sistema_path)
+            sistema = get_cached_file(Sistema, sistema_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Acessar propriedade geracao_usinas_nao_simuladas
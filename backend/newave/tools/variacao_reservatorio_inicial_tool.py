@@ -9,6 +9,7 @@ import pandas as pd
 import re
 from typing import Dict, Any, Optional
 from backend.newave.config import debug_print, safe_print
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
 
 class VariacaoReservatorioInicialTool(NEWAVETool):
     """
@@ -88,7 +89,7 @@ class VariacaoReservatorioInicialTool(NEWAVETool):
         try:
             # ETAPA 1: Verificar existência do arquivo
             debug_print("[TOOL] ETAPA 1: Verificando existência do arquivo CONFHD.DAT...")
-            confhd_path = os.path.join(self.deck_path, "CONFHD.DAT")
+            confhd_path = find_deck_file(self.deck_path, "CONFHD.DAT") or os.path.join(self.deck_path, "CONFHD.DAT")
             
             if not os.path.exists(confhd_path):
                 confhd_path_lower = os.path.join(self.deck_path, "confhd.dat")
@@ -106,7 +107,7 @@ class VariacaoReservatorioInicialTool(NEWAVETool):
             
             # ETAPA 2: Ler arquivo usando inewave
             debug_print("[TOOL] ETAPA 2: Lendo arquivo com inewave...")
-            confhd = Confhd.read(confhd_path)
+            confhd = get_cached_file(Confhd, confhd_path)
             debug_print("[TOOL] ✅ Arquivo lido com sucesso")
             
             # ETAPA 3: Identificar filtros (codigo_usina=CONFHD interno para filtro; codigo_csv para selected_plant)
@@ -5,7 +5,9 @@ Inclui mapeamento interno de nome de usina para posto (via CONFHD.DAT).
 """
 from backend.newave.tools.base import NEWAVETool
 from backend.newave.config import debug_print, safe_print
-from inewave.newave import Vazoes, Confhd
+from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
+from backend.newave.utils.vazoes_mmap import get_vazoes_mmap
+from inewave.newave import Confhd
 import os
 import pandas as pd
 import re
@@ -96,7 +98,7 @@ class VazoesTool(NEWAVETool):
         debug_print("[TOOL] Carregando mapeamento completo usina → posto do CONFHD.DAT (descompilando)...")
         
         # Tentar encontrar CONFHD.DAT
-        confhd_path = os.path.join(self.deck_path, "CONFHD.DAT")
+        confhd_path = find_deck_file(self.deck_path, "CONFHD.DAT") or os.path.join(self.deck_path, "CONFHD.DAT")
         if not os.path.exists(confhd_path):
             confhd_path = os.path.join(self.deck_path, "confhd.dat")
         
@@ -107,7 +109,7 @@ class VazoesTool(NEWAVETool):
             return self._mapeamento_usina_posto
         
         try:
-            confhd = Confhd.read(confhd_path)
+            confhd = get_cached_file(Confhd, confhd_path)
             
             if confhd.usinas is None or confhd.usinas.empty:
                 debug_print("[TOOL] ⚠️ Nenhuma usina encontrada no CONFHD.DAT")
@@ -393,7 +395,7 @@ class VazoesTool(NEWAVETool):
             return self._ano_inicial_cache
         
         # Tentar ler do dger.dat
-        dger_path = os.path.join(self.deck_path, "DGER.DAT")
+        dger_path = find_deck_file(self.deck_path, "DGER.DAT") or os.path.join(self.deck_path, "DGER.DAT")
         if not os.path.exists(dger_path):
             dger_path = os.path.join(self.deck_path, "dger.dat")
         
@@ -462,7 +464,7 @@ class VazoesTool(NEWAVETool):
         
         Fluxo:
         1. Verifica se VAZOES.DAT existe
-        2. Lê o arquivo usando inewave
+        2. Mapeia o arquivo em memória (utils/vazoes_mmap.py)
         3. Identifica posto(s) da query (por número ou nome de usina)
         4. Processa e retorna dados
         """
@@ -471,7 +473,7 @@ class VazoesTool(NEWAVETool):
         debug_print(f"[TOOL] Deck path: {self.deck_path}")
         
         try:
-            vazoes_path = os.path.join(self.deck_path, "VAZOES.DAT")
+            vazoes_path = find_deck_file(self.deck_path, "VAZOES.DAT") or os.path.join(self.deck_path, "VAZOES.DAT")
             
             if not os.path.exists(vazoes_path):
                 vazoes_path_lower = os.path.join(self.deck_path, "vazoes.dat")
@@ -487,12 +489,11 @@ class VazoesTool(NEWAVETool):
             
             debug_print(f"[TOOL] ✅ Arquivo encontrado: {vazoes_path}")
             
-            vazoes = Vazoes.read(vazoes_path)
-            debug_print("[TOOL] ✅ Arquivo lido com sucesso")
+            # Memory map do VAZOES.DAT: só os postos/meses consultados são lidos
+            vazoes = get_vazoes_mmap(vazoes_path)
+            debug_print("[TOOL] ✅ Arquivo mapeado com sucesso")
             
-            df_vazoes = vazoes.vazoes
-            
-            if df_vazoes is None or df_vazoes.empty:
+            if vazoes.n_meses == 0:
                 safe_print("[TOOL] ❌ DataFrame vazio ou None")
                 return {
                     "success": False,
@@ -500,7 +501,7 @@ class VazoesTool(NEWAVETool):
                     "tool": self.get_name()
                 }
             
-            debug_print(f"[TOOL] ✅ DataFrame obtido: {len(df_vazoes)} meses, {len(df_vazoes.columns)} postos")
+            debug_print(f"[TOOL] ✅ Histórico: {vazoes.n_meses} meses, {vazoes.n_postos} postos")
             
             # ETAPA 1: Verificar se há código forçado (correção de usina)
             forced_plant_code = kwargs.get("forced_plant_code")
@@ -533,7 +534,7 @@ class VazoesTool(NEWAVETool):
                 matcher = get_hydraulic_plant_matcher()
                 if codigo_usina_forcado in matcher.code_to_names:
                     _, _, posto_csv = matcher.code_to_names[codigo_usina_forcado]
-                    if posto_csv is not None and posto_csv in df_vazoes.columns:
+                    if posto_csv is not None and vazoes.tem_posto(posto_csv):
                         postos_consultados.append(posto_csv)
                         nome_arquivo_csv, nome_completo_csv, _ = matcher.code_to_names[codigo_usina_forcado]
                         nome_usina_encontrado = nome_arquivo_csv
@@ -545,24 +546,24 @@ class VazoesTool(NEWAVETool):
             if not postos_consultados:
                 posto_numero = self._extract_posto_from_query(query)
                 if posto_numero is not None:
-                    if posto_numero in df_vazoes.columns:
+                    if vazoes.tem_posto(posto_numero):
                         postos_consultados.append(posto_numero)
                         debug_print(f"[TOOL] ✅ Posto {posto_numero} identificado")
                     else:
-                        debug_print(f"[TOOL] ⚠️ Posto {posto_numero} não existe no arquivo (postos disponíveis: 1-{len(df_vazoes.columns)})")
+                        debug_print(f"[TOOL] ⚠️ Posto {posto_numero} não existe no arquivo (postos disponíveis: 1-{vazoes.n_postos})")
             
             if not postos_consultados:
-                confhd_path = os.path.join(self.deck_path, "CONFHD.DAT")
+                confhd_path = find_deck_file(self.deck_path, "CONFHD.DAT") or os.path.join(self.deck_path, "CONFHD.DAT")
                 if not os.path.exists(confhd_path):
                     confhd_path = os.path.join(self.deck_path, "confhd.dat")
                 
                 if os.path.exists(confhd_path):
                     try:
-                        confhd = Confhd.read(confhd_path)
+                        confhd = get_cached_file(Confhd, confhd_path)
                         resultado = self._buscar_posto_por_query(query, confhd)
                         if resultado is not None:
                             posto_encontrado, nome_usina_encontrado = resultado
-                            if posto_encontrado in df_vazoes.columns:
+                            if vazoes.tem_posto(posto_encontrado):
                                 postos_consultados.append(posto_encontrado)
                                 debug_print(f"[TOOL] ✅ Posto {posto_encontrado} encontrado para usina '{nome_usina_encontrado}'")
                             else:
@@ -578,17 +579,16 @@ class VazoesTool(NEWAVETool):
             
             if not postos_consultados:
                 debug_print("[TOOL] ⚠️ Nenhum posto específico identificado - retornando todos os postos disponíveis")
-                postos_consultados = list(df_vazoes.columns)
+                postos_consultados = list(vazoes.postos)
                 debug_print(f"[TOOL] Total de postos disponíveis: {len(postos_consultados)}")
             
-            df_filtrado = df_vazoes[postos_consultados].copy()
+            indice_fim = None
             
             if ano_filtro and ano_inicial:
                 debug_print(f"[TOOL] Filtro por ano detectado: {ano_filtro}")
                 indice_inicio = self._ano_para_indice(ano_filtro, ano_inicial)
-                if indice_inicio is not None and indice_inicio < len(df_filtrado):
-                    indice_fim = min(indice_inicio + 12, len(df_filtrado))
-                    df_filtrado = df_filtrado.iloc[indice_inicio:indice_fim].copy()
+                if indice_inicio is not None and indice_inicio < vazoes.n_meses:
+                    indice_fim = min(indice_inicio + 12, vazoes.n_meses)
                     debug_print(f"[TOOL] ✅ Dados filtrados para o ano {ano_filtro} (índices {indice_inicio}-{indice_fim-1})")
                 else:
                     debug_print(f"[TOOL] ⚠️ Ano {ano_filtro} está fora do range do histórico (início: {ano_inicial})")
@@ -600,6 +600,9 @@ class VazoesTool(NEWAVETool):
                         "ano_inicial_disponivel": ano_inicial
                     }
             
+            # Apenas os postos e meses consultados saem do memory map
+            df_filtrado = vazoes.to_dataframe(postos_consultados, indice_inicio or 0, indice_fim)
+            
             stats_por_posto = []
             for posto in postos_consultados:
                 serie_posto = df_filtrado[posto]
@@ -698,8 +701,8 @@ class VazoesTool(NEWAVETool):
                 "success": True,
                 "data": result_data,
                 "summary": {
-                    "total_meses": len(df_vazoes),
-                    "total_postos": len(df_vazoes.columns),
+                    "total_meses": vazoes.n_meses,
+                    "total_postos": vazoes.n_postos,
                     "postos_consultados": len(postos_consultados),
                     "ano_inicial": ano_inicial,
                     "filtro_aplicado": filtro_info if filtro_info else None
@@ -2,13 +2,15 @@
 Utilitário para carregar e extrair decks da pasta decks/.
 Suporta descoberta dinâmica de N decks.
 """
-import zipfile
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, TypedDict
+from typing import Any, List, Dict, Optional, Tuple, TypedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from backend.newave.config import NEWAVE_DECKS_DIR, NEWAVE_DATA_DIR
 from backend.core.config import ROOT_DIR
+from backend.core.deck_ingestion import DeckIngestor
+from backend.core.utils.deck_catalog import DeckCatalog
+from backend.core.utils.zip_deck import ensure_deck_dir
 
 def _find_decks_dir() -> Path:
     """
@@ -115,20 +117,23 @@ def parse_deck_name(deck_name: str) -> Optional[Dict[str, any]]:
     }
 
 
-def list_available_decks() -> List[DeckInfo]:
+def _scan_decks() -> Tuple[List[DeckInfo], List[Path]]:
     """
     Escaneia a pasta decks/ e lista todos os decks disponíveis.
     
     Returns:
-        Lista de DeckInfo ordenada cronologicamente (mais antigo primeiro)
+        (Lista de DeckInfo ordenada cronologicamente, diretórios lidos na varredura)
     """
     decks: List[DeckInfo] = []
+    # Diretórios lidos por _find_decks_dir e pela varredura (invalidação do catálogo)
+    scanned_dirs = [NEWAVE_DECKS_DIR, NEWAVE_DECKS_DIR / "decks", NEWAVE_DATA_DIR]
     
     # Recalcular o diretório dinamicamente para garantir que está correto
     decks_dir = _find_decks_dir()
+    scanned_dirs.append(decks_dir)
     
     if not decks_dir.exists():
-        return decks
+        return decks, scanned_dirs
     
     # Buscar todos os arquivos .zip que seguem o padrão NW{YYYY}{MM} diretamente no diretório
     zip_files_direct = list(decks_dir.glob("NW*.zip"))
@@ -156,6 +161,7 @@ def list_available_decks() -> List[DeckInfo]:
     if not decks and decks_dir.exists():
         for subdir in decks_dir.iterdir():
             if subdir.is_dir():
+                scanned_dirs.append(subdir)
                 zip_files_in_subdir = list(subdir.glob("NW*.zip"))
                 for zip_file in zip_files_in_subdir:
                     deck_name = zip_file.stem
@@ -179,7 +185,22 @@ def list_available_decks() -> List[DeckInfo]:
     # Ordenar cronologicamente (mais antigo primeiro)
     decks.sort(key=lambda d: (d["year"], d["month"]))
     
-    return decks
+    return decks, scanned_dirs
+
+
+_catalog = DeckCatalog("NEWAVE", _scan_decks)
+
+
+def list_available_decks() -> List[DeckInfo]:
+    """
+    Lista todos os decks disponíveis (catálogo em memória).
+    
+    A pasta decks/ só é escaneada de novo quando algum diretório muda.
+    
+    Returns:
+        Lista de DeckInfo ordenada cronologicamente (mais antigo primeiro)
+    """
+    return _catalog.list()
 
 
 def get_deck_by_name(deck_name: str) -> Optional[DeckInfo]:
@@ -192,16 +213,15 @@ def get_deck_by_name(deck_name: str) -> Optional[DeckInfo]:
     Returns:
         DeckInfo ou None se não encontrado
     """
-    decks = list_available_decks()
-    for deck in decks:
-        if deck["name"] == deck_name:
-            return deck
-    return None
+    return _catalog.get(deck_name)
 
 
 def load_deck(deck_name: str) -> Path:
     """
-    Extrai e retorna caminho do deck.
+    Prepara (ou extrai) e retorna caminho do deck.
+
+    Com DECK_ZIP_ON_DEMAND o ZIP não é extraído: o diretório recebe apenas o
+    marcador do ZIP e cada arquivo é extraído na primeira leitura.
     
     Args:
         deck_name: Nome do deck (ex: "NW202512")
@@ -217,21 +237,9 @@ def load_deck(deck_name: str) -> Path:
     if not zip_path.exists():
         raise FileNotFoundError(f"Deck {deck_name}.zip não encontrado em {decks_dir}")
     
-    # Extrair se ainda não foi extraído
-    if not extract_path.exists():
-        extract_path.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_path)
-        
-        # Se extraiu em uma subpasta, mover arquivos para o nível superior
-        extracted_items = list(extract_path.iterdir())
-        if len(extracted_items) == 1 and extracted_items[0].is_dir():
-            inner_dir = extracted_items[0]
-            for item in inner_dir.iterdir():
-                import shutil
-                shutil.move(str(item), str(extract_path / item.name))
-            inner_dir.rmdir()
-    
+    # Preparação única por deck, mesmo com chamadas concorrentes
+    ensure_deck_dir(zip_path, extract_path)
+
     return extract_path
 
 
@@ -320,3 +328,64 @@ def get_deck_display_names_dict(deck_names: List[str]) -> Dict[str, str]:
         Dict mapeando nome do deck para seu nome amigável
     """
     return {name: get_deck_display_name(name) for name in deck_names}
+
+
+# Arquivos do deck lidos pela maioria das tools (aquecidos na ingestão)
+_INGEST_FILES = ["CONFHD.DAT", "SISTEMA.DAT", "EXPT.DAT", "MODIF.DAT", "CLAST.DAT", "TERM.DAT"]
+
+
+def ingest_deck(deck_name: str) -> Dict[str, Any]:
+    """
+    Prepara um deck e aquece os caches antes da primeira consulta.
+
+    Usado pela ingestão em segundo plano (deck_ingestor): prepara o deck
+    (load_deck), faz o parse dos arquivos principais no cache do inewave,
+    lê o HIDR.DAT e monta os índices de nomes de usinas.
+
+    Args:
+        deck_name: Nome do deck (ex: "NW202501")
+
+    Returns:
+        Dict com os arquivos aquecidos, ausentes e com erro
+    """
+    # Imports locais para evitar dependências cíclicas
+    from inewave.newave import Clast, Confhd, Expt, Modif, Sistema, Term
+    from backend.core.utils.hidr_reader import get_hidr_cadastro
+    from backend.newave.utils.hydraulic_plant_matcher import get_hydraulic_plant_matcher
+    from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
+    from backend.newave.utils.thermal_plant_matcher import get_thermal_plant_matcher
+
+    deck_path = str(load_deck(deck_name))
+    classes = {"CONFHD.DAT": Confhd, "SISTEMA.DAT": Sistema, "EXPT.DAT": Expt,
+               "MODIF.DAT": Modif, "CLAST.DAT": Clast, "TERM.DAT": Term}
+    result: Dict[str, Any] = {"warmed": [], "missing": [], "errors": {}}
+
+    for filename in _INGEST_FILES:
+        path = find_deck_file(deck_path, filename)
+        if path is None:
+            result["missing"].append(filename)
+            continue
+        try:
+            get_cached_file(classes[filename], path)
+            result["warmed"].append(filename)
+        except Exception as e:
+            result["errors"][filename] = str(e)
+
+    hidr_path = find_deck_file(deck_path, "HIDR.DAT")
+    if hidr_path is None:
+        result["missing"].append("HIDR.DAT")
+    else:
+        try:
+            result["usinas_hidr"] = len(get_hidr_cadastro(hidr_path).codigo_para_nome())
+            result["warmed"].append("HIDR.DAT")
+        except Exception as e:
+            result["errors"]["HIDR.DAT"] = str(e)
+
+    # Índices de nomes de usinas (de-para), montados uma vez por processo
+    get_thermal_plant_matcher()
+    get_hydraulic_plant_matcher()
+    return result
+
+
+# Ingestão em segundo plano de decks novos/alterados (iniciada no startup da API)
+deck_ingestor = DeckIngestor("NEWAVE", list_available_decks, ingest_deck)
@@ -0,0 +1,181 @@
+"""
+⚡ Cache global para arquivos do NEWAVE lidos com inewave.
+
+Cada tool do NEWAVE fazia o parse do seu arquivo (CONFHD.DAT, SISTEMA.DAT,
+HIDR.DAT, ...) a cada execute(). Este módulo é o equivalente NEWAVE do
+dadger_cache do DECOMP: um cache LRU compartilhado entre todas as tools,
+válido para qualquer classe de arquivo do inewave (Confhd, Sistema, Hidr,
+Vazoes, Modif, Expt, ...).
+
+A chave do cache é (SHA-256 do conteúdo do arquivo, classe inewave), ver
+core/utils/content_hash.py. Decks consecutivos repetem HIDR.DAT, VAZOES.DAT,
+CONFHD.DAT etc. byte a byte: o arquivo idêntico em vários decks é parseado e
+guardado uma única vez. Um arquivo alterado no disco tem outro hash e é lido
+de novo; a entrada antiga sai pelo LRU.
+
+⚠️ O objeto retornado é compartilhado entre tools e requisições. Nunca altere
+os DataFrames in-place: use .copy() antes de adicionar ou converter colunas.
+
+Uso:
+    from backend.newave.utils.inewave_cache import find_deck_file, get_cached_file
+
+    confhd_path = find_deck_file(deck_path, "CONFHD.DAT")
+    confhd = get_cached_file(Confhd, confhd_path)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+from backend.core.utils.content_hash import content_digest
+from backend.core.utils.zip_deck import find_deck_member
+from backend.newave.config import NEWAVE_FILE_CACHE_SIZE, safe_print
+
+T = TypeVar("T")
+
+# Chave: (SHA-256 do conteúdo do arquivo, nome qualificado da classe inewave)
+_CacheKey = Tuple[str, str]
+
+# Entradas: chave -> objeto lido
+_cache: "OrderedDict[_CacheKey, Any]" = OrderedDict()
+_cache_lock = threading.RLock()
+
+# Um lock por chave: leituras concorrentes do mesmo arquivo aguardam um único parse
+_load_locks: Dict[_CacheKey, threading.Lock] = {}
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0,
+}
+
+
+def find_deck_file(deck_path: str, filename: str) -> Optional[str]:
+    """
+    Localiza um arquivo do deck tolerando variação de maiúsculas/minúsculas.
+
+    Em decks lidos direto do ZIP (DECK_ZIP_ON_DEMAND), o arquivo é extraído
+    na primeira chamada.
+
+    Args:
+        deck_path: Caminho do diretório do deck NEWAVE
+        filename: Nome do arquivo (ex: "CONFHD.DAT")
+
+    Returns:
+        Caminho completo do arquivo ou None se não existir
+    """
+    return find_deck_member(deck_path, filename)
+
+
+def _make_key(file_class: type, file_path: str) -> _CacheKey:
+    return (content_digest(file_path), f"{file_class.__module__}.{file_class.__qualname__}")
+
+
+def _get_load_lock(key: _CacheKey) -> threading.Lock:
+    with _cache_lock:
+        lock = _load_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _load_locks[key] = lock
+        return lock
+
+
+def _lookup(key: _CacheKey) -> Tuple[bool, Any]:
+    """Procura a chave no cache."""
+    with _cache_lock:
+        if key not in _cache:
+            return False, None
+        _cache.move_to_end(key)
+        return True, _cache[key]
+
+
+def _store(key: _CacheKey, obj: Any) -> None:
+    with _cache_lock:
+        _cache[key] = obj
+        _cache.move_to_end(key)
+        while len(_cache) > NEWAVE_FILE_CACHE_SIZE:
+            evicted_key, _ = _cache.popitem(last=False)
+            _load_locks.pop(evicted_key, None)
+            _stats["evictions"] += 1
+
+
+def get_cached_file(file_class: Type[T], file_path: str) -> T:
+    """
+    Retorna o arquivo inewave do cache ou faz o parse se não existir.
+
+    Esta função deve ser usada por todas as tools em vez de <Classe>.read() direto.
+
+    Args:
+        file_class: Classe do inewave (ex: Confhd, Sistema, Hidr)
+        file_path: Caminho completo do arquivo
+
+    Returns:
+        Objeto inewave lido (compartilhado - não modificar in-place)
+    """
+    key = _make_key(file_class, file_path)
+
+    found, obj = _lookup(key)
+    if found:
+        with _cache_lock:
+            _stats["hits"] += 1
+        return obj
+
+    with _get_load_lock(key):
+        # Outra thread pode ter carregado enquanto esperávamos o lock
+        found, obj = _lookup(key)
+        if found:
+            with _cache_lock:
+                _stats["hits"] += 1
+            return obj
+
+        with _cache_lock:
+            _stats["misses"] += 1
+
+        start = time.time()
+        obj = file_class.read(file_path)
+        elapsed = time.time() - start
+        safe_print(f"[INEWAVE CACHE] ⚡ Carregado {file_class.__name__} de {file_path} em {elapsed:.2f}s (novo)")
+
+        _store(key, obj)
+        return obj
+
+
+def get_cached_deck_file(file_class: Type[T], deck_path: str, filename: str) -> Optional[T]:
+    """
+    Atalho para localizar e ler um arquivo do deck pelo nome.
+
+    Args:
+        file_class: Classe do inewave (ex: Confhd)
+        deck_path: Caminho do diretório do deck NEWAVE
+        filename: Nome do arquivo (ex: "CONFHD.DAT")
+
+    Returns:
+        Objeto inewave ou None se o arquivo não existir no deck
+    """
+    file_path = find_deck_file(deck_path, filename)
+    if file_path is None:
+        return None
+    return get_cached_file(file_class, file_path)
+
+
+def clear_inewave_cache():
+    """Limpa o cache de arquivos inewave (útil para testes ou reload forçado)."""
+    with _cache_lock:
+        _cache.clear()
+        _load_locks.clear()
+    safe_print("[INEWAVE CACHE] 🗑️ Cache limpo")
+
+
+def get_cache_stats() -> dict:
+    """Retorna estatísticas do cache."""
+    with _cache_lock:
+        hits = _stats["hits"]
+        misses = _stats["misses"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": _stats["evictions"],
+            "maxsize": NEWAVE_FILE_CACHE_SIZE,
+            "currsize": len(_cache),
+            "hit_rate": hits / (hits + misses) if (hits + misses) > 0 else 0,
+        }
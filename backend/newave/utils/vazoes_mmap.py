@@ -0,0 +1,175 @@
+"""
+⚡ Leitor memory-mapped do VAZOES.DAT (vazões históricas dos postos).
+
+O VAZOES.DAT é um binário de largura fixa: um registro por mês, cada registro
+com um inteiro de 4 bytes (little-endian) por posto. Ler com inewave
+(Vazoes.read) monta um registro cfinterface por mês e depois um DataFrame
+célula a célula, mesmo quando a consulta é de um único posto em um único ano.
+
+Este módulo mapeia o arquivo como um array NumPy (meses, postos) sem copiar os
+dados: a série de um posto ou os 12 meses de um ano são fatias do memory map,
+e só as linhas/colunas pedidas são lidas do disco. O layout (colunas 1..N,
+índice 0..meses-1) é o mesmo do DataFrame Vazoes.vazoes do inewave.
+
+Uso:
+    from backend.newave.utils.vazoes_mmap import get_vazoes_mmap
+
+    vazoes = get_vazoes_mmap(vazoes_path)
+    serie = vazoes.serie(posto)                  # np.ndarray (view)
+    df = vazoes.to_dataframe([posto], inicio, fim)
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.newave.config import NEWAVE_VAZOES_POSTOS, safe_print
+
+# Inteiro de 4 bytes little-endian (mesmo formato do IntegerField binário do cfinterface)
+_DTYPE = np.dtype("<i4")
+
+
+class VazoesMmap:
+    """Vazões históricas de um VAZOES.DAT, mapeadas em memória."""
+
+    def __init__(self, path: str, postos: int = NEWAVE_VAZOES_POSTOS):
+        """
+        Args:
+            path: Caminho do VAZOES.DAT
+            postos: Número de postos por registro (largura fixa do arquivo,
+                    não declarada em cabeçalho; 320 no padrão do inewave)
+        """
+        self.path = path
+        self.n_postos = postos
+
+        record_size = postos * _DTYPE.itemsize
+        self.n_meses = os.path.getsize(path) // record_size
+        if self.n_meses > 0:
+            self.array = np.memmap(path, dtype=_DTYPE, mode="r", shape=(self.n_meses, postos))
+        else:
+            self.array = np.empty((0, postos), dtype=_DTYPE)
+
+    @property
+    def postos(self) -> range:
+        """Números dos postos (1-based, como as colunas do inewave)."""
+        return range(1, self.n_postos + 1)
+
+    def tem_posto(self, posto: int) -> bool:
+        return 1 <= posto <= self.n_postos
+
+    @staticmethod
+    def indice_do_ano(ano: int, ano_inicial: int) -> Optional[int]:
+        """
+        Índice (0-based) de janeiro do ano no histórico.
+
+        Mesmo cálculo de VazoesTool._ano_para_indice: (ano - ano_inicial) * 12,
+        None se o ano for anterior ao início do histórico.
+        """
+        if ano < ano_inicial:
+            return None
+        return (ano - ano_inicial) * 12
+
+    def intervalo_do_ano(self, ano: int, ano_inicial: int) -> Optional[Tuple[int, int]]:
+        """
+        Intervalo [inicio, fim) dos meses do ano no histórico.
+
+        Returns:
+            Tupla (inicio, fim) ou None se o ano estiver fora do histórico
+        """
+        inicio = self.indice_do_ano(ano, ano_inicial)
+        if inicio is None or inicio >= self.n_meses:
+            return None
+        return inicio, min(inicio + 12, self.n_meses)
+
+    def serie(self, posto: int, inicio: int = 0, fim: Optional[int] = None) -> np.ndarray:
+        """
+        Série de vazões de um posto (view do memory map, sem cópia).
+
+        Args:
+            posto: Número do posto (1-based)
+            inicio: Primeiro mês (índice 0-based)
+            fim: Mês final exclusivo (None = até o fim do histórico)
+        """
+        return self.array[inicio:fim, posto - 1]
+
+    def to_dataframe(
+        self,
+        postos: Optional[Iterable[int]] = None,
+        inicio: int = 0,
+        fim: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        DataFrame no mesmo formato de Vazoes.vazoes, apenas com os postos e meses pedidos.
+
+        Args:
+            postos: Postos (colunas) desejados; None = todos
+            inicio: Primeiro mês (índice 0-based)
+            fim: Mês final exclusivo (None = até o fim do histórico)
+        """
+        fim = self.n_meses if fim is None else min(fim, self.n_meses)
+        colunas = list(self.postos) if postos is None else list(postos)
+        dados = self.array[inicio:fim][:, [p - 1 for p in colunas]]
+        return pd.DataFrame(
+            np.asarray(dados, dtype=np.int64),
+            columns=colunas,
+            index=range(inicio, max(fim, inicio)),
+        )
+
+
+# Entradas: (caminho absoluto, postos) -> (mtime_ns, VazoesMmap)
+_cache: "OrderedDict[Tuple[str, int], Tuple[int, VazoesMmap]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 64
+
+
+def get_vazoes_mmap(path: str, postos: int = NEWAVE_VAZOES_POSTOS) -> VazoesMmap:
+    """
+    Retorna o VAZOES.DAT mapeado em memória (cacheado por arquivo e mtime).
+
+    Args:
+        path: Caminho do VAZOES.DAT
+        postos: Número de postos por registro
+
+    Returns:
+        VazoesMmap do arquivo
+    """
+    key = (os.path.abspath(path), postos)
+    mtime_ns = os.stat(path).st_mtime_ns
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == mtime_ns:
+            _cache.move_to_end(key)
+            return entry[1]
+
+        vazoes = VazoesMmap(path, postos)
+        _cache[key] = (mtime_ns, vazoes)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+        safe_print(f"[VAZOES MMAP] ⚡ {path} mapeado: {vazoes.n_meses} meses x {postos} postos")
+        return vazoes
+
+
+def clear_vazoes_cache():
+    """Descarta os arquivos mapeados (útil para testes ou reload forçado)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def evict_vazoes_dir(deck_dir: str) -> int:
+    """
+    Descarta os arquivos mapeados de um diretório de deck (ex: sessão removida).
+
+    Returns:
+        Número de entradas descartadas
+    """
+    prefix = os.path.abspath(deck_dir) + os.sep
+    with _cache_lock:
+        keys = [key for key in _cache if key[0].startswith(prefix)]
+        for key in keys:
+            del _cache[key]
+    return len(keys)
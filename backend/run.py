@@ -79,11 +79,24 @@ if __name__ == "__main__":
         force=True  # Força reconfiguração mesmo se já configurado
     )
     
-    uvicorn.run(
-        "backend.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info",
-        access_log=True
-    )
+    from backend.core.config import WORKER_PROCESSES
+
+    if WORKER_PROCESSES > 1:
+        # Modo multiprocesso: supervisor na porta pública, roteando por deck
+        # para WORKER_PROCESSES workers (ver backend/supervisor.py)
+        uvicorn.run(
+            "backend.supervisor:app",
+            host="0.0.0.0",
+            port=8000,
+            log_level="info",
+            access_log=True
+        )
+    else:
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info",
+            access_log=True
+        )
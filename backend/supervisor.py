@@ -0,0 +1,429 @@
+"""
+⚡ Supervisor do modo multiprocesso: N workers uvicorn com roteamento por deck.
+
+Os caches de decks são por processo (core/deck_affinity.py): com
+`uvicorn --workers N` cada deck acabava parseado em vários processos e as
+requisições caíam em workers sem o deck em cache. No modo supervisor
+(WORKER_PROCESSES > 1 em run.py):
+
+- o supervisor inicia N processos `uvicorn backend.main:app` em
+  127.0.0.1:WORKER_BASE_PORT+i, com WORKER_INDEX/WORKER_COUNT no ambiente,
+  e os reinicia se morrerem
+- ele atende na porta pública e repassa cada requisição (proxy HTTP, SSE em
+  streaming) ao worker dono do deck, por hash consistente do nome:
+    /load-deck                  -> deck_name
+    /init-comparison            -> primeiro deck selecionado
+    /decks/ingestion/{deck}     -> deck
+    /query, /query/stream,
+    /sessions/{id},
+    GET /upload/{id}            -> worker que criou a sessão
+  as sessões criadas por /upload, /load-deck e /init-comparison ficam
+  registradas no supervisor (session_id -> worker); as demais rotas vão
+  para os workers em rodízio
+- GET /decks/ingestion e /health/ready de cada agente são consultados em
+  todos os workers e respondidos com o status combinado (cada worker ingere
+  só os seus decks)
+- cada worker ingere em segundo plano só os seus decks
+- o header X-Worker (índice) força um worker (ex: /admin/cache de um worker)
+
+Uma comparação multi-deck roda no worker do primeiro deck; os demais decks
+da comparação são carregados também nele.
+
+Uso:
+    WORKER_PROCESSES=4 python backend/run.py
+"""
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from backend.core.config import WORKER_BASE_PORT, WORKER_PROCESSES, safe_print
+from backend.core.deck_affinity import deck_key, get_ring
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+AGENTS = ("newave", "decomp", "dessem")
+
+# Rotas cuja resposta traz o session_id de uma sessão nova
+_SESSION_CREATORS = ("/upload", "/load-deck", "/init-comparison")
+# Rotas roteadas pelo corpo JSON
+_JSON_ROUTED = ("/load-deck", "/init-comparison", "/query", "/query/stream")
+_MAX_SESSIONS = 100_000
+_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+}
+_RESTART_CHECK_SECONDS = 2.0
+
+
+class WorkerProcess:
+    """Um processo uvicorn com backend.main:app em uma porta local."""
+
+    def __init__(self, index: int, count: int, port: int):
+        self.index = index
+        self.count = count
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+
+    def start(self) -> None:
+        env = dict(os.environ)
+        env.update(WORKER_INDEX=str(self.index), WORKER_COUNT=str(self.count), WORKER_PROCESSES="1")
+        # O pool de parse é por processo: dividir os cores entre os workers
+        env.setdefault("PARSE_POOL_PROCESSES", str(max(1, (os.cpu_count() or 1) // self.count)))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(self.port)],
+            cwd=str(ROOT_DIR),
+            env=env,
+        )
+        self.started_at = time.time()
+        safe_print(f"[SUPERVISOR] ⚡ Worker {self.index} iniciado (pid {self.process.pid}, porta {self.port})")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.is_alive():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "worker": self.index,
+            "pid": self.process.pid if self.process else None,
+            "port": self.port,
+            "alive": self.is_alive(),
+            "started_at": self.started_at,
+            "restarts": self.restarts,
+        }
+
+
+class Supervisor:
+    """Workers, anel de hash consistente e sessões conhecidas."""
+
+    def __init__(self, worker_count: int = WORKER_PROCESSES, base_port: int = WORKER_BASE_PORT):
+        self.worker_count = max(1, worker_count)
+        self.workers = [WorkerProcess(i, self.worker_count, base_port + i) for i in range(self.worker_count)]
+        self.ring = get_ring(self.worker_count)
+        self._lock = threading.Lock()
+        # session_id -> worker que criou a sessão (LRU)
+        self._sessions: "OrderedDict[str, int]" = OrderedDict()
+        self._round_robin = itertools.cycle(range(self.worker_count))
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._watch, name="supervisor-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for worker in self.workers:
+            worker.stop()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(_RESTART_CHECK_SECONDS):
+            for worker in self.workers:
+                if not worker.is_alive() and not self._stop.is_set():
+                    code = worker.process.returncode if worker.process else None
+                    safe_print(f"[SUPERVISOR] ❌ Worker {worker.index} encerrado (código {code}); reiniciando")
+                    worker.restarts += 1
+                    worker.start()
+
+    def remember_session(self, session_id: str, worker: int) -> None:
+        with self._lock:
+            self._sessions[session_id] = worker
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > _MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+
+    def worker_for_session(self, session_id: str) -> int:
+        with self._lock:
+            worker = self._sessions.get(session_id)
+        if worker is not None:
+            return worker
+        # Sessão desconhecida (ex: supervisor reiniciado): destino estável pelo id
+        return self.ring.get_worker(f"session:{session_id}")
+
+    def next_worker(self) -> int:
+        with self._lock:
+            return next(self._round_robin)
+
+    def route(self, agent: str, subpath: str, method: str, payload: Optional[dict]) -> int:
+        """
+        Escolhe o worker de uma requisição para /api/{agent}{subpath}.
+
+        Args:
+            agent: newave, decomp ou dessem
+            subpath: Caminho dentro do agente (ex: "/load-deck")
+            method: Método HTTP
+            payload: Corpo JSON, se lido
+        """
+        payload = payload if isinstance(payload, dict) else {}
+        if subpath == "/load-deck" and payload.get("deck_name"):
+            return self.ring.get_worker(deck_key(agent, str(payload["deck_name"])))
+        if subpath == "/init-comparison":
+            selected = payload.get("selected_decks") or []
+            # Sem seleção: os decks mais recentes, sempre no mesmo worker
+            name = str(selected[0]) if selected else "__latest__"
+            return self.ring.get_worker(deck_key(agent, name))
+        if subpath in ("/query", "/query/stream") and payload.get("session_id"):
+            return self.worker_for_session(str(payload["session_id"]))
+        if subpath.startswith("/sessions/") or subpath.startswith("/upload/"):
+            # /upload/{id}: status da preparação, guardado só no worker que recebeu o upload
+            return self.worker_for_session(subpath.split("/")[2])
+        if subpath.startswith("/decks/ingestion/") and method == "POST":
+            return self.ring.get_worker(deck_key(agent, subpath.split("/", 3)[3]))
+        return self.next_worker()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = len(self._sessions)
+        return {
+            "workers": [worker.get_status() for worker in self.workers],
+            "sessions": sessions,
+        }
+
+
+supervisor = Supervisor()
+app = FastAPI(title="NW Multi Agent API (supervisor)")
+_client: Optional[httpx.AsyncClient] = None
+
+
+@app.on_event("startup")
+async def start_workers() -> None:
+    global _client
+    _client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=5.0))
+    supervisor.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers() -> None:
+    supervisor.stop()
+    if _client is not None:
+        await _client.aclose()
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness do supervisor."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: pronto quando todos os workers estão prontos."""
+    async def check(worker: WorkerProcess) -> Dict[str, Any]:
+        try:
+            response = await _client.get(f"{worker.url}/health/ready", timeout=2.0)
+            return {"worker": worker.index, "ready": response.status_code == 200, "status": response.json()}
+        except Exception as e:
+            return {"worker": worker.index, "ready": False, "error": str(e)}
+
+    workers = await asyncio.gather(*(check(worker) for worker in supervisor.workers))
+    ready = all(worker["ready"] for worker in workers)
+    preload = {
+        agent: merge_preload([
+            worker["status"]["agents"][agent]["preload"]
+            for worker in workers
+            if agent in ((worker.get("status") or {}).get("agents") or {})
+        ])
+        for agent in AGENTS
+    }
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "preload": preload, "workers": workers},
+    )
+
+
+@app.get("/supervisor/workers")
+async def supervisor_workers():
+    """Processos worker e sessões registradas."""
+    return supervisor.get_status()
+
+
+def _forward_headers(headers) -> Dict[str, str]:
+    return {k: v for k, v in headers.items() if k.lower() not in _HOP_HEADERS}
+
+
+def _merge_counts(statuses: List[Dict[str, Any]]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for status in statuses:
+        for state, count in (status.get("counts") or {}).items():
+            counts[state] = counts.get(state, 0) + count
+    return counts
+
+
+def merge_ingestion_status(statuses: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combina o GET /decks/ingestion de cada worker (worker -> status).
+
+    Os decks de cada worker são disjuntos: a lista é a união, com o índice do
+    worker em cada deck, e as contagens são somadas.
+    """
+    answered = list(statuses.values())
+    decks = [
+        {**deck, "worker": worker}
+        for worker, status in statuses.items()
+        for deck in status.get("decks", [])
+    ]
+    merged = dict(answered[0]) if answered else {}
+    merged.update(
+        enabled=any(status.get("enabled") for status in answered),
+        running=any(status.get("running") for status in answered),
+        counts=_merge_counts(answered),
+        decks=sorted(decks, key=lambda d: d["deck"]),
+    )
+    return merged
+
+
+def merge_preload(progresses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combina o resumo de preload (DeckIngestor.get_progress) de cada worker."""
+    return {
+        "enabled": any(p.get("enabled") for p in progresses),
+        "running": any(p.get("running") for p in progresses),
+        "total": sum(p.get("total", 0) for p in progresses),
+        "done": sum(p.get("done", 0) for p in progresses),
+        "complete": bool(progresses) and all(p.get("complete") for p in progresses),
+        "counts": _merge_counts(progresses),
+    }
+
+
+async def _fan_out(path: str, timeout: float = 10.0) -> Dict[int, Any]:
+    """GET em todos os workers; worker -> (status HTTP, JSON) ou exceção."""
+    async def get(worker: WorkerProcess) -> Any:
+        try:
+            response = await _client.get(f"{worker.url}{path}", timeout=timeout)
+            return response.status_code, response.json()
+        except Exception as e:
+            return e
+
+    results = await asyncio.gather(*(get(worker) for worker in supervisor.workers))
+    return dict(zip((worker.index for worker in supervisor.workers), results))
+
+
+def _answered(results: Dict[int, Any]) -> Dict[int, Dict[str, Any]]:
+    """Respostas JSON dos workers que atenderam (worker -> corpo)."""
+    return {
+        index: result[1]
+        for index, result in results.items()
+        if not isinstance(result, Exception) and isinstance(result[1], dict)
+    }
+
+
+@app.get("/api/{agent}/decks/ingestion")
+async def agent_deck_ingestion(agent: str, request: Request):
+    """Status da ingestão de decks do agente, combinado de todos os workers."""
+    if agent not in AGENTS or request.headers.get("x-worker") is not None:
+        return await proxy(f"api/{agent}/decks/ingestion", request)
+    results = await _fan_out(f"/api/{agent}/decks/ingestion")
+    statuses = {
+        index: body
+        for index, body in _answered(results).items()
+        if results[index][0] == 200
+    }
+    merged = merge_ingestion_status(statuses)
+    merged["unavailable_workers"] = sorted(set(results) - set(statuses))
+    return merged
+
+
+@app.get("/api/{agent}/health/ready")
+async def agent_health_ready(agent: str, request: Request):
+    """Readiness do agente em todos os workers, com o preload combinado."""
+    if agent not in AGENTS or request.headers.get("x-worker") is not None:
+        return await proxy(f"api/{agent}/health/ready", request)
+    results = await _fan_out(f"/api/{agent}/health/ready", timeout=2.0)
+    answered = _answered(results)
+    workers = []
+    for index, result in results.items():
+        if index in answered:
+            workers.append({"worker": index, "ready": result[0] == 200, "status": answered[index]})
+        else:
+            error = str(result) if isinstance(result, Exception) else f"HTTP {result[0]}"
+            workers.append({"worker": index, "ready": False, "error": error})
+    ready = all(worker["ready"] for worker in workers)
+    preload = merge_preload([body["preload"] for body in answered.values() if "preload" in body])
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "preload": preload, "workers": workers},
+    )
+
+
+@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"])
+async def proxy(path: str, request: Request):
+    """Repassa a requisição ao worker escolhido por Supervisor.route."""
+    parts = path.split("/", 2)
+    agent = parts[1] if len(parts) > 1 and parts[0] == "api" and parts[1] in AGENTS else None
+    subpath = "/" + parts[2] if agent and len(parts) > 2 else ""
+
+    body: Any = request.stream()
+    payload = None
+    if agent and request.method == "POST" and subpath in _JSON_ROUTED:
+        body = await request.body()
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = None
+
+    forced = request.headers.get("x-worker")
+    if forced is not None and forced.isdigit() and int(forced) < supervisor.worker_count:
+        index = int(forced)
+    elif agent:
+        index = supervisor.route(agent, subpath, request.method, payload)
+    else:
+        index = supervisor.next_worker()
+    worker = supervisor.workers[index]
+
+    url = f"{worker.url}/{path}"
+    if request.url.query:
+        url = f"{url}?{request.url.query}"
+    upstream = _client.build_request(request.method, url, headers=_forward_headers(request.headers), content=body)
+    try:
+        response = await _client.send(upstream, stream=True)
+    except httpx.TransportError as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": f"Worker {index} indisponível: {e}"},
+            headers={"Retry-After": "5"},
+        )
+
+    headers = _forward_headers(response.headers)
+    if agent and subpath in _SESSION_CREATORS and response.status_code == 200:
+        # Resposta pequena: ler para registrar a sessão no worker
+        content = await response.aread()
+        await response.aclose()
+        try:
+            session_id = json.loads(content).get("session_id")
+        except (ValueError, AttributeError):
+            session_id = None
+        if session_id:
+            supervisor.remember_session(str(session_id), index)
+        headers.pop("content-encoding", None)
+        return Response(content=content, status_code=response.status_code, headers=headers)
+
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers=headers,
+        background=BackgroundTask(response.aclose),
+    )
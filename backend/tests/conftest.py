@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+
+import pytest
+
+# As APIs importadas nos testes não devem gravar sessões no banco real nem ingerir decks
+os.environ.setdefault("SESSION_PERSIST_ENABLED", "false")
+os.environ.setdefault("DECK_INGEST_ENABLED", "false")
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+DADGER_FIXTURE = FIXTURES_DIR / "dadger.rv0"
+
+
+@pytest.fixture
+def make_decomp_deck(tmp_path, monkeypatch):
+    """
+    Cria decks DECOMP em tmp_path com o dadger de fixtures/.
+
+    Os snapshots em disco ficam desativados para que cada teste faça o parse
+    do arquivo. `extra` é acrescentado ao dadger (ex: um comentário para que
+    dois decks tenham conteúdos, e portanto chaves de cache, diferentes).
+    """
+    from backend.decomp.utils import parsed_snapshot
+
+    monkeypatch.setattr(parsed_snapshot, "DECOMP_SNAPSHOT_ENABLED", False)
+
+    def make(name: str, extra: str = "") -> str:
+        deck = tmp_path / name
+        deck.mkdir()
+        (deck / "dadger.rv0").write_text(DADGER_FIXTURE.read_text() + extra)
+        return str(deck)
+
+    return make
+
+
+@pytest.fixture
+def parse_pool_enabled(monkeypatch):
+    """Pool de parse com 2 processos (spawn), encerrado ao fim do teste."""
+    from backend.core import parse_pool
+
+    monkeypatch.setattr(parse_pool, "PARSE_POOL_PROCESSES", 2)
+    yield
+    parse_pool.shutdown_parse_pool()
@@ -0,0 +1,167 @@
+"""
+Equivalência dos acessos do Dadger com as implementações anteriores.
+
+- Filtros por registro (__registros, índice por tipo e campos) contra a busca
+  linear do cfinterface (RegisterData.get_registers_of_type), usada
+  diretamente antes do índice.
+- DataFrames (__expande_colunas_df vetorizado e memoizado) contra a expansão
+  linha a linha com df.apply, reproduzida aqui como referência.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from idecomp.decomp.modelos.dadger import CQ, CT, DP, FU, HQ, IA, LQ, LU, PQ, RE, SB, UH, VI
+
+from backend.decomp.decompclass import Dadger
+
+LEITORES = {"read": Dadger.read, "read_lazy": Dadger.read_lazy}
+
+
+@pytest.fixture(params=list(LEITORES))
+def dadger(request, make_decomp_deck):
+    return LEITORES[request.param](make_decomp_deck("A") + "/dadger.rv0")
+
+
+def _expande_colunas_linha_a_linha(df: pd.DataFrame) -> pd.DataFrame:
+    """Expansão de colunas de listas anterior à vetorização (df.apply por linha)."""
+    colunas_com_listas = df.map(lambda linha: isinstance(linha, list)).all()
+    nomes_colunas = [c for c in colunas_com_listas[colunas_com_listas].index]
+    for c in nomes_colunas:
+        num_elementos = len(df.at[0, c])
+        particoes_coluna = [f"{c}_{i}" for i in range(1, num_elementos + 1)]
+        df[particoes_coluna] = df.apply(
+            lambda linha: linha[c] + [np.nan] * max(0, num_elementos - len(linha[c])),
+            axis=1,
+            result_type="expand",
+        )
+        df.drop(columns=[c], inplace=True)
+    return df
+
+
+def _mesmos_registros(obtido, esperado) -> bool:
+    if isinstance(esperado, list):
+        return isinstance(obtido, list) and len(obtido) == len(esperado) and all(
+            a is b for a, b in zip(obtido, esperado)
+        )
+    return obtido is esperado
+
+
+@pytest.mark.parametrize(
+    "metodo, tipo, filtros",
+    [
+        ("ct", CT, {"codigo_usina": 1}),
+        ("ct", CT, {"codigo_usina": 1, "estagio": 2}),
+        ("ct", CT, {"codigo_usina": 2, "estagio": 3, "nome_usina": "U0"}),
+        ("ct", CT, {"codigo_usina": 3, "codigo_submercado": 1}),
+        ("ct", CT, {"codigo_usina": 99}),
+        ("ct", CT, {"nome_usina": "U5"}),
+        ("uh", UH, {"codigo_usina": 2}),
+        ("uh", UH, {"codigo_usina": 3, "codigo_ree": 1}),
+        ("uh", UH, {"codigo_ree": 4}),
+        ("sb", SB, {"codigo_submercado": 1}),
+        ("sb", SB, {"codigo_submercado": 3}),
+        ("dp", DP, {"codigo_submercado": 1, "estagio": 4}),
+        ("dp", DP, {"estagio": 3}),
+        ("re", RE, {"codigo_restricao": 1}),
+        ("hq", HQ, {"codigo_restricao": 2}),
+        ("cq", CQ, {"codigo_restricao": 2, "estagio": 1}),
+        ("fu", FU, {"codigo_restricao": 1, "codigo_usina": 2}),
+        ("ct", CT, {}),
+        ("uh", UH, {}),
+    ],
+)
+def test_filtros_equivalentes_a_busca_linear(dadger, metodo, tipo, filtros):
+    obtido = getattr(dadger, metodo)(**filtros)
+    esperado = dadger.data.get_registers_of_type(tipo, **filtros)
+
+    assert _mesmos_registros(obtido, esperado)
+
+
+def test_indice_acompanha_insercao_e_reindexa(dadger):
+    dadger.ct(codigo_usina=1, estagio=2)  # constrói o índice
+    novo = CT()
+    novo.codigo_usina = 1
+    novo.estagio = 2
+    dadger.data.add_after(dadger.data.get_registers_of_type(CT)[-1], novo)
+
+    obtido = dadger.ct(codigo_usina=1, estagio=2)
+    assert _mesmos_registros(obtido, dadger.data.get_registers_of_type(CT, codigo_usina=1, estagio=2))
+    assert novo in (obtido if isinstance(obtido, list) else [obtido])
+
+    # Campo indexado alterado in-place: vale após reindexa()
+    novo.codigo_usina = 4
+    dadger.reindexa()
+    assert _mesmos_registros(
+        dadger.ct(codigo_usina=4, estagio=2),
+        dadger.data.get_registers_of_type(CT, codigo_usina=4, estagio=2),
+    )
+
+
+@pytest.mark.parametrize("metodo, tipo", [
+    ("ct", CT), ("dp", DP), ("lu", LU), ("lq", LQ), ("uh", UH), ("ia", IA), ("vi", VI), ("pq", PQ), ("sb", SB),
+])
+def test_dataframe_equivalente_a_expansao_linha_a_linha(dadger, metodo, tipo):
+    obtido = getattr(dadger, metodo)(df=True)
+    esperado = _expande_colunas_linha_a_linha(dadger._as_df(tipo))
+
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_dataframe_memoizado_devolve_copia(dadger):
+    df = dadger.ct(df=True)
+    df["cvu_1"] = -1.0
+
+    assert (dadger.ct(df=True)["cvu_1"] != -1.0).all()
+
+
+def test_indice_descartado_quando_tipo_pendente_e_parseado(make_decomp_deck, monkeypatch):
+    from cfinterface.data.registerdata import RegisterData
+
+    from backend.decomp.utils.lazy_registers import LazyRegisterData
+
+    dadger = Dadger.read_lazy(make_decomp_deck("A") + "/dadger.rv0")
+    # Índice construído enquanto CT ainda não foi parseado (visão de uma
+    # thread concorrente no meio do parse): nenhum registro CT
+    with monkeypatch.context() as m:
+        m.setattr(LazyRegisterData, "materializa", lambda self, t: None)
+        m.setattr(LazyRegisterData, "of_type", RegisterData.of_type)
+        assert dadger.ct(estagio=1) is None
+
+    # O parse altera _type_index in-place, sem mudar o número de registros
+    dadger.data.materializa(CT)
+
+    esperado = dadger.data.get_registers_of_type(CT, estagio=1)
+    assert len(esperado) == 5
+    assert _mesmos_registros(dadger.ct(estagio=1), esperado)
+
+
+def test_acessos_concorrentes_ao_tipo_em_parse(make_decomp_deck, monkeypatch):
+    import threading
+    import time
+
+    dadger = Dadger.read_lazy(make_decomp_deck("A") + "/dadger.rv0")
+    em_parse = threading.Event()
+    leitura_original = CT.read
+
+    def leitura_lenta(self, *args, **kwargs):
+        em_parse.set()
+        time.sleep(0.01)
+        return leitura_original(self, *args, **kwargs)
+
+    monkeypatch.setattr(CT, "read", leitura_lenta)
+    resultados = {}
+    a = threading.Thread(target=lambda: resultados.update(todos=dadger.ct()))
+    b = threading.Thread(target=lambda: resultados.update(estagio=dadger.ct(estagio=1)))
+    a.start()
+    assert em_parse.wait(10)
+    # B consulta CT enquanto A ainda está no parse
+    b.start()
+    a.join(30)
+    b.join(30)
+    monkeypatch.undo()
+
+    esperado = dadger.data.get_registers_of_type(CT, estagio=1)
+    assert len(esperado) == 5
+    assert len(resultados["todos"]) == 12
+    assert _mesmos_registros(resultados["estagio"], esperado)
+    assert _mesmos_registros(dadger.ct(estagio=1), esperado)
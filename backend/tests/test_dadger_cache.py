@@ -0,0 +1,56 @@
+import pytest
+
+from backend.decomp.decompclass import Dadger
+from backend.decomp.utils import dadger_cache
+from backend.decomp.utils.file_cache import estimate_size
+
+
+@pytest.fixture
+def lazy_mode(monkeypatch):
+    """Leitura sob demanda ativa e cache de dadgers vazio."""
+    monkeypatch.setattr(dadger_cache, "DECOMP_DADGER_LAZY", True)
+    dadger_cache.clear_dadger_cache()
+    yield
+    dadger_cache.clear_dadger_cache()
+
+
+def _entry_bytes(dadger_path: str) -> int:
+    return next(e["bytes"] for e in dadger_cache.get_cache_entries() if e["path"] == dadger_path)
+
+
+def test_lazy_mode_parses_batch_misses_in_pool(lazy_mode, parse_pool_enabled, make_decomp_deck):
+    decks = {
+        "A": make_decomp_deck("A", "& deck A\n"),
+        "B": make_decomp_deck("B", "& deck B\n"),
+    }
+    before = dadger_cache.get_cache_stats()["process_loads"]
+
+    dadgers = dadger_cache.get_cached_dadgers(decks)
+
+    assert dadger_cache.get_cache_stats()["process_loads"] == before + 2
+    # O pool faz o parse completo: nenhum tipo fica pendente
+    for dadger in dadgers.values():
+        assert not getattr(dadger.data, "tipos_pendentes", None)
+    assert dadgers["A"] == Dadger.read(decks["A"] + "/dadger.rv0")
+
+
+def test_lazy_entry_size_follows_materialized_blocks(lazy_mode, make_decomp_deck):
+    deck = make_decomp_deck("A")
+    dadger_path = deck + "/dadger.rv0"
+
+    dadger = dadger_cache.get_cached_dadger(deck)
+    assert dadger.data.tipos_pendentes
+    loaded = _entry_bytes(dadger_path)
+    assert loaded == estimate_size(dadger)
+
+    dadger.ct(codigo_usina=1)
+    after_ct = _entry_bytes(dadger_path)
+    assert after_ct > loaded
+    assert after_ct == estimate_size(dadger)
+
+    for consulta in (dadger.uh, dadger.dp, dadger.lu, dadger.lq):
+        consulta(df=True)
+    after_df = _entry_bytes(dadger_path)
+    assert after_df > after_ct
+    assert after_df == estimate_size(dadger)
+    assert dadger_cache.get_cache_stats()["bytes"] == after_df
@@ -0,0 +1,57 @@
+import importlib
+import io
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core import deck_upload
+from backend.core.deck_upload import DeckUploadManager
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("dadger.rv0", "& deck\n")
+    return buffer.getvalue()
+
+
+@pytest.fixture(params=["newave", "decomp", "dessem"])
+def failing_upload(request, tmp_path, monkeypatch):
+    """API do agente com uploads em tmp_path cuja preparação falha."""
+    api = importlib.import_module(f"backend.{request.param}.api")
+
+    def fail(zip_path, deck_dir, *args, **kwargs):
+        raise OSError("Sem espaço no dispositivo")
+
+    monkeypatch.setattr(deck_upload, "ensure_deck_dir", fail)
+    uploads = DeckUploadManager(request.param.upper(), tmp_path, lambda: [], api.load_deck, api.session_store.put)
+    monkeypatch.setattr(api, "uploads", uploads)
+    yield TestClient(api.app)
+    uploads._executor.shutdown(wait=True)
+
+
+def test_failed_preparation_returns_upload_error(failing_upload):
+    client = failing_upload
+    upload = client.post("/upload", files={"file": ("deck.zip", _zip_bytes(), "application/zip")})
+    assert upload.status_code == 200
+    session_id = upload.json()["session_id"]
+
+    for method, path, body in (
+        ("POST", "/query", {"session_id": session_id, "query": "CVU"}),
+        ("POST", "/query/stream", {"session_id": session_id, "query": "CVU"}),
+        ("GET", f"/sessions/{session_id}", None),
+    ):
+        response = client.request(method, path, json=body)
+        assert response.status_code == 422, path
+        assert "Sem espaço no dispositivo" in response.json()["detail"]
+
+    status = client.get(f"/upload/{session_id}").json()
+    assert status["status"] == deck_upload.ERROR
+    assert status["error"] == "Sem espaço no dispositivo"
+
+
+def test_unknown_session_is_still_not_found(failing_upload):
+    response = failing_upload.post("/query", json={"session_id": "inexistente", "query": "CVU"})
+
+    assert response.status_code == 404
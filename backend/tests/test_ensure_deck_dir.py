@@ -0,0 +1,82 @@
+import functools
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from backend.core.utils import zip_deck
+from backend.decomp.utils import dadger_cache, deck_loader, parsed_snapshot
+
+DADGER_FIXTURE = Path(__file__).resolve().parent / "fixtures" / "dadger.rv0"
+THREADS = 8
+
+
+@pytest.fixture
+def new_deck(tmp_path, monkeypatch):
+    """Repositório DECOMP em tmp_path com um deck ainda não preparado (DC202501-sem1)."""
+    decks_dir = tmp_path / "decks"
+    month_dir = decks_dir / "DC202501"
+    month_dir.mkdir(parents=True)
+    with zipfile.ZipFile(month_dir / "DC202501-sem1.zip", "w") as zf:
+        zf.write(DADGER_FIXTURE, "dadger.rv0")
+        zf.writestr("hidr.dat", b"hidr" * 1000)
+        zf.writestr("vazoes.rv0", b"vazoes" * 1000)
+    monkeypatch.setattr(deck_loader, "DECOMP_DECKS_DIR", decks_dir)
+    monkeypatch.setattr(parsed_snapshot, "DECOMP_SNAPSHOT_ENABLED", False)
+    monkeypatch.setattr(zip_deck, "DECK_BLOB_DIR", tmp_path / "blobs")
+    monkeypatch.setattr(zip_deck, "_blobs_collected", True)
+    monkeypatch.setattr(zip_deck, "_member_digests", {})
+    dadger_cache.clear_dadger_cache()
+    yield decks_dir
+    dadger_cache.clear_dadger_cache()
+
+
+@pytest.mark.parametrize("on_demand", [True, False])
+def test_concurrent_load_deck_prepares_once(new_deck, monkeypatch, on_demand):
+    monkeypatch.setattr(deck_loader, "ensure_deck_dir", functools.partial(zip_deck.ensure_deck_dir, on_demand=on_demand))
+    creations = []
+    create = zip_deck._create_deck_dir
+
+    def slow_create(deck_dir, fill):
+        def slow_fill(directory):
+            # Alarga a janela em que as outras threads chegam com o deck pela metade
+            time.sleep(0.2)
+            return fill(directory)
+
+        creations.append(deck_dir)
+        return create(deck_dir, slow_fill)
+
+    monkeypatch.setattr(zip_deck, "_create_deck_dir", slow_create)
+    barrier = threading.Barrier(THREADS)
+    seen, errors = [], []
+
+    def load():
+        try:
+            barrier.wait(10)
+            path = deck_loader.load_deck("DC202501-sem1")
+            # O que cada chamada vê ao retornar: o deck completo
+            names = sorted(p.name for p in path.iterdir() if not p.name.startswith("."))
+            members = [zip_deck.find_deck_member(str(path), name) for name in ("dadger.rv0", "hidr.dat", "vazoes.rv0")]
+            seen.append((path, names, [Path(m).stat().st_size for m in members]))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert errors == []
+    assert len(creations) == 1
+    assert len(seen) == THREADS
+    expected_sizes = [DADGER_FIXTURE.stat().st_size, 4000, 6000]
+    for path, names, sizes in seen:
+        assert path == new_deck / "DC202501-sem1_extracted"
+        assert sizes == expected_sizes
+        if not on_demand:
+            assert names == ["dadger.rv0", "hidr.dat", "vazoes.rv0"]
+    # Nenhum diretório temporário ao lado do deck
+    assert sorted(p.name for p in new_deck.iterdir()) == ["DC202501", "DC202501-sem1_extracted"]
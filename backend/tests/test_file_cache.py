@@ -0,0 +1,127 @@
+from backend.decomp.decompclass import Dadger
+from backend.decomp.utils.file_cache import MemoryBudgetCache, estimate_size
+
+
+class _Growing:
+    """Objeto com tamanho controlado pelo teste e o mesmo protocolo ao_crescer do Dadger."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.listener = None
+
+    def ao_crescer(self, listener):
+        self.listener = listener
+
+    def grow(self, size: int):
+        self.size = size
+        if self.listener is not None:
+            self.listener()
+
+
+def _cache(max_bytes: int) -> MemoryBudgetCache:
+    return MemoryBudgetCache("TEST", max_bytes=max_bytes, sizer=lambda obj: obj.size)
+
+
+def test_put_evicts_least_recently_used_over_budget():
+    cache = _cache(100)
+    cache.put("a", 0, _Growing(40))
+    cache.put("b", 0, _Growing(40))
+    cache.lookup("a", 0)
+    cache.put("c", 0, _Growing(40))
+
+    assert [e["key"] for e in cache.entries()] == ["c", "a"]
+    assert cache.get_stats()["bytes"] == 80
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_growth_after_put_is_counted_and_evicts():
+    cache = _cache(100)
+    a = _Growing(30)
+    cache.put("a", 0, a)
+    cache.put("b", 0, _Growing(30))
+    cache.put("c", 0, _Growing(30))
+
+    a.grow(60)
+
+    # "a" cresceu e passou a ser a mais recente: "b" (a menos usada) sai para caber
+    stats = cache.get_stats()
+    assert stats["resizes"] == 1
+    assert [e["key"] for e in cache.entries()] == ["a", "c"]
+    assert stats["bytes"] == 90
+    assert cache.entries()[0]["bytes"] == 60
+
+
+def test_evicted_object_stops_reporting_growth():
+    cache = _cache(50)
+    a = _Growing(30)
+    cache.put("a", 0, a)
+    cache.put("b", 0, _Growing(30))
+
+    assert a.listener is None
+    a.grow(1000)
+    assert cache.get_stats()["bytes"] == 30
+
+
+def test_resize_of_unknown_key_is_noop():
+    cache = _cache(100)
+    assert cache.resize("x") == 0
+    assert cache.get_stats()["resizes"] == 0
+
+
+def test_dadger_growth_updates_entry_size(make_decomp_deck):
+    path = make_decomp_deck("A") + "/dadger.rv0"
+    cache = MemoryBudgetCache("DADGER", max_bytes=0)
+    dadger = cache.get_or_load(path, Dadger.read)
+    size = cache.get_stats()["bytes"]
+    assert size == estimate_size(dadger)
+
+    dadger.ct(codigo_usina=1)
+    after_index = cache.get_stats()["bytes"]
+    assert after_index > size
+
+    dadger.ct(df=True)
+    after_df = cache.get_stats()["bytes"]
+    assert after_df > after_index
+    assert after_df == estimate_size(dadger)
+
+    # Consultas que não criam índices/DataFrames novos não reestimam a entrada
+    resizes = cache.get_stats()["resizes"]
+    dadger.ct(codigo_usina=2)
+    dadger.ct(df=True)
+    assert cache.get_stats()["resizes"] == resizes
+
+
+def test_dadger_growth_evicts_other_entries(make_decomp_deck):
+    path_a = make_decomp_deck("A") + "/dadger.rv0"
+    path_b = make_decomp_deck("B", "& deck B\n") + "/dadger.rv0"
+    size_a = estimate_size(Dadger.read(path_a))
+    size_b = estimate_size(Dadger.read(path_b))
+    # Cabem os dois recém-lidos, mas não depois de "a" memoizar os DataFrames
+    cache = MemoryBudgetCache("DADGER", max_bytes=size_a + size_b + 1024)
+    dadger_a = cache.get_or_load(path_a, Dadger.read)
+    cache.get_or_load(path_b, Dadger.read)
+    assert cache.get_stats()["entries"] == 2
+
+    for consulta in (dadger_a.ct, dadger_a.lu, dadger_a.dp, dadger_a.uh):
+        consulta(df=True)
+
+    assert [e["path"] for e in cache.entries()] == [path_a]
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_dadger_pickle_drops_cache_listener(make_decomp_deck):
+    import pickle
+
+    path = make_decomp_deck("A") + "/dadger.rv0"
+    cache = MemoryBudgetCache("DADGER", max_bytes=0)
+    dadger = cache.get_or_load(path, Dadger.read)
+    dadger.ct(df=True)
+
+    copia = pickle.loads(pickle.dumps(dadger))
+
+    assert copia == dadger
+    assert copia.ct(df=True).equals(dadger.ct(df=True))
+    # A cópia não está no cache: crescer não reestima a entrada do original
+    resizes = cache.get_stats()["resizes"]
+    copia.lu(df=True)
+    assert cache.get_stats()["resizes"] == resizes
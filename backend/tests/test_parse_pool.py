@@ -0,0 +1,36 @@
+from backend.core import parse_pool
+from backend.decomp.decompclass import Dadger
+from backend.decomp.utils import dadger_cache
+
+
+def test_parse_files_in_processes_matches_read(parse_pool_enabled, make_decomp_deck):
+    paths = [
+        make_decomp_deck("A") + "/dadger.rv0",
+        make_decomp_deck("B", "& deck B\n") + "/dadger.rv0",
+    ]
+
+    parsed = parse_pool.parse_files_in_processes(Dadger, paths)
+
+    assert set(parsed) == set(paths)
+    for path in paths:
+        assert parsed[path] == Dadger.read(path)
+
+
+def test_get_cached_dadgers_parses_misses_in_pool(parse_pool_enabled, make_decomp_deck, monkeypatch):
+    monkeypatch.setattr(dadger_cache, "DECOMP_DADGER_LAZY", False)
+    dadger_cache.clear_dadger_cache()
+    decks = {
+        "A": make_decomp_deck("A", "& deck A\n"),
+        "B": make_decomp_deck("B", "& deck B\n"),
+    }
+    before = dadger_cache.get_cache_stats()["process_loads"]
+
+    dadgers = dadger_cache.get_cached_dadgers(decks)
+
+    assert set(dadgers) == {"A", "B"}
+    assert dadger_cache.get_cache_stats()["process_loads"] == before + 2
+    assert dadgers["A"].ct(df=True).equals(Dadger.read(decks["A"] + "/dadger.rv0").ct(df=True))
+    # Segunda chamada: tudo no cache, nada vai para o pool
+    assert dadger_cache.get_cached_dadgers(decks)["B"] is dadgers["B"]
+    assert dadger_cache.get_cache_stats()["process_loads"] == before + 2
+    dadger_cache.clear_dadger_cache()
@@ -0,0 +1,94 @@
+import os
+import time
+
+import pytest
+
+from backend.core import parse_pool
+from backend.decomp.decompclass import Dadger
+from backend.decomp.utils import parsed_snapshot
+
+
+@pytest.fixture
+def snapshot_dir(make_decomp_deck, tmp_path, monkeypatch):
+    """Snapshots ativos em um diretório temporário."""
+    directory = tmp_path / "snapshots"
+    monkeypatch.setattr(parsed_snapshot, "DECOMP_SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(parsed_snapshot, "DECOMP_SNAPSHOT_DIR", directory)
+    return directory
+
+
+def _wait_pending(timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while parsed_snapshot._pending and time.time() < deadline:
+        time.sleep(0.05)
+    assert not parsed_snapshot._pending
+
+
+def test_lazy_object_snapshot_is_parsed_in_pool(snapshot_dir, make_decomp_deck, parse_pool_enabled, monkeypatch):
+    path = make_decomp_deck("A") + "/dadger.rv0"
+    expected = Dadger.read(path)
+
+    def no_parse_in_api_process(*args, **kwargs):
+        raise AssertionError("parse completo no processo da API")
+
+    monkeypatch.setattr(Dadger, "read", no_parse_in_api_process)
+    dadger = parsed_snapshot.load_with_snapshot(path, Dadger, Dadger.read_lazy)
+    assert dadger.data.tipos_pendentes
+    _wait_pending()
+
+    snapshot = parsed_snapshot.load_snapshot(path, Dadger)
+    assert snapshot is not None
+    assert not getattr(snapshot.data, "tipos_pendentes", None)
+    assert snapshot == expected
+
+
+def test_lazy_object_without_pool_gets_no_snapshot(snapshot_dir, make_decomp_deck, monkeypatch):
+    monkeypatch.setattr(parse_pool, "PARSE_POOL_PROCESSES", 0)
+    path = make_decomp_deck("A") + "/dadger.rv0"
+
+    parsed_snapshot.load_with_snapshot(path, Dadger, Dadger.read_lazy)
+
+    assert not parsed_snapshot._pending
+    assert parsed_snapshot.load_snapshot(path, Dadger) is None
+
+
+def test_fully_parsed_object_snapshot_in_thread(snapshot_dir, make_decomp_deck):
+    path = make_decomp_deck("A") + "/dadger.rv0"
+
+    dadger = parsed_snapshot.load_with_snapshot(path, Dadger, Dadger.read)
+    _wait_pending()
+
+    assert parsed_snapshot.load_snapshot(path, Dadger) == dadger
+
+
+def test_prune_snapshots_by_parser_version_and_age(snapshot_dir):
+    snapshot_dir.mkdir()
+    current = f"dadger-{parsed_snapshot.parser_version(Dadger)}-"
+    recent = snapshot_dir / f"{current}{'a' * 64}.pkl"
+    stale = snapshot_dir / f"{current}{'b' * 64}.pkl"
+    old_version = snapshot_dir / f"dadger-0000000000000000-{'c' * 64}.pkl"
+    stale_tmp = snapshot_dir / f"{current}{'d' * 64}.tmp1234"
+    other_class = snapshot_dir / f"outro-0000000000000000-{'e' * 64}.pkl"
+    for f in (recent, stale, old_version, stale_tmp, other_class):
+        f.write_bytes(b"x")
+    old = time.time() - 40 * 86400
+    for f in (stale, stale_tmp):
+        os.utime(f, (old, old))
+
+    removed = parsed_snapshot.prune_snapshots([Dadger], max_age_days=30)
+
+    assert removed == 3
+    assert sorted(p.name for p in snapshot_dir.iterdir()) == sorted([recent.name, other_class.name])
+
+
+def test_loading_snapshot_renews_its_age(snapshot_dir, make_decomp_deck):
+    path = make_decomp_deck("A") + "/dadger.rv0"
+    parsed_snapshot.load_with_snapshot(path, Dadger, Dadger.read)
+    _wait_pending()
+    (snapshot,) = snapshot_dir.glob("dadger-*.pkl")
+    old = time.time() - 40 * 86400
+    os.utime(snapshot, (old, old))
+
+    assert parsed_snapshot.load_snapshot(path, Dadger) is not None
+    assert parsed_snapshot.prune_snapshots([Dadger], max_age_days=30) == 0
+    assert snapshot.exists()
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.core.query_executor import QueryExecutor, QueryExecutorSaturated
+
+
+def _admitted(executor: QueryExecutor) -> int:
+    stats = executor.get_stats()
+    return stats["running"] + stats["queued"]
+
+
+@pytest.fixture
+def executor():
+    executor = QueryExecutor(workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_run_returns_result_and_releases_slot(executor):
+    result = asyncio.run(executor.run(lambda a, b=0: a + b, 1, b=2))
+
+    assert result == 3
+    assert executor.get_stats()["completed"] == 1
+    assert _admitted(executor) == 0
+
+
+def test_rejects_over_capacity_and_admits_again_after_release(executor):
+    release = threading.Event()
+
+    async def scenario():
+        # 1 executando + 1 na fila = capacidade
+        running = asyncio.ensure_future(executor.run(release.wait, 10))
+        queued = asyncio.ensure_future(executor.run(lambda: "fila"))
+        await asyncio.sleep(0.05)
+        assert executor.get_stats()["saturated"]
+
+        with pytest.raises(QueryExecutorSaturated) as exc_info:
+            await executor.run(lambda: "recusada")
+        assert exc_info.value.retry_after > 0
+
+        release.set()
+        assert await running is True
+        assert await queued == "fila"
+        return await executor.run(lambda: "admitida")
+
+    assert asyncio.run(scenario()) == "admitida"
+    stats = executor.get_stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 3
+    assert _admitted(executor) == 0
+
+
+def test_exception_releases_slot(executor):
+    def fail():
+        raise ValueError("falhou")
+
+    for _ in range(executor.capacity + 1):
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(fail))
+
+    stats = executor.get_stats()
+    assert stats["failed"] == executor.capacity + 1
+    assert stats["rejected"] == 0
+    assert _admitted(executor) == 0
+    assert not stats["saturated"]
+
+
+def test_stream_forwards_items_and_propagates_errors(executor):
+    def generator():
+        yield "a"
+        yield "b"
+        raise RuntimeError("erro no gerador")
+
+    async def consume():
+        items = []
+        with pytest.raises(RuntimeError):
+            async for item in executor.stream(generator):
+                items.append(item)
+        return items
+
+    assert asyncio.run(consume()) == ["a", "b"]
+    assert _admitted(executor) == 0
+
+
+def test_stream_closes_generator_when_consumer_disconnects(executor):
+    closed = threading.Event()
+
+    def generator():
+        try:
+            while True:
+                yield "evento"
+        finally:
+            closed.set()
+
+    async def disconnect_after_two():
+        events = executor.stream(generator)
+        received = [await events.__anext__(), await events.__anext__()]
+        # StreamingResponse fecha o iterador quando o cliente desconecta
+        await events.aclose()
+        return received
+
+    assert asyncio.run(disconnect_after_two()) == ["evento", "evento"]
+    assert closed.wait(5)
+    for _ in range(100):
+        if _admitted(executor) == 0:
+            break
+        time.sleep(0.01)
+    assert _admitted(executor) == 0
+    assert executor.get_stats()["cancelled"] == 1
+
+
+def test_stream_rejects_before_response_starts(executor):
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 10))
+        queued = asyncio.ensure_future(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(QueryExecutorSaturated):
+                executor.stream(lambda: iter(["nunca"]))
+        finally:
+            release.set()
+            await running
+            await queued
+
+    asyncio.run(scenario())
+    assert executor.get_stats()["rejected"] == 1
+
+
+def test_api_answers_503_with_retry_after_when_saturated(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+
+    from backend.decomp import api
+
+    saturated = QueryExecutor(workers=1, max_queue=0)
+    release = threading.Event()
+    saturated._submit(release.wait, 10)
+    monkeypatch.setattr(api, "query_executor", saturated)
+    monkeypatch.setattr(api, "_get_session_path", lambda session_id: tmp_path)
+    client = TestClient(api.app)
+
+    try:
+        for endpoint in ("/query", "/query/stream"):
+            response = client.post(endpoint, json={"session_id": "s1", "query": "CVU de Angra 1"})
+            assert response.status_code == 503
+            assert int(response.headers["Retry-After"]) > 0
+    finally:
+        release.set()
+        saturated.shutdown()
+    assert saturated.get_stats()["rejected"] == 2
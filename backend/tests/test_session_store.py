@@ -0,0 +1,202 @@
+import os
+import time
+import types
+
+import pytest
+
+from backend.core import session_store as session_store_module
+from backend.core.session_store import SessionStore
+
+TTL = 3600.0
+
+
+class Clock:
+    """Relógio do session_store controlado pelo teste."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store_module, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def uploads_dir(tmp_path):
+    directory = tmp_path / "uploads"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "sessions.db"
+
+
+def _upload(uploads_dir, session_id: str):
+    deck = uploads_dir / session_id
+    deck.mkdir()
+    (deck / "dadger.rv0").write_text("& deck\n")
+    return deck
+
+
+def _age(path, seconds: float) -> None:
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_put_and_get(uploads_dir):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=None)
+    deck = _upload(uploads_dir, "s1")
+
+    store.put("s1", deck, selected_decks=["DC1", "DC2"])
+
+    assert store.get("s1") == deck
+    assert store.get_selected_decks("s1") == ["DC1", "DC2"]
+    assert "s1" in store
+    assert store.get("s2") is None
+
+
+def test_idle_session_expires_and_its_upload_is_removed(uploads_dir, db_path, clock):
+    removed = []
+    store = SessionStore(
+        "DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path,
+        on_remove=lambda session_id, deck_path: removed.append(session_id),
+    )
+    idle = _upload(uploads_dir, "idle")
+    active = _upload(uploads_dir, "active")
+    store.put("idle", idle)
+    store.put("active", active)
+
+    clock.now += TTL * 0.75
+    assert store.get("active") == active
+    clock.now += TTL * 0.5
+
+    assert store.reap() == {"expired": 1, "orphan_dirs": 0}
+    assert removed == ["idle"]
+    assert not idle.exists()
+    assert store.get("idle") is None
+    assert store.get("active") == active
+    # Também saiu do SQLite
+    assert SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path).get("idle") is None
+
+
+def test_ttl_zero_never_expires(uploads_dir, clock):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=0, db_path=None)
+    deck = _upload(uploads_dir, "s1")
+    store.put("s1", deck)
+
+    clock.now += 365 * 86400
+
+    assert store.reap() == {"expired": 0, "orphan_dirs": 0}
+    assert store.get("s1") == deck
+
+
+def test_lru_evicts_least_recently_used(tmp_path, uploads_dir):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, max_sessions=2, db_path=None)
+    decks = {}
+    for name in ("a", "b", "c"):
+        decks[name] = tmp_path / "decks" / name
+        decks[name].mkdir(parents=True)
+
+    store.put("a", decks["a"])
+    store.put("b", decks["b"])
+    assert store.get("a") == decks["a"]
+    store.put("c", decks["c"])
+
+    assert store.get_stats()["lru_evictions"] == 1
+    assert store.get_stats()["in_memory"] == 2
+    assert store.get("b") is None
+    assert store.get("a") == decks["a"]
+    assert store.get("c") == decks["c"]
+
+
+def test_session_evicted_from_memory_is_reloaded_from_sqlite(tmp_path, uploads_dir, db_path):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, max_sessions=1, db_path=db_path)
+    deck = tmp_path / "decks" / "DC1"
+    deck.mkdir(parents=True)
+    store.put("a", deck, selected_decks=["DC1"])
+    store.put("b", deck)
+
+    assert store.get_stats()["in_memory"] == 1
+    assert store.get("a") == deck
+    assert store.get_selected_decks("a") == ["DC1"]
+
+
+def test_second_store_loads_session_from_sqlite(tmp_path, uploads_dir, db_path):
+    deck = tmp_path / "decks" / "DC1"
+    deck.mkdir(parents=True)
+    SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path).put("s1", deck, ["DC1", "DC2"])
+
+    # Outro worker (ou a API reiniciada)
+    other = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path)
+
+    assert other.get("s1") == deck
+    assert other.get_selected_decks("s1") == ["DC1", "DC2"]
+    # As sessões são por agente
+    assert SessionStore("NEWAVE", uploads_dir, ttl_seconds=TTL, db_path=db_path).get("s1") is None
+
+
+def test_session_deleted_by_another_store_is_forgotten(uploads_dir, db_path, clock):
+    first = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path)
+    second = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path)
+    deck = _upload(uploads_dir, "s1")
+    first.put("s1", deck)
+    assert second.get("s1") == deck
+
+    first.delete("s1")
+
+    assert not deck.exists()
+    assert second.get("s1") is None
+
+
+def test_reap_removes_only_old_unknown_upload_dirs(uploads_dir, db_path):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=db_path)
+    # Sessão de outro agente, no mesmo SQLite: não é órfã para este store
+    other_agent = SessionStore("NEWAVE", uploads_dir, ttl_seconds=TTL, db_path=db_path)
+    orphan = _upload(uploads_dir, "orphan")
+    recent = _upload(uploads_dir, "recent")
+    known = _upload(uploads_dir, "known")
+    hidden = uploads_dir / ".zips"
+    hidden.mkdir()
+    other_agent.put("known", known)
+    for path in (orphan, known, hidden):
+        _age(path, 2 * TTL)
+    _age(recent, TTL / 2)
+
+    assert store.reap() == {"expired": 0, "orphan_dirs": 1}
+    assert not orphan.exists()
+    assert recent.exists()
+    assert known.exists()
+    assert hidden.exists()
+    assert store.get_stats()["orphan_dirs"] == 1
+
+
+def test_upload_dir_without_session_is_adopted(uploads_dir):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=None)
+    legacy = _upload(uploads_dir, "legacy")
+
+    assert store.get("legacy") == legacy
+    assert store.get_stats()["created"] == 1
+
+
+@pytest.mark.parametrize("session_id", ["../decks", "..", ".zips", "a/../../decks"])
+def test_rejects_path_traversal_ids(tmp_path, uploads_dir, session_id):
+    store = SessionStore("DECOMP", uploads_dir, ttl_seconds=TTL, db_path=None)
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    (decks / "DC1.zip").write_bytes(b"PK")
+    (uploads_dir / ".zips").mkdir()
+
+    assert store.get(session_id) is None
+    store.delete(session_id)
+
+    assert (decks / "DC1.zip").exists()
+    assert (uploads_dir / ".zips").is_dir()
+    assert store.get_stats()["in_memory"] == 0
@@ -0,0 +1,116 @@
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+from backend.core.single_flight_cache import SingleFlightCache
+
+
+def _wait_coalesced(cache: SingleFlightCache, count: int) -> None:
+    deadline = time.time() + 10
+    while cache.get_stats()["coalesced"] < count and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get_stats()["coalesced"] == count
+
+
+def _run_concurrently(cache, compute, callers: int):
+    """Um líder calcula (bloqueado até release) enquanto callers-1 aguardam a mesma chave."""
+    started = threading.Event()
+    release = threading.Event()
+    results, errors = [], []
+
+    def leader_compute():
+        started.set()
+        release.wait(10)
+        return compute()
+
+    def call(fn):
+        try:
+            results.append(cache.get_or_compute("chave", fn))
+        except Exception as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call, args=(leader_compute,))
+    leader.start()
+    assert started.wait(10)
+    waiters = [
+        threading.Thread(target=call, args=(lambda: pytest.fail("cálculo duplicado"),))
+        for _ in range(callers - 1)
+    ]
+    for waiter in waiters:
+        waiter.start()
+    _wait_coalesced(cache, callers - 1)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(10)
+    return results, errors
+
+
+def test_concurrent_misses_compute_once():
+    cache = SingleFlightCache(max_entries=10, max_bytes=0)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "valor"
+
+    results, errors = _run_concurrently(cache, compute, callers=5)
+
+    assert errors == []
+    assert results == ["valor"] * 5
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["coalesced"], stats["inflight"]) == (1, 4, 0)
+    assert cache.get_or_compute("chave", lambda: pytest.fail("não é hit")) == "valor"
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    cache = SingleFlightCache(max_entries=10, max_bytes=0)
+
+    def compute():
+        raise ValueError("falhou")
+
+    results, errors = _run_concurrently(cache, compute, callers=4)
+
+    assert results == []
+    assert len(errors) == 4
+    assert all(isinstance(e, ValueError) and str(e) == "falhou" for e in errors)
+    assert len(cache) == 0
+    assert cache.get_stats()["inflight"] == 0
+    # A chave volta a ser calculada na chamada seguinte
+    assert cache.get_or_compute("chave", lambda: "recuperado") == "recuperado"
+
+
+def test_lru_evicts_by_entries_and_bytes():
+    cache = SingleFlightCache(max_entries=2, max_bytes=0)
+    for key in ("a", "b"):
+        cache.get_or_compute(key, lambda: key)
+    assert cache.get("a") == (True, "a")
+    cache.get_or_compute("c", lambda: "c")
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "a")
+
+    by_bytes = SingleFlightCache(max_entries=10, max_bytes=2 * 800)
+    for key in ("x", "y", "z"):
+        by_bytes.get_or_compute(key, lambda: np.zeros(100))
+    assert len(by_bytes) == 2
+    assert by_bytes.get("x") == (False, None)
+    assert by_bytes.get_stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries(monkeypatch):
+    from backend.core import single_flight_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(single_flight_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    cache = SingleFlightCache(max_entries=10, max_bytes=0, ttl_seconds=60)
+    cache.get_or_compute("k", lambda: 1)
+
+    now[0] += 61
+
+    assert cache.get("k") == (False, None)
+    assert cache.get_stats()["expirations"] == 1
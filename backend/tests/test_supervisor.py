@@ -0,0 +1,229 @@
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import supervisor as supervisor_module
+from backend.core.deck_affinity import HashRing, deck_key
+from backend.supervisor import Supervisor
+
+BASE_PORT = 9100
+
+
+def test_hash_ring_moves_about_one_nth_of_keys_when_worker_is_added():
+    keys = [deck_key("decomp", f"DC{i:06d}") for i in range(10_000)]
+    before = HashRing(4)
+    after = HashRing(5)
+
+    moved = [key for key in keys if before.get_worker(key) != after.get_worker(key)]
+
+    # Idealmente 1/5 das chaves; todas vão para o worker novo
+    assert 0.12 < len(moved) / len(keys) < 0.28
+    assert {after.get_worker(key) for key in moved} == {4}
+
+
+def test_hash_ring_is_stable_and_uses_every_worker():
+    ring = HashRing(4)
+    keys = [deck_key("newave", f"NW{i}") for i in range(1000)]
+
+    assert [ring.get_worker(k) for k in keys] == [HashRing(4).get_worker(k) for k in keys]
+    assert {ring.get_worker(k) for k in keys} == {0, 1, 2, 3}
+    assert HashRing(1).get_worker(keys[0]) == 0
+
+
+@pytest.fixture
+def sup():
+    return Supervisor(worker_count=4, base_port=BASE_PORT)
+
+
+def test_route_by_deck_and_session(sup):
+    owner = sup.ring.get_worker(deck_key("decomp", "DC202501-sem1"))
+
+    assert sup.route("decomp", "/load-deck", "POST", {"deck_name": "DC202501-sem1"}) == owner
+    assert sup.route("decomp", "/init-comparison", "POST", {"selected_decks": ["DC202501-sem1", "X"]}) == owner
+    assert sup.route("decomp", "/init-comparison", "POST", {}) == sup.ring.get_worker(
+        deck_key("decomp", "__latest__")
+    )
+    assert sup.route("decomp", "/decks/ingestion/DC202501-sem1", "POST", None) == owner
+
+    sup.remember_session("s1", 3)
+    for subpath, payload in (
+        ("/query", {"session_id": "s1"}),
+        ("/query/stream", {"session_id": "s1"}),
+        ("/sessions/s1", None),
+        ("/sessions/s1/decks", None),
+        ("/upload/s1", None),
+    ):
+        assert sup.route("decomp", subpath, "POST", payload) == 3
+
+    # Sessão desconhecida: destino estável pelo id
+    unknown = sup.ring.get_worker("session:s2")
+    assert sup.route("decomp", "/query", "POST", {"session_id": "s2"}) == unknown
+    assert sup.route("decomp", "/sessions/s2", "DELETE", None) == unknown
+    assert sup.route("decomp", "/upload/s2", "GET", None) == unknown
+
+
+def test_route_is_agent_specific(sup):
+    names = [f"D{i}" for i in range(50)]
+    newave = [sup.route("newave", "/load-deck", "POST", {"deck_name": n}) for n in names]
+    decomp = [sup.route("decomp", "/load-deck", "POST", {"deck_name": n}) for n in names]
+
+    assert newave != decomp
+
+
+def test_other_routes_use_round_robin(sup):
+    routed = [sup.route("decomp", path, "GET", None) for path in ("/", "/decks/list", "/query", "/load-deck")]
+
+    assert routed == [0, 1, 2, 3]
+
+
+def _worker(request: httpx.Request) -> int:
+    return request.url.port - BASE_PORT
+
+
+def _reply(status_code: int, body) -> httpx.Response:
+    """Resposta JSON de worker ainda não lida (como a de um servidor real, em streaming)."""
+    return httpx.Response(
+        status_code,
+        headers={"content-type": "application/json"},
+        stream=httpx.ByteStream(json.dumps(body).encode()),
+    )
+
+
+class WorkerTransport(httpx.AsyncBaseTransport):
+    """Workers simulados por rota; as demais rotas respondem o índice do worker."""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        handler = self.handlers.get(request.url.path)
+        if handler is None:
+            return _reply(200, {"worker": _worker(request)})
+        return handler(request)
+
+
+@pytest.fixture
+def proxied(monkeypatch, sup):
+    """Supervisor com 4 workers simulados por um transporte httpx (sem processos)."""
+    handlers = {}
+    monkeypatch.setattr(supervisor_module, "supervisor", sup)
+    monkeypatch.setattr(supervisor_module, "_client", httpx.AsyncClient(transport=WorkerTransport(handlers)))
+    return TestClient(supervisor_module.app), handlers
+
+
+@pytest.mark.parametrize(
+    "subpath, body",
+    [
+        ("/upload", None),
+        ("/load-deck", {"deck_name": "DC202501-sem1"}),
+        ("/init-comparison", {"selected_decks": ["DC202501-sem1"]}),
+    ],
+)
+def test_session_creators_register_the_worker(proxied, sup, subpath, body):
+    client, handlers = proxied
+    handlers[f"/api/decomp{subpath}"] = lambda request: _reply(200, {"session_id": f"sess-{_worker(request)}"})
+
+    if body is None:
+        response = client.post(f"/api/decomp{subpath}", files={"file": ("deck.zip", b"PK")})
+    else:
+        response = client.post(f"/api/decomp{subpath}", json=body)
+    worker = int(response.json()["session_id"].split("-")[1])
+
+    assert sup.worker_for_session(f"sess-{worker}") == worker
+    handlers["/api/decomp/query"] = lambda request: _reply(200, {"worker": _worker(request)})
+    for _ in range(3):
+        query = client.post("/api/decomp/query", json={"session_id": f"sess-{worker}", "query": "q"})
+        assert query.json()["worker"] == worker
+
+
+def test_failed_session_creation_is_not_registered(proxied, sup):
+    client, handlers = proxied
+    handlers["/api/decomp/load-deck"] = lambda request: _reply(404, {"session_id": "x"})
+
+    client.post("/api/decomp/load-deck", json={"deck_name": "DC1"})
+
+    assert sup.get_status()["sessions"] == 0
+
+
+def test_deck_ingestion_status_is_merged_from_all_workers(proxied):
+    client, handlers = proxied
+
+    def status(request):
+        worker = _worker(request)
+        if worker == 3:
+            return _reply(500, "erro")
+        decks = [{"deck": f"DC{worker}", "status": "pronto"}]
+        if worker == 0:
+            decks.append({"deck": "DC9", "status": "erro"})
+        return _reply(200, {
+            "agent": "decomp",
+            "enabled": True,
+            "running": worker == 1,
+            "poll_seconds": 60,
+            "counts": {s: sum(d["status"] == s for d in decks) for s in {d["status"] for d in decks}},
+            "decks": decks,
+        })
+
+    handlers["/api/decomp/decks/ingestion"] = status
+    merged = client.get("/api/decomp/decks/ingestion").json()
+
+    assert merged["agent"] == "decomp"
+    assert merged["running"] is True
+    assert merged["counts"] == {"pronto": 3, "erro": 1}
+    assert [(d["deck"], d["worker"]) for d in merged["decks"]] == [
+        ("DC0", 0), ("DC1", 1), ("DC2", 2), ("DC9", 0),
+    ]
+    assert merged["unavailable_workers"] == [3]
+
+
+def test_forced_worker_bypasses_fan_out(proxied):
+    client, _ = proxied
+
+    response = client.get("/api/decomp/decks/ingestion", headers={"X-Worker": "2"})
+
+    assert response.json() == {"worker": 2}
+
+
+def test_agent_health_merges_preload(proxied):
+    client, handlers = proxied
+
+    def ready(request):
+        worker = _worker(request)
+        complete = worker != 2
+        return _reply(200 if complete else 503, {
+            "ready": complete,
+            "preload": {
+                "enabled": True, "running": True, "total": 2, "done": 2 if complete else 1,
+                "complete": complete, "counts": {"pronto": 2} if complete else {"pronto": 1, "pendente": 1},
+            },
+        })
+
+    handlers["/api/dessem/health/ready"] = ready
+    response = client.get("/api/dessem/health/ready")
+    body = response.json()
+
+    assert response.status_code == 503
+    assert body["preload"]["total"] == 8
+    assert body["preload"]["done"] == 7
+    assert body["preload"]["complete"] is False
+    assert body["preload"]["counts"] == {"pronto": 7, "pendente": 1}
+    assert [w["ready"] for w in body["workers"]] == [True, True, False, True]
+
+
+def test_health_ready_merges_preload_per_agent(proxied):
+    client, handlers = proxied
+    progress = {"enabled": True, "running": True, "total": 1, "done": 1, "complete": True, "counts": {"pronto": 1}}
+    handlers["/health/ready"] = lambda request: _reply(200, {
+        "ready": True,
+        "agents": {agent: {"ready": True, "preload": progress} for agent in ("newave", "decomp", "dessem")},
+    })
+
+    body = client.get("/health/ready").json()
+
+    assert body["ready"] is True
+    assert body["preload"]["decomp"]["total"] == 4
+    assert body["preload"]["decomp"]["complete"] is True
+    assert [w["worker"] for w in body["workers"]] == [0, 1, 2, 3]
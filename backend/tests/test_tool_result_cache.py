@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+import types
+
+from backend.core import tool_result_cache
+from backend.core.base_tool import BaseTool
+from backend.core.tool_registry import ToolSpec
+from backend.core.tool_result_cache import deck_fingerprint, execute_cached
+
+
+def test_fingerprint_covers_files_in_subdirectories(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_result_cache, "TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS", 0)
+    deck = tmp_path / "deck"
+    (deck / "sub").mkdir(parents=True)
+    (deck / "dadger.rv0").write_text("& deck\n")
+    nested = deck / "sub" / "hidr.dat"
+    nested.write_bytes(b"hidr")
+    before = deck_fingerprint(deck)
+
+    nested.write_bytes(b"hidr alterado")
+    assert deck_fingerprint(deck) != before
+
+    changed = deck_fingerprint(deck)
+    os.utime(nested, ns=(0, 0))
+    assert deck_fingerprint(deck) != changed
+
+    (deck / "sub" / "novo.dat").write_bytes(b"")
+    assert deck_fingerprint(deck) != changed
+
+
+def test_fingerprint_is_stable_and_path_independent(tmp_path):
+    decks = []
+    for name in ("a", "b"):
+        deck = tmp_path / name
+        (deck / "sub").mkdir(parents=True)
+        for relative in ("dadger.rv0", "sub/hidr.dat"):
+            (deck / relative).write_bytes(b"x")
+            os.utime(deck / relative, ns=(1, 1))
+        decks.append(deck)
+
+    assert deck_fingerprint(decks[0]) == deck_fingerprint(decks[0])
+    assert deck_fingerprint(decks[0]) == deck_fingerprint(decks[1])
+    assert deck_fingerprint(tmp_path / "inexistente") is None
+
+
+def test_concurrent_callers_get_own_copies_of_uncacheable_result():
+    key = f"teste-nao-cacheavel-{time.time_ns()}"
+    release = threading.Event()
+    calls = []
+
+    def execute():
+        calls.append(1)
+        release.wait(10)
+        return {"success": False, "data": [1, 2, 3]}
+
+    results = {}
+
+    def call(name):
+        results[name] = execute_cached("FakeTool", key, execute)
+
+    coalesced = tool_result_cache._cache.get_stats()["coalesced"]
+    leader = threading.Thread(target=call, args=("leader",))
+    leader.start()
+    while not calls:
+        time.sleep(0.01)
+    waiters = [threading.Thread(target=call, args=(f"waiter{i}",)) for i in range(2)]
+    for waiter in waiters:
+        waiter.start()
+    while tool_result_cache._cache.get_stats()["coalesced"] < coalesced + 2:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(10)
+
+    assert len(calls) == 1
+    assert all(result == {"success": False, "data": [1, 2, 3]} for result in results.values())
+    objects = {id(result) for result in results.values()} | {id(result["data"]) for result in results.values()}
+    assert len(objects) == 6
+
+
+def test_fingerprint_memoized_until_root_mtime_or_recheck_interval(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(tool_result_cache, "time", types.SimpleNamespace(monotonic=lambda: clock[0]))
+    monkeypatch.setattr(tool_result_cache, "TOOL_RESULT_CACHE_FINGERPRINT_RECHECK_SECONDS", 2)
+    monkeypatch.setattr(tool_result_cache, "_dir_fingerprints", {})
+    walks = []
+    walk = tool_result_cache._walk_fingerprint
+    monkeypatch.setattr(tool_result_cache, "_walk_fingerprint", lambda path: walks.append(path) or walk(path))
+
+    deck = tmp_path / "deck"
+    (deck / "sub").mkdir(parents=True)
+    nested = deck / "sub" / "hidr.dat"
+    nested.write_bytes(b"hidr")
+    before = deck_fingerprint(deck)
+    assert deck_fingerprint(deck) == before
+    assert len(walks) == 1
+
+    # Alteração em subdiretório não muda o mtime da raiz: aparece após o intervalo
+    nested.write_bytes(b"hidr alterado")
+    assert deck_fingerprint(deck) == before
+    clock[0] += 2
+    changed = deck_fingerprint(deck)
+    assert changed != before
+    assert len(walks) == 2
+
+    # Arquivo novo na raiz muda o mtime: aparece na hora
+    (deck / "novo.dat").write_bytes(b"")
+    os.utime(deck, ns=(1, 1))
+    assert deck_fingerprint(deck) != changed
+    assert len(walks) == 3
+
+
+class _FakeCvuTool(BaseTool):
+    """Tool de teste que extrai o código da usina da query."""
+
+    executions = []
+
+    def can_handle(self, query):
+        return True
+
+    def get_description(self):
+        return "CVU de teste"
+
+    def get_cache_params(self, query, **kwargs):
+        codigo = kwargs.get("forced_plant_code")
+        if codigo is None:
+            codigo = 1 if "angra 1" in query.lower() else None
+        return {"codigo_usina": codigo}
+
+    def execute(self, query, **kwargs):
+        self.executions.append(query)
+        return {"success": True, "data": [{"query": query}]}
+
+
+class _FakePlainTool(_FakeCvuTool):
+    """Mesma tool, sem parâmetros extraídos: a chave usa a query normalizada."""
+
+    get_cache_params = BaseTool.get_cache_params
+
+
+def test_tool_params_key_paraphrases_together(tmp_path, monkeypatch):
+    monkeypatch.setattr(_FakeCvuTool, "executions", [])
+    (tmp_path / "dadger.rv0").write_text("& deck\n")
+    spec = ToolSpec(_FakeCvuTool, str(tmp_path))
+    tool_result_cache.clear_tool_result_cache()
+
+    first = spec.execute("CVU de Angra 1")
+    assert spec.execute("qual o cvu da usina angra 1?") == first
+    assert _FakeCvuTool.executions == ["CVU de Angra 1"]
+
+    # forced_plant_code entra nos parâmetros: outra usina, outra chave
+    spec.execute("CVU de Angra 1", forced_plant_code=2)
+    assert len(_FakeCvuTool.executions) == 2
+
+
+def test_tool_without_params_keys_on_normalized_query(tmp_path, monkeypatch):
+    monkeypatch.setattr(_FakePlainTool, "executions", [])
+    (tmp_path / "dadger.rv0").write_text("& deck\n")
+    spec = ToolSpec(_FakePlainTool, str(tmp_path))
+    tool_result_cache.clear_tool_result_cache()
+
+    spec.execute("CVU de Angra 1")
+    spec.execute("  cvu de ANGRA 1?")
+    assert len(_FakePlainTool.executions) == 1
+    spec.execute("qual o cvu da usina angra 1")
+    assert len(_FakePlainTool.executions) == 2
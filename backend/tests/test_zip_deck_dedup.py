@@ -0,0 +1,91 @@
+import os
+import stat
+import zipfile
+
+import pytest
+
+from backend.core.utils import zip_deck
+
+
+@pytest.fixture
+def blob_dir(tmp_path, monkeypatch):
+    """Deduplicação ativa com os blobs em um diretório temporário."""
+    directory = tmp_path / "blobs"
+    monkeypatch.setattr(zip_deck, "DECK_BLOB_DIR", directory)
+    monkeypatch.setattr(zip_deck, "DECK_DEDUP_ENABLED", True)
+    monkeypatch.setattr(zip_deck, "_blobs_collected", True)
+    monkeypatch.setattr(zip_deck, "_member_digests", {})
+    return directory
+
+
+def _make_deck(tmp_path, name: str, files: dict) -> str:
+    zip_path = tmp_path / f"{name}.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for member, content in files.items():
+            zf.writestr(member, content)
+    deck_dir = tmp_path / "decks" / name
+    deck_dir.parent.mkdir(exist_ok=True)
+    zip_deck.ensure_deck_dir(zip_path, deck_dir, on_demand=True)
+    return str(deck_dir)
+
+
+def test_identical_members_share_a_read_only_blob(tmp_path, blob_dir):
+    deck_a = _make_deck(tmp_path, "A", {"HIDR.DAT": b"hidr" * 100, "dadger.rv0": b"a"})
+    deck_b = _make_deck(tmp_path, "B", {"HIDR.DAT": b"hidr" * 100, "dadger.rv0": b"b"})
+
+    path_a = zip_deck.find_deck_member(deck_a, "HIDR.DAT")
+    path_b = zip_deck.find_deck_member(deck_b, "HIDR.DAT")
+
+    assert os.path.samefile(path_a, path_b)
+    # blob + dois decks
+    assert os.stat(path_a).st_nlink == 3
+    assert stat.S_IMODE(os.stat(path_a).st_mode) == 0o444
+    assert not [p for p in blob_dir.iterdir() if p.name.startswith(".tmp")]
+
+
+def test_blob_removed_by_another_process_is_extracted_again(tmp_path, blob_dir):
+    deck_a = _make_deck(tmp_path, "A", {"HIDR.DAT": b"hidr" * 100})
+    path_a = zip_deck.find_deck_member(deck_a, "HIDR.DAT")
+    # Coleta de outro processo entre o stat e o link: o nome do blob some
+    for blob in blob_dir.glob("??/*"):
+        blob.unlink()
+
+    deck_b = _make_deck(tmp_path, "B", {"HIDR.DAT": b"hidr" * 100})
+    path_b = zip_deck.find_deck_member(deck_b, "HIDR.DAT")
+
+    with open(path_b, "rb") as f:
+        assert f.read() == b"hidr" * 100
+    with open(path_a, "rb") as f:
+        assert f.read() == b"hidr" * 100
+    # O conteúdo foi publicado de novo, já ligado ao deck B
+    (blob,) = blob_dir.glob("??/*")
+    assert os.path.samefile(blob, path_b)
+
+
+def test_published_blob_always_has_a_deck_link(tmp_path, blob_dir, monkeypatch):
+    seen = []
+    real_link = os.link
+
+    def link(src, dst, *args, **kwargs):
+        real_link(src, dst, *args, **kwargs)
+        if os.path.dirname(os.path.dirname(dst)) == str(blob_dir):
+            seen.append(os.stat(dst).st_nlink)
+
+    monkeypatch.setattr(zip_deck.os, "link", link)
+    deck = _make_deck(tmp_path, "A", {"HIDR.DAT": b"hidr" * 100})
+    zip_deck.find_deck_member(deck, "HIDR.DAT")
+
+    # Ao aparecer em DECK_BLOB_DIR/xx/, o blob já tem os links do tmp e do deck
+    assert seen == [3]
+
+
+def test_remove_deck_dir_releases_unlinked_blob(tmp_path, blob_dir):
+    deck_a = _make_deck(tmp_path, "A", {"HIDR.DAT": b"hidr" * 100})
+    deck_b = _make_deck(tmp_path, "B", {"HIDR.DAT": b"hidr" * 100})
+    zip_deck.find_deck_member(deck_a, "HIDR.DAT")
+    zip_deck.find_deck_member(deck_b, "HIDR.DAT")
+
+    zip_deck.remove_deck_dir(deck_a)
+    assert len(list(blob_dir.glob("??/*"))) == 1
+    zip_deck.remove_deck_dir(deck_b)
+    assert list(blob_dir.glob("??/*")) == []